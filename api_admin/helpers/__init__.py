@@ -7,6 +7,12 @@ from .check_admin_permissions import (
     CanViewAdmins,
     CanViewRoles,
 )
+from .campaign_propagation import (
+    CAMPAIGN_TRACKER_FIELDS,
+    create_history_bulk,
+    propagate_campaign_percentage,
+    propagate_campaign_trackers,
+)
 from .code_reason_message import get_message_from_code_reason
 from .countries import CountryCode
 from .frequent_question_categories import Icons
@@ -14,6 +20,17 @@ from .fx_conversion_cases import (
     fx_conversion_specific_adviser_daily_cases,
     fx_conversion_usd_adviser_daily_cases,
 )
+from .member_report import (
+    MEMBER_REPORT_CODENAME,
+    MEMBER_REPORT_GROUPED_PREFIX,
+    get_member_report_daily_queryset,
+    get_member_report_filters,
+    get_member_report_grouped_daily_queryset,
+    get_member_report_grouped_month_queryset,
+    get_member_report_grouped_vars,
+    order_member_report_grouped_queryset,
+    use_member_report_month_rollup,
+)
 from .normalize_admin_reg_info import NormalizeAdminRegInfo
 from .normalize_bookmaker import normalize_bookmaker_name
 from .paginators import (
@@ -34,6 +51,16 @@ from .paginators import (
     TaskResultPaginator,
 )
 from .partner_accum_history import create_history
+from .report_exports import (
+    REPORT_EXPORTS,
+    ReportExport,
+    get_account_report_export,
+    get_account_report_export_schema,
+    get_bills_export,
+    get_bills_export_schema,
+    get_member_report_export,
+    get_member_report_export_schema,
+)
 from .routers_db import DB_ADMIN
 from .temperature import (
     calculate_temperature,
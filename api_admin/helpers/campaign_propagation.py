@@ -0,0 +1,168 @@
+from api_partner.helpers import DB_USER_PARTNER
+from django.db import connections
+from django.db.models import (
+    Case,
+    F,
+    FloatField,
+    Q,
+    Value,
+    When,
+)
+
+# Trackers of campaign used as default by partner link accumulated
+CAMPAIGN_TRACKER_FIELDS = (
+    "tracker",
+    "tracker_deposit",
+    "tracker_registered_count",
+    "tracker_first_deposit_count",
+    "tracker_wagering_count",
+)
+
+
+def propagate_campaign_percentage(
+    campaign_id,
+    default_percentage,
+    level_percentages,
+    update_reason,
+    adviser_id,
+    using=DB_USER_PARTNER,
+):
+    """
+    Update `percentage_cpa` of assigned partner link accumulated without
+    custom percentage of campaign to `default_percentage` by the
+    percentage of level of partner, in a single UPDATE. A history row is
+    written for every affected partner link accumulated with INSERT ...
+    SELECT.
+
+    `level_percentages` is the dict of level to percentage of
+    `LevelPercentageBase`, partners with level out of dict keep its
+    percentage. Returns the count of updated rows
+    """
+    from api_partner.models import PartnerLinkAccumulated
+
+    filters = (
+        Q(campaign_id=campaign_id),
+        Q(is_percentage_custom=False),
+        Q(is_assigned=True),
+    )
+    whens = [
+        When(
+            partner_level=int(level),
+            then=Value(percentage * default_percentage),
+        )
+        for level, percentage in level_percentages.items()
+        if percentage is not None
+    ]
+    if (not whens):
+        return 0
+
+    count = PartnerLinkAccumulated.objects.using(using).filter(*filters).update(
+        percentage_cpa=Case(
+            *whens,
+            default=F("percentage_cpa"),
+            output_field=FloatField(),
+        ),
+    )
+    create_history_bulk(
+        filters=filters,
+        update_reason=update_reason,
+        adviser_id=adviser_id,
+        using=using,
+    )
+    return count
+
+
+def propagate_campaign_trackers(
+    campaign_id,
+    trackers_old,
+    trackers_new,
+    using=DB_USER_PARTNER,
+):
+    """
+    Update the trackers of partner link accumulated of campaign that keep
+    the old tracker of campaign (not customized) to the new value, all
+    trackers on a single UPDATE.
+
+    `trackers_old` and `trackers_new` are dicts with keys of
+    `CAMPAIGN_TRACKER_FIELDS`, only keys on `trackers_new` are updated.
+    Returns the count of updated rows
+    """
+    from api_partner.models import PartnerLinkAccumulated
+
+    updates = {}
+    filters = Q()
+    for field in CAMPAIGN_TRACKER_FIELDS:
+        if (field not in trackers_new or trackers_new.get(field) == trackers_old.get(field)):
+            continue
+        condition = Q(**{field: trackers_old.get(field)})
+        updates[field] = Case(
+            When(condition, then=Value(trackers_new.get(field))),
+            default=F(field),
+            output_field=FloatField(),
+        )
+        filters |= condition
+
+    if (not updates):
+        return 0
+
+    return PartnerLinkAccumulated.objects.using(using).filter(
+        filters,
+        campaign_id=campaign_id,
+    ).update(**updates)
+
+
+def create_history_bulk(filters, update_reason, adviser_id, using=DB_USER_PARTNER):
+    """
+    Same of `create_history` for all partner link accumulated of filters
+    with a single INSERT ... SELECT, the link is taken from the current
+    assignment. Returns the count of history rows
+    """
+    from api_partner.models import (
+        HistoricalPartnerLinkAccum,
+        Link,
+        PartnerLinkAccumulated,
+    )
+
+    connection = connections[using]
+    quote_name = connection.ops.quote_name
+
+    select_sql, select_params = PartnerLinkAccumulated.objects.using(using).filter(
+        *filters,
+    ).values("pk").query.sql_with_params()
+
+    fields = (
+        "prom_code",
+        "is_assigned",
+        "percentage_cpa",
+        "is_percentage_custom",
+        *CAMPAIGN_TRACKER_FIELDS,
+        "status",
+        "partner_level",
+        "assigned_at",
+    )
+    history_columns = ", ".join(
+        quote_name(column)
+        for column in (
+            "partner_link_accum_id",
+            "link_id",
+            *fields,
+            "adviser_id",
+            "update_reason",
+        )
+    )
+    accum_columns = ", ".join(f"accum.{quote_name(column)}" for column in fields)
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            INSERT INTO {quote_name(HistoricalPartnerLinkAccum._meta.db_table)} ({history_columns})
+            SELECT accum.id, link.id, {accum_columns}, %s, %s
+            FROM {quote_name(PartnerLinkAccumulated._meta.db_table)} AS accum
+            LEFT JOIN {quote_name(Link._meta.db_table)} AS link
+                ON link.partner_link_accumulated_id = accum.id
+            WHERE accum.id IN ({select_sql})
+            ORDER BY accum.id
+            """,
+            (adviser_id, update_reason, *select_params),
+        )
+        return cursor.rowcount
@@ -0,0 +1,396 @@
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.db import models
+from django.db.models import (
+    Avg,
+    F,
+    Q,
+    Sum,
+    Value,
+)
+from django.db.models.functions import (
+    Cast,
+    Coalesce,
+    Concat,
+    NullIf,
+)
+from django.utils import timezone
+
+from .fx_conversion_cases import fx_conversion_usd_adviser_daily_cases
+
+MEMBER_REPORT_CODENAME = "member report api-get"
+
+# Prefix of aggregates of grouped cases, removed on response and export
+MEMBER_REPORT_GROUPED_PREFIX = "grouped_"
+
+
+def use_member_report_month_rollup(since_date, until_date, is_grouped):
+    """
+    Grouped cases of complete months are read from month rollup, there the
+    fields of partner daily are on the same row. Months with changes not
+    yet on rollup are read from daily reports
+    """
+    from api_partner.helpers import (
+        has_dirty_member_report_months,
+        is_month_range,
+    )
+
+    return (
+        is_grouped and
+        is_month_range(
+            since_date=since_date,
+            until_date=until_date,
+            today=timezone.localdate(),
+        ) and
+        not has_dirty_member_report_months(
+            since_date=since_date,
+            until_date=until_date,
+        )
+    )
+
+
+def get_member_report_filters(admin, document, since_date, until_date, partner_prefix):
+    """
+    Filters of member report by the params of `document`, non superusers
+    without search partner limit only see the partners assigned to them.
+    `partner_prefix` is the path to fields of partner daily report (empty
+    on month rollup)
+    """
+    from api_admin.models import SearchPartnerLimit
+
+    filters = []
+
+    if not admin.is_superuser:
+        filters_search_partner_limit = (
+            Q(rol=admin.rol),
+            Q(codename=MEMBER_REPORT_CODENAME),
+        )
+        # Limit admin search to a specifics partners
+        searchpartnerlimit = SearchPartnerLimit.objects.filter(*filters_search_partner_limit).first()
+        if (not searchpartnerlimit or searchpartnerlimit.search_type == SearchPartnerLimit.SearchType.ONLY_ASSIGNED):
+            filters.append(
+                Q(**{f"{partner_prefix}adviser_id": admin.pk})
+            )
+
+    if 'adviser_id' in document:
+        filters.append(
+            Q(**{f"{partner_prefix}adviser_id": document.get("adviser_id")})
+        )
+
+    filters.append(Q(created_at__gte=since_date))
+    filters.append(Q(created_at__lte=until_date))
+
+    if 'bookmaker' in document:
+        filters.append(Q(betenlace_cpa__link__campaign__bookmaker__id=document.get("bookmaker")))
+
+    if 'campaign' in document:
+        filters.append(
+            Q(campaign_title__icontains=document.get("campaign"))
+        )
+
+    if 'prom_code' in document:
+        filters.append(Q(betenlace_cpa__link__prom_code__iexact=document.get("prom_code")))
+
+    if 'partner' in document:
+        filters.append(
+            Q(
+                **{
+                    f"{partner_prefix}partner_link_accumulated__partner__user__id": document.get("partner"),
+                }
+            )
+        )
+
+    if 'country_campaign' in document:
+        filters.append(
+            Q(betenlace_cpa__link__campaign__countries__icontains=document.get("country_campaign")))
+
+    if 'country_partner' in document:
+        filters.append(
+            Q(
+                **{
+                    f"{partner_prefix}partner_link_accumulated__partner__additionalinfo__country": document.
+                    get("country_partner"),
+                }
+            )
+        )
+
+    return filters
+
+
+def get_member_report_daily_queryset(filters, order_by):
+    """
+    Member report without group, a row by daily report of betenlace with
+    the fields of its partner daily report and the values converted to USD
+    """
+    from api_partner.helpers import DB_USER_PARTNER
+    from api_partner.models import BetenlaceDailyReport
+
+    # Get cases for Fx conversion from fixed_incomes to USD for annotates
+    fx_conversion_cases = fx_conversion_usd_adviser_daily_cases(
+        model_func=F,
+    )
+
+    return BetenlaceDailyReport.objects.using(DB_USER_PARTNER).annotate(
+        id_partner=F("partnerlinkdailyreport__partner_link_accumulated__partner__pk"),
+        partner_name=Concat(
+            "partnerlinkdailyreport__partner_link_accumulated__partner__user__first_name",
+            Value(" "),
+            "partnerlinkdailyreport__partner_link_accumulated__partner__user__second_name",
+            Value(" "),
+            "partnerlinkdailyreport__partner_link_accumulated__partner__user__last_name",
+            Value(" "),
+            "partnerlinkdailyreport__partner_link_accumulated__partner__user__second_last_name",
+        ),
+        campaign_title=Concat(
+            "betenlace_cpa__link__campaign__bookmaker__name",
+            Value(" "),
+            "betenlace_cpa__link__campaign__title",
+        ),
+        prom_code=F("betenlace_cpa__link__prom_code"),
+        **fx_conversion_cases,
+
+        fixed_income_local=F("partnerlinkdailyreport__fixed_income_local"),
+        fixed_income_unitary_local=F("partnerlinkdailyreport__fixed_income_unitary_local"),
+
+        registered_count_partner=F("partnerlinkdailyreport__registered_count"),
+        first_deposit_count_partner=F("partnerlinkdailyreport__first_deposit_count"),
+        wagering_count_partner=F("partnerlinkdailyreport__wagering_count"),
+
+        cpa_partner=F("partnerlinkdailyreport__cpa_count"),
+        percentage_cpa=F("partnerlinkdailyreport__percentage_cpa"),
+
+        tracker=F("partnerlinkdailyreport__tracker"),
+        tracker_deposit=F("partnerlinkdailyreport__tracker_deposit"),
+        tracker_registered_count=F("partnerlinkdailyreport__tracker_registered_count"),
+        tracker_first_deposit_count=F("partnerlinkdailyreport__tracker_first_deposit_count"),
+        tracker_wagering_count=F("partnerlinkdailyreport__tracker_wagering_count"),
+
+        adviser_id=F("partnerlinkdailyreport__adviser_id"),
+
+        fixed_income_adviser_local=F("partnerlinkdailyreport__fixed_income_adviser_local"),
+        net_revenue_adviser_local=F("partnerlinkdailyreport__net_revenue_adviser_local"),
+
+
+        fixed_income_adviser_percentage=F("partnerlinkdailyreport__fixed_income_adviser_percentage"),
+        net_revenue_adviser_percentage=F("partnerlinkdailyreport__net_revenue_adviser_percentage"),
+
+        referred_by_id=F("partnerlinkdailyreport__referred_by_id"),
+        fixed_income_referred_local=F("partnerlinkdailyreport__fixed_income_referred_local"),
+        net_revenue_referred_local=F("partnerlinkdailyreport__net_revenue_referred_local"),
+        fixed_income_referred_percentage=F("partnerlinkdailyreport__fixed_income_referred_percentage"),
+        net_revenue_referred_percentage=F("partnerlinkdailyreport__net_revenue_referred_percentage"),
+    ).select_related(
+        "partnerlinkdailyreport",
+        "betenlace_cpa",
+        "fx_partner",
+    ).filter(
+        *filters,
+    ).order_by(
+        F(order_by[1:]).desc(nulls_last=True)
+        if "-" == order_by[0]
+        else
+        F(order_by).asc(nulls_first=True),
+    )
+
+
+def get_member_report_grouped_vars(
+    group_by_month,
+    group_by_campaign,
+    group_by_prom_code,
+    partner_prefix,
+):
+    """
+    Values of group by and the annotates needed by them
+    """
+    group_values = []
+    annotates = {}
+
+    if (group_by_month):
+        group_values.append("created_at__year")
+        group_values.append("created_at__month")
+
+    if (group_by_campaign):
+        group_values.append("campaign_title")
+
+    if (group_by_prom_code):
+        group_values.append("prom_code")
+        group_values.append("partner_name")
+
+        annotates["partner_name"] = Concat(
+            f"{partner_prefix}partner_link_accumulated__partner__user__first_name",
+            Value(" "),
+            f"{partner_prefix}partner_link_accumulated__partner__user__second_name",
+            Value(" "),
+            f"{partner_prefix}partner_link_accumulated__partner__user__last_name",
+            Value(" "),
+            f"{partner_prefix}partner_link_accumulated__partner__user__second_last_name",
+        )
+
+    return group_values, annotates
+
+
+def get_member_report_grouped_daily_queryset(filters, group_values, annotates):
+    """
+    Grouped member report aggregated on DB from daily reports, sums
+    and averages excluding zeros and nulls like the previous calculation
+    with pandas. Aggregates are prefixed with `MEMBER_REPORT_GROUPED_PREFIX`
+    """
+    from api_partner.helpers import (
+        DB_USER_PARTNER,
+        MONTH_MEAN_COLUMNS,
+        MONTH_SUM_COLUMNS,
+    )
+    from api_partner.models import BetenlaceDailyReport
+
+    # Get cases for Fx conversion from fixed_incomes to USD for annotates
+    fx_conversion_cases = fx_conversion_usd_adviser_daily_cases(
+        model_func=F,
+    )
+
+    # Values of day prefixed for not collide with the aggregates
+    day_annotates = {
+        f"day_{column}": fx_conversion_cases.get(column) if path is None else F(path)
+        for column, path in (*MONTH_SUM_COLUMNS.items(), *MONTH_MEAN_COLUMNS.items())
+    }
+
+    aggregates = {}
+    for column in MONTH_SUM_COLUMNS:
+        aggregates[f"{MEMBER_REPORT_GROUPED_PREFIX}{column}"] = Coalesce(
+            Sum(f"day_{column}"),
+            Value(0.0),
+            output_field=models.FloatField(),
+        )
+    for column in MONTH_MEAN_COLUMNS:
+        aggregates[f"{MEMBER_REPORT_GROUPED_PREFIX}{column}"] = Coalesce(
+            Avg(NullIf(f"day_{column}", Value(0.0), output_field=models.FloatField())),
+            Value(0.0),
+            output_field=models.FloatField(),
+        )
+    aggregates[f"{MEMBER_REPORT_GROUPED_PREFIX}adviser_id"] = ArrayAgg(
+        Coalesce("day_adviser_id", Value(0)),
+        distinct=True,
+    )
+    aggregates[f"{MEMBER_REPORT_GROUPED_PREFIX}referred_by_id"] = ArrayAgg(
+        Coalesce("day_referred_by_id", Value(0)),
+        distinct=True,
+    )
+
+    return BetenlaceDailyReport.objects.using(DB_USER_PARTNER).annotate(
+        **day_annotates,
+        day_adviser_id=F("partnerlinkdailyreport__adviser_id"),
+        day_referred_by_id=F("partnerlinkdailyreport__referred_by_id"),
+        campaign_title=Concat(
+            "betenlace_cpa__link__campaign__bookmaker__name",
+            Value(" "),
+            "betenlace_cpa__link__campaign__title",
+        ),
+        prom_code=F("betenlace_cpa__link__prom_code"),
+        **annotates,
+    ).filter(
+        *filters,
+    ).values(
+        *group_values,
+    ).annotate(
+        **aggregates,
+    )
+
+
+def get_member_report_grouped_month_queryset(filters, group_values, annotates):
+    """
+    Grouped member report aggregated on DB from month rollup, only
+    valid for ranges of complete months (see `is_month_range`). The
+    averages are the sum of non zero values over its count, same as
+    the average of daily reports excluding zeros. Aggregates are
+    prefixed with `MEMBER_REPORT_GROUPED_PREFIX`
+    """
+    from api_partner.helpers import (
+        DB_USER_PARTNER,
+        MONTH_MEAN_COLUMNS,
+        MONTH_SUM_COLUMNS,
+    )
+    from api_partner.models import MemberReportMonth
+
+    aggregates = {}
+    for column in MONTH_SUM_COLUMNS:
+        aggregates[f"{MEMBER_REPORT_GROUPED_PREFIX}{column}"] = Coalesce(
+            Sum(column),
+            Value(0.0),
+            output_field=models.FloatField(),
+        )
+    for column in MONTH_MEAN_COLUMNS:
+        aggregates[f"{MEMBER_REPORT_GROUPED_PREFIX}{column}"] = Coalesce(
+            Sum(f"{column}_sum") / NullIf(
+                Cast(Sum(f"{column}_count"), output_field=models.FloatField()),
+                Value(0.0),
+            ),
+            Value(0.0),
+            output_field=models.FloatField(),
+        )
+    aggregates[f"{MEMBER_REPORT_GROUPED_PREFIX}adviser_id"] = ArrayAgg(
+        Coalesce("adviser_id", Value(0)),
+        distinct=True,
+    )
+    aggregates[f"{MEMBER_REPORT_GROUPED_PREFIX}referred_by_id"] = ArrayAgg(
+        Coalesce("referred_by_id", Value(0)),
+        distinct=True,
+    )
+
+    return MemberReportMonth.objects.using(DB_USER_PARTNER).annotate(
+        campaign_title=Concat(
+            "betenlace_cpa__link__campaign__bookmaker__name",
+            Value(" "),
+            "betenlace_cpa__link__campaign__title",
+        ),
+        prom_code=F("betenlace_cpa__link__prom_code"),
+        **annotates,
+    ).filter(
+        *filters,
+    ).values(
+        *group_values,
+    ).annotate(
+        **aggregates,
+    )
+
+
+def order_member_report_grouped_queryset(queryset, group_values, group_by_month, order_by):
+    """
+    Sort of grouped member report, nulls always at end and the group
+    values complete the sort for stable pages. Returns None when the sort
+    is not supported for grouped cases
+    """
+    descending = "-" == order_by[0]
+    order_by_name = order_by.lstrip("-")
+    if ("created_at" == order_by_name):
+        order_by_columns = (
+            [
+                "created_at__year",
+                "created_at__month",
+            ]
+            if group_by_month
+            else
+            []
+        )
+    elif (order_by_name in group_values):
+        order_by_columns = [
+            order_by_name,
+        ]
+    elif (f"{MEMBER_REPORT_GROUPED_PREFIX}{order_by_name}" in queryset.query.annotations):
+        order_by_columns = [
+            f"{MEMBER_REPORT_GROUPED_PREFIX}{order_by_name}",
+        ]
+    else:
+        return None
+
+    return queryset.order_by(
+        *(
+            F(column).desc(nulls_last=True)
+            if descending
+            else
+            F(column).asc(nulls_last=True)
+            for column in order_by_columns
+        ),
+        *(
+            column
+            for column in group_values
+            if column not in order_by_columns
+        ),
+    )
@@ -0,0 +1,560 @@
+import ast
+from collections import namedtuple
+
+from django.db.models import Q
+
+from .member_report import (
+    MEMBER_REPORT_CODENAME,
+    MEMBER_REPORT_GROUPED_PREFIX,
+    get_member_report_daily_queryset,
+    get_member_report_filters,
+    get_member_report_grouped_daily_queryset,
+    get_member_report_grouped_month_queryset,
+    get_member_report_grouped_vars,
+    order_member_report_grouped_queryset,
+    use_member_report_month_rollup,
+)
+
+ReportExport = namedtuple(
+    typename="ReportExport",
+    field_names=(
+        "codename",
+        "get_schema",
+        "get_export",
+    ),
+)
+"""
+Report that can be exported, `codename` is the permission required for
+export it, `get_schema` returns the cerberus schema of params and
+`get_export` returns the queryset, columns and filename for the admin and
+the validated params
+"""
+
+BILLS_EXPORT_CODENAME = "bills api-get"
+ACCOUNT_REPORT_EXPORT_CODENAME = "account report api-get"
+MEMBER_REPORT_EXPORT_CODENAME = MEMBER_REPORT_CODENAME
+
+
+def get_bills_export_schema():
+    from api_partner.models import WithdrawalPartnerMoney
+    from api_partner.serializers import WithdrawalPartnerMoneyForAdviserTableSer
+    from core.helpers import (
+        to_date,
+        to_datetime_from,
+        to_datetime_to,
+    )
+
+    return {
+        "partner": {
+            "required": False,
+            "type": "integer",
+            "coerce": int,
+        },
+        "creation_date_from": {
+            "required": False,
+            "type": "datetime",
+            "coerce": to_datetime_from,
+        },
+        "creation_date_to": {
+            "required": False,
+            "type": "datetime",
+            "coerce": to_datetime_to,
+        },
+        "billed_from_at": {
+            "required": False,
+            "type": "date",
+            "coerce": to_date,
+        },
+        "billed_to_at": {
+            "required": False,
+            "type": "date",
+            "coerce": to_date,
+        },
+        "payment_date_from": {
+            "required": False,
+            "type": "datetime",
+            "coerce": to_datetime_from,
+        },
+        "payment_date_to": {
+            "required": False,
+            "type": "datetime",
+            "coerce": to_datetime_to,
+        },
+        "status": {
+            "required": False,
+            "type": "integer",
+            "coerce": int,
+            "allowed": WithdrawalPartnerMoney.Status.values,
+        },
+        "sort_by": {
+            "required": False,
+            "type": "string",
+            "default": "-id",
+            "allowed": (
+                WithdrawalPartnerMoneyForAdviserTableSer.Meta.fields +
+                tuple(["-"+i for i in WithdrawalPartnerMoneyForAdviserTableSer.Meta.fields])
+            ),
+        },
+    }
+
+
+def get_bills_export(admin, document):
+    """
+    Bills of partners filtered and sorted by the params of bills export
+    """
+    from api_admin.models import SearchPartnerLimit
+    from api_partner.helpers import DB_USER_PARTNER
+    from api_partner.models import WithdrawalPartnerMoney
+    from core.helpers import (
+        ExportColumn,
+        to_export_date,
+    )
+
+    filters = []
+    filters_partner_limit = (
+        Q(rol=admin.rol),
+        Q(codename=BILLS_EXPORT_CODENAME),
+    )
+    search_partner_limit = SearchPartnerLimit.objects.filter(*filters_partner_limit).first()
+
+    if (
+        (
+            not search_partner_limit or
+            search_partner_limit.search_type == SearchPartnerLimit.SearchType.ONLY_ASSIGNED
+        ) and
+            not admin.is_superuser
+    ):
+        filters.append(Q(partner__adviser_id=admin.pk))
+
+    # setting sort_by
+    sort_by = document.get("sort_by")
+
+    # filters
+    partner = document.get("partner")
+    creation_date_from = document.get("creation_date_from")
+    creation_date_to = document.get("creation_date_to")
+    billed_from_at = document.get("billed_from_at")
+    billed_to_at = document.get("billed_to_at")
+    payment_date_from = document.get("payment_date_from")
+    payment_date_to = document.get("payment_date_to")
+    status_ = document.get("status")
+
+    if partner:
+        filters.append(Q(partner=partner))
+    if creation_date_from and creation_date_to:
+        filters.append(Q(created_at__range=[creation_date_from, creation_date_to]))
+    if billed_from_at and billed_to_at:
+        filters.append(
+            Q(billed_from_at__gte=billed_from_at, billed_to_at__lte=billed_to_at) |
+            Q(billed_from_at__lte=billed_from_at, billed_to_at__gte=billed_to_at)
+        )
+    if payment_date_from and payment_date_to:
+        filters.append(Q(payment_at__range=[payment_date_from, payment_date_to]))
+    if status_ is not None:
+        filters.append(Q(status=status_))
+
+    withdrawals_partner_money = WithdrawalPartnerMoney.objects.using(
+        DB_USER_PARTNER,
+    ).filter(
+        *filters,
+    ).order_by(
+        sort_by,
+    )
+
+    columns = (
+        ExportColumn("pk", "pk"),
+        ExportColumn("partner_id", "Partner ID"),
+        ExportColumn("first_name", "Nombre"),
+        ExportColumn("last_name", "Apellido"),
+        ExportColumn("email", "Correo"),
+        ExportColumn("created_at", "created_at", to_export_date),
+        ExportColumn("billed_from_at", "Facturado_desde", to_export_date),
+        ExportColumn("billed_to_at", "Facturado_hasta", to_export_date),
+        ExportColumn("payment_at", "Fecha_pago", to_export_date),
+        ExportColumn("fixed_income_usd", "Ingresos_fijos_USD"),
+        ExportColumn("fixed_income_eur", "Ingresos_fijos_EUR"),
+        ExportColumn("fixed_income_cop", "Ingresos_fijos_COP"),
+        ExportColumn("fixed_income_mxn", "Ingresos_fijos_MXN"),
+        ExportColumn("fixed_income_gbp", "Ingresos_fijos_GBP"),
+        ExportColumn("fixed_income_pen", "Ingresos_fijos_PEN"),
+        ExportColumn("fixed_income_local", "Ingresos_moneda_local"),
+        ExportColumn("bill_rate", "Gastos_Financieros"),
+        ExportColumn("bill_bonus", "Bono"),
+        ExportColumn("cpa_count", "#_cpa"),
+        ExportColumn("status", "Estado"),
+    )
+
+    return withdrawals_partner_money, columns, "BillingPartner"
+
+
+def get_account_report_export_schema():
+    from api_admin.serializers import AcountReportAdminSerializers
+    from core.helpers import to_date
+
+    return {
+        "since_date": {
+            "required": False,
+            "type": "date",
+            "coerce": to_date,
+        },
+        "until_date": {
+            "required": False,
+            "type": "date",
+            "coerce": to_date,
+        },
+        "since_cpa_date": {
+            "required": False,
+            "type": "date",
+            "coerce": to_date,
+        },
+        "until_cpa_date": {
+            "required": False,
+            "type": "date",
+            "coerce": to_date,
+        },
+        "punter_id": {
+            "required": False,
+            "type": "string",
+        },
+        "cpa": {
+            "required": False,
+            "type": "integer",
+            "coerce": int,
+        },
+        "campaign": {
+            "required": False,
+            "type": "string",
+        },
+        "partner_id": {
+            "required": False,
+            "type": "integer",
+            "coerce": int,
+        },
+        "cpa_betenlace": {
+            "required": False,
+            "type": "integer",
+            "coerce": int,
+        },
+        "bookmaker": {
+            "required": False,
+            "type": "integer",
+            "coerce": int,
+        },
+        "sort_by": {
+            "required": False,
+            "type": "string",
+            "default": "-created_at",
+            "allowed": (
+                AcountReportAdminSerializers.Meta.fields +
+                tuple(["-"+i for i in AcountReportAdminSerializers.Meta.fields])
+            ),
+        },
+    }
+
+
+def get_account_report_export(admin, document):
+    """
+    Account reports (punters) filtered and sorted by the params of account
+    report, same rules of `AccountReportAPI`. Only the columns allowed by
+    report visualization of rol of admin are exported
+    """
+    from api_admin.models import (
+        ReportVisualization,
+        SearchPartnerLimit,
+    )
+    from api_admin.serializers import AcountReportAdminSerializers
+    from api_partner.helpers import DB_USER_PARTNER
+    from api_partner.models import AccountReport
+    from core.helpers import (
+        ExportColumn,
+        to_export_date,
+    )
+    from django.db.models import (
+        F,
+        Value,
+    )
+    from django.db.models.functions import Concat
+
+    filters = []
+    filters_partner_limit = (
+        Q(rol=admin.rol),
+        Q(codename=ACCOUNT_REPORT_EXPORT_CODENAME),
+    )
+    search_partner_limit = SearchPartnerLimit.objects.filter(*filters_partner_limit).first()
+
+    if (
+        (
+            not search_partner_limit or
+            search_partner_limit.search_type == SearchPartnerLimit.SearchType.ONLY_ASSIGNED
+        ) and
+            not admin.is_superuser
+    ):
+        filters.append(Q(partner_link_accumulated__partner__adviser_id=admin.pk))
+
+    if admin.is_superuser:
+        fields_can_view = set(AcountReportAdminSerializers.Meta.fields)
+    else:
+        report_visualization = ReportVisualization.objects.filter(
+            Q(rol=admin.rol),
+            Q(permission__codename=ACCOUNT_REPORT_EXPORT_CODENAME),
+        ).first()
+        if not report_visualization:
+            raise PermissionError("Rol of admin has not report visualization of account report")
+        fields_can_view = set(ast.literal_eval(report_visualization.values_can_view))
+
+    since_date = document.get("since_date")
+    until_date = document.get("until_date")
+    since_cpa_date = document.get("since_cpa_date")
+    until_cpa_date = document.get("until_cpa_date")
+
+    if since_date and until_date:
+        filters.append(Q(registered_at__gte=since_date, registered_at__lte=until_date))
+    if since_cpa_date and until_cpa_date:
+        filters.append(Q(cpa_at__gte=since_cpa_date, cpa_at__lte=until_cpa_date))
+    if "punter_id" in document:
+        filters.append(Q(punter_id__icontains=document.get("punter_id")))
+    if "campaign" in document:
+        filters.append(Q(campaign_title__icontains=document.get("campaign")))
+    if "partner_id" in document:
+        filters.append(Q(partner_link_accumulated__partner__user_id=document.get("partner_id")))
+    if "cpa_betenlace" in document:
+        filters.append(Q(cpa_betenlace=document.get("cpa_betenlace")))
+    if "cpa" in document:
+        filters.append(Q(cpa_partner=document.get("cpa")))
+    if "bookmaker" in document:
+        filters.append(Q(link__campaign__bookmaker__id=document.get("bookmaker")))
+
+    account_reports = AccountReport.objects.using(DB_USER_PARTNER).annotate(
+        campaign_title=Concat(
+            "link__campaign__bookmaker__name",
+            Value(" "),
+            "link__campaign__title",
+        ),
+        partner_name=Concat(
+            "partner_link_accumulated__partner__user__first_name",
+            Value(" "),
+            "partner_link_accumulated__partner__user__last_name",
+        ),
+        prom_code=F(
+            "link__prom_code",
+        ),
+    ).filter(
+        *filters,
+    ).order_by(
+        document.get("sort_by"),
+    )
+
+    date_fields = (
+        "cpa_at",
+        "created_at",
+        "updated_at",
+        "registered_at",
+        "first_deposit_at",
+    )
+    columns = tuple(
+        ExportColumn(field, field, to_export_date if field in date_fields else None)
+        for field in AcountReportAdminSerializers.Meta.fields
+        if field in fields_can_view
+    )
+
+    return account_reports, columns, "AccountReport"
+
+
+
+def get_member_report_export_schema():
+    from core.helpers import (
+        CountryCampaign,
+        CountryPartner,
+        to_date,
+    )
+
+    return {
+        "since_date": {
+            "required": True,
+            "type": "date",
+            "coerce": to_date,
+        },
+        "until_date": {
+            "required": True,
+            "type": "date",
+            "coerce": to_date,
+        },
+        "campaign": {
+            "required": False,
+            "type": "string",
+        },
+        "partner": {
+            "required": False,
+            "type": "string",
+        },
+        "adviser_id": {
+            "required": False,
+            "type": "integer",
+            "coerce": int,
+        },
+        "bookmaker": {
+            "required": False,
+            "type": "integer",
+            "coerce": int,
+        },
+        "prom_code": {
+            "required": False,
+            "type": "string",
+        },
+        "country_campaign": {
+            "required": False,
+            "type": "string",
+            "allowed": CountryCampaign.values,
+        },
+        "country_partner": {
+            "required": False,
+            "type": "string",
+            "allowed": CountryPartner.values,
+        },
+        "group_by_campaign": {
+            "required": False,
+            "type": "string",
+        },
+        "group_by_month": {
+            "required": False,
+            "type": "string",
+        },
+        "group_by_prom_code": {
+            "required": False,
+            "type": "string",
+        },
+        "sort_by": {
+            "required": False,
+            "type": "string",
+            "default": "-created_at",
+        },
+    }
+
+
+def get_member_report_export(admin, document):
+    """
+    Member report filtered, grouped and sorted by the params of member
+    report, same querysets of `MemberReportAPI` (month rollup for grouped
+    cases of complete months). Only the columns allowed by report
+    visualization of rol of admin are exported
+    """
+    from api_admin.serializers import (
+        FilterMemeberReportSer,
+        MembertReportGroupSer,
+    )
+    from core.helpers import (
+        ExportColumn,
+        to_export_list,
+    )
+    from rest_framework.serializers import ListField
+
+    from .adviser_limit import report_visualization_limit
+
+    if admin.is_superuser:
+        fields_can_view = set(FilterMemeberReportSer.Meta.fields).union(MembertReportGroupSer._declared_fields)
+    else:
+        fields_can_view = report_visualization_limit(
+            admin=admin,
+            permission_codename=MEMBER_REPORT_EXPORT_CODENAME,
+        )
+        if not fields_can_view:
+            raise PermissionError("Rol of admin has not report visualization of member report")
+        fields_can_view = set(fields_can_view)
+
+    group_by_month = "group_by_month" in document
+    group_by_campaign = "group_by_campaign" in document
+    group_by_prom_code = "group_by_prom_code" in document
+    is_grouped = group_by_month or group_by_campaign or group_by_prom_code
+
+    since_date = document.get("since_date")
+    until_date = document.get("until_date")
+    use_month_rollup = use_member_report_month_rollup(
+        since_date=since_date,
+        until_date=until_date,
+        is_grouped=is_grouped,
+    )
+    partner_prefix = "" if use_month_rollup else "partnerlinkdailyreport__"
+
+    filters = get_member_report_filters(
+        admin=admin,
+        document=document,
+        since_date=since_date,
+        until_date=until_date,
+        partner_prefix=partner_prefix,
+    )
+
+    if (not is_grouped):
+        member_reports = get_member_report_daily_queryset(
+            filters=filters,
+            order_by=document.get("sort_by"),
+        )
+        columns = tuple(
+            ExportColumn(field, field)
+            for field in FilterMemeberReportSer.Meta.fields
+            if field in fields_can_view
+        )
+        return member_reports, columns, "MemberReport"
+
+    group_values, annotates = get_member_report_grouped_vars(
+        group_by_month=group_by_month,
+        group_by_campaign=group_by_campaign,
+        group_by_prom_code=group_by_prom_code,
+        partner_prefix=partner_prefix,
+    )
+    if (use_month_rollup):
+        member_reports = get_member_report_grouped_month_queryset(
+            filters=filters,
+            group_values=group_values,
+            annotates=annotates,
+        )
+    else:
+        member_reports = get_member_report_grouped_daily_queryset(
+            filters=filters,
+            group_values=group_values,
+            annotates=annotates,
+        )
+    member_reports = order_member_report_grouped_queryset(
+        queryset=member_reports,
+        group_values=group_values,
+        group_by_month=group_by_month,
+        order_by=document.get("sort_by"),
+    )
+    if (member_reports is None):
+        raise ValueError("Sort not supported for grouped member report")
+
+    # Group values and aggregates on order of grouped serializer, the
+    # prefix of aggregates is removed from headers
+    columns = []
+    for field, serializer_field in MembertReportGroupSer._declared_fields.items():
+        if (field not in fields_can_view):
+            continue
+        if (field in group_values):
+            columns.append(ExportColumn(field, field))
+        elif (f"{MEMBER_REPORT_GROUPED_PREFIX}{field}" in member_reports.query.annotations):
+            columns.append(
+                ExportColumn(
+                    f"{MEMBER_REPORT_GROUPED_PREFIX}{field}",
+                    field,
+                    to_export_list if isinstance(serializer_field, ListField) else None,
+                ),
+            )
+
+    return member_reports, tuple(columns), "MemberReportGrouped"
+
+REPORT_EXPORTS = {
+    "account_report": ReportExport(
+        codename=ACCOUNT_REPORT_EXPORT_CODENAME,
+        get_schema=get_account_report_export_schema,
+        get_export=get_account_report_export,
+    ),
+    "bills": ReportExport(
+        codename=BILLS_EXPORT_CODENAME,
+        get_schema=get_bills_export_schema,
+        get_export=get_bills_export,
+    ),
+    "member_report": ReportExport(
+        codename=MEMBER_REPORT_EXPORT_CODENAME,
+        get_schema=get_member_report_export_schema,
+        get_export=get_member_report_export,
+    ),
+}
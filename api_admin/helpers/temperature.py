@@ -1,49 +1,48 @@
-from api_partner.models.reports_management import (
-    Campaign,
-    Link,
-)
-from django.db.models import Q
+from api_partner.models.reports_management import Campaign
+
+
+def _get_temperature(campaign):
+    """
+    Temperature of campaign from its counters of links, 1 when there are
+    not links or all are assigned
+    """
+    campaign.refresh_from_db(
+        fields=(
+            "links_count",
+            "links_assigned_count",
+        ),
+    )
+    total = campaign.links_count
+    assigned = campaign.links_assigned_count
+    return total, assigned, (1 if total == 0 else assigned/total)
 
 
 def recalculate_temperature(campaign):
-    links = Link.objects.filter(
-        Q(campaign=campaign),
-        ~Q(status=Link.Status.UNAVAILABLE)
-    )
-    total = links.count()
-    assigned = links.filter(
-        Q(status=Link.Status.ASSIGNED)
-    ).count()
+    total, assigned, temperature = _get_temperature(campaign)
 
     if (total == 0 or total == assigned):
         campaign.has_links = False
         if(campaign.status != Campaign.Status.NOT_AVALAIBLE and campaign.status != Campaign.Status.INACTIVE):
             campaign.status = Campaign.Status.OUT_STOCK
-
-        campaign.temperature = 1
-        campaign.save()
     else:
         campaign.has_links = True
         if(campaign.status != Campaign.Status.NOT_AVALAIBLE and campaign.status != Campaign.Status.INACTIVE):
             campaign.status = Campaign.Status.AVAILABLE
 
-        campaign.temperature = assigned/total
-        campaign.save()
-
-
-def calculate_temperature(campaign, data_status):
-    filters = (
-        Q(campaign=campaign),
-        ~Q(status=Link.Status.UNAVAILABLE),
+    campaign.temperature = temperature
+    # Counters are only updated by F expressions, not overwrite them
+    campaign.save(
+        update_fields=(
+            "has_links",
+            "status",
+            "temperature",
+            "updated_at",
+        ),
     )
-    links = Link.objects.filter(*filters)
 
-    total = links.count()
 
-    filters = (Q(status=Link.Status.ASSIGNED),)
-    assigned = links.filter(*filters).count()
-
-    temperature = 1 if total == 0 else assigned/total
+def calculate_temperature(campaign, data_status):
+    _, _, temperature = _get_temperature(campaign)
 
     if (temperature == 1 and data_status == Campaign.Status.AVAILABLE):
         return Campaign.Status.OUT_STOCK, temperature
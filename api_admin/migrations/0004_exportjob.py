@@ -0,0 +1,35 @@
+# Generated by Django 3.2.12 on 2026-10-17 11:00
+
+import api_admin.models.export_management.export_job
+import core.helpers.s3_config
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_admin', '0003_unnacent_pg'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('admin_id', models.BigIntegerField()),
+                ('report', models.CharField(max_length=50)),
+                ('params', models.JSONField(default=dict)),
+                ('file_format', models.CharField(max_length=10)),
+                ('status', models.SmallIntegerField(default=0)),
+                ('file', models.FileField(default=None, null=True, storage=core.helpers.s3_config.S3StandardIA, upload_to=api_admin.models.export_management.export_job.ExportJob.file_upload)),
+                ('rows_count', models.IntegerField(default=None, null=True)),
+                ('error', models.TextField(default=None, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('finished_at', models.DateTimeField(default=None, null=True)),
+            ],
+            options={
+                'verbose_name': 'Export job',
+                'verbose_name_plural': 'Export jobs',
+            },
+        ),
+    ]
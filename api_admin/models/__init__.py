@@ -3,6 +3,7 @@ from .authentication import (
     ValidationCode,
 )
 from .campaign_levels import LevelPercentageBase
+from .export_management import ExportJob
 from .inactive_management import (
     InactiveActiveCodeReason,
     InactiveHistory,
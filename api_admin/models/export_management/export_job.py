@@ -0,0 +1,52 @@
+import os
+
+from core.helpers import S3StandardIA
+from django.db import models
+
+
+class ExportJob(models.Model):
+    """
+    Export of a report made on background by `export_job` task, the file
+    is stored on S3 and is downloaded with signed URL. Stale jobs and old
+    files are removed by `expire_export_jobs` task
+    """
+
+    def file_upload(instance, filename):
+        return os.path.join(
+            "admin",
+            "exports",
+            str(instance.admin_id),
+            filename,
+        )
+
+    admin_id = models.BigIntegerField()
+    report = models.CharField(max_length=50)
+    params = models.JSONField(default=dict)
+    file_format = models.CharField(max_length=10)
+
+    class Status(models.IntegerChoices):
+        PENDING = 0
+        RUNNING = 1
+        SUCCESS = 2
+        FAILED = 3
+
+    status = models.SmallIntegerField(default=Status.PENDING)
+    file = models.FileField(
+        upload_to=file_upload,
+        storage=S3StandardIA,
+        null=True,
+        default=None,
+    )
+    rows_count = models.IntegerField(null=True, default=None)
+    error = models.TextField(null=True, default=None)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, default=None)
+    finished_at = models.DateTimeField(null=True, default=None)
+
+    class Meta:
+        verbose_name = "Export job"
+        verbose_name_plural = "Export jobs"
+
+    def __str__(self):
+        return f"Export {self.report} of {self.admin_id} status {self.status}"
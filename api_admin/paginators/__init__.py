@@ -18,3 +18,4 @@ from .custom_paginators import (
     ReferredManagementPaginator,
     RolesPaginator,
 )
+from .keyset import KeysetLimitOffsetPagination
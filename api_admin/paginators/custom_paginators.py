@@ -1,5 +1,7 @@
 from rest_framework import pagination
 
+from .keyset import KeysetLimitOffsetPagination
+
 
 class GetAllBookamkers(pagination.LimitOffsetPagination):
     default_limit = 10
@@ -15,14 +17,14 @@ class GetAllCampaigns(pagination.LimitOffsetPagination):
     max_limit = 10
 
 
-class GetAllLinks(pagination.LimitOffsetPagination):
+class GetAllLinks(KeysetLimitOffsetPagination):
     default_limit = 10
     limit_query_param = 'lim'
     offset_query_param = 'offs'
     max_limit = 10
 
 
-class GetAllMemberReport(pagination.LimitOffsetPagination):
+class GetAllMemberReport(KeysetLimitOffsetPagination):
     default_limit = 10
     limit_query_param = 'lim'
     offset_query_param = 'offs'
@@ -57,7 +59,7 @@ class OwnCompanyPaginator(pagination.LimitOffsetPagination):
     max_limit = 10
 
 
-class GetAllCpas(pagination.LimitOffsetPagination):
+class GetAllCpas(KeysetLimitOffsetPagination):
     default_limit = 10
     limit_query_param = 'lim'
     offset_query_param = 'offs'
@@ -0,0 +1,264 @@
+import base64
+import binascii
+import datetime
+import decimal
+import json
+import uuid
+
+from django.db import connections
+from django.db.models import (
+    F,
+    Q,
+    QuerySet,
+)
+from django.db.models.expressions import OrderBy
+from rest_framework import pagination
+from rest_framework.exceptions import ValidationError
+from rest_framework.utils.urls import replace_query_param
+
+# Types of values of cursor encoded as {type: str} for be decoded exactly
+# (microseconds of datetimes included)
+CURSOR_TYPES = {
+    "datetime": (datetime.datetime, datetime.datetime.fromisoformat),
+    "date": (datetime.date, datetime.date.fromisoformat),
+    "time": (datetime.time, datetime.time.fromisoformat),
+    "decimal": (decimal.Decimal, decimal.Decimal),
+    "uuid": (uuid.UUID, uuid.UUID),
+}
+
+
+class KeysetLimitOffsetPagination(pagination.LimitOffsetPagination):
+    """
+    Limit offset pagination with keyset (cursor) mode. When the request
+    has the param `cursor` (empty for first page) the page is filtered by
+    the values of sort columns of the last row of previous page instead of
+    OFFSET, so any page costs the same as the first one. The sort of
+    queryset is completed with `pk` for be stable, the cursor of next page
+    is on `next_cursor` (None on last page).
+
+    Param `count` defines how `count` is calculated:
+        - exact: COUNT of queryset (default on offset mode)
+        - approx: estimate of planner of DB, exact when the estimate is
+        lower than `approx_count_exact_below` (default on keyset mode)
+        - none: not calculated, `count` is None
+
+    Grouped querysets (values with aggregates) and lists are always
+    paginated with offset
+    """
+    cursor_query_param = "cursor"
+    count_query_param = "count"
+    approx_count_exact_below = 10000
+
+    cursor_prefix = "_cursor_"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.next_cursor = None
+        self.has_next = None
+        self.is_keyset = (
+            self.cursor_query_param in request.query_params and
+            isinstance(queryset, QuerySet) and
+            queryset.query.group_by is None
+        )
+        self.count_mode = request.query_params.get(
+            self.count_query_param,
+            "approx" if self.is_keyset else "exact",
+        )
+        if (not self.is_keyset and self.count_mode == "none"):
+            return self._paginate_offset_without_count(queryset=queryset, request=request)
+        if (not self.is_keyset):
+            return super().paginate_queryset(queryset, request, view=view)
+
+        self.limit = self.get_limit(request)
+        self.offset = 0
+        self.count = self.get_count(queryset)
+
+        ordering = self._get_ordering(queryset)
+        queryset = queryset.annotate(
+            **{
+                f"{self.cursor_prefix}{index}": expression
+                for index, (expression, _, _) in enumerate(ordering)
+            },
+        ).order_by(
+            *(
+                OrderBy(
+                    F(f"{self.cursor_prefix}{index}"),
+                    descending=descending,
+                    nulls_first=not nulls_last,
+                    nulls_last=nulls_last,
+                )
+                for index, (_, descending, nulls_last) in enumerate(ordering)
+            ),
+        )
+
+        cursor_values = self._decode_cursor(
+            cursor=request.query_params.get(self.cursor_query_param),
+            size=len(ordering),
+        )
+        if (cursor_values is not None):
+            queryset = queryset.filter(self._after_cursor(ordering=ordering, values=cursor_values))
+
+        page = list(queryset[:self.limit + 1])
+        if (len(page) > self.limit):
+            page = page[:self.limit]
+            self.next_cursor = self._encode_cursor(row=page[-1], size=len(ordering))
+        return page
+
+    def _paginate_offset_without_count(self, queryset, request):
+        """
+        Offset mode with `count` none, a row more of limit is read for know
+        if there is next page
+        """
+        self.limit = self.get_limit(request)
+        if (self.limit is None):
+            return None
+
+        self.offset = self.get_offset(request)
+        self.count = None
+        page = list(queryset[self.offset:self.offset + self.limit + 1])
+        self.has_next = len(page) > self.limit
+        return page[:self.limit]
+
+    def get_next_link(self):
+        if (self.is_keyset):
+            # Next page is on cursor, see `next_cursor`
+            return None
+        if (self.count is None):
+            if (not self.has_next):
+                return None
+            url = self.request.build_absolute_uri()
+            url = replace_query_param(url, self.limit_query_param, self.limit)
+            return replace_query_param(url, self.offset_query_param, self.offset + self.limit)
+        return super().get_next_link()
+
+    def get_count(self, queryset):
+        if (self.count_mode == "none"):
+            return None
+        if (self.count_mode == "approx" and isinstance(queryset, QuerySet)):
+            count = self._get_approx_count(queryset)
+            if (count is not None and count >= self.approx_count_exact_below):
+                return count
+        return super().get_count(queryset)
+
+    def get_pagination_headers(self):
+        """
+        Headers of response with count and cursor of next page
+        """
+        headers = {
+            "access-control-expose-headers": "count,next,previous,next-cursor",
+        }
+        if (self.count is not None):
+            headers["count"] = self.count
+        if (self.next_cursor is not None):
+            headers["next-cursor"] = self.next_cursor
+        return headers
+
+    def _get_approx_count(self, queryset):
+        """
+        Rows estimated by planner of Postgres, None on other DBs
+        """
+        connection = connections[queryset.db]
+        if (connection.vendor != "postgresql"):
+            return None
+
+        sql, params = queryset.order_by().query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            plan = cursor.fetchone()[0]
+        if (isinstance(plan, str)):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    def _get_ordering(self, queryset):
+        """
+        Sort of queryset as list of (expression, descending, nulls_last),
+        completed with pk. Nulls position is default of Postgres when is
+        not defined (last on asc, first on desc)
+        """
+        ordering = []
+        names = set()
+        for order_i in queryset.query.order_by or queryset.model._meta.ordering:
+            if (isinstance(order_i, str)):
+                descending = order_i.startswith("-")
+                name = order_i.lstrip("-")
+                expression = F(name)
+                nulls_last = not descending
+            elif (isinstance(order_i, OrderBy)):
+                descending = order_i.descending
+                expression = order_i.expression
+                name = getattr(expression, "name", None)
+                nulls_last = (
+                    order_i.nulls_last
+                    if order_i.nulls_last or order_i.nulls_first
+                    else not descending
+                )
+            else:
+                raise ValidationError(detail={"cursor": ["Sort not supported for cursor pagination"]})
+
+            if (name in ("pk", queryset.model._meta.pk.name)):
+                expression = F("pk")
+                name = "pk"
+            names.add(name)
+            ordering.append((expression, descending, nulls_last))
+
+        if ("pk" not in names):
+            ordering.append((F("pk"), False, True))
+        return ordering
+
+    def _after_cursor(self, ordering, values):
+        """
+        Condition of rows after the cursor on sort of `ordering`, for
+        columns (a, b) is (a after va) or (a equal va and b after vb)
+        """
+        condition = Q(pk__in=[])
+        equal_previous = Q()
+        for index, ((_, descending, nulls_last), value) in enumerate(zip(ordering, values)):
+            name = f"{self.cursor_prefix}{index}"
+            if (value is None):
+                after = ~Q(**{f"{name}__isnull": True}) if not nulls_last else None
+                equal = Q(**{f"{name}__isnull": True})
+            else:
+                after = Q(**{f"{name}__{'lt' if descending else 'gt'}": value})
+                if (nulls_last):
+                    after |= Q(**{f"{name}__isnull": True})
+                equal = Q(**{name: value})
+
+            if (after is not None):
+                condition |= equal_previous & after
+            equal_previous &= equal
+        return condition
+
+    def _encode_cursor(self, row, size):
+        if (isinstance(row, dict)):
+            values = [row.get(f"{self.cursor_prefix}{index}") for index in range(size)]
+        else:
+            values = [getattr(row, f"{self.cursor_prefix}{index}") for index in range(size)]
+        data = json.dumps([self._encode_value(value) for value in values])
+        return base64.urlsafe_b64encode(data.encode()).decode()
+
+    def _encode_value(self, value):
+        for type_name, (type_, _) in CURSOR_TYPES.items():
+            if (isinstance(value, type_)):
+                return {type_name: value.isoformat() if hasattr(value, "isoformat") else str(value)}
+        return value
+
+    def _decode_value(self, value):
+        if (not isinstance(value, dict)):
+            return value
+        if (len(value) != 1 or next(iter(value)) not in CURSOR_TYPES):
+            raise ValueError("Invalid value of cursor")
+        type_name, raw = next(iter(value.items()))
+        return CURSOR_TYPES.get(type_name)[1](raw)
+
+    def _decode_cursor(self, cursor, size):
+        if (not cursor):
+            return None
+        try:
+            values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            if (isinstance(values, list)):
+                values = [self._decode_value(value) for value in values]
+        except (binascii.Error, UnicodeDecodeError, ValueError, TypeError, decimal.InvalidOperation):
+            values = None
+        if (not isinstance(values, list) or len(values) != size):
+            raise ValidationError(detail={"cursor": ["Invalid cursor"]})
+        return values
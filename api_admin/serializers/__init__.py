@@ -33,6 +33,7 @@ from .cpa_management import (
     CpaManageDailyNotBilledSer,
     CpaManageLinksNotBilledSer,
 )
+from .export_management import ExportJobSer
 from .fx import (
     FxPartnerToUSD,
     MinWithdrawalPartnerMoneySerializer,
@@ -0,0 +1,30 @@
+from api_admin.models import ExportJob
+from rest_framework import serializers
+
+
+class ExportJobSer(serializers.ModelSerializer):
+    """
+    Status of export job, `url` is the signed URL of file when the job is
+    finished successfully
+    """
+    url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ExportJob
+        fields = (
+            "id",
+            "report",
+            "params",
+            "file_format",
+            "status",
+            "rows_count",
+            "created_at",
+            "started_at",
+            "finished_at",
+            "url",
+        )
+
+    def get_url(self, obj):
+        if (obj.status != ExportJob.Status.SUCCESS or not obj.file):
+            return None
+        return obj.file.url
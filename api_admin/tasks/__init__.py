@@ -1 +1,5 @@
 from .backup_upload import backup_upload
+from .export_job import (
+    expire_export_jobs,
+    export_job,
+)
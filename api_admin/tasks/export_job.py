@@ -0,0 +1,157 @@
+import sys
+import tempfile
+import traceback
+
+from api_admin.helpers import (
+    DB_ADMIN,
+    REPORT_EXPORTS,
+)
+from api_admin.models import ExportJob
+from betenlace.celery import app
+from celery.utils.log import get_task_logger
+from cerberus import Validator
+from core.helpers import write_export_file
+from core.tasks import chat_logger as chat_logger_task
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files import File
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.timezone import timedelta
+
+logger_task = get_task_logger(__name__)
+
+
+@app.task(
+    ignore_result=True,
+)
+def export_job(export_job_id):
+    """
+    Render the report of an export job to a file and store it on S3,
+    the status of job is updated for the polling of admin.
+
+    The params of job are validated again with the schema of report, so
+    the job is made with the same rules of the sync export
+    """
+    filters = (
+        Q(pk=export_job_id),
+        Q(status=ExportJob.Status.PENDING),
+    )
+    updated = ExportJob.objects.using(DB_ADMIN).filter(*filters).update(
+        status=ExportJob.Status.RUNNING,
+        started_at=timezone.now(),
+    )
+    if (not updated):
+        logger_task.warning(f"Export job {export_job_id} not found or already started")
+        return
+
+    job = ExportJob.objects.using(DB_ADMIN).get(pk=export_job_id)
+    try:
+        report_export = REPORT_EXPORTS.get(job.report)
+        validator = Validator(report_export.get_schema())
+        if not validator.validate(job.params):
+            raise ValueError(f"Invalid params {validator.errors}")
+
+        admin = get_user_model().objects.using(DB_ADMIN).get(pk=job.admin_id)
+        queryset, columns, filename = report_export.get_export(
+            admin=admin,
+            document=validator.document,
+        )
+
+        with tempfile.TemporaryFile(dir=settings.EXPORT_TMP_DIR) as export_file:
+            job.rows_count = write_export_file(
+                file=export_file,
+                queryset=queryset,
+                columns=columns,
+                file_format=job.file_format,
+            )
+            export_file.seek(0)
+            job.file.save(
+                name=f"{filename}_{job.pk}.{job.file_format}",
+                content=File(export_file),
+                save=False,
+            )
+    except Exception:
+        exc_type, exc_value, exc_traceback = sys.exc_info()
+        e = traceback.format_exception(
+            etype=exc_type,
+            value=exc_value,
+            tb=exc_traceback,
+        )
+        job.status = ExportJob.Status.FAILED
+        job.error = "".join(e)
+        job.finished_at = timezone.now()
+        job.save()
+
+        msg = f"Export job {job.pk} of report {job.report} failed:\n\n{job.error}"
+        logger_task.error(msg)
+        chat_logger_task.apply_async(
+            kwargs={
+                "msg": f"*LEVEL:* `ERROR` \n*message:* `{msg}`\n\n",
+                "msg_url": settings.CHAT_WEBHOOK_CELERY,
+            },
+        )
+        return
+
+    job.status = ExportJob.Status.SUCCESS
+    job.finished_at = timezone.now()
+    job.save()
+    logger_task.info(f"Export job {job.pk} of report {job.report} finished with {job.rows_count} rows")
+
+
+@app.task(
+    ignore_result=True,
+)
+def expire_export_jobs():
+    """
+    Maintenance of export jobs, must be scheduled periodically
+    (django_celery_beat).
+
+    - Running jobs started before `EXPORT_JOB_TIMEOUT_SECONDS` are failed,
+    the worker was lost (restart, OOM) and the job is never finished
+    - Pending jobs created before `EXPORT_JOB_TIMEOUT_SECONDS` are queued
+    again, the message of task was lost. A job is started only once (see
+    `export_job`)
+    - Finished jobs before `EXPORT_JOB_RETENTION_DAYS` are removed with
+    their file on S3
+    """
+    now = timezone.now()
+    stale_at = now - timedelta(seconds=settings.EXPORT_JOB_TIMEOUT_SECONDS)
+
+    filters = (
+        Q(status=ExportJob.Status.RUNNING),
+        Q(started_at__lt=stale_at),
+    )
+    failed_count = ExportJob.objects.using(DB_ADMIN).filter(*filters).update(
+        status=ExportJob.Status.FAILED,
+        error=f"Export job not finished after {settings.EXPORT_JOB_TIMEOUT_SECONDS} seconds, worker lost",
+        finished_at=now,
+    )
+
+    filters = (
+        Q(status=ExportJob.Status.PENDING),
+        Q(created_at__lt=stale_at),
+    )
+    pending_ids = list(ExportJob.objects.using(DB_ADMIN).filter(*filters).values_list("pk", flat=True))
+    for export_job_id in pending_ids:
+        export_job.apply_async(
+            kwargs={
+                "export_job_id": export_job_id,
+            },
+        )
+
+    filters = (
+        Q(status__in=(ExportJob.Status.SUCCESS, ExportJob.Status.FAILED)),
+        Q(finished_at__lt=now - timedelta(days=settings.EXPORT_JOB_RETENTION_DAYS)),
+    )
+    removed_count = 0
+    for job in ExportJob.objects.using(DB_ADMIN).filter(*filters).iterator():
+        if (job.file):
+            job.file.delete(save=False)
+        job.delete()
+        removed_count += 1
+
+    logger_task.info(
+        f"Export jobs expired, {failed_count} stale failed, {len(pending_ids)} pending queued again, "
+        f"{removed_count} removed"
+    )
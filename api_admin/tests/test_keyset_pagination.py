@@ -0,0 +1,87 @@
+import datetime
+
+from api_admin.paginators import KeysetLimitOffsetPagination
+from api_partner.helpers import DB_USER_PARTNER
+from core.models import User
+from django.test import (
+    SimpleTestCase,
+    TestCase,
+)
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+
+def _request(query):
+    return Request(APIRequestFactory().get(f"/report?{query}"))
+
+
+class KeysetOffsetWithoutCountTest(SimpleTestCase):
+    """
+    Offset mode with `count=none` (lists, grouped querysets and requests
+    without cursor)
+    """
+
+    def test_page_without_count(self):
+        paginator = KeysetLimitOffsetPagination()
+        page = paginator.paginate_queryset(
+            queryset=list(range(5)),
+            request=_request("limit=2&offset=2&count=none"),
+        )
+
+        self.assertEqual(page, [2, 3])
+        self.assertIsNone(paginator.count)
+        self.assertNotIn("count", paginator.get_pagination_headers())
+        self.assertIn("offset=4", paginator.get_next_link())
+        self.assertIsNone(paginator.get_paginated_response(page).data.get("count"))
+
+    def test_last_page_without_count(self):
+        paginator = KeysetLimitOffsetPagination()
+        page = paginator.paginate_queryset(
+            queryset=list(range(5)),
+            request=_request("limit=2&offset=4&count=none"),
+        )
+
+        self.assertEqual(page, [4])
+        self.assertIsNone(paginator.get_next_link())
+
+
+class KeysetCursorTest(TestCase):
+    """
+    Keyset mode with `count=none`, rows with datetimes of same millisecond
+    must not be repeated between pages
+    """
+    databases = {DB_USER_PARTNER}
+
+    def setUp(self):
+        joined_at = timezone.make_aware(datetime.datetime(2022, 1, 1, 10, 0, 0, 100))
+        self.users = [
+            User.objects.using(DB_USER_PARTNER).create(
+                email=f"keyset{index}@test.com",
+                date_joined=joined_at + datetime.timedelta(microseconds=100 * index),
+            )
+            for index in range(3)
+        ]
+
+    def _page(self, query):
+        paginator = KeysetLimitOffsetPagination()
+        page = paginator.paginate_queryset(
+            queryset=User.objects.using(DB_USER_PARTNER).filter(
+                email__startswith="keyset",
+            ).order_by("date_joined"),
+            request=_request(query),
+        )
+        return paginator, page
+
+    def test_pages_without_count(self):
+        paginator, page = self._page("limit=2&cursor=&count=none")
+
+        self.assertEqual([user.pk for user in page], [user.pk for user in self.users[:2]])
+        self.assertIsNone(paginator.count)
+        self.assertIsNone(paginator.get_next_link())
+        self.assertIsNotNone(paginator.next_cursor)
+
+        paginator, page = self._page(f"limit=2&cursor={paginator.next_cursor}&count=none")
+
+        self.assertEqual([user.pk for user in page], [self.users[2].pk])
+        self.assertIsNone(paginator.next_cursor)
@@ -44,6 +44,7 @@ from api_admin.views import (
     DeclinePartnerPhase2AAPI,
     DeclinePartnerPhase2BAPI,
     DeclinePartnerPhase2CAPI,
+    ExportJobAPI,
     FxPartnerCurrentFullConversionAPI,
     FXRateAPI,
     FXRatePercentageAPI,
@@ -171,6 +172,7 @@ urlpatterns = [
     # path("decline_partner_data_phase2B", DeclinePartnerPhase2BAPI.as_view()),
     # path("decline_partner_data_phase2C", DeclinePartnerPhase2CAPI.as_view()),
     path("edit/cpa_data", CpaManagementAPI.as_view()),
+    path("export_job", ExportJobAPI.as_view()),
     path("fx_partner_current_full_conversion", FxPartnerCurrentFullConversionAPI.as_view()),
     path("fx_rate", FXRateAPI.as_view()),
     path("fx_rate_percentage", FXRatePercentageAPI.as_view()),
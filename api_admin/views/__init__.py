@@ -66,6 +66,7 @@ from .cpa_management import (
     CpaManagePrevNotBilledPartnersAPI,
     CpaPartnersAPI,
 )
+from .export_management import ExportJobAPI
 from .frequent_questions import (
     QuestionAPI,
     QuestionCategoryAPI,
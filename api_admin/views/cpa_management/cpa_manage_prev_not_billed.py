@@ -8,7 +8,10 @@ from api_admin.serializers import (
     ParnertAssignSer,
     FxPartnerToUSD,
 )
-from api_partner.helpers import DB_USER_PARTNER
+from api_partner.helpers import (
+    DB_USER_PARTNER,
+    FxPartnerByDay,
+)
 from api_partner.models import (
     BetenlaceCPA,
     BetenlaceDailyReport,
@@ -496,8 +499,22 @@ class CpaManagePrevNotBilledAPI(APIView, CpaPrevNotBillPag):
             "partnerlinkdailyreport",
         ).filter(query)
 
-        query = Q(created_at__date__in=created_at_dates)
-        fx_partners = FxPartner.objects.filter(query)
+        # Index by keys of rows
+        links_by_pk = {
+            link.pk: link
+            for link in links
+        }
+        betenlace_dailies_by_key = {
+            (betenlace_daily.betenlace_cpa_id, betenlace_daily.created_at): betenlace_daily
+            for betenlace_daily in betenlace_daily_reports
+        }
+
+        # Fx of all days of range resolved from a single query
+        fx_partner_by_day = FxPartnerByDay(
+            from_date=min(created_at_dates),
+            to_date=max(created_at_dates),
+            using=DB_USER_PARTNER,
+        )
 
         # Acumulators bulk create and update
         member_reports_daily_betenlace_update = []
@@ -507,13 +524,7 @@ class CpaManagePrevNotBilledAPI(APIView, CpaPrevNotBillPag):
         member_reports_daily_partner_create = []
         for row in zip(*df.to_dict('list').values()):
             # Get link according to prom_code of current loop
-            link = next(
-                filter(
-                    lambda link: link.pk == row[keys.get("betenlace_cpa_id")],
-                    links,
-                ),
-                None,
-            )
+            link = links_by_pk.get(row[keys.get("betenlace_cpa_id")])
             if not link:
                 logger.error(
                     f"Link with id {row[keys.get('betenlace_cpa_id')]} not found on DB or filter functions"
@@ -556,55 +567,26 @@ class CpaManagePrevNotBilledAPI(APIView, CpaPrevNotBillPag):
             # member_reports_betenlace_month_update.append(betenlace_cpa)
 
             # Betenlace Daily
-            betenlace_daily = next(
-                filter(
-                    lambda betenlace_daily: (
-                        betenlace_daily.betenlace_cpa_id == betenlace_cpa.pk and
-                        betenlace_daily.created_at == row[keys.get("created_at")].date()
-                    ),
-                    betenlace_daily_reports,
-                ),
-                None,
+            betenlace_daily = betenlace_dailies_by_key.get(
+                (betenlace_cpa.pk, row[keys.get("created_at")].date()),
             )
 
-            fx_partner = next(
-                filter(
-                    lambda fx_partner: (
-                        fx_partner.created_at.date() == row[keys.get("created_at")].date()
-                    ),
-                    fx_partners,
-                ),
-                None,
-            )
+            fx_partner = fx_partner_by_day.get(row[keys.get("created_at")].date())
 
-            # Case not on filtered
-            if (fx_partner is None):
-                logger.warning(
-                    f"Filters does not have a fx_partner for link {link.pk} at date {row[keys.get('created_at')]}"
-                )
-                # Get the last Fx value
-                query = Q(created_at__gte=row[keys.get("created_at")])
-                fx_partner = FxPartner.objects.filter(query).order_by("created_at").first()
-
-                if(fx_partner is None):
-                    # Get just next from supplied date
-                    query = Q(created_at__lte=row[keys.get("created_at")])
-                    fx_partner = FxPartner.objects.filter(query).order_by("-created_at").first()
-
-                # If still none prevent execution
-                if(fx_partner is None):
-                    logger.critical("Undefined fx_partner on DB")
-                    return Response(
-                        data={
-                            "error": settings.INTERNAL_SERVER_ERROR,
-                            "detail": {
-                                "non_field_errors": [
-                                    _("Does not exist FxPartner on DB"),
-                                ],
-                            },
+            # If none prevent execution
+            if(fx_partner is None):
+                logger.critical("Undefined fx_partner on DB")
+                return Response(
+                    data={
+                        "error": settings.INTERNAL_SERVER_ERROR,
+                        "detail": {
+                            "non_field_errors": [
+                                _("Does not exist FxPartner on DB"),
+                            ],
                         },
-                        status=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    )
+                    },
+                    status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                )
 
             if(betenlace_daily is not None):
                 betenlace_daily = self._betenlace_daily_update(
@@ -8,10 +8,10 @@ from api_admin.serializers import (
 from api_partner.helpers import (
     DB_USER_PARTNER,
     PartnerAccumStatusCHO,
+    get_fx_partner_on,
 )
 from api_partner.models import (
     BetenlaceDailyReport,
-    FxPartner,
     Link,
     Partner,
     PartnerLinkAccumulated,
@@ -83,6 +83,15 @@ class CpaManagementAPI(APIView, GetAllCpas):
                     'required': False,
                     'type': 'string',
                 },
+                'cursor': {
+                    'required': False,
+                    'type': 'string',
+                },
+                'count': {
+                    'required': False,
+                    'type': 'string',
+                    'allowed': ('exact', 'approx', 'none'),
+                },
                 'sort_by': {
                     'required': False,
                     'type': 'string',
@@ -157,10 +166,7 @@ class CpaManagementAPI(APIView, GetAllCpas):
             data={
                 "clicks": clicks_management.data,
             },
-            headers={
-                "count": self.count,
-                "access-control-expose-headers": "count,next,previous",
-            },
+            headers=self.get_pagination_headers(),
             status=status.HTTP_200_OK,
         )
 
@@ -250,18 +256,8 @@ class CpaManagementAPI(APIView, GetAllCpas):
         fx_created_at = timezone.now().astimezone(pytz.timezone(settings.TIME_ZONE)) - timedelta(days=1)
         fx_created_at = fx_created_at.replace(minute=0, hour=0, second=0, microsecond=0)
 
-        # Get the last Fx value
-        filters = (
-            Q(created_at__gte=fx_created_at),
-        )
-        tax_fx_today = FxPartner.objects.filter(*filters).order_by("created_at").first()
-
-        if(tax_fx_today is None):
-            # Get just next from supplied date
-            filters = (
-                Q(created_at__lte=fx_created_at),
-            )
-            tax_fx_today = FxPartner.objects.filter(*filters).order_by("-created_at").first()
+        # Get the Fx of day
+        tax_fx_today = get_fx_partner_on(fx_date=fx_created_at)
 
         if not tax_fx_today:
             return Response(
@@ -0,0 +1,165 @@
+from api_admin.helpers import (
+    DB_ADMIN,
+    REPORT_EXPORTS,
+)
+from api_admin.models import ExportJob
+from api_admin.serializers import ExportJobSer
+from api_admin.tasks import export_job as export_job_task
+from cerberus import Validator
+from core.helpers import (
+    ExportFormat,
+    HavePermissionBasedView,
+    StandardErrorHandler,
+    obj_not_found_response,
+    to_int,
+)
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils.translation import gettext as _
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+
+class ExportJobAPI(APIView):
+    """
+    Exports of reports on background, the admin creates the job and polls
+    its status until the URL of file is available
+    """
+
+    permission_classes = (
+        IsAuthenticated,
+        HavePermissionBasedView,
+    )
+
+    def get(self, request):
+        """
+        Status of export job of the admin
+        """
+        validator = Validator(
+            schema={
+                "id": {
+                    "required": True,
+                    "type": "integer",
+                    "coerce": to_int,
+                },
+            },
+            error_handler=StandardErrorHandler,
+        )
+
+        if not validator.validate(request.query_params):
+            return Response(
+                data={
+                    "error": settings.CERBERUS_ERROR_CODE,
+                    "details": validator.errors,
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        filters = (
+            Q(pk=validator.document.get("id")),
+            Q(admin_id=request.user.pk),
+        )
+        job = ExportJob.objects.using(DB_ADMIN).filter(*filters).first()
+        if (job is None):
+            return obj_not_found_response(ExportJob, "id")
+
+        return Response(
+            data={
+                "export_job": ExportJobSer(instance=job).data,
+            },
+            status=status.HTTP_200_OK,
+        )
+
+    def post(self, request):
+        """
+        Create an export job of report with the same params of its sync
+        export, the admin must have the permission of report
+        """
+        validator = Validator(
+            schema={
+                "report": {
+                    "required": True,
+                    "type": "string",
+                    "allowed": tuple(REPORT_EXPORTS.keys()),
+                },
+                "file_format": {
+                    "required": False,
+                    "type": "string",
+                    "default": ExportFormat.XLSX,
+                    "allowed": ExportFormat.values,
+                },
+                "params": {
+                    "required": False,
+                    "type": "dict",
+                    "default": {},
+                    "allow_unknown": True,
+                },
+            },
+            error_handler=StandardErrorHandler,
+        )
+
+        if not validator.validate(request.data):
+            return Response(
+                data={
+                    "error": settings.CERBERUS_ERROR_CODE,
+                    "details": validator.errors,
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        report_export = REPORT_EXPORTS.get(validator.document.get("report"))
+        if not request.user.has_perm(report_export.codename):
+            return Response(
+                data={
+                    "error": settings.FORBIDDEN_NOT_ALLOWED,
+                    "details": {
+                        "report": [
+                            _("You don't have permission"),
+                        ],
+                    },
+                },
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        # Params are stored without coerce, the task validates them again
+        params = validator.document.get("params")
+        validator_params = Validator(
+            schema=report_export.get_schema(),
+            error_handler=StandardErrorHandler,
+        )
+        if not validator_params.validate(params):
+            return Response(
+                data={
+                    "error": settings.CERBERUS_ERROR_CODE,
+                    "details": {
+                        "params": validator_params.errors,
+                    },
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        with transaction.atomic(using=DB_ADMIN):
+            job = ExportJob.objects.using(DB_ADMIN).create(
+                admin_id=request.user.pk,
+                report=validator.document.get("report"),
+                params=params,
+                file_format=validator.document.get("file_format"),
+            )
+            transaction.on_commit(
+                func=lambda: export_job_task.apply_async(
+                    kwargs={
+                        "export_job_id": job.pk,
+                    },
+                ),
+                using=DB_ADMIN,
+            )
+
+        return Response(
+            data={
+                "export_job": ExportJobSer(instance=job).data,
+            },
+            status=status.HTTP_201_CREATED,
+        )
@@ -1,8 +1,17 @@
 import numpy as np
 import pandas as pd
 from api_admin.helpers import (
+    MEMBER_REPORT_CODENAME,
+    MEMBER_REPORT_GROUPED_PREFIX,
     fx_conversion_usd_adviser_daily_cases,
+    get_member_report_daily_queryset,
+    get_member_report_filters,
+    get_member_report_grouped_daily_queryset,
+    get_member_report_grouped_month_queryset,
+    get_member_report_grouped_vars,
+    order_member_report_grouped_queryset,
     report_visualization_limit,
+    use_member_report_month_rollup,
 )
 from api_admin.helpers.routers_db import DB_ADMIN
 from api_admin.models import SearchPartnerLimit
@@ -59,6 +68,9 @@ class MemberReportAPI(APIView, GetAllMemberReport):
         HavePermissionBasedView,
     )
 
+    # Prefix of aggregates of grouped cases, removed on response
+    grouped_prefix = MEMBER_REPORT_GROUPED_PREFIX
+
     def get(self, request):
         """
             Returning member report data
@@ -155,6 +167,15 @@ class MemberReportAPI(APIView, GetAllMemberReport):
                     "required": False,
                     "type": "string",
                 },
+                "cursor": {
+                    "required": False,
+                    "type": "string",
+                },
+                "count": {
+                    "required": False,
+                    "type": "string",
+                    "allowed": ("exact", "approx", "none"),
+                },
                 "sort_by": {
                     "required": True,
                     "type": "string",
@@ -174,75 +195,32 @@ class MemberReportAPI(APIView, GetAllMemberReport):
 
         admin = request.user
 
-        filters = []
-        codename = "member report api-get"
-
-        if not admin.is_superuser:
-            filters_search_partner_limit = (
-                Q(rol=admin.rol),
-                Q(codename=codename),
-            )
-            # Limit admin search to a specifics partners
-            searchpartnerlimit = SearchPartnerLimit.objects.filter(*filters_search_partner_limit).first()
-            if (not searchpartnerlimit or searchpartnerlimit.search_type == SearchPartnerLimit.SearchType.ONLY_ASSIGNED):
-                filters.append(
-                    Q(partnerlinkdailyreport__adviser_id=admin.pk)
-                )
-
-        if 'adviser_id' in validator.document:
-            filters.append(
-                Q(partnerlinkdailyreport__adviser_id=validator.document.get("adviser_id"))
-            )
-
-        if 'since_date' in validator.document:
-            filters.append(
-                Q(created_at__gte=datetime.strptime(validator.document.get("since_date"), "%Y-%m-%d"))
-            )
-
-        if 'until_date' in validator.document:
-            filters.append(
-                Q(created_at__lte=datetime.strptime(validator.document.get("until_date"), "%Y-%m-%d"))
-            )
-
-        if 'bookmaker' in validator.document:
-            filters.append(Q(betenlace_cpa__link__campaign__bookmaker__id=validator.document.get("bookmaker")))
-
-        if 'campaign' in validator.document:
-            filters.append(
-                Q(campaign_title__icontains=validator.document.get("campaign"))
-            )
-
-        if 'prom_code' in validator.document:
-            filters.append(Q(betenlace_cpa__link__prom_code__iexact=validator.document.get("prom_code")))
-
-        if 'partner' in validator.document:
-            filters.append(
-                Q(
-                    partnerlinkdailyreport__partner_link_accumulated__partner__user__id=validator.document.
-                    get("partner")
-                )
-            )
-
-        if 'country_campaign' in validator.document:
-            filters.append(
-                Q(betenlace_cpa__link__campaign__countries__icontains=validator.document.get("country_campaign")))
-
-        if 'country_partner' in validator.document:
-            filters.append(
-                Q(
-                    partnerlinkdailyreport__partner_link_accumulated__partner__additionalinfo__country=validator.document.
-                    get("country_partner")
-                )
-            )
-
-        # Order by var used on pandas
-        order_by = validator.document.get("sort_by")
-
         # Grouped cases
         group_by_month = "group_by_month" in validator.document
         group_by_campaign = "group_by_campaign" in validator.document
         group_by_prom_code = "group_by_prom_code" in validator.document
 
+        since_date = datetime.strptime(validator.document.get("since_date"), "%Y-%m-%d").date()
+        until_date = datetime.strptime(validator.document.get("until_date"), "%Y-%m-%d").date()
+        use_month_rollup = use_member_report_month_rollup(
+            since_date=since_date,
+            until_date=until_date,
+            is_grouped=group_by_month or group_by_campaign or group_by_prom_code,
+        )
+        partner_prefix = "" if use_month_rollup else "partnerlinkdailyreport__"
+
+        codename = MEMBER_REPORT_CODENAME
+        filters = get_member_report_filters(
+            admin=admin,
+            document=validator.document,
+            since_date=since_date,
+            until_date=until_date,
+            partner_prefix=partner_prefix,
+        )
+
+        # Order by var used on pandas
+        order_by = validator.document.get("sort_by")
+
         # Make report visualization fields if is_superuser so can be show all fields
         if admin.is_superuser:
             member_group = set(MembertReportGroupSer._declared_fields.keys())
@@ -274,205 +252,67 @@ class MemberReportAPI(APIView, GetAllMemberReport):
             # - Campaign
             # - Prom Code
 
-            # All values that will used into dataframe
-            values, df_groupby, annotates, df_astype = self._grouped_cases_df_create_vars()
-            self._grouped_cases_df_recalculate_vars(
+            # Group by values and the annotates that they need
+            group_values, annotates = get_member_report_grouped_vars(
                 group_by_month=group_by_month,
                 group_by_campaign=group_by_campaign,
                 group_by_prom_code=group_by_prom_code,
-                values=values,
-                df_groupby=df_groupby,
-                annotates=annotates,
-                df_astype=df_astype,
+                partner_prefix=partner_prefix,
             )
-            # Calculate sort by
-            if ("created_at" == order_by or "-created_at" == order_by):
-                if "-" == order_by[0]:
-                    df_ascending = [
-                        False,
-                        False,
-                    ]
-                else:
-                    df_ascending = [
-                        True,
-                        True,
-                    ]
-                df_order_by = [
-                    "created_at__year",
-                    "created_at__month",
-                ]
+
+            if (use_month_rollup):
+                bet_grouped = get_member_report_grouped_month_queryset(
+                    filters=filters,
+                    group_values=group_values,
+                    annotates=annotates,
+                )
             else:
-                if "-" == order_by[0]:
-                    df_ascending = [
-                        False,
-                    ]
-                    df_order_by = [
-                        order_by[1:],
-                    ]
-                else:
-                    df_ascending = [
-                        True,
-                    ]
-                    df_order_by = [
-                        order_by,
-                    ]
-            # Get cases for Fx conversion from fixed_incomes to USD for annotates
-            fx_conversion_cases = fx_conversion_usd_adviser_daily_cases(
-                model_func=F,
-            )
+                bet_grouped = get_member_report_grouped_daily_queryset(
+                    filters=filters,
+                    group_values=group_values,
+                    annotates=annotates,
+                )
 
-            bet = BetenlaceDailyReport.objects.using(DB_USER_PARTNER).annotate(
-                **fx_conversion_cases,
-                campaign_title=Concat(
-                    "betenlace_cpa__link__campaign__bookmaker__name",
-                    Value(" "),
-                    "betenlace_cpa__link__campaign__title",
-                ),
-                prom_code=F("betenlace_cpa__link__prom_code"),
-
-                fixed_income_local=F("partnerlinkdailyreport__fixed_income_local"),
-                fixed_income_unitary_local=F("partnerlinkdailyreport__fixed_income_unitary_local"),
-
-                registered_count_partner=F("partnerlinkdailyreport__registered_count"),
-                first_deposit_count_partner=F("partnerlinkdailyreport__first_deposit_count"),
-                wagering_count_partner=F("partnerlinkdailyreport__wagering_count"),
-
-                cpa_partner=F("partnerlinkdailyreport__cpa_count"),
-                percentage_cpa=F("partnerlinkdailyreport__percentage_cpa"),
-
-                tracker=F("partnerlinkdailyreport__tracker"),
-                tracker_deposit=F("partnerlinkdailyreport__tracker_deposit"),
-                tracker_registered_count=F("partnerlinkdailyreport__tracker_registered_count"),
-                tracker_first_deposit_count=F("partnerlinkdailyreport__tracker_first_deposit_count"),
-                tracker_wagering_count=F("partnerlinkdailyreport__tracker_wagering_count"),
-
-                adviser_id=F("partnerlinkdailyreport__adviser_id"),
-                fixed_income_adviser_local=F("partnerlinkdailyreport__fixed_income_adviser_local"),
-                net_revenue_adviser_local=F("partnerlinkdailyreport__net_revenue_adviser_local"),
-                fixed_income_adviser_percentage=F("partnerlinkdailyreport__fixed_income_adviser_percentage"),
-                net_revenue_adviser_percentage=F("partnerlinkdailyreport__net_revenue_adviser_percentage"),
-
-                referred_by_id=F("partnerlinkdailyreport__referred_by_id"),
-                fixed_income_referred_local=F("partnerlinkdailyreport__fixed_income_referred_local"),
-                net_revenue_referred_local=F("partnerlinkdailyreport__net_revenue_referred_local"),
-                fixed_income_referred_percentage=F("partnerlinkdailyreport__fixed_income_referred_percentage"),
-                net_revenue_referred_percentage=F("partnerlinkdailyreport__net_revenue_referred_percentage"),
-                **annotates,
-            ).select_related(
-                "partnerlinkdailyreport",
-                "betenlace_cpa",
-                "fx_partner",
-            ).filter(
-                *filters,
+            # Calculate sort by, nulls always at end
+            bet_grouped = order_member_report_grouped_queryset(
+                queryset=bet_grouped,
+                group_values=group_values,
+                group_by_month=group_by_month,
+                order_by=order_by,
             )
-
-            bet_daily_values = bet.values(*values)
-
-            if not bet_daily_values:
+            if (bet_grouped is None):
                 return Response(
-                    data={},
-                    status=status.HTTP_200_OK,
+                    data={
+                        "message": _("Invalid input"),
+                        "error": {
+                            "sort_by": [
+                                _("Sort not supported for grouped member report"),
+                            ],
+                        },
+                    },
+                    status=status.HTTP_400_BAD_REQUEST,
                 )
 
-            bet_daily_df = pd.DataFrame(bet_daily_values)
-            bet_daily_df.fillna(0, inplace=True)
-
-            # Force to correct data types
-            bet_daily_df = bet_daily_df.astype(
-                df_astype,
-                copy=False,
+            bet_grouped_pag = self.paginate_queryset(
+                queryset=bet_grouped,
+                request=request,
+                view=self,
             )
 
-            # Fill zeros with NaN for exclude cases for mean calculation
-            df_replace_columns = [
-                "fixed_income_unitary_usd",
-                "fixed_income_unitary_local",
-                "percentage_cpa",
-                "tracker",
-                "tracker_deposit",
-                "tracker_registered_count",
-                "tracker_first_deposit_count",
-                "tracker_wagering_count",
-                "fixed_income_adviser_percentage",
-                "net_revenue_adviser_percentage",
-                "fixed_income_referred_percentage",
-                "net_revenue_referred_percentage",
-
-            ]
-            bet_daily_df[df_replace_columns] = bet_daily_df[df_replace_columns].replace(0, np.NaN)
-
-            if bet_daily_df.empty:
+            if (not bet_grouped_pag and not self.offset):
                 return Response(
                     data={},
                     status=status.HTTP_200_OK,
                 )
 
-            bet_daily_df = bet_daily_df.groupby(
-                df_groupby,
-                as_index=False,
-                dropna=False,
-            ).agg(
-                {
-                    "deposit_usd": np.sum,
-                    "deposit_partner_usd": np.sum,
-                    "stake_usd": np.sum,
-
-                    "net_revenue_usd": np.sum,
-                    "revenue_share_usd": np.sum,
-
-                    "cpa_count": np.sum,
-                    "fixed_income_usd": np.sum,
-                    "fixed_income_unitary_usd": np.mean,
-
-                    "click_count": np.sum,
-                    "registered_count": np.sum,
-                    "registered_count_partner": np.sum,
-                    "first_deposit_count": np.sum,
-                    "first_deposit_count_partner": np.sum,
-                    "wagering_count": np.sum,
-                    "wagering_count_partner": np.sum,
-
-                    "cpa_partner": np.sum,
-                    "fixed_income_local": np.sum,
-                    "fixed_income_unitary_local": np.mean,
-
-                    "percentage_cpa": np.mean,
-                    "tracker": np.mean,
-                    "tracker_deposit": np.mean,
-                    "tracker_registered_count": np.mean,
-                    "tracker_first_deposit_count": np.mean,
-                    "tracker_wagering_count": np.mean,
-
-
-                    "adviser_id": lambda x: set(x),
-                    "fixed_income_adviser_local": np.sum,
-                    "net_revenue_adviser_local": np.sum,
-                    "fixed_income_adviser_percentage": np.mean,
-                    "net_revenue_adviser_percentage": np.mean,
-
-                    "referred_by_id": lambda x: set(x),
-                    "fixed_income_referred_local": np.sum,
-                    "net_revenue_referred_local": np.sum,
-                    "fixed_income_referred_percentage": np.mean,
-                    "net_revenue_referred_percentage": np.mean,
-                },
-            ).sort_values(
-                by=df_order_by,
-                ascending=df_ascending,
-                kind="stable",
-            )
-
-            # If nan persist
-            bet_daily_df.fillna(0, inplace=True)
-
-            bet_daily_pag = self.paginate_queryset(
-                queryset=bet_daily_df.to_dict("records"),
-                request=request,
-                view=self,
-            )
-
             betenlace_ser = MembertReportGroupSer(
-                instance=bet_daily_pag,
+                instance=[
+                    {
+                        key[len(self.grouped_prefix):] if key.startswith(self.grouped_prefix) else key: value
+                        for key, value in row_i.items()
+                    }
+                    for row_i in bet_grouped_pag
+                ],
                 many=True,
                 context={
                     "permissions": report_visualization,
@@ -483,78 +323,13 @@ class MemberReportAPI(APIView, GetAllMemberReport):
                 data={
                     "member": betenlace_ser.data,
                 },
-                headers={
-                    "count": self.count,
-                    "access-control-expose-headers": "count,next,previous",
-                }, status=status.HTTP_200_OK,
+                headers=self.get_pagination_headers(), status=status.HTTP_200_OK,
             )
         # Case not grouped
         else:
-            # Get cases for Fx conversion from fixed_incomes to USD for annotates
-            fx_conversion_cases = fx_conversion_usd_adviser_daily_cases(
-                model_func=F,
-            )
-
-            bet_daily = BetenlaceDailyReport.objects.using(DB_USER_PARTNER).annotate(
-                id_partner=F("partnerlinkdailyreport__partner_link_accumulated__partner__pk"),
-                partner_name=Concat(
-                    "partnerlinkdailyreport__partner_link_accumulated__partner__user__first_name",
-                    Value(" "),
-                    "partnerlinkdailyreport__partner_link_accumulated__partner__user__second_name",
-                    Value(" "),
-                    "partnerlinkdailyreport__partner_link_accumulated__partner__user__last_name",
-                    Value(" "),
-                    "partnerlinkdailyreport__partner_link_accumulated__partner__user__second_last_name",
-                ),
-                campaign_title=Concat(
-                    "betenlace_cpa__link__campaign__bookmaker__name",
-                    Value(" "),
-                    "betenlace_cpa__link__campaign__title",
-                ),
-                prom_code=F("betenlace_cpa__link__prom_code"),
-                **fx_conversion_cases,
-
-                fixed_income_local=F("partnerlinkdailyreport__fixed_income_local"),
-                fixed_income_unitary_local=F("partnerlinkdailyreport__fixed_income_unitary_local"),
-
-                registered_count_partner=F("partnerlinkdailyreport__registered_count"),
-                first_deposit_count_partner=F("partnerlinkdailyreport__first_deposit_count"),
-                wagering_count_partner=F("partnerlinkdailyreport__wagering_count"),
-
-                cpa_partner=F("partnerlinkdailyreport__cpa_count"),
-                percentage_cpa=F("partnerlinkdailyreport__percentage_cpa"),
-
-                tracker=F("partnerlinkdailyreport__tracker"),
-                tracker_deposit=F("partnerlinkdailyreport__tracker_deposit"),
-                tracker_registered_count=F("partnerlinkdailyreport__tracker_registered_count"),
-                tracker_first_deposit_count=F("partnerlinkdailyreport__tracker_first_deposit_count"),
-                tracker_wagering_count=F("partnerlinkdailyreport__tracker_wagering_count"),
-
-                adviser_id=F("partnerlinkdailyreport__adviser_id"),
-
-                fixed_income_adviser_local=F("partnerlinkdailyreport__fixed_income_adviser_local"),
-                net_revenue_adviser_local=F("partnerlinkdailyreport__net_revenue_adviser_local"),
-
-
-                fixed_income_adviser_percentage=F("partnerlinkdailyreport__fixed_income_adviser_percentage"),
-                net_revenue_adviser_percentage=F("partnerlinkdailyreport__net_revenue_adviser_percentage"),
-
-                referred_by_id=F("partnerlinkdailyreport__referred_by_id"),
-                fixed_income_referred_local=F("partnerlinkdailyreport__fixed_income_referred_local"),
-                net_revenue_referred_local=F("partnerlinkdailyreport__net_revenue_referred_local"),
-                fixed_income_referred_percentage=F("partnerlinkdailyreport__fixed_income_referred_percentage"),
-                net_revenue_referred_percentage=F("partnerlinkdailyreport__net_revenue_referred_percentage"),
-            ).select_related(
-                "partnerlinkdailyreport",
-                "betenlace_cpa",
-                "fx_partner",
-            ).filter(
-                *filters,
-            ).order_by(
-                F(order_by[1:]).desc(nulls_last=True)
-                if "-" == order_by[0]
-                else
-                F(order_by).asc(nulls_first=True),
+            bet_daily = get_member_report_daily_queryset(
+                filters=filters,
+                order_by=order_by,
             )
 
             bet_daily_pag = self.paginate_queryset(
@@ -574,159 +349,10 @@ class MemberReportAPI(APIView, GetAllMemberReport):
             return Response(
                 data={
                     "member": bet_daily_ser.data
-                }, headers={
-                    "count": self.count,
-                    "access-control-expose-headers": "count,next,previous",
-                },
+                }, headers=self.get_pagination_headers(),
                 status=status.HTTP_200_OK,
             )
 
-    def _grouped_cases_df_recalculate_vars(
-        self,
-        group_by_month,
-        group_by_campaign,
-        group_by_prom_code,
-        values,
-        df_groupby,
-        annotates,
-        df_astype,
-    ):
-        if (group_by_month):
-            values.append("created_at__year")
-            values.append("created_at__month")
-
-            df_groupby.append("created_at__year")
-            df_groupby.append("created_at__month")
-
-            df_astype["created_at__year"] = np.uint32
-            df_astype["created_at__month"] = np.uint32
-
-        if (group_by_campaign):
-            values.append("campaign_title")
-            df_groupby.append("campaign_title")
-            df_astype["campaign_title"] = "string"
-
-        if (group_by_prom_code):
-            values.append('id_partner')
-            values.append('prom_code')
-            values.append("partner_name")
-
-            df_groupby.append("prom_code")
-            df_groupby.append("partner_name")
-
-            annotates["id_partner"] = F("partnerlinkdailyreport__partner_link_accumulated__partner__pk")
-            annotates["partner_name"] = Concat(
-                "partnerlinkdailyreport__partner_link_accumulated__partner__user__first_name",
-                Value(" "),
-                "partnerlinkdailyreport__partner_link_accumulated__partner__user__second_name",
-                Value(" "),
-                "partnerlinkdailyreport__partner_link_accumulated__partner__user__last_name",
-                Value(" "),
-                "partnerlinkdailyreport__partner_link_accumulated__partner__user__second_last_name",
-            )
-
-            df_astype["id_partner"] = np.uint32
-            df_astype["prom_code"] = "string"
-            df_astype["partner_name"] = "string"
-
-    def _grouped_cases_df_create_vars(self):
-        values = [
-            "deposit_usd",
-            "deposit_partner_usd",
-            "stake_usd",
-            "net_revenue_usd",
-            "revenue_share_usd",
-
-            "fixed_income_usd",
-            "fixed_income_unitary_usd",
-            "cpa_count",
-
-            "registered_count",
-            "registered_count_partner",
-            "first_deposit_count",
-            "first_deposit_count_partner",
-            "wagering_count",
-            "wagering_count_partner",
-            "click_count",
-
-            "cpa_partner",
-            "fixed_income_local",
-            "fixed_income_unitary_local",
-
-            "percentage_cpa",
-            "tracker",
-            "tracker_deposit",
-            "tracker_registered_count",
-            "tracker_first_deposit_count",
-            "tracker_wagering_count",
-
-            "adviser_id",
-            "fixed_income_adviser_local",
-            "net_revenue_adviser_local",
-            "fixed_income_adviser_percentage",
-            "net_revenue_adviser_percentage",
-
-            "referred_by_id",
-            "fixed_income_referred_local",
-            "net_revenue_referred_local",
-            "fixed_income_referred_percentage",
-            "net_revenue_referred_percentage",
-        ]
-
-        # Group by vars for DF
-        filter_group = [
-        ]
-
-        # Annotates for DF grouped case
-        annotates_filt = {
-        }
-
-        # Define df astype for grouped case
-        df_astype = {
-            "deposit_usd": np.float32,
-            "deposit_partner_usd": np.float32,
-            "stake_usd": np.float32,
-
-            "net_revenue_usd": np.float32,
-            "revenue_share_usd": np.float32,
-
-            "cpa_count": np.int32,
-            "fixed_income_usd": np.float32,
-            "fixed_income_unitary_usd": np.float32,
-            "registered_count": np.int32,
-            "registered_count_partner": np.int32,
-            "first_deposit_count": np.int32,
-            "first_deposit_count_partner": np.int32,
-            "wagering_count": np.int32,
-            "wagering_count_partner": np.int32,
-            "click_count": np.int32,
-
-            "cpa_partner": np.int32,
-            "fixed_income_local": np.float32,
-            "fixed_income_unitary_local": np.float32,
-
-            "percentage_cpa": np.float32,
-            "tracker": np.float32,
-            "tracker_deposit": np.float32,
-            "tracker_registered_count": np.float32,
-            "tracker_first_deposit_count": np.float32,
-            "tracker_wagering_count": np.float32,
-
-            "adviser_id": np.uint32,
-            "fixed_income_adviser_local": np.float32,
-            "net_revenue_adviser_local": np.float32,
-            "fixed_income_adviser_percentage": np.float32,
-            "net_revenue_adviser_percentage": np.float32,
-
-            "referred_by_id": np.uint32,
-            "fixed_income_referred_local": np.float32,
-            "net_revenue_referred_local": np.float32,
-            "fixed_income_referred_percentage": np.float32,
-            "net_revenue_referred_percentage": np.float32,
-        }
-
-        return values, filter_group, annotates_filt, df_astype
-
 
 class MemberConsolidated(APIView):
 
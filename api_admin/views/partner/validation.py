@@ -7,7 +7,6 @@ from api_admin.helpers import (
 from api_admin.helpers.partner_accum_history import create_history
 from api_admin.models import (
     CodeReason,
-    LevelPercentageBase,
     PartnerLevelHistory,
     SearchPartnerLimit,
 )
@@ -19,12 +18,13 @@ from api_partner.helpers import (
     DB_USER_PARTNER,
     PartnerLevelCHO,
     PartnerStatusCHO,
+    get_latest_fx_partner,
+    get_latest_level_percentage,
 )
 from api_partner.helpers.choices.partner_link_accum_status import PartnerAccumUpdateReasonCHO
 from api_partner.models import (
     AdditionalInfo,
     DocumentPartner,
-    FxPartner,
     Partner,
     PartnerBankAccount,
     PartnerBankValidationRequest,
@@ -704,7 +704,7 @@ class PartnerLevelRequestAPI(APIView, DefaultPAG):
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
-            level_p = LevelPercentageBase.objects.order_by("created_at").last()
+            level_p = get_latest_level_percentage()
             if level_p is None:
                 msg = _("Level percentage is not defined")
                 logger.critical(msg)
@@ -917,7 +917,7 @@ class VerifyCustomPercentageAPI(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        level_percentage = LevelPercentageBase.objects.order_by("created_at").last()
+        level_percentage = get_latest_level_percentage()
         if level_percentage is None:
             msg = _("Level percentage is not defined")
             logger.critical(msg)
@@ -975,7 +975,7 @@ class VerifyCustomPercentageAPI(APIView):
             campaign_currency_fixed_income=F("campaign__currency_fixed_income"),
         )
 
-        fx_partner = FxPartner.objects.all().order_by("-created_at").first()
+        fx_partner = get_latest_fx_partner()
 
         accumulated_links_ser = PartnerLevelVerifyCustomSER(
             accumulated_links,
@@ -1203,7 +1203,7 @@ class ChangePartnerLevelAPI(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        level_p = LevelPercentageBase.objects.order_by("created_at").last()
+        level_p = get_latest_level_percentage()
         if level_p is None:
             msg = _("Level percentage is not defined")
             logger.critical(msg)
@@ -1,5 +1,6 @@
 from api_admin.serializers import ProfileAdminSerializer
 from cerberus import Validator
+from core.helpers import invalidate_user_token_cache
 from core.models import User
 from django.conf import settings
 from django.db.models import Q
@@ -77,6 +78,8 @@ class ProfileAdminAPI(APIView):
             )
         filters = (Q(id=admin_request.id),)
         User.objects.filter(*filters).update(**request.data)
+        # Update not send signals, cached user of tokens is removed here
+        invalidate_user_token_cache(user_id=admin_request.id, using=admin_request._state.db)
 
         return Response(
             data={
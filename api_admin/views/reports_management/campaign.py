@@ -1,11 +1,12 @@
 import logging
 
 from api_admin.helpers import (
+    CAMPAIGN_TRACKER_FIELDS,
     DB_ADMIN,
     calculate_temperature,
-    create_history,
+    propagate_campaign_percentage,
+    propagate_campaign_trackers,
 )
-from api_admin.models import LevelPercentageBase
 from api_admin.paginators import GetAllCampaigns
 from api_admin.serializers import (
     CampaignBasicSer,
@@ -17,12 +18,12 @@ from api_partner.helpers import (
     DB_USER_PARTNER,
     PartnerAccumUpdateReasonCHO,
     PartnerLevelCHO,
+    get_latest_level_percentage,
 )
 from api_partner.models import (
     Bookmaker,
     Campaign,
     HistoricalCampaign,
-    PartnerLinkAccumulated,
 )
 from api_partner.serializers import CampaignPartnerBasicSER
 from cerberus import Validator
@@ -519,130 +520,33 @@ class CampaignAPI(APIView, GetAllCampaigns):
         with transaction.atomic(using=DB_USER_PARTNER, savepoint=True):
             sid = transaction.savepoint(using=DB_USER_PARTNER)
             if "default_percentage" in validator.document:
-                percentages_new = validator.document.get("default_percentage")
-                query = Q(is_percentage_custom=False, is_assigned=True, campaign=validator.document.get("id"))
-                partner_accum = PartnerLinkAccumulated.objects.select_related(
-                    "campaign",
-                ).only(
-                    "campaign__default_percentage",
-                    "percentage_cpa",
-                    "pk",
-                    "partner_level",
-                ).filter(query)
-
-                level_percentage = LevelPercentageBase.objects.order_by("-created_at").first()
-                level_percentage_data = level_percentage.percentages
-
-                update_partner_accum = []
-                for partner_accum_i in partner_accum:
-                    partner_accum_i.percentage_cpa = (
-                        (level_percentage_data.get(str(partner_accum_i.partner_level))) * percentages_new
+                level_percentage = get_latest_level_percentage()
+                propagate_campaign_percentage(
+                    campaign_id=campaign.pk,
+                    default_percentage=validator.document.get("default_percentage"),
+                    level_percentages=level_percentage.percentages,
+                    update_reason=PartnerAccumUpdateReasonCHO.CAMPAIGN,
+                    adviser_id=request.user.id,
+                    using=DB_USER_PARTNER,
+                )
 
-                    )
-                    update_partner_accum.append(partner_accum_i)
-
-                if(update_partner_accum):
-                    PartnerLinkAccumulated.objects.bulk_update(
-                        objs=update_partner_accum,
-                        fields=(
-                            "percentage_cpa",
-                        ),
-                        batch_size=999,
-                    )
-                partner_accum = PartnerLinkAccumulated.objects.select_related(
-                    "campaign",
-                ).filter(query)
-
-                for partner_accum_i in partner_accum:
-                    create_history(
-                        instance=partner_accum_i,
-                        update_reason=PartnerAccumUpdateReasonCHO.CAMPAIGN,
-                        adviser=request.user.id,
-                    )
+            # Trackers not customized on partner link accumulated follow the
+            # campaign
+            propagate_campaign_trackers(
+                campaign_id=campaign.pk,
+                trackers_old={
+                    field: getattr(campaign, field)
+                    for field in CAMPAIGN_TRACKER_FIELDS
+                    if field in validator.document
+                },
+                trackers_new={
+                    field: validator.document.get(field)
+                    for field in CAMPAIGN_TRACKER_FIELDS
+                    if field in validator.document
+                },
+                using=DB_USER_PARTNER,
+            )
 
-            if "tracker" in validator.document:
-                partner_link_accumulateds = PartnerLinkAccumulated.objects.filter(
-                    Q(campaign=campaign),
-                    Q(tracker=campaign.tracker)
-                )
-                list_to_update = []
-                for partner_link_accumulated_i in partner_link_accumulateds:
-                    partner_link_accumulated_i.tracker = validator.document.get("tracker")
-                    list_to_update.append(partner_link_accumulated_i)
-
-                PartnerLinkAccumulated.objects.bulk_update(
-                    objs=list_to_update,
-                    fields=(
-                        "tracker",
-                    )
-                )
-            if "tracker_deposit" in validator.document:
-                partner_link_accumulateds = PartnerLinkAccumulated.objects.filter(
-                    Q(campaign=campaign),
-                    Q(tracker_deposit=campaign.tracker_deposit)
-                )
-                list_to_update = []
-                for partner_link_accumulated_i in partner_link_accumulateds:
-                    partner_link_accumulated_i.tracker_deposit = validator.document.get("tracker_deposit")
-                    list_to_update.append(partner_link_accumulated_i)
-
-                PartnerLinkAccumulated.objects.bulk_update(
-                    objs=list_to_update,
-                    fields=(
-                        "tracker_deposit",
-                    )
-                )
-            if "tracker_registered_count" in validator.document:
-                partner_link_accumulateds = PartnerLinkAccumulated.objects.filter(
-                    Q(campaign=campaign),
-                    Q(tracker_registered_count=campaign.tracker_registered_count)
-                )
-                list_to_update = []
-                for partner_link_accumulated_i in partner_link_accumulateds:
-                    partner_link_accumulated_i.tracker_registered_count = validator.document.get(
-                        "tracker_registered_count")
-                    list_to_update.append(partner_link_accumulated_i)
-
-                PartnerLinkAccumulated.objects.bulk_update(
-                    objs=list_to_update,
-                    fields=(
-                        "tracker_registered_count",
-                    )
-                )
-            if "tracker_first_deposit_count" in validator.document:
-                partner_link_accumulateds = PartnerLinkAccumulated.objects.filter(
-                    Q(campaign=campaign),
-                    Q(tracker_registered_count=campaign.tracker_registered_count)
-                )
-                list_to_update = []
-                for partner_link_accumulated_i in partner_link_accumulateds:
-                    partner_link_accumulated_i.tracker_first_deposit_count = validator.document.get(
-                        "tracker_first_deposit_count")
-                    list_to_update.append(partner_link_accumulated_i)
-
-                PartnerLinkAccumulated.objects.bulk_update(
-                    objs=list_to_update,
-                    fields=(
-                        "tracker_first_deposit_count",
-                    )
-                )
-            if "tracker_wagering_count" in validator.document:
-                partner_link_accumulateds = PartnerLinkAccumulated.objects.filter(
-                    Q(campaign=campaign),
-                    Q(tracker_wagering_count=campaign.tracker_wagering_count)
-                )
-                list_to_update = []
-                for partner_link_accumulated_i in partner_link_accumulateds:
-                    partner_link_accumulated_i.tracker_wagering_count = validator.document.get(
-                        "tracker_wagering_count")
-                    list_to_update.append(partner_link_accumulated_i)
-
-                PartnerLinkAccumulated.objects.bulk_update(
-                    objs=list_to_update,
-                    fields=(
-                        "tracker_wagering_count",
-                    )
-                )
             # campaign historic process
             campaign_ser = CampaignManageSer(
                 instance=campaign,
@@ -5,10 +5,7 @@ from api_admin.helpers.partner_accum_history import create_history
 
 import pytz
 from api_admin.helpers import recalculate_temperature
-from api_admin.models import (
-    LevelPercentageBase,
-    SearchPartnerLimit,
-)
+from api_admin.models import SearchPartnerLimit
 from api_admin.paginators import GetAllLinks
 from api_admin.serializers import (
     BetenlacecpaSerializer,
@@ -23,12 +20,15 @@ from api_partner.helpers import (
     DB_USER_PARTNER,
     PartnerAccumUpdateReasonCHO,
     PartnerLevelCHO,
+    add_created_links,
+    get_latest_fx_partner,
+    get_latest_level_percentage,
+    invalidate_redirect_cache,
 )
 from api_partner.models import (
     BetenlaceDailyReport,
     Bookmaker,
     Campaign,
-    FxPartner,
     Link,
     Partner,
     PartnerLinkAccumulated,
@@ -134,6 +134,15 @@ class LinkAPI(APIView, GetAllLinks):
                 "offs": {
                     "required": False,
                 },
+                "cursor": {
+                    "required": False,
+                    "type": "string",
+                },
+                "count": {
+                    "required": False,
+                    "type": "string",
+                    "allowed": ("exact", "approx", "none"),
+                },
             },
         )
 
@@ -253,8 +262,8 @@ class LinkAPI(APIView, GetAllLinks):
             sort_by,
         )
 
-        fx_partner = FxPartner.objects.all().order_by("-created_at").first()
-        percentages = LevelPercentageBase.objects.all().order_by("-created_at").first()
+        fx_partner = get_latest_fx_partner()
+        percentages = get_latest_level_percentage()
 
         links_pag = self.paginate_queryset(
             queryset=links,
@@ -274,10 +283,7 @@ class LinkAPI(APIView, GetAllLinks):
         return Response(
             data={
                 "links": links_serializer.data,
-            }, headers={
-                "count": self.count,
-                "access-control-expose-headers": "count,next,previous",
-            },
+            }, headers=self.get_pagination_headers(),
             status=status.HTTP_200_OK,
         )
 
@@ -372,6 +378,12 @@ class LinkAPI(APIView, GetAllLinks):
                     "url",
                 ],
             )
+            # Bulk operations not send signals
+            invalidate_redirect_cache(using=DB_USER_PARTNER)
+            add_created_links(
+                links=links_to_create,
+                using=DB_USER_PARTNER,
+            )
             for link in links_to_create:
                 BetenlaceCPA.objects.create(
                     currency_condition=link.campaign.currency_condition,
@@ -490,7 +502,7 @@ class LinkAPI(APIView, GetAllLinks):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        level = LevelPercentageBase.objects.order_by("-created_at").first()
+        level = get_latest_level_percentage()
 
         sid = transaction.savepoint(using=DB_USER_PARTNER)
         for data in request.data.get("links"):
@@ -606,6 +618,15 @@ class LinkByCampaign(APIView, GetAllLinks):
                 "offs": {
                     "required": False,
                 },
+                "cursor": {
+                    "required": False,
+                    "type": "string",
+                },
+                "count": {
+                    "required": False,
+                    "type": "string",
+                    "allowed": ("exact", "approx", "none"),
+                },
             },
         )
 
@@ -660,8 +681,8 @@ class LinkByCampaign(APIView, GetAllLinks):
             *filters,
         )
 
-        fx_partner = FxPartner.objects.all().order_by("-created_at").first()
-        percentages = LevelPercentageBase.objects.all().order_by("-created_at").first()
+        fx_partner = get_latest_fx_partner()
+        percentages = get_latest_level_percentage()
 
         links_pag = self.paginate_queryset(
             queryset=links,
@@ -681,10 +702,7 @@ class LinkByCampaign(APIView, GetAllLinks):
             data={
                 "links": links_serializer.data,
             },
-            headers={
-                "count": self.count,
-                "access-control-expose-headers": "count,next,previous",
-            },
+            headers=self.get_pagination_headers(),
             status=status.HTTP_200_OK,
         )
 
@@ -939,7 +957,7 @@ class LinkAssignAPI(APIView):
             )
 
         today = timezone.now().astimezone(pytz.timezone(settings.TIME_ZONE))
-        level = LevelPercentageBase.objects.order_by("-created_at").first()
+        level = get_latest_level_percentage()
         partner.level
 
         # Update case
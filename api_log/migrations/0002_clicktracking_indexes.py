@@ -0,0 +1,24 @@
+# Generated by Django 3.2.12 on 2026-10-17 10:00
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Click log table is large, indexes are built without lock of writes
+    atomic = False
+
+    dependencies = [
+        ('api_log', '0001_initial'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='clicktracking',
+            index=models.Index(fields=['link_id', 'ip', '-created_at'], name='clicktracking_link_ip_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='clicktracking',
+            index=models.Index(fields=['created_at'], name='clicktracking_created_at_idx'),
+        ),
+    ]
@@ -73,6 +73,16 @@ class ClickTracking(models.Model):
     class Meta:
         verbose_name = "Click tracking"
         verbose_name_plural = "Clicks tracking"
+        indexes = (
+            models.Index(
+                fields=("link_id", "ip", "-created_at"),
+                name="clicktracking_link_ip_idx",
+            ),
+            models.Index(
+                fields=("created_at",),
+                name="clicktracking_created_at_idx",
+            ),
+        )
 
     def __str__(self):
         return f"{self.ip} - {self.created_at}"
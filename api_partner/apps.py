@@ -3,3 +3,13 @@ from django.apps import AppConfig
 class ApiForecasterConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api_partner'
+
+    def ready(self):
+        from api_partner.helpers import (
+            connect_link_counter_signals,
+            connect_redirect_cache_signals,
+            connect_reference_cache_signals,
+        )
+        connect_redirect_cache_signals()
+        connect_link_counter_signals()
+        connect_reference_cache_signals()
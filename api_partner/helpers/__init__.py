@@ -1,3 +1,7 @@
+from .account_report_loader import (
+    ACCOUNT_LOADER_COLUMNS,
+    AccountReportBulkLoader,
+)
 from .adviser_assignment import get_adviser_id_for_partner
 from .allowed import AllowedChannels
 from .authenticate_active_check import (
@@ -10,15 +14,60 @@ from .choices import (
     PartnerStatusCHO,
     PartnerAccumUpdateReasonCHO
 )
+from .click_buffer import (
+    pop_clicks,
+    push_click,
+    requeue_clicks,
+)
 from .click_error import click_error
+from .click_session import (
+    ClickSessionWindow,
+    get_click_sessions,
+)
 from .frequent_question_categories import Icons
 from .fx_conversion_cases import (
     fx_conversion_campaign_fixed_income_cases,
     fx_conversion_usd_account_cases,
     fx_conversion_usd_partner_daily_cases,
 )
+from .fx_partner_by_day import FxPartnerByDay
 from .get_client_ip_partner import get_client_ip
+from .ip_range_db import (
+    IpRangeDatabase,
+    get_ip_range_db,
+)
 from .iplist_helper import make_iplist_call
+from .link_counters import (
+    add_created_links,
+    connect_link_counter_signals,
+    link_counter_deltas,
+    recount_link_counters,
+    update_link_counters,
+)
+from .member_ingestion import (
+    BetanoAdapter,
+    CampeonbetAdapter,
+    GanabetAdapter,
+    MemberReportEngine,
+    PixbetAdapter,
+    SportazaAdapter,
+    StrendusAdapter,
+    WilliamHillAdapter,
+    YajuegoAdapter,
+    get_member_report_adapter,
+    get_partner_values,
+    run_member_reports,
+)
+from .member_report_index import MemberReportIndex
+from .member_report_month import (
+    MONTH_MEAN_COLUMNS,
+    MONTH_SUM_COLUMNS,
+    has_dirty_member_report_months,
+    is_month_range,
+    month_range,
+    refresh_dirty_member_report_months,
+    refresh_member_report_months,
+)
 from .normalize_partner_reg_info import NormalizePartnerRegInfo
 from .paginators import (
     BillsPaginator,
@@ -52,6 +101,27 @@ from .permissions import (
     IsUploadedAll,
     NoLevel,
 )
+from .redirect_cache import (
+    connect_redirect_cache_signals,
+    get_redirect_target,
+    invalidate_redirect_cache,
+)
+from .reference_cache import (
+    connect_reference_cache_signals,
+    fx_day_start,
+    get_cached_reference,
+    get_fx_partner_on,
+    get_latest_fx_partner,
+    get_latest_level_percentage,
+    get_latest_min_withdrawal,
+    get_reference_cache,
+    invalidate_reference_cache,
+)
+from .report_fetcher import (
+    ReportFetchScheduler,
+    get_report_session,
+    get_with_backoff,
+)
 from .routers_db import DB_USER_PARTNER
 from .update_cpas import UpdateCpasHandler
 from .validation_code_type import (
@@ -59,3 +129,11 @@ from .validation_code_type import (
     ValidationCodeType,
 )
 from .validation_phone_email import ValidationPhoneEmail
+from .withdrawal_partner import (
+    WITHDRAWAL_DAILY_FIELDS,
+    WITHDRAWAL_FIXED_INCOME_FIELDS,
+    calc_withdrawal_dailies,
+    get_withdrawal_dailies_df,
+    sum_withdrawal_partners,
+    withdrawal_daily_reports,
+)
@@ -0,0 +1,348 @@
+import io
+import uuid
+
+from django.conf import settings
+from django.db import connections
+
+from .routers_db import DB_USER_PARTNER
+
+# Columns of DataFrame supplied to `AccountReportBulkLoader.stage`, the
+# amounts are the values of the day (added to the accumulated of punter)
+ACCOUNT_LOADER_COLUMNS = (
+    "link_id",
+    "partner_link_accumulated_id",
+    "punter_id",
+    "deposit",
+    "stake",
+    "net_revenue",
+    "revenue_share",
+    "cpa_betenlace",
+    "cpa_at",
+    "registered_at",
+    "first_deposit_at",
+)
+
+
+class AccountReportBulkLoader():
+    """
+    Set based load of punters of a bookmaker report to `AccountReport` and
+    `AccountDailyReport` on Postgres. Rows of DataFrame are streamed by
+    chunks to a temporary table with COPY, the account reports are
+    created or accumulated with `INSERT ... ON CONFLICT (link_id,
+    punter_id) DO UPDATE` and the daily reports are inserted from the
+    same statement, so the punters are never loaded as instances.
+
+    Flow of use:
+    - `stage`: copy the rows and mark the punters that become CPA with
+    this load, CPA is triggered when `cpa_revenue_share` is reached by the
+    accumulated revenue share or when the row has `cpa_betenlace`
+    - `get_new_cpas`: punters that become CPA by link, for tracker
+    - `remove_cpa_partner`: punters that not count CPA for partner
+    - `load`: write of account reports and daily reports, must be called
+    on the transaction of the rest of reports of ingestion
+    - `close`: drop the temporary table
+
+    Rows of DataFrame must be unique by (`link_id`, `punter_id`)
+    """
+
+    def __init__(
+        self,
+        currency_condition,
+        currency_fixed_income,
+        created_at,
+        fixed_income_unitary=0,
+        cpa_revenue_share=None,
+        using=DB_USER_PARTNER,
+    ):
+        from api_partner.models import (
+            AccountDailyReport,
+            AccountReport,
+        )
+
+        self.connection = connections[using]
+        self.quote_name = self.connection.ops.quote_name
+        self.account_table = self.quote_name(AccountReport._meta.db_table)
+        self.account_daily_table = self.quote_name(AccountDailyReport._meta.db_table)
+        self.stage_table = self.quote_name(f"account_loader_{uuid.uuid4().hex}")
+
+        self.currency_condition = currency_condition
+        self.currency_fixed_income = currency_fixed_income
+        self.created_at = created_at
+        self.fixed_income_unitary = fixed_income_unitary
+        self.cpa_revenue_share = cpa_revenue_share
+
+    def stage(self, df, chunk_size=None):
+        """
+        Copy rows of DataFrame (columns of `ACCOUNT_LOADER_COLUMNS`) to the
+        temporary table and resolve the current account report of every
+        punter. Returns the count of staged rows
+        """
+        chunk_size = chunk_size or settings.ACCOUNT_LOADER_CHUNK_SIZE
+
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                CREATE TEMPORARY TABLE {self.stage_table} (
+                    row_number bigint NOT NULL,
+                    link_id bigint NOT NULL,
+                    partner_link_accumulated_id bigint NULL,
+                    punter_id varchar(50) NOT NULL,
+                    deposit double precision NOT NULL DEFAULT 0,
+                    stake double precision NOT NULL DEFAULT 0,
+                    net_revenue double precision NOT NULL DEFAULT 0,
+                    revenue_share double precision NOT NULL DEFAULT 0,
+                    cpa_betenlace integer NOT NULL DEFAULT 0,
+                    cpa_at date NULL,
+                    registered_at date NULL,
+                    first_deposit_at date NULL,
+                    account_report_id bigint NULL,
+                    is_new_cpa boolean NOT NULL DEFAULT false,
+                    is_cpa_partner_removed boolean NOT NULL DEFAULT false
+                )
+                """
+            )
+
+            columns = ", ".join(("row_number", *ACCOUNT_LOADER_COLUMNS))
+            for index in range(0, len(df.index), chunk_size):
+                chunk = df.iloc[index:index + chunk_size].loc[:, ACCOUNT_LOADER_COLUMNS].fillna(
+                    value={
+                        "deposit": 0,
+                        "stake": 0,
+                        "net_revenue": 0,
+                        "revenue_share": 0,
+                        "cpa_betenlace": 0,
+                    },
+                ).astype(
+                    # Ids as integers on CSV, nullable ids are not floats
+                    {
+                        "link_id": "int64",
+                        "partner_link_accumulated_id": "Int64",
+                        "cpa_betenlace": "int64",
+                    },
+                )
+                chunk.insert(0, "row_number", range(index, index + len(chunk.index)))
+                buffer = io.StringIO()
+                chunk.to_csv(
+                    buffer,
+                    header=False,
+                    index=False,
+                    na_rep="",
+                    date_format="%Y-%m-%d",
+                )
+                buffer.seek(0)
+                cursor.copy_expert(
+                    f"COPY {self.stage_table} ({columns}) FROM STDIN WITH (FORMAT csv, NULL '')",
+                    buffer,
+                )
+
+            cursor.execute(f"CREATE INDEX ON {self.stage_table} (link_id, punter_id)")
+            cursor.execute(f"ANALYZE {self.stage_table}")
+
+            # Current account report of punters, only the punters not yet
+            # CPA can become CPA
+            cpa_condition_update, cpa_condition_create, params = self._cpa_conditions()
+            cursor.execute(
+                f"""
+                UPDATE {self.stage_table} AS stage
+                SET account_report_id = account.id,
+                    is_new_cpa = (account.cpa_betenlace <> 1 AND {cpa_condition_update})
+                FROM {self.account_table} AS account
+                WHERE account.link_id = stage.link_id
+                    AND account.punter_id = stage.punter_id
+                """,
+                params,
+            )
+            cursor.execute(
+                f"""
+                UPDATE {self.stage_table} AS stage
+                SET is_new_cpa = {cpa_condition_create}
+                WHERE stage.account_report_id IS NULL
+                """,
+                params,
+            )
+        return len(df.index)
+
+    def _cpa_conditions(self):
+        """
+        SQL conditions of CPA for existing punters and for new punters
+        """
+        if (self.cpa_revenue_share is None):
+            return (
+                "stage.cpa_betenlace = 1",
+                "stage.cpa_betenlace = 1",
+                {},
+            )
+        return (
+            "account.revenue_share + stage.revenue_share >= %(cpa_revenue_share)s",
+            "stage.revenue_share >= %(cpa_revenue_share)s",
+            {"cpa_revenue_share": self.cpa_revenue_share},
+        )
+
+    def get_new_cpas(self):
+        """
+        Punters that become CPA with this load as dict of `link_id` to
+        list of `punter_id` on order of rows of DataFrame
+        """
+        new_cpas = {}
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                SELECT link_id, punter_id
+                FROM {self.stage_table}
+                WHERE is_new_cpa
+                ORDER BY row_number
+                """
+            )
+            for link_id, punter_id in cursor.fetchall():
+                new_cpas.setdefault(link_id, []).append(punter_id)
+        return new_cpas
+
+    def remove_cpa_partner(self, link_id, punter_ids):
+        """
+        Punters of link that become CPA for betenlace but not for partner
+        (removed by tracker)
+        """
+        if (not punter_ids):
+            return
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                UPDATE {self.stage_table}
+                SET is_cpa_partner_removed = true
+                WHERE link_id = %(link_id)s
+                    AND punter_id = ANY(%(punter_ids)s)
+                """,
+                {
+                    "link_id": link_id,
+                    "punter_ids": list(punter_ids),
+                },
+            )
+
+    def load(self):
+        """
+        Create or accumulate the account reports of staged punters and
+        insert its daily reports. Returns the count of account reports
+        written
+        """
+        is_cpa_partner = (
+            "(stage.is_new_cpa AND stage.partner_link_accumulated_id IS NOT NULL "
+            "AND NOT stage.is_cpa_partner_removed)"
+        )
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                WITH upsert AS (
+                    INSERT INTO {self.account_table} AS account (
+                        link_id,
+                        partner_link_accumulated_id,
+                        punter_id,
+                        deposit,
+                        stake,
+                        currency_condition,
+                        fixed_income,
+                        net_revenue,
+                        revenue_share,
+                        revenue_share_cpa,
+                        currency_fixed_income,
+                        cpa_betenlace,
+                        cpa_partner,
+                        cpa_at,
+                        registered_at,
+                        first_deposit_at,
+                        created_at,
+                        updated_at
+                    )
+                    SELECT
+                        stage.link_id,
+                        stage.partner_link_accumulated_id,
+                        stage.punter_id,
+                        stage.deposit,
+                        stage.stake,
+                        %(currency_condition)s,
+                        CASE WHEN stage.is_new_cpa THEN %(fixed_income_unitary)s ELSE 0 END,
+                        stage.net_revenue,
+                        stage.revenue_share,
+                        0,
+                        %(currency_fixed_income)s,
+                        stage.is_new_cpa::integer,
+                        {is_cpa_partner}::integer,
+                        CASE
+                            WHEN stage.is_new_cpa THEN COALESCE(stage.cpa_at, %(created_at)s)
+                            ELSE stage.cpa_at
+                        END,
+                        stage.registered_at,
+                        stage.first_deposit_at,
+                        %(created_at)s,
+                        NOW()
+                    FROM {self.stage_table} AS stage
+                    ORDER BY stage.row_number
+                    ON CONFLICT (link_id, punter_id) DO UPDATE SET
+                        deposit = account.deposit + EXCLUDED.deposit,
+                        stake = account.stake + EXCLUDED.stake,
+                        net_revenue = account.net_revenue + EXCLUDED.net_revenue,
+                        revenue_share = account.revenue_share + EXCLUDED.revenue_share,
+                        partner_link_accumulated_id = CASE
+                            WHEN account.cpa_betenlace = 1 THEN account.partner_link_accumulated_id
+                            ELSE EXCLUDED.partner_link_accumulated_id
+                        END,
+                        fixed_income = CASE
+                            WHEN EXCLUDED.cpa_betenlace = 1 THEN EXCLUDED.fixed_income
+                            ELSE account.fixed_income
+                        END,
+                        cpa_partner = CASE
+                            WHEN EXCLUDED.cpa_betenlace = 1 THEN EXCLUDED.cpa_partner
+                            ELSE account.cpa_partner
+                        END,
+                        cpa_betenlace = GREATEST(account.cpa_betenlace, EXCLUDED.cpa_betenlace),
+                        cpa_at = COALESCE(account.cpa_at, EXCLUDED.cpa_at),
+                        registered_at = COALESCE(account.registered_at, EXCLUDED.registered_at),
+                        first_deposit_at = COALESCE(account.first_deposit_at, EXCLUDED.first_deposit_at),
+                        updated_at = EXCLUDED.updated_at
+                    RETURNING account.id, account.link_id, account.punter_id
+                )
+                INSERT INTO {self.account_daily_table} (
+                    account_report_id,
+                    deposit,
+                    stake,
+                    currency_condition,
+                    fixed_income,
+                    net_revenue,
+                    revenue_share,
+                    revenue_share_cpa,
+                    currency_fixed_income,
+                    is_cpa_betenlace,
+                    is_cpa_partner,
+                    is_first_deposit_count,
+                    created_at
+                )
+                SELECT
+                    upsert.id,
+                    stage.deposit,
+                    stage.stake,
+                    %(currency_condition)s,
+                    CASE WHEN stage.is_new_cpa THEN %(fixed_income_unitary)s ELSE 0 END,
+                    stage.net_revenue,
+                    stage.revenue_share,
+                    0,
+                    %(currency_fixed_income)s,
+                    stage.is_new_cpa,
+                    {is_cpa_partner},
+                    COALESCE(stage.first_deposit_at = %(created_at)s, false),
+                    %(created_at)s
+                FROM upsert
+                INNER JOIN {self.stage_table} AS stage
+                    ON stage.link_id = upsert.link_id
+                    AND stage.punter_id = upsert.punter_id
+                """,
+                {
+                    "currency_condition": self.currency_condition,
+                    "currency_fixed_income": self.currency_fixed_income,
+                    "fixed_income_unitary": self.fixed_income_unitary,
+                    "created_at": self.created_at,
+                },
+            )
+            return cursor.rowcount
+
+    def close(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS {self.stage_table}")
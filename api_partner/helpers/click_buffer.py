@@ -0,0 +1,80 @@
+import json
+import logging
+import time
+
+import redis
+
+logger = logging.getLogger(__name__)
+
+# List on Redis where the clicks wait to be flushed by task `flush_clicks`
+CLICK_BUFFER_KEY = "clicks:buffer"
+
+
+def push_click(
+    link_id,
+    currency_condition,
+    currency_fixed_income,
+    ip_client,
+):
+    """
+    Add a click to the buffer on Redis, the click is counted later in
+    bulk by task `flush_clicks`.
+
+    Returns False when Redis is not defined or fails, in that case the
+    caller must count the click with the task `click_count`
+    """
+    from core.helpers import get_redis_cache
+
+    redis_cache = get_redis_cache()
+    if (redis_cache is None):
+        return False
+
+    click = {
+        "link_id": link_id,
+        "currency_condition": currency_condition,
+        "currency_fixed_income": currency_fixed_income,
+        "ip": ip_client,
+        "clicked_at": time.time(),
+    }
+    try:
+        redis_cache.rpush(CLICK_BUFFER_KEY, json.dumps(click))
+    except redis.exceptions.RedisError:
+        logger.warning("Redis not available for buffer click, fallback to click_count task")
+        return False
+    return True
+
+
+def pop_clicks(max_count):
+    """
+    Take at most `max_count` clicks from the buffer, the read and removal
+    are made on the same transaction so every click is taken by only one
+    worker
+    """
+    from core.helpers import get_redis_cache
+
+    redis_cache = get_redis_cache()
+    if (redis_cache is None):
+        return []
+
+    with redis_cache.pipeline(transaction=True) as pipe:
+        pipe.lrange(CLICK_BUFFER_KEY, 0, max_count - 1)
+        pipe.ltrim(CLICK_BUFFER_KEY, max_count, -1)
+        raw_clicks, _ = pipe.execute()
+    return [json.loads(raw_click) for raw_click in raw_clicks]
+
+
+def requeue_clicks(clicks):
+    """
+    Return clicks to the head of buffer, used when the flush of a batch
+    fails so the clicks are not lost
+    """
+    from core.helpers import get_redis_cache
+
+    redis_cache = get_redis_cache()
+    if (redis_cache is None or not clicks):
+        return
+
+    redis_cache.lpush(
+        CLICK_BUFFER_KEY,
+        *(json.dumps(click) for click in reversed(clicks)),
+    )
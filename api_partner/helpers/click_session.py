@@ -0,0 +1,123 @@
+import logging
+import time
+
+import redis
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+_click_sessions = None
+
+
+class ClickSessionWindow():
+    """
+    Sessions of clicks by link and ip, a session is the ClickTracking
+    record that counts all clicks of same link and ip until
+    `CLICK_PERIOD_SECONDS` since its creation. Replaces the lookup of the
+    latest ClickTracking on history DB for every click.
+
+    Sessions are keys on Redis with TTL until end of window, when Redis is
+    not defined or fails a windowed map on memory of process is used.
+    Losing a session (Redis restart, other process without Redis) only
+    creates a new record, the sum of `count` of records is still the total
+    of clicks
+    """
+
+    KEY_PREFIX = "clicks:session"
+
+    def __init__(self, period_seconds, local_maxsize):
+        from core.helpers import LocalLRUCache
+
+        self.period_seconds = period_seconds
+        self.local = LocalLRUCache(
+            maxsize=local_maxsize,
+            ttl_seconds=period_seconds,
+        )
+
+    def _key(self, link_id, ip):
+        return f"{self.KEY_PREFIX}:{link_id}:{ip or ''}"
+
+    def get_sessions(self, keys):
+        """
+        Get pk of ClickTracking of the current session of every pair
+        (link_id, ip) of `keys`, returns dict with only the pairs with
+        session
+        """
+        from core.helpers import (
+            CACHE_MISS,
+            get_redis_cache,
+        )
+
+        keys = list(keys)
+        if (not keys):
+            return {}
+
+        redis_cache = get_redis_cache()
+        if (redis_cache is not None):
+            try:
+                values = redis_cache.mget([self._key(*key) for key in keys])
+            except redis.exceptions.RedisError:
+                logger.warning("Redis not available for get click sessions, using local window")
+            else:
+                return {
+                    key: int(value)
+                    for key, value in zip(keys, values)
+                    if value is not None
+                }
+
+        sessions = {}
+        for key in keys:
+            value = self.local.get(self._key(*key))
+            if (value is not CACHE_MISS):
+                sessions[key] = value
+        return sessions
+
+    def get_session(self, link_id, ip):
+        return self.get_sessions(keys=((link_id, ip),)).get((link_id, ip))
+
+    def start_sessions(self, sessions):
+        """
+        Start sessions from dict of (link_id, ip) to tuple of
+        (click_tracking_pk, created_at timestamp), the window of every
+        session ends `period_seconds` after its creation
+        """
+        from core.helpers import get_redis_cache
+
+        now = time.time()
+        windows = []
+        for key, (click_tracking_pk, created_at) in sessions.items():
+            ttl_seconds = int(self.period_seconds - (now - created_at))
+            if (ttl_seconds > 0):
+                windows.append((self._key(*key), click_tracking_pk, ttl_seconds))
+
+        for key, click_tracking_pk, ttl_seconds in windows:
+            self.local.set(key, click_tracking_pk, ttl_seconds=ttl_seconds)
+
+        redis_cache = get_redis_cache()
+        if (redis_cache is None or not windows):
+            return
+
+        try:
+            with redis_cache.pipeline(transaction=False) as pipe:
+                for key, click_tracking_pk, ttl_seconds in windows:
+                    pipe.set(key, click_tracking_pk, ex=ttl_seconds)
+                pipe.execute()
+        except redis.exceptions.RedisError:
+            logger.warning("Redis not available for start click sessions, using local window")
+
+    def start_session(self, link_id, ip, click_tracking_pk, created_at):
+        self.start_sessions(
+            sessions={
+                (link_id, ip): (click_tracking_pk, created_at),
+            },
+        )
+
+
+def get_click_sessions():
+    global _click_sessions
+    if (_click_sessions is None):
+        _click_sessions = ClickSessionWindow(
+            period_seconds=settings.CLICK_PERIOD_SECONDS,
+            local_maxsize=settings.CLICK_SESSION_LOCAL_SIZE,
+        )
+    return _click_sessions
@@ -150,11 +150,10 @@ def fx_conversion_usd_account_cases(model_func=Sum, include_stake=True, include_
     - fx_conversion_stake_cases : list
         Cases of conversion for stake
     """
-    # Prevent circular import
-    from api_partner.models import FxPartner
+    from .reference_cache import get_latest_fx_partner
 
     # Get current fx
-    fx_partner = FxPartner.objects.all().order_by("-created_at").first()
+    fx_partner = get_latest_fx_partner()
 
     currencies_condition = CurrencyCondition.values
     # Remove usd from currency condition list
@@ -230,13 +229,12 @@ def fx_conversion_campaign_fixed_income_cases(model_func=F, currency_local="USD"
         Cases of conversion for deposit
     """
     # Prevent circular import
-    from api_partner.models import (
-        FxPartner,
-        FxPartnerPercentage,
-    )
+    from api_partner.models import FxPartnerPercentage
+
+    from .reference_cache import get_latest_fx_partner
 
     # Get current fx
-    fx_partner = FxPartner.objects.all().order_by("-created_at").first()
+    fx_partner = get_latest_fx_partner()
 
     # Get current fx percentage
     fx_partner_percentage = FxPartnerPercentage.objects.all().order_by("-updated_at").first()
@@ -0,0 +1,68 @@
+import bisect
+
+from django.db.models import (
+    Q,
+    Subquery,
+)
+
+from .reference_cache import fx_day_start
+from .routers_db import DB_USER_PARTNER
+
+
+class FxPartnerByDay():
+    """
+    Resolver of the Fx effective on every day of a range of dates, same
+    rule of `get_fx_partner_on` (first Fx created on the day or later, if
+    not exist the last Fx created before the day). The candidates of the
+    whole range are loaded with a single query and every day is resolved
+    with a binary search over the creation dates, days are memoized.
+
+    Candidates are the Fx created between the start of `from_date` and
+    the end of `to_date`, the first Fx created after the range and the
+    last Fx created before the range
+    """
+
+    def __init__(self, from_date, to_date, using=DB_USER_PARTNER):
+        from api_partner.models import FxPartner
+
+        range_start = fx_day_start(from_date)
+        range_end = fx_day_start(to_date, days=1)
+        queryset = FxPartner.objects.using(using)
+
+        filters = (
+            Q(created_at__gte=range_start, created_at__lt=range_end) |
+            Q(
+                pk=Subquery(
+                    queryset.filter(
+                        created_at__gte=range_end,
+                    ).order_by("created_at").values("pk")[:1],
+                ),
+            ) |
+            Q(
+                pk=Subquery(
+                    queryset.filter(
+                        created_at__lte=range_start,
+                    ).order_by("-created_at").values("pk")[:1],
+                ),
+            ),
+        )
+        self.fx_partners = list(queryset.filter(*filters).order_by("created_at", "pk"))
+        self.created_ats = [fx_partner.created_at for fx_partner in self.fx_partners]
+        self.by_day = {}
+
+    def get(self, fx_date):
+        """
+        Fx effective on day `fx_date` (date), None if there is not Fx on
+        DB
+        """
+        if (fx_date in self.by_day):
+            return self.by_day.get(fx_date)
+
+        fx_partner = None
+        if (self.fx_partners):
+            index = bisect.bisect_left(self.created_ats, fx_day_start(fx_date))
+            # All candidates are before the day, the last one is effective
+            fx_partner = self.fx_partners[min(index, len(self.fx_partners) - 1)]
+
+        self.by_day[fx_date] = fx_partner
+        return fx_partner
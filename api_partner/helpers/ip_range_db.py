@@ -0,0 +1,117 @@
+import bisect
+import csv
+import ipaddress
+import logging
+import threading
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+_ip_range_db = None
+_ip_range_db_lock = threading.Lock()
+
+
+class IpRangeDatabase():
+    """
+    Offline database of ip ranges with registry, country and ASN, loaded
+    on memory from a CSV with header
+
+        ip_start,ip_end,registry,countrycode,countryname,city,asn_code,
+        asn_name,asn_route,asn_start,asn_end,asn_count
+
+    Ranges are stored as sorted integers by ip version, so every lookup is
+    a binary search. The ranges must not overlap. Results have same shape
+    of response of ip list API, `spam` and `tor` are not available so are
+    None
+    """
+
+    FIELDS = (
+        "registry",
+        "countrycode",
+        "countryname",
+        "city",
+    )
+    ASN_FIELDS = (
+        "code",
+        "name",
+        "route",
+        "start",
+        "end",
+        "count",
+    )
+
+    def __init__(self, rows):
+        ranges = {4: [], 6: []}
+        for row_i in rows:
+            ip_start = ipaddress.ip_address(row_i.get("ip_start").strip())
+            ip_end = ipaddress.ip_address(row_i.get("ip_end").strip())
+            ranges[ip_start.version].append((int(ip_start), int(ip_end), row_i))
+
+        self.starts = {}
+        self.ends = {}
+        self.rows = {}
+        for version, ranges_i in ranges.items():
+            ranges_i.sort(key=lambda range_i: range_i[0])
+            self.starts[version] = [range_i[0] for range_i in ranges_i]
+            self.ends[version] = [range_i[1] for range_i in ranges_i]
+            self.rows[version] = [range_i[2] for range_i in ranges_i]
+
+    @classmethod
+    def from_csv(cls, path):
+        with open(path, newline="") as csv_file:
+            return cls(rows=csv.DictReader(csv_file))
+
+    def __len__(self):
+        return sum(len(starts) for starts in self.starts.values())
+
+    def lookup(self, ip):
+        """
+        Get detail of ip, None if ip is invalid or is not on any range
+        """
+        try:
+            ip_address = ipaddress.ip_address(ip.strip())
+        except ValueError:
+            return None
+
+        ip_int = int(ip_address)
+        starts = self.starts.get(ip_address.version)
+        index = bisect.bisect_right(starts, ip_int) - 1
+        if (index < 0 or ip_int > self.ends[ip_address.version][index]):
+            return None
+
+        row = self.rows[ip_address.version][index]
+        ip_detail = {
+            "ip": str(ip_address),
+            "spam": None,
+            "tor": None,
+        }
+        for field in self.FIELDS:
+            ip_detail[field] = row.get(field) or None
+        ip_detail["asn"] = {
+            field: row.get(f"asn_{field}") or None
+            for field in self.ASN_FIELDS
+        }
+        return ip_detail
+
+
+def get_ip_range_db():
+    """
+    Local ip range database loaded from `IP_RANGE_DB_PATH`, None when the
+    var is not defined or the file can not be loaded. Loaded once by
+    process
+    """
+    global _ip_range_db
+    if (not settings.IP_RANGE_DB_PATH):
+        return None
+
+    with _ip_range_db_lock:
+        if (_ip_range_db is None):
+            try:
+                _ip_range_db = IpRangeDatabase.from_csv(path=settings.IP_RANGE_DB_PATH)
+            except (OSError, ValueError, AttributeError):
+                logger.exception(f"Failed to load ip range database from {settings.IP_RANGE_DB_PATH}")
+                # Avoid retry the load on every call
+                _ip_range_db = IpRangeDatabase(rows=())
+            logger.info(f"Ip range database loaded with {len(_ip_range_db)} ranges")
+    return _ip_range_db
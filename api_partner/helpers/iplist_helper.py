@@ -6,12 +6,67 @@ import traceback
 import requests
 from django.conf import settings
 
+from .ip_range_db import get_ip_range_db
+
 logger = logging.getLogger(__name__)
 
+_iplist_cache = None
+
+
+def get_iplist_cache():
+    """
+    Cache of ip details by ip, local tier on every process and Redis as
+    shared tier
+    """
+    from core.helpers import TwoTierCache
+
+    global _iplist_cache
+    if (_iplist_cache is None):
+        _iplist_cache = TwoTierCache(
+            namespace="iplist",
+            ttl_seconds=settings.IPLIST_CACHE_SECONDS,
+            local_ttl_seconds=settings.IPLIST_CACHE_LOCAL_SECONDS,
+            local_maxsize=settings.IPLIST_CACHE_LOCAL_SIZE,
+        )
+    return _iplist_cache
+
 
 def make_iplist_call(ip):
+    """
+    Get detail of ip (registry, country, ASN, etc), sources in order are
+    cache, the local ip range database when `IP_RANGE_DB_PATH` is defined
+    and finally the ip list API. Found details are cached for
+    `IPLIST_CACHE_SECONDS`, failed calls are not cached.
+
+    Returns None if the detail is not available
+    """
+    from core.helpers import CACHE_MISS
+
+    ip = ip.strip()
+    iplist_cache = get_iplist_cache()
+    ip_detail = iplist_cache.get(ip)
+    if (ip_detail is not CACHE_MISS):
+        return ip_detail
+
+    ip_detail = None
+    ip_range_db = get_ip_range_db()
+    if (ip_range_db is not None):
+        ip_detail = ip_range_db.lookup(ip)
+
+    if (ip_detail is None):
+        ip_detail = _fetch_iplist(ip)
+
+    if (ip_detail is not None):
+        iplist_cache.set(ip, ip_detail)
+    return ip_detail
+
+
+def _fetch_iplist(ip):
     try:
-        response = requests.get(settings.IP_LIST_CALL+ip)
+        response = requests.get(
+            settings.IP_LIST_CALL+ip,
+            timeout=settings.IPLIST_TIMEOUT_SECONDS,
+        )
     except:
         exc_type, exc_value, exc_traceback = sys.exc_info()
         e = traceback.format_exception(
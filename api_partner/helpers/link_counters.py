@@ -0,0 +1,179 @@
+from django.db.models import (
+    Count,
+    F,
+    Q,
+)
+
+from .routers_db import DB_USER_PARTNER
+
+
+def link_counter_deltas(status):
+    """
+    Contribution of a link with status to the counters of its campaign,
+    tuple (`links_count`, `links_assigned_count`). Unavailable links are
+    not counted (same of temperature)
+    """
+    from api_partner.models import Link
+
+    if (status is None or status == Link.Status.UNAVAILABLE):
+        return 0, 0
+    return 1, int(status == Link.Status.ASSIGNED)
+
+
+def update_link_counters(
+    campaign_id,
+    links_delta,
+    assigned_delta,
+    using=DB_USER_PARTNER,
+):
+    """
+    Add the deltas to counters of links of campaign with F expressions,
+    the row of campaign is locked until the end of current transaction so
+    concurrent status transitions are serialized
+    """
+    from api_partner.models import Campaign
+
+    if (links_delta == 0 and assigned_delta == 0):
+        return
+    Campaign.objects.using(using).filter(
+        pk=campaign_id,
+    ).update(
+        links_count=F("links_count") + links_delta,
+        links_assigned_count=F("links_assigned_count") + assigned_delta,
+    )
+
+
+def add_created_links(links, using=DB_USER_PARTNER):
+    """
+    Update counters for links created with `bulk_create`, signals are not
+    sent on bulk operations
+    """
+    deltas = {}
+    for link in links:
+        links_delta, assigned_delta = link_counter_deltas(link.status)
+        campaign_deltas = deltas.setdefault(link.campaign_id, [0, 0])
+        campaign_deltas[0] += links_delta
+        campaign_deltas[1] += assigned_delta
+        link._counter_state = (link.campaign_id, link.status)
+
+    for campaign_id, (links_delta, assigned_delta) in deltas.items():
+        update_link_counters(
+            campaign_id=campaign_id,
+            links_delta=links_delta,
+            assigned_delta=assigned_delta,
+            using=using,
+        )
+
+
+def recount_link_counters(campaign_ids=None, using=DB_USER_PARTNER):
+    """
+    Set counters of campaigns from the current links, only the campaigns
+    with counters out of sync are updated. Returns the list of ids of
+    updated campaigns
+    """
+    from api_partner.models import (
+        Campaign,
+        Link,
+    )
+
+    links = Link.objects.using(using).exclude(
+        status=Link.Status.UNAVAILABLE,
+    )
+    if (campaign_ids is not None):
+        links = links.filter(campaign_id__in=campaign_ids)
+    counts = {
+        row_i.get("campaign_id"): (row_i.get("total"), row_i.get("assigned"))
+        for row_i in links.values("campaign_id").annotate(
+            total=Count("id"),
+            assigned=Count("id", filter=Q(status=Link.Status.ASSIGNED)),
+        ).order_by()
+    }
+
+    campaigns = Campaign.objects.using(using).only(
+        "pk",
+        "links_count",
+        "links_assigned_count",
+    )
+    if (campaign_ids is not None):
+        campaigns = campaigns.filter(pk__in=campaign_ids)
+
+    campaigns_to_update = []
+    for campaign_i in campaigns.iterator():
+        total, assigned = counts.get(campaign_i.pk, (0, 0))
+        if (campaign_i.links_count == total and campaign_i.links_assigned_count == assigned):
+            continue
+        campaign_i.links_count = total
+        campaign_i.links_assigned_count = assigned
+        campaigns_to_update.append(campaign_i)
+
+    Campaign.objects.using(using).bulk_update(
+        objs=campaigns_to_update,
+        fields=(
+            "links_count",
+            "links_assigned_count",
+        ),
+        batch_size=999,
+    )
+    return [campaign_i.pk for campaign_i in campaigns_to_update]
+
+
+def _link_saved(sender, instance, created, using, update_fields=None, **kwargs):
+    if (update_fields is not None and not {"status", "campaign"} & set(update_fields)):
+        return
+
+    new_state = (instance.campaign_id, instance.status)
+    old_state = None if created else getattr(instance, "_counter_state", None)
+
+    if (not created and old_state is None):
+        # Instance without loaded status (deferred), recount its campaign
+        recount_link_counters(campaign_ids=(instance.campaign_id,), using=using)
+    elif (old_state != new_state):
+        if (old_state is not None):
+            links_delta, assigned_delta = link_counter_deltas(old_state[1])
+            update_link_counters(
+                campaign_id=old_state[0],
+                links_delta=-links_delta,
+                assigned_delta=-assigned_delta,
+                using=using,
+            )
+        links_delta, assigned_delta = link_counter_deltas(new_state[1])
+        update_link_counters(
+            campaign_id=new_state[0],
+            links_delta=links_delta,
+            assigned_delta=assigned_delta,
+            using=using,
+        )
+    instance._counter_state = new_state
+
+
+def _link_deleted(sender, instance, using, **kwargs):
+    state = getattr(instance, "_counter_state", None)
+    if (state is None):
+        recount_link_counters(campaign_ids=(instance.campaign_id,), using=using)
+        return
+    links_delta, assigned_delta = link_counter_deltas(state[1])
+    update_link_counters(
+        campaign_id=state[0],
+        links_delta=-links_delta,
+        assigned_delta=-assigned_delta,
+        using=using,
+    )
+
+
+def connect_link_counter_signals():
+    from api_partner.models import Link
+    from django.db.models.signals import (
+        post_delete,
+        post_save,
+    )
+
+    post_save.connect(
+        receiver=_link_saved,
+        sender=Link,
+        dispatch_uid="link_counters_save",
+    )
+    post_delete.connect(
+        receiver=_link_deleted,
+        sender=Link,
+        dispatch_uid="link_counters_delete",
+    )
@@ -0,0 +1,19 @@
+from .adapters import (
+    BetanoAdapter,
+    CampeonbetAdapter,
+    GanabetAdapter,
+    IncomeAccessAdapter,
+    MemberReportAdapter,
+    MemberReportNoRecords,
+    PixbetAdapter,
+    SportazaAdapter,
+    StrendusAdapter,
+    WilliamHillAdapter,
+    YajuegoAdapter,
+    get_member_report_adapter,
+)
+from .engine import (
+    MemberReportEngine,
+    get_partner_values,
+    run_member_reports,
+)
@@ -0,0 +1,424 @@
+import numpy as np
+import pandas as pd
+from django.conf import settings
+
+from ..report_fetcher import (
+    StreamedBody,
+    get_with_backoff,
+)
+
+# Max of characters of body of response shown on logs
+BODY_PREVIEW_LENGTH = 2000
+
+
+class MemberReportNoRecords(Exception):
+    """
+    Raised when the bookmaker answer correctly but without records for
+    the requested range of date
+    """
+    pass
+
+
+class MemberReportAdapter():
+    """
+    Base adapter for the member report of a bookmaker. The adapter only
+    knows how to get and normalize the raw data of the bookmaker, the
+    tracker, fx math and writes on DB are responsability of
+    `MemberReportEngine`.
+
+    The normalized DataFrame returned by `get_dataframe` have the columns
+    with the names of the models `BetenlaceCPA` and `BetenlaceDailyReport`
+
+    ### Required columns
+    - prom_code
+    - deposit
+    - net_revenue
+    - revenue_share
+    - registered_count
+    - cpa_count
+    - first_deposit_count
+    - wagering_count
+
+    ### Optional columns
+    - stake : when is not supplied the stake is not updated
+    - fixed_income : when is not supplied the fixed income is calculated
+    with the `fixed_income_unitary` of the campaign
+    """
+
+    # Name used on logs
+    bookmaker_name = None
+
+    # Campaign title -> {credential name: settings var name}
+    campaigns = {}
+
+    # Raw column name -> (normalized column name, dtype)
+    columns = {}
+
+    date_format = "%Y/%m/%d"
+
+    # Sum the rows with same prom_code, used when the bookmaker return
+    # more than one row by prom_code
+    group_by_prom_code = False
+
+    # Max of concurrent requests to the API of bookmaker
+    max_concurrency = 2
+
+    def __init__(self, campaign_title):
+        self.campaign_title = campaign_title
+        self.url = None
+        # Start of body of response for logs, the body is streamed and not
+        # available after parse
+        self.body_preview = None
+
+    def get_credentials(self):
+        """
+        Get the credentials of the campaign from settings, returns None
+        if the campaign is not defined for the adapter
+        """
+        settings_vars = self.campaigns.get(self.campaign_title)
+        if (settings_vars is None):
+            return None
+
+        return {
+            credential: getattr(settings, settings_var, None)
+            for credential, settings_var in settings_vars.items()
+        }
+
+    def build_url(self, credentials, from_date_str, to_date_str):
+        raise NotImplementedError
+
+    def fetch(self, credentials, from_date, to_date):
+        """
+        Make the request to bookmaker API with the shared session and
+        backoff retries, the used url is stored on `self.url` for logs.
+        The body is streamed, see `get_data_io`
+        """
+        self.url = self.build_url(
+            credentials=credentials,
+            from_date_str=from_date.strftime(self.date_format),
+            to_date_str=to_date.strftime(self.date_format),
+        )
+        return get_with_backoff(url=self.url, stream=True)
+
+    def get_data_io(self, response):
+        """
+        Set the characters and line based interface to stream I/O, the
+        body is read by chunks while is parsed
+        """
+        data_io = StreamedBody(response=response)
+        self.body_preview = data_io.preamble[:BODY_PREVIEW_LENGTH]
+        return data_io
+
+    def read(self, data_io):
+        """
+        Parse the CSV by chunks of `REPORT_CSV_CHUNKSIZE` rows, every chunk
+        is returned with the normalized column names
+        """
+        cols_to_use = list(self.columns.keys())
+        chunks = pd.read_csv(
+            filepath_or_buffer=data_io,
+            sep=",",
+            usecols=cols_to_use,
+            dtype={
+                column: dtype
+                for column, (_, dtype) in self.columns.items()
+            },
+            chunksize=settings.REPORT_CSV_CHUNKSIZE,
+        )
+        for chunk in chunks:
+            yield chunk[cols_to_use].rename(
+                columns={
+                    column: name
+                    for column, (name, _) in self.columns.items()
+                },
+            )
+
+    def clean(self, df, credentials):
+        """
+        Remove the rows that not must be processed, override in place
+        """
+        return df
+
+    def get_dataframe(self, response, credentials):
+        """
+        Normalized DataFrame from the response of the bookmaker, every
+        chunk is cleaned before concat so only the kept rows are on memory
+        """
+        data_io = self.get_data_io(response=response)
+        chunks = [
+            self.clean(df=chunk, credentials=credentials)
+            for chunk in self.read(data_io=data_io)
+        ]
+        if (chunks):
+            df = pd.concat(chunks, ignore_index=True)
+        else:
+            # Body without rows, empty DataFrame with same dtypes
+            df = pd.DataFrame(
+                data={
+                    name: pd.Series(dtype=dtype)
+                    for name, dtype in self.columns.values()
+                },
+            )
+            df = self.clean(df=df, credentials=credentials)
+
+        if (self.group_by_prom_code):
+            # Temp group by for get data of Big range date
+            df = df.groupby(
+                by=["prom_code"],
+                as_index=False,
+            ).sum()
+
+        if ("fixed_income" in df.columns):
+            df.loc[np.isnan(df.fixed_income.values), "fixed_income"] = 0
+
+        return df
+
+
+class IncomeAccessAdapter(MemberReportAdapter):
+    """
+    Bookmakers with the affiliate platform Income Access, the report
+    "Member Report - Detailed" is returned as CSV with a preamble before
+    the header and a summarized row with `rowid` equal to 2
+
+    CSV columns
+    ---
+    - rowid : `np.uint8`
+        row that indicastes 1 for normal data, 2 for summarized data,
+        equivalent to `row_id`
+    - siteid : `string`
+        Equivalent to prom_code used on Model `Link` and
+        `MemberReport (Month, daily) for betenlace and partners`
+    - purchases : `np.float32`
+        Equivalent to deposit
+    - netwagers : `np.float32`
+        Equivalent to stake, total of wagered money by player/punter_id on
+        supplied date. Not supplied by all bookmakers
+    - totalcpacommission : `np.float32`
+        Equivalent to fixed_income. Not supplied by all bookmakers
+    - netrevenue : `np.float32`
+        Equivalent to net_revenue, some bookmakers use grossrevenue
+    - revsharecommission : `np.float32`
+        Equivalent to revenue_share
+    - downloads : `np.uint32`
+        Equivalent to registered_count
+    - cpacommissioncount : `np.uint32`
+        Equivalent to cpa_count
+    - firstdepositcount : `np.uint32`
+        Equivalent to first_deposit_count
+    - wageraccountcount : `np.uint32`
+        Equivalent to wagering_count
+    """
+
+    host = None
+
+    base_columns = {
+        "rowid": ("row_id", np.uint8),
+        "siteid": ("prom_code", "string"),
+        "purchases": ("deposit", np.float32),
+        "revsharecommission": ("revenue_share", np.float32),
+        "downloads": ("registered_count", np.uint32),
+        "cpacommissioncount": ("cpa_count", np.uint32),
+        "firstdepositcount": ("first_deposit_count", np.uint32),
+        "wageraccountcount": ("wagering_count", np.uint32),
+    }
+
+    extra_columns = {
+        "netwagers": ("stake", np.float32),
+        "totalcpacommission": ("fixed_income", np.float32),
+        "netrevenue": ("net_revenue", np.float32),
+    }
+
+    @property
+    def columns(self):
+        return {
+            **self.base_columns,
+            **self.extra_columns,
+        }
+
+    def build_url(self, credentials, from_date_str, to_date_str):
+        return (
+            f"{self.host}/api/affreporting.asp?key={credentials.get('key')}"
+            f"&reportname=Member%20Report%20-%20Detailed&reportformat=csv"
+            f"&reportmerchantid={credentials.get('account_id')}&reportstartdate={from_date_str}"
+            f"&reportenddate={to_date_str}"
+        )
+
+    def get_data_io(self, response):
+        # Skip the preamble until the header
+        data_io = StreamedBody(
+            response=response,
+            marker="\"rowid\"",
+        )
+        self.body_preview = data_io.preamble[:BODY_PREVIEW_LENGTH]
+        if (not data_io.found):
+            if "No Records" in data_io.preamble:
+                raise MemberReportNoRecords
+            raise ValueError("Header \"rowid\" not found on response")
+        return data_io
+
+    def clean(self, df, credentials):
+        # Filter data - Override in same place of memory
+        # rowid == 2
+        df.drop(
+            labels=df[df.eval("(row_id == 2)", engine="numexpr")].index,
+            inplace=True,
+        )
+        df.drop(
+            columns=["row_id"],
+            inplace=True,
+        )
+        return df
+
+
+class BetanoAdapter(IncomeAccessAdapter):
+    bookmaker_name = "Betano"
+    host = "https://affiliates.betano.com"
+    campaigns = {
+        "betano pe": {
+            "key": "API_MEMBER_REPORT_BETANOPE_KEY",
+            "account_id": "API_MEMBER_REPORT_BETANOPE_ACCOUNT_ID",
+        },
+        "betano cl": {
+            "key": "API_MEMBER_REPORT_BETANOCL_KEY",
+            "account_id": "API_MEMBER_REPORT_BETANOCL_ACCOUNT_ID",
+        },
+    }
+    # Betano not supply stake and fixed income
+    extra_columns = {
+        "grossrevenue": ("net_revenue", np.float32),
+    }
+
+
+class CampeonbetAdapter(IncomeAccessAdapter):
+    bookmaker_name = "CampeonBet"
+    host = "https://affiliates.campeonaffiliates.com"
+    campaigns = {
+        "campeonbet latam": {
+            "key": "API_MEMBER_REPORT_CAMPEONBETLATAM_KEY",
+            "account_id": "API_MEMBER_REPORT_CAMPEONBETLATAM_ACCOUNT_ID",
+        },
+    }
+    # Stake is not supplied for CampeonBet
+    extra_columns = {
+        "totalcpacommission": ("fixed_income", np.float32),
+        "netrevenue": ("net_revenue", np.float32),
+    }
+
+
+class GanabetAdapter(IncomeAccessAdapter):
+    bookmaker_name = "Ganabet"
+    host = "https://partners.ganabet.mx"
+    campaigns = {
+        "ganabet mex": {
+            "key": "API_MEMBER_REPORT_GANABETMEX_KEY",
+            "account_id": "API_MEMBER_REPORT_GANABETMEX_ACCOUNT_ID",
+        },
+    }
+    group_by_prom_code = True
+
+
+class PixbetAdapter(IncomeAccessAdapter):
+    bookmaker_name = "Pixbet"
+    host = "https://afiliados.pixbet.com"
+    campaigns = {
+        "pixbet br": {
+            "key": "API_MEM_PIXBETBR_KEY",
+            "account_id": "API_MEM_PIXBETBR_MERCH_ID",
+        },
+    }
+
+
+class SportazaAdapter(IncomeAccessAdapter):
+    bookmaker_name = "Sportaza"
+    host = "https://affiliates.247partners.com"
+    campaigns = {
+        "sportaza br": {
+            "key": "API_MEMBER_REPORT_SPORTAZABR_KEY",
+            "account_id": "API_MEMBER_REPORT_SPORTAZABR_ACCOUNT_ID",
+        },
+    }
+
+
+class StrendusAdapter(IncomeAccessAdapter):
+    bookmaker_name = "Strendus"
+    host = "https://afiliados.wintown.com.mx"
+    campaigns = {
+        "strendus mex": {
+            "key": "API_MEMBER_REPORT_STRENDUS_KEY",
+            "account_id": "API_MEMBER_REPORT_STRENDUS_ACCOUNT_ID",
+        },
+    }
+    # Stake is not supplied for Strendus
+    extra_columns = {
+        "totalcpacommission": ("fixed_income", np.float32),
+        "netrevenue": ("net_revenue", np.float32),
+    }
+
+
+class WilliamHillAdapter(IncomeAccessAdapter):
+    bookmaker_name = "William Hill"
+    host = "https://partners.williamhill.com"
+    campaigns = {
+        "william hill esp": {
+            "key": "API_MEMBER_REPORT_WILLIAMHILLESP_KEY",
+            "account_id": "API_MEMBER_REPORT_WILLIAMHILLESP_ACCOUNT_ID",
+            "account_name": "API_MEMBER_REPORT_WILLIAMHILLESP_ACCOUNT_NAME",
+        },
+    }
+    extra_columns = {
+        "merchantname": ("account_name", "string"),
+        "netwagers": ("stake", np.float32),
+        "totalcpacommission": ("fixed_income", np.float32),
+        "netrevenue": ("net_revenue", np.float32),
+    }
+
+    def clean(self, df, credentials):
+        # The key returns the data of all merchants of the account
+        df.drop(
+            labels=df[df.account_name != credentials.get("account_name")].index,
+            inplace=True,
+        )
+        df.drop(
+            columns=["account_name"],
+            inplace=True,
+        )
+        return super().clean(df=df, credentials=credentials)
+
+
+class YajuegoAdapter(IncomeAccessAdapter):
+    bookmaker_name = "Ya juego"
+    host = "https://webaffiliates.yajuego.co"
+    campaigns = {
+        "yajuego 80": {
+            "key": "API_MEMBER_REPORT_YAJUEGO80_KEY",
+            "account_id": "API_MEMBER_REPORT_YAJUEGO80_ACCOUNT_ID",
+        },
+        "yajuego 50": {
+            "key": "API_MEMBER_REPORT_YAJUEGO50_KEY",
+            "account_id": "API_MEMBER_REPORT_YAJUEGO50_ACCOUNT_ID",
+        },
+    }
+
+
+# Adapters used to resolve the campaign titles of member reports
+MEMBER_REPORT_ADAPTERS = (
+    BetanoAdapter,
+    CampeonbetAdapter,
+    GanabetAdapter,
+    PixbetAdapter,
+    SportazaAdapter,
+    StrendusAdapter,
+    WilliamHillAdapter,
+    YajuegoAdapter,
+)
+
+
+def get_member_report_adapter(campaign_title):
+    """
+    Instance of adapter that has defined the campaign title, None if the
+    campaign is not supported
+    """
+    for adapter_class in MEMBER_REPORT_ADAPTERS:
+        if (campaign_title in adapter_class.campaigns):
+            return adapter_class(campaign_title=campaign_title)
+    return None
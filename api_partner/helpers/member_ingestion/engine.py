@@ -0,0 +1,1060 @@
+import sys
+import traceback
+from functools import partial
+
+import numpy as np
+import pandas as pd
+from celery.utils.log import get_task_logger
+from django.conf import settings
+from django.db import transaction
+from django.db.models import (
+    Q,
+    Value,
+)
+from django.db.models.functions import Concat
+
+from ..report_fetcher import (
+    ReportFetchScheduler,
+    SpooledResponse,
+)
+from .adapters import MemberReportNoRecords
+
+logger_task = get_task_logger(__name__)
+
+# Columns tracked for partners, deposit is scaled without round
+TRACKED_KEYS = (
+    "deposit",
+    "registered_count",
+    "first_deposit_count",
+    "wagering_count",
+)
+
+
+class MemberReportEngine():
+    """
+    Ingestion of member report (summarized data by prom_code) for a day.
+    The adapter supply the normalized DataFrame of the bookmaker, the
+    engine resolve the links, apply the trackers and fx of partners and
+    save all with bulk operations on a single transaction.
+
+    Betenlace bulk update only includes `stake` when the adapter supply
+    it, when `fixed_income` is not supplied is calculated with the
+    `fixed_income_unitary` of the campaign.
+    """
+
+    def __init__(self, adapter):
+        self.adapter = adapter
+        self.list_logs = []
+
+        # Result of fetch when is made before run, see `run_member_reports`
+        self.response = None
+        self.fetch_exception = None
+
+    def fetch(self, report_date):
+        """
+        Request the report of the day to bookmaker API, the body is
+        downloaded to a temporary file (see `SpooledResponse`) so on
+        concurrent fetch the whole transfer is made on the pool, not only
+        the headers. The response is kept for the process on `run`.
+        Exceptions are raised to caller
+        """
+        self.response = SpooledResponse(
+            response=self.adapter.fetch(
+                credentials=self.adapter.get_credentials(),
+                from_date=report_date,
+                to_date=report_date,
+            ),
+        )
+        return self.response
+
+    def run(self, report_date):
+        """
+        Get, process and save the member report of the bookmaker for the
+        supplied date. Returns the count of processed rows or None if the
+        process was stopped
+        """
+        try:
+            return self._run(report_date=report_date)
+        finally:
+            self.close()
+
+    def close(self):
+        """
+        Remove the temporary file of the fetched body
+        """
+        if (self.response is not None):
+            self.response.close()
+            self.response = None
+
+    def _run(self, report_date):
+        from api_partner.helpers import (
+            DB_USER_PARTNER,
+            MemberReportIndex,
+            PartnerAccumStatusCHO,
+        )
+        from api_partner.models import (
+            BetenlaceDailyReport,
+            Campaign,
+            Link,
+            PartnerLinkDailyReport,
+        )
+
+        campaign_title = self.adapter.campaign_title
+        report_date_str = report_date.strftime(self.adapter.date_format)
+        msg = (
+            f"Making call to API Member {self.adapter.bookmaker_name}\n"
+            f"Campaign Title -> {campaign_title}\n"
+            f"From date -> {report_date_str}\n"
+            f"To date -> {report_date_str}"
+        )
+        logger_task.info(msg)
+        _chat_log(msg=f"*LEVEL:* `INFO` \n*message:* `{msg}`\n\n")
+
+        # Get id of Campaign Title
+        filters = (
+            Q(campaign_title__iexact=campaign_title),
+        )
+        campaign = Campaign.objects.using(DB_USER_PARTNER).annotate(
+            campaign_title=Concat(
+                "bookmaker__name",
+                Value(" "),
+                "title",
+            ),
+        ).filter(
+            *filters,
+        ).first()
+        if not campaign:
+            error_msg = f"Campaign with title \"{campaign_title}\" not found in DB"
+            self._error(msg=error_msg)
+            return None
+
+        credentials = self.adapter.get_credentials()
+        if credentials is None:
+            error_msg = f"Campaign with title \"{campaign_title}\" has not credentials for {self.adapter.bookmaker_name}"
+            self._error(msg=error_msg)
+            return None
+
+        df = self._get_dataframe(
+            credentials=credentials,
+            report_date=report_date,
+        )
+        if df is None:
+            return None
+
+        # Get related link from prom_codes and campaign, QUERY
+        filters = (
+            Q(prom_code__in=df.prom_code.unique()),
+            Q(campaign_id=campaign.id),
+        )
+        links = Link.objects.filter(
+            *filters,
+        ).select_related(
+            "partner_link_accumulated",
+            "partner_link_accumulated__partner",
+            "betenlacecpa",
+        )
+
+        betenlacecpas_pk = links.values_list("betenlacecpa__pk", flat=True)
+
+        filters = (
+            Q(betenlace_cpa__pk__in=betenlacecpas_pk),
+            Q(created_at=report_date.date()),
+        )
+        betenlace_daily_reports = BetenlaceDailyReport.objects.filter(*filters)
+
+        filters = (
+            Q(betenlace_daily_report__in=betenlace_daily_reports),
+        )
+        partner_link_dailies_reports = PartnerLinkDailyReport.objects.filter(*filters)
+
+        # Hash index of links and daily reports for lookups by row
+        member_report_index = MemberReportIndex(
+            links=links,
+            betenlace_daily_reports=betenlace_daily_reports,
+            partner_link_dailies_reports=partner_link_dailies_reports,
+        )
+
+        fx_partner = _get_fx_partner(report_date=report_date)
+
+        # If still none prevent execution
+        if(fx_partner is None):
+            self._error(msg="Undefined fx_partner on DB")
+            return None
+
+        fx_partner_percentage = fx_partner.fx_percentage
+
+        # Tracker and Fx of partners for all rows as column operations
+        partner_values = get_partner_values(
+            df=df,
+            member_report_index=member_report_index,
+            campaign=campaign,
+            fx_partner=fx_partner,
+        )
+
+        # Acumulators bulk create and update
+        member_reports_betenlace_month_update = []
+        member_reports_daily_betenlace_update = []
+        member_reports_daily_betenlace_create = []
+
+        member_reports_partner_month_update = []
+        member_reports_daily_partner_update = []
+        member_reports_daily_partner_create = []
+
+        # Set keys by index based on colum names of Dataframe
+        keys = {key: index for index, key in enumerate(df.columns.values)}
+
+        for row, partner_row in zip(zip(*df.to_dict("list").values()), partner_values):
+            # Get link according to prom_code of current loop
+            link = member_report_index.get_link(prom_code=row[keys.get("prom_code")])
+            if not link:
+                msg_warning = (
+                    f"Link with prom_code=\"{row[keys.get('prom_code')]}\" and campaign=\"{campaign_title}\" not "
+                    "found on database"
+                )
+                self._log_warning(msg=msg_warning)
+                continue
+
+            try:
+                # Get current entry of member report based on link (prom_code)
+                betenlace_cpa = link.betenlacecpa
+            except link._meta.model.betenlacecpa.RelatedObjectDoesNotExist:
+                msg_error = f"Betenlace CPA entry not found for link with prom_code={row[keys.get('prom_code')]}"
+                msg_error = f"*LEVEL:* `ERROR` \n*message:* `{msg_error}`\n\n"
+                logger_task.error(msg_error)
+                self.list_logs.append(msg_error)
+                continue
+
+            # Betenlace Month
+            betenlace_cpa = _betenlace_month_update(
+                keys=keys,
+                row=row,
+                betenlace_cpa=betenlace_cpa,
+                campaign=campaign,
+            )
+            member_reports_betenlace_month_update.append(betenlace_cpa)
+
+            # Betenlace Daily
+            betenlace_daily = member_report_index.get_betenlace_daily(
+                betenlace_cpa_id=betenlace_cpa.pk,
+                created_at=report_date.date(),
+            )
+
+            if(betenlace_daily):
+                betenlace_daily = _betenlace_daily_update(
+                    keys=keys,
+                    row=row,
+                    betenlace_daily=betenlace_daily,
+                    campaign=campaign,
+                    fx_partner=fx_partner,
+                )
+                member_reports_daily_betenlace_update.append(betenlace_daily)
+            else:
+                betenlace_daily = _betenlace_daily_create(
+                    from_date=report_date.date(),
+                    keys=keys,
+                    row=row,
+                    betenlace_cpa=betenlace_cpa,
+                    campaign=campaign,
+                    fx_partner=fx_partner,
+                )
+                member_reports_daily_betenlace_create.append(betenlace_daily)
+
+            # Partner Month
+            partner_link_accumulated = link.partner_link_accumulated
+
+            # When partner have not assigned the link must be continue to next loop
+            if(partner_link_accumulated is None):
+                continue
+
+            # Validate if link has relationship with partner and if has verify if status is equal to status campaign
+            if partner_link_accumulated.status == PartnerAccumStatusCHO.BY_CAMPAIGN:
+                # Validate if campaign status is equal to INACTIVE and last inactive at is great tha
+                if (
+                    campaign.status == Campaign.Status.INACTIVE and
+                    report_date.date() >= campaign.last_inactive_at.date()
+                ):
+                    msg = f"link with prom_code {partner_link_accumulated.prom_code} has status campaign inactive"
+                    self._log_warning(msg=msg)
+                    continue
+            elif (partner_link_accumulated.status == PartnerAccumStatusCHO.INACTIVE):
+                msg = f"link with prom_code {partner_link_accumulated.prom_code} has custom status inactive"
+                self._log_warning(msg=msg)
+                continue
+
+            fx_fixed_income_partner = partner_row.get("fx_fixed_income_partner")
+            fx_condition_partner = partner_row.get("fx_condition_partner")
+            if (fx_fixed_income_partner is None or fx_condition_partner is None):
+                msg_error = (
+                    f"Fx from currency \"{campaign.currency_fixed_income}\" or \"{campaign.currency_condition}\" "
+                    f"to \"{partner_link_accumulated.currency_local}\" undefined for link with prom_code "
+                    f"{partner_link_accumulated.prom_code}"
+                )
+                msg_error = f"*LEVEL:* `ERROR` \n*message:* `{msg_error}`\n\n"
+                logger_task.error(msg_error)
+                self.list_logs.append(msg_error)
+                continue
+
+            cpa_count = partner_row.get("cpa_count")
+            tracked_data = {
+                key: partner_row.get(f"tracked_{key}")
+                for key in TRACKED_KEYS
+                if keys.get(key) is not None
+            }
+            fixed_income_partner_unitary = partner_row.get("fixed_income_partner_unitary")
+            fixed_income_partner = partner_row.get("fixed_income_partner")
+            fixed_income_partner_unitary_local = partner_row.get("fixed_income_partner_unitary_local")
+            fixed_income_partner_local = partner_row.get("fixed_income_partner_local")
+
+            # Update partner month
+            partner_link_accumulated = _partner_link_month_update(
+                partner_link_accumulated=partner_link_accumulated,
+                cpa_count=cpa_count,
+                fixed_income_partner=fixed_income_partner,
+                fixed_income_partner_local=fixed_income_partner_local,
+            )
+            member_reports_partner_month_update.append(partner_link_accumulated)
+
+            # Partner Daily
+            partner_link_daily = member_report_index.get_partner_link_daily(
+                betenlace_daily_report_id=betenlace_daily.id,
+            )
+
+            if(partner_link_daily):
+                partner_link_daily = _partner_link_daily_update(
+                    cpa_count=cpa_count,
+                    tracked_data=tracked_data,
+                    fx_fixed_income_partner=fx_fixed_income_partner,
+                    fx_condition_partner=fx_condition_partner,
+                    fx_partner_percentage=fx_partner_percentage,
+                    fixed_income_partner_unitary=fixed_income_partner_unitary,
+                    fixed_income_partner=fixed_income_partner,
+                    fixed_income_partner_unitary_local=fixed_income_partner_unitary_local,
+                    fixed_income_partner_local=fixed_income_partner_local,
+                    partner_link_daily=partner_link_daily,
+                    partner_link_accumulated=partner_link_accumulated,
+                    partner=partner_link_accumulated.partner,
+                    betenlace_daily=betenlace_daily,
+                )
+                member_reports_daily_partner_update.append(partner_link_daily)
+            else:
+                partner_link_daily = _partner_link_daily_create(
+                    from_date=report_date.date(),
+                    campaign=campaign,
+                    betenlace_daily=betenlace_daily,
+                    partner_link_accumulated=partner_link_accumulated,
+                    cpa_count=cpa_count,
+                    tracked_data=tracked_data,
+                    fx_fixed_income_partner=fx_fixed_income_partner,
+                    fx_condition_partner=fx_condition_partner,
+                    fx_partner_percentage=fx_partner_percentage,
+                    fixed_income_partner_unitary=fixed_income_partner_unitary,
+                    fixed_income_partner=fixed_income_partner,
+                    fixed_income_partner_unitary_local=fixed_income_partner_unitary_local,
+                    fixed_income_partner_local=fixed_income_partner_local,
+                    partner=partner_link_accumulated.partner,
+                )
+                member_reports_daily_partner_create.append(partner_link_daily)
+
+        if (self.list_logs):
+            _chat_log(msg="".join(self.list_logs))
+
+        _bulk_save(
+            keys=keys,
+            member_reports_betenlace_month_update=member_reports_betenlace_month_update,
+            member_reports_daily_betenlace_update=member_reports_daily_betenlace_update,
+            member_reports_daily_betenlace_create=member_reports_daily_betenlace_create,
+            member_reports_partner_month_update=member_reports_partner_month_update,
+            member_reports_daily_partner_update=member_reports_daily_partner_update,
+            member_reports_daily_partner_create=member_reports_daily_partner_create,
+        )
+
+        if (len(df.index) == 0):
+            msg = f"Member for Campaign {campaign_title} No Records/No data"
+        else:
+            msg = f"Member for Campaign {campaign_title} processed count {len(df.index)}"
+        msg = f"*LEVEL:* `WARNING` \n*message:* `{msg}`\n\n"
+        logger_task.warning(msg)
+        _chat_log(msg=msg)
+        return len(df.index)
+
+    def _get_dataframe(self, credentials, report_date):
+        """
+        Fetch and normalize the report of the bookmaker, returns None when
+        is not possible get the data
+        """
+        try:
+            if (self.fetch_exception is not None):
+                raise self.fetch_exception
+
+            response = self.response
+            if (response is None):
+                response = self.fetch(report_date=report_date)
+        except:
+            error_msg = (
+                "Something is wrong at get data from API, check if current connection IP/VPN is on Whitelist of API"
+                f"server, if problem still check traceback:\n\n{_format_exception()}"
+            )
+            self._error(msg=error_msg)
+            return None
+
+        try:
+            return self.adapter.get_dataframe(
+                response=response,
+                credentials=credentials,
+            )
+        except MemberReportNoRecords:
+            warning_msg = (
+                "Data not found at requested url\n"
+                f"campaign_title: \"{self.adapter.campaign_title}\"\n"
+                f"Request url: {self.adapter.url}\n"
+                "Data obtained\n"
+                f"{self.adapter.body_preview}"
+            )
+            warning_msg = f"*LEVEL:* `WARNING` \n*message:* `{warning_msg}`\n\n"
+            logger_task.warning(warning_msg)
+            _chat_log(msg=warning_msg)
+            return None
+        except:
+            error_msg = (
+                "Something is wrong at get data from API, check the credentials (key and reportmerchantid) if problem "
+                f"persist check traceback:\n\n{_format_exception()}\n"
+                f"Request url: {self.adapter.url}\n"
+                "Data obtained\n"
+                f"{self.adapter.body_preview}"
+            )
+            self._error(msg=error_msg)
+            return None
+
+    def _error(self, msg):
+        """
+        Log and send to chat immediately an error that stop the process
+        """
+        msg = f"*LEVEL:* `ERROR` \n*message:* `{msg}`\n\n"
+        logger_task.error(msg)
+        _chat_log(msg=msg)
+
+    def _log_warning(self, msg):
+        """
+        Log a warning of a row, the warnings are sent to chat at the end
+        of loop in a single message
+        """
+        msg = f"*LEVEL:* `WARNING` \n*message:* `{msg}`\n\n"
+        logger_task.warning(msg)
+        self.list_logs.append(msg)
+
+
+def run_member_reports(adapters, report_date):
+    """
+    Fetch concurrently the reports of all adapters and then process them
+    one by one, the requests are limited by bookmaker with the
+    `max_concurrency` of adapter and the writes on DB are kept sequential
+    """
+    engines = [
+        MemberReportEngine(adapter=adapter)
+        for adapter in adapters
+    ]
+
+    report_fetch_scheduler = ReportFetchScheduler()
+    scheduled_engines = []
+    for member_report_engine in engines:
+        # Campaigns without credentials are reported on run
+        if (member_report_engine.adapter.get_credentials() is None):
+            continue
+
+        report_fetch_scheduler.add(
+            fetch=partial(member_report_engine.fetch, report_date=report_date),
+            group=member_report_engine.adapter.bookmaker_name,
+            max_concurrency=member_report_engine.adapter.max_concurrency,
+        )
+        scheduled_engines.append(member_report_engine)
+
+    results = report_fetch_scheduler.run()
+    for member_report_engine, (_, exception) in zip(scheduled_engines, results):
+        member_report_engine.fetch_exception = exception
+
+    for member_report_engine in engines:
+        member_report_engine.run(report_date=report_date)
+
+
+def _chat_log(msg):
+    from core.tasks import chat_logger as chat_logger_task
+
+    chat_logger_task.apply_async(
+        kwargs={
+            "msg": msg,
+            "msg_url": settings.CHAT_WEBHOOK_CELERY,
+        },
+    )
+
+
+def _format_exception():
+    exc_type, exc_value, exc_traceback = sys.exc_info()
+    e = traceback.format_exception(
+        etype=exc_type,
+        value=exc_value,
+        tb=exc_traceback,
+    )
+    return "".join(e)
+
+
+def _get_fx_partner(report_date):
+    """
+    Get the first Fx created on the day of report or later, if not
+    exist use the last Fx created before the day of report
+    """
+    from api_partner.helpers import get_fx_partner_on
+
+    return get_fx_partner_on(fx_date=report_date)
+
+
+def _bulk_save(
+    keys,
+    member_reports_betenlace_month_update,
+    member_reports_daily_betenlace_update,
+    member_reports_daily_betenlace_create,
+    member_reports_partner_month_update,
+    member_reports_daily_partner_update,
+    member_reports_daily_partner_create,
+):
+    from api_partner.helpers import DB_USER_PARTNER
+    from api_partner.models import (
+        BetenlaceCPA,
+        BetenlaceDailyReport,
+        PartnerLinkAccumulated,
+        PartnerLinkDailyReport,
+    )
+
+    # Stake only is updated when is supplied by bookmaker
+    stake_fields = ("stake",) if keys.get("stake") is not None else ()
+
+    with transaction.atomic(using=DB_USER_PARTNER):
+        if(member_reports_betenlace_month_update):
+            BetenlaceCPA.objects.bulk_update(
+                objs=member_reports_betenlace_month_update,
+                fields=(
+                    "deposit",
+                    *stake_fields,
+                    "fixed_income",
+                    "net_revenue",
+                    "revenue_share",
+                    "registered_count",
+                    "cpa_count",
+                    "first_deposit_count",
+                    "wagering_count",
+                ),
+            )
+
+        if(member_reports_daily_betenlace_update):
+            BetenlaceDailyReport.objects.bulk_update(
+                objs=member_reports_daily_betenlace_update,
+                fields=(
+                    "deposit",
+                    *stake_fields,
+                    "net_revenue",
+                    "revenue_share",
+                    "fixed_income",
+                    "fixed_income_unitary",
+                    "fx_partner",
+                    "registered_count",
+                    "cpa_count",
+                    "first_deposit_count",
+                    "wagering_count",
+                ),
+            )
+
+        if(member_reports_daily_betenlace_create):
+            BetenlaceDailyReport.objects.bulk_create(
+                objs=member_reports_daily_betenlace_create,
+            )
+
+        if(member_reports_partner_month_update):
+            PartnerLinkAccumulated.objects.bulk_update(
+                objs=member_reports_partner_month_update,
+                fields=(
+                    "cpa_count",
+                    "fixed_income",
+                    "fixed_income_local",
+                ),
+            )
+
+        if(member_reports_daily_partner_update):
+            PartnerLinkDailyReport.objects.bulk_update(
+                objs=member_reports_daily_partner_update,
+                fields=(
+                    "fixed_income",
+                    "fixed_income_unitary",
+                    "fx_book_local",
+                    "fx_book_net_revenue_local",
+                    "fx_percentage",
+                    "fixed_income_local",
+                    "fixed_income_unitary_local",
+                    "cpa_count",
+                    "percentage_cpa",
+                    "deposit",
+                    "registered_count",
+                    "first_deposit_count",
+                    "wagering_count",
+                    "tracker",
+                    "tracker_deposit",
+                    "tracker_registered_count",
+                    "tracker_first_deposit_count",
+                    "tracker_wagering_count",
+                    "adviser_id",
+                    "fixed_income_adviser",
+                    "fixed_income_adviser_local",
+                    "net_revenue_adviser",
+                    "net_revenue_adviser_local",
+                    "fixed_income_adviser_percentage",
+                    "net_revenue_adviser_percentage",
+                    "referred_by",
+                    "fixed_income_referred",
+                    "fixed_income_referred_local",
+                    "net_revenue_referred",
+                    "net_revenue_referred_local",
+                    "fixed_income_referred_percentage",
+                    "net_revenue_referred_percentage",
+                ),
+            )
+
+        if(member_reports_daily_partner_create):
+            PartnerLinkDailyReport.objects.bulk_create(
+                objs=member_reports_daily_partner_create,
+            )
+
+
+def _track_count(count, tracker):
+    """
+    Counts greater than 1 are scaled with the tracker and rounded to floor,
+    same as `math.floor`
+    """
+    return np.where(count > 1, np.floor(count*tracker), count)
+
+
+def get_partner_values(
+    df,
+    member_report_index,
+    campaign,
+    fx_partner,
+    fx_partner_percentage=None,
+    tracked_keys=TRACKED_KEYS,
+):
+    """
+    Calculate the tracked values, fx and fixed income of partners for all
+    rows of DataFrame with column operations. The DataFrame is merged
+    with the attributes of `PartnerLinkAccumulated` of every link, then
+    the trackers and fx are applied over the whole columns.
+
+    Only the columns of `tracked_keys` present on DataFrame are tracked.
+    `fx_partner_percentage` replace the `fx_percentage` of `fx_partner`
+    (tasks with `FxPartnerPercentage`), by default use the fx_partner.
+
+    Returns a list of dicts in the same order of rows of DataFrame, the
+    rows without partner or with undefined fx have None on the respective
+    values.
+    """
+    from core.helpers import FxMatrix
+
+    partner_attrs = pd.DataFrame.from_records(
+        data=[
+            (
+                prom_code,
+                link.partner_link_accumulated.tracker,
+                link.partner_link_accumulated.tracker_deposit,
+                link.partner_link_accumulated.tracker_registered_count,
+                link.partner_link_accumulated.tracker_first_deposit_count,
+                link.partner_link_accumulated.tracker_wagering_count,
+                link.partner_link_accumulated.percentage_cpa,
+                link.partner_link_accumulated.currency_local.lower(),
+            )
+            for prom_code, link in member_report_index.links.items()
+            if link.partner_link_accumulated is not None
+        ],
+        columns=(
+            "prom_code",
+            "tracker",
+            "tracker_deposit",
+            "tracker_registered_count",
+            "tracker_first_deposit_count",
+            "tracker_wagering_count",
+            "percentage_cpa",
+            "currency_local",
+        ),
+    )
+    partner_attrs = partner_attrs.astype({"prom_code": df.prom_code.dtype})
+
+    # Left merge keeps the order of rows of DataFrame
+    values = df.merge(
+        right=partner_attrs,
+        how="left",
+        on="prom_code",
+    )
+
+    cpa_count = values.cpa_count.to_numpy(dtype=np.float64)
+    values["cpa_count"] = np.where(
+        cpa_count > settings.MIN_CPA_TRACKER_DAY,
+        np.floor(cpa_count*values.tracker.to_numpy(dtype=np.float64)),
+        cpa_count,
+    )
+
+    tracked_keys = [
+        key
+        for key in TRACKED_KEYS
+        if key in tracked_keys and key in values.columns
+    ]
+    if ("deposit" in tracked_keys):
+        values["tracked_deposit"] = (
+            values.deposit.to_numpy(dtype=np.float64) *
+            values.tracker_deposit.to_numpy(dtype=np.float64)
+        )
+    for key in tracked_keys:
+        if (key != "deposit"):
+            values[f"tracked_{key}"] = _track_count(
+                count=values[key].to_numpy(dtype=np.float64),
+                tracker=values[f"tracker_{key}"].to_numpy(dtype=np.float64),
+            )
+
+    # Fx Currency Fixed income and Currency Condition, rows without
+    # partner or with undefined fx are NaN
+    fx_matrix = FxMatrix.from_fx_partner(fx_partner)
+    if (fx_partner_percentage is None):
+        fx_partner_percentage = fx_matrix.fx_percentage
+    currencies_local = values.currency_local.to_numpy(dtype=object)
+    values["fx_fixed_income_partner"] = _get_partner_fx(
+        fx_matrix=fx_matrix,
+        currency_from=campaign.currency_fixed_income,
+        currencies_local=currencies_local,
+        fx_partner_percentage=fx_partner_percentage,
+    )
+    values["fx_condition_partner"] = _get_partner_fx(
+        fx_matrix=fx_matrix,
+        currency_from=campaign.currency_condition,
+        currencies_local=currencies_local,
+        fx_partner_percentage=fx_partner_percentage,
+    )
+
+    # Fixed income
+    values["fixed_income_partner_unitary"] = campaign.fixed_income_unitary * values.percentage_cpa
+    values["fixed_income_partner"] = values.cpa_count * values.fixed_income_partner_unitary
+    values["fixed_income_partner_unitary_local"] = (
+        campaign.fixed_income_unitary *
+        values.percentage_cpa *
+        values.fx_fixed_income_partner
+    )
+    values["fixed_income_partner_local"] = values.cpa_count * values.fixed_income_partner_unitary_local
+
+    columns = [
+        "cpa_count",
+        "fx_fixed_income_partner",
+        "fx_condition_partner",
+        "fixed_income_partner_unitary",
+        "fixed_income_partner",
+        "fixed_income_partner_unitary_local",
+        "fixed_income_partner_local",
+        *(
+            f"tracked_{key}"
+            for key in tracked_keys
+        ),
+    ]
+    values = values[columns].astype(object)
+    values = values.where(values.notna(), None)
+
+    partner_values = values.to_dict("records")
+    for partner_row in partner_values:
+        if (partner_row.get("cpa_count") is not None):
+            partner_row["cpa_count"] = int(partner_row.get("cpa_count"))
+        for key in tracked_keys:
+            if (key != "deposit" and partner_row.get(f"tracked_{key}") is not None):
+                partner_row[f"tracked_{key}"] = int(partner_row.get(f"tracked_{key}"))
+    return partner_values
+
+
+def _get_partner_fx(
+    fx_matrix,
+    currency_from,
+    currencies_local,
+    fx_partner_percentage,
+):
+    """
+    Fx from currency of campaign to local currencies of partners, the
+    percentage is applied only to conversions between different currencies
+    """
+    rates = fx_matrix.rates(
+        currency_from=currency_from,
+        currency_to=currencies_local,
+    )
+    return rates * np.where(
+        fx_matrix.indexes(currency_from) == fx_matrix.indexes(currencies_local),
+        1,
+        fx_partner_percentage,
+    )
+
+
+def _get_fixed_income(
+    keys,
+    row,
+    campaign,
+):
+    """
+    Returns the fixed income and fixed income unitary of the row, when
+    the bookmaker not supply the fixed income is used the unitary value
+    of campaign
+    """
+    cpa_count = row[keys.get("cpa_count")]
+    if (keys.get("fixed_income") is None):
+        return (
+            campaign.fixed_income_unitary * cpa_count,
+            campaign.fixed_income_unitary,
+        )
+
+    fixed_income = row[keys.get("fixed_income")]
+    fixed_income_unitary = (
+        fixed_income / cpa_count
+        if cpa_count != 0
+        else
+        campaign.fixed_income_unitary
+    )
+    return fixed_income, fixed_income_unitary
+
+
+def _partner_link_daily_create(
+    from_date,
+    campaign,
+    betenlace_daily,
+    partner_link_accumulated,
+    cpa_count,
+    tracked_data,
+    fx_fixed_income_partner,
+    fx_condition_partner,
+    fx_partner_percentage,
+    fixed_income_partner_unitary,
+    fixed_income_partner,
+    fixed_income_partner_unitary_local,
+    fixed_income_partner_local,
+    partner,
+):
+    from api_partner.models import PartnerLinkDailyReport
+
+    partner_link_daily = PartnerLinkDailyReport(
+        betenlace_daily_report=betenlace_daily,
+        partner_link_accumulated=partner_link_accumulated,
+
+        currency_fixed_income=campaign.currency_fixed_income,
+        currency_local=partner_link_accumulated.currency_local,
+
+        created_at=from_date,
+    )
+    return _partner_link_daily_update(
+        cpa_count=cpa_count,
+        tracked_data=tracked_data,
+        fx_fixed_income_partner=fx_fixed_income_partner,
+        fx_condition_partner=fx_condition_partner,
+        fx_partner_percentage=fx_partner_percentage,
+        fixed_income_partner_unitary=fixed_income_partner_unitary,
+        fixed_income_partner=fixed_income_partner,
+        fixed_income_partner_unitary_local=fixed_income_partner_unitary_local,
+        fixed_income_partner_local=fixed_income_partner_local,
+        partner_link_daily=partner_link_daily,
+        partner_link_accumulated=partner_link_accumulated,
+        partner=partner,
+        betenlace_daily=betenlace_daily,
+    )
+
+
+def _partner_link_daily_update(
+    cpa_count,
+    tracked_data,
+    fx_fixed_income_partner,
+    fx_condition_partner,
+    fx_partner_percentage,
+    fixed_income_partner_unitary,
+    fixed_income_partner,
+    fixed_income_partner_unitary_local,
+    fixed_income_partner_local,
+    partner_link_daily,
+    partner_link_accumulated,
+    partner,
+    betenlace_daily,
+):
+    partner_link_daily.fixed_income = fixed_income_partner
+    partner_link_daily.fixed_income_unitary = fixed_income_partner_unitary
+
+    partner_link_daily.fx_book_local = fx_fixed_income_partner
+    partner_link_daily.fx_book_net_revenue_local = fx_condition_partner
+    partner_link_daily.fx_percentage = fx_partner_percentage
+
+    partner_link_daily.fixed_income_local = fixed_income_partner_local
+    partner_link_daily.fixed_income_unitary_local = fixed_income_partner_unitary_local
+
+    partner_link_daily.cpa_count = cpa_count
+    partner_link_daily.percentage_cpa = partner_link_accumulated.percentage_cpa
+
+    partner_link_daily.deposit = tracked_data.get("deposit")
+    partner_link_daily.registered_count = tracked_data.get("registered_count")
+    partner_link_daily.first_deposit_count = tracked_data.get("first_deposit_count")
+    partner_link_daily.wagering_count = tracked_data.get("wagering_count")
+
+    partner_link_daily.tracker = partner_link_accumulated.tracker
+    partner_link_daily.tracker_deposit = partner_link_accumulated.tracker_deposit
+    partner_link_daily.tracker_registered_count = partner_link_accumulated.tracker_registered_count
+    partner_link_daily.tracker_first_deposit_count = partner_link_accumulated.tracker_first_deposit_count
+    partner_link_daily.tracker_wagering_count = partner_link_accumulated.tracker_wagering_count
+
+    # Calculate Adviser payment
+    partner_link_daily.adviser_id = partner.adviser_id
+    partner_link_daily.fixed_income_adviser_percentage = partner.fixed_income_adviser_percentage
+    partner_link_daily.net_revenue_adviser_percentage = partner.net_revenue_adviser_percentage
+
+    if (partner.fixed_income_adviser_percentage is None):
+        partner_link_daily.fixed_income_adviser = None
+        partner_link_daily.fixed_income_adviser_local = None
+    else:
+        partner_link_daily.fixed_income_adviser = (
+            partner_link_daily.fixed_income *
+            partner.fixed_income_adviser_percentage
+        )
+        partner_link_daily.fixed_income_adviser_local = (
+            partner_link_daily.fixed_income_adviser *
+            fx_fixed_income_partner
+        )
+
+    if (partner.net_revenue_adviser_percentage is None):
+        partner_link_daily.net_revenue_adviser = None
+        partner_link_daily.net_revenue_adviser_local = None
+    else:
+        partner_link_daily.net_revenue_adviser = (
+            betenlace_daily.net_revenue * partner.net_revenue_adviser_percentage
+            if betenlace_daily.net_revenue is not None
+            else
+            0
+        )
+        partner_link_daily.net_revenue_adviser_local = (
+            partner_link_daily.net_revenue_adviser * fx_condition_partner
+        )
+
+    # Calculate referred payment
+    partner_link_daily.referred_by = partner.referred_by
+    partner_link_daily.fixed_income_referred_percentage = partner.fixed_income_referred_percentage
+    partner_link_daily.net_revenue_referred_percentage = partner.net_revenue_referred_percentage
+
+    if (partner.fixed_income_referred_percentage is None):
+        partner_link_daily.fixed_income_referred = None
+        partner_link_daily.fixed_income_referred_local = None
+    else:
+        partner_link_daily.fixed_income_referred = (
+            partner_link_daily.fixed_income *
+            partner.fixed_income_referred_percentage
+        )
+        partner_link_daily.fixed_income_referred_local = (
+            partner_link_daily.fixed_income_referred *
+            fx_fixed_income_partner
+        )
+
+    if (partner.net_revenue_referred_percentage is None):
+        partner_link_daily.net_revenue_referred = None
+        partner_link_daily.net_revenue_referred_local = None
+    else:
+        partner_link_daily.net_revenue_referred = (
+            betenlace_daily.net_revenue * partner.net_revenue_referred_percentage
+            if betenlace_daily.net_revenue is not None
+            else
+            0
+        )
+        partner_link_daily.net_revenue_referred_local = (
+            partner_link_daily.net_revenue_referred * fx_condition_partner
+        )
+
+    return partner_link_daily
+
+
+def _partner_link_month_update(
+    partner_link_accumulated,
+    cpa_count,
+    fixed_income_partner,
+    fixed_income_partner_local,
+):
+    partner_link_accumulated.cpa_count += cpa_count
+    partner_link_accumulated.fixed_income += fixed_income_partner
+    partner_link_accumulated.fixed_income_local += fixed_income_partner_local
+
+    return partner_link_accumulated
+
+
+def _betenlace_daily_create(
+    from_date,
+    keys,
+    row,
+    betenlace_cpa,
+    campaign,
+    fx_partner,
+):
+    from api_partner.models import BetenlaceDailyReport
+
+    betenlace_daily = BetenlaceDailyReport(
+        betenlace_cpa=betenlace_cpa,
+
+        currency_condition=campaign.currency_condition,
+        currency_fixed_income=campaign.currency_fixed_income,
+
+        created_at=from_date,
+    )
+    return _betenlace_daily_update(
+        keys=keys,
+        row=row,
+        betenlace_daily=betenlace_daily,
+        campaign=campaign,
+        fx_partner=fx_partner,
+    )
+
+
+def _betenlace_daily_update(
+    keys,
+    row,
+    betenlace_daily,
+    campaign,
+    fx_partner,
+):
+    betenlace_daily.deposit = row[keys.get("deposit")]
+    if (keys.get("stake") is not None):
+        betenlace_daily.stake = row[keys.get("stake")]
+
+    betenlace_daily.net_revenue = row[keys.get("net_revenue")]
+    betenlace_daily.revenue_share = row[keys.get("revenue_share")]
+
+    betenlace_daily.fixed_income, betenlace_daily.fixed_income_unitary = _get_fixed_income(
+        keys=keys,
+        row=row,
+        campaign=campaign,
+    )
+
+    betenlace_daily.fx_partner = fx_partner
+
+    betenlace_daily.registered_count = row[keys.get("registered_count")]
+    betenlace_daily.cpa_count = row[keys.get("cpa_count")]
+    betenlace_daily.first_deposit_count = row[keys.get("first_deposit_count")]
+    betenlace_daily.wagering_count = row[keys.get("wagering_count")]
+    return betenlace_daily
+
+
+def _betenlace_month_update(
+    keys,
+    row,
+    betenlace_cpa,
+    campaign,
+):
+    fixed_income, _ = _get_fixed_income(
+        keys=keys,
+        row=row,
+        campaign=campaign,
+    )
+
+    betenlace_cpa.deposit += row[keys.get("deposit")]
+    if (keys.get("stake") is not None):
+        betenlace_cpa.stake += row[keys.get("stake")]
+    betenlace_cpa.fixed_income += fixed_income
+    betenlace_cpa.net_revenue += row[keys.get("net_revenue")]
+    betenlace_cpa.revenue_share += row[keys.get("revenue_share")]
+    betenlace_cpa.registered_count += row[keys.get("registered_count")]
+    betenlace_cpa.cpa_count += row[keys.get("cpa_count")]
+    betenlace_cpa.first_deposit_count += row[keys.get("first_deposit_count")]
+    betenlace_cpa.wagering_count += row[keys.get("wagering_count")]
+    return betenlace_cpa
@@ -0,0 +1,88 @@
+class MemberReportIndex():
+    """
+    Hash indexes over the rows required by the member and account
+    ingestion tasks, built once per run. The tasks resolve every row of
+    the bookmaker report against `Link`, `BetenlaceDailyReport`,
+    `PartnerLinkDailyReport` and `AccountReport`, with this index every
+    resolution is a dict lookup instead of a linear scan of the
+    querysets.
+
+    Every queryset is evaluated only once at the moment that is indexed,
+    the returned instances are the same along the run, so changes made
+    on the objects (accumulated values) are kept between loops.
+
+    # Indexes
+    - links : `prom_code` -> `Link`
+    - betenlace_daily_reports : (`betenlace_cpa_id`, `created_at`) ->
+    `BetenlaceDailyReport`
+    - partner_link_dailies_reports : `betenlace_daily_report_id` ->
+    `PartnerLinkDailyReport`
+    - account_reports : (`link_id`, `punter_id`) -> `AccountReport`
+    """
+
+    def __init__(
+        self,
+        links,
+        betenlace_daily_reports=None,
+        partner_link_dailies_reports=None,
+        account_reports=None,
+    ):
+        self.links = {
+            link.prom_code: link
+            for link in links
+        }
+        self.betenlace_daily_reports = {}
+        self.partner_link_dailies_reports = {}
+        self.account_reports = {}
+
+        if (betenlace_daily_reports is not None or partner_link_dailies_reports is not None):
+            self.index_daily_reports(
+                betenlace_daily_reports=betenlace_daily_reports or (),
+                partner_link_dailies_reports=partner_link_dailies_reports or (),
+            )
+
+        if (account_reports is not None):
+            self.index_account_reports(account_reports=account_reports)
+
+    def index_daily_reports(
+        self,
+        betenlace_daily_reports,
+        partner_link_dailies_reports,
+    ):
+        """
+        Index the daily reports of betenlace and partners, previous
+        indexed daily reports are replaced
+        """
+        self.betenlace_daily_reports = {
+            (betenlace_daily.betenlace_cpa_id, betenlace_daily.created_at): betenlace_daily
+            for betenlace_daily in betenlace_daily_reports
+        }
+        self.partner_link_dailies_reports = {
+            partner_link_daily.betenlace_daily_report_id: partner_link_daily
+            for partner_link_daily in partner_link_dailies_reports
+        }
+
+    def index_account_reports(self, account_reports):
+        """
+        Index the account reports (punter level), previous indexed account
+        reports are replaced
+        """
+        self.account_reports = {
+            (account_report.link_id, account_report.punter_id): account_report
+            for account_report in account_reports
+        }
+
+    def get_link(self, prom_code):
+        return self.links.get(prom_code)
+
+    def get_betenlace_daily(self, betenlace_cpa_id, created_at):
+        return self.betenlace_daily_reports.get((betenlace_cpa_id, created_at))
+
+    def get_partner_link_daily(self, betenlace_daily_report_id):
+        if (betenlace_daily_report_id is None):
+            # Betenlace daily not saved yet, can not have partner daily
+            return None
+        return self.partner_link_dailies_reports.get(betenlace_daily_report_id)
+
+    def get_account_report(self, link_id, punter_id):
+        return self.account_reports.get((link_id, punter_id))
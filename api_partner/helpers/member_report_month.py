@@ -0,0 +1,233 @@
+import datetime
+
+from django.db import transaction
+from django.db.models import (
+    Count,
+    F,
+    Q,
+    Sum,
+)
+from django.db.models.functions import TruncMonth
+
+from .routers_db import DB_USER_PARTNER
+
+# Columns summed on member report, name on rollup to path from
+# BetenlaceDailyReport (None are the fx cases to USD)
+MONTH_SUM_COLUMNS = {
+    "deposit_usd": None,
+    "deposit_partner_usd": None,
+    "stake_usd": None,
+    "net_revenue_usd": None,
+    "revenue_share_usd": None,
+    "fixed_income_usd": None,
+    "cpa_count": "cpa_count",
+    "click_count": "click_count",
+    "registered_count": "registered_count",
+    "registered_count_partner": "partnerlinkdailyreport__registered_count",
+    "first_deposit_count": "first_deposit_count",
+    "first_deposit_count_partner": "partnerlinkdailyreport__first_deposit_count",
+    "wagering_count": "wagering_count",
+    "wagering_count_partner": "partnerlinkdailyreport__wagering_count",
+    "cpa_partner": "partnerlinkdailyreport__cpa_count",
+    "fixed_income_local": "partnerlinkdailyreport__fixed_income_local",
+    "fixed_income_adviser_local": "partnerlinkdailyreport__fixed_income_adviser_local",
+    "net_revenue_adviser_local": "partnerlinkdailyreport__net_revenue_adviser_local",
+    "fixed_income_referred_local": "partnerlinkdailyreport__fixed_income_referred_local",
+    "net_revenue_referred_local": "partnerlinkdailyreport__net_revenue_referred_local",
+}
+
+# Columns averaged on member report, the zeros are excluded of average
+MONTH_MEAN_COLUMNS = {
+    "fixed_income_unitary_usd": None,
+    "fixed_income_unitary_local": "partnerlinkdailyreport__fixed_income_unitary_local",
+    "percentage_cpa": "partnerlinkdailyreport__percentage_cpa",
+    "tracker": "partnerlinkdailyreport__tracker",
+    "tracker_deposit": "partnerlinkdailyreport__tracker_deposit",
+    "tracker_registered_count": "partnerlinkdailyreport__tracker_registered_count",
+    "tracker_first_deposit_count": "partnerlinkdailyreport__tracker_first_deposit_count",
+    "tracker_wagering_count": "partnerlinkdailyreport__tracker_wagering_count",
+    "fixed_income_adviser_percentage": "partnerlinkdailyreport__fixed_income_adviser_percentage",
+    "net_revenue_adviser_percentage": "partnerlinkdailyreport__net_revenue_adviser_percentage",
+    "fixed_income_referred_percentage": "partnerlinkdailyreport__fixed_income_referred_percentage",
+    "net_revenue_referred_percentage": "partnerlinkdailyreport__net_revenue_referred_percentage",
+}
+
+
+def month_range(since_date, until_date):
+    """
+    First day of month of `since_date` and last day of month of
+    `until_date`
+    """
+    since_month = since_date.replace(day=1)
+    next_month = (until_date.replace(day=1) + datetime.timedelta(days=32)).replace(day=1)
+    return since_month, next_month - datetime.timedelta(days=1)
+
+
+def is_month_range(since_date, until_date, today=None):
+    """
+    True when the range starts on first day of a month and ends on last
+    day of a month (or today or later for the current month), so it can
+    be read from `MemberReportMonth`
+    """
+    if (since_date.day != 1 or since_date > until_date):
+        return False
+    if (today is not None and until_date >= today):
+        return True
+    return (until_date + datetime.timedelta(days=1)).day == 1
+
+
+def refresh_member_report_months(
+    since_date,
+    until_date,
+    betenlace_cpa_ids=None,
+    campaign_ids=None,
+    using=DB_USER_PARTNER,
+):
+    """
+    Recalculate the rows of `MemberReportMonth` of the months between
+    `since_date` and `until_date` from daily reports, limited to links of
+    `betenlace_cpa_ids` and/or campaigns of `campaign_ids` when are
+    supplied. The daily reports are aggregated on DB with a single query,
+    rows of those links and months are replaced on a transaction.
+
+    Returns the count of rows of rollup created
+    """
+    from api_admin.helpers import fx_conversion_usd_adviser_daily_cases
+    from api_partner.models import (
+        BetenlaceDailyReport,
+        MemberReportMonth,
+    )
+
+    since_month, until_month = month_range(since_date=since_date, until_date=until_date)
+
+    filters = (
+        Q(created_at__gte=since_month),
+        Q(created_at__lte=until_month),
+    )
+    if (betenlace_cpa_ids is not None):
+        filters += (Q(betenlace_cpa_id__in=betenlace_cpa_ids),)
+    if (campaign_ids is not None):
+        filters += (Q(betenlace_cpa__link__campaign_id__in=campaign_ids),)
+
+    # Values of day with fx to USD, prefixed for not collide with the
+    # aggregates
+    fx_conversion_cases = fx_conversion_usd_adviser_daily_cases(
+        model_func=F,
+    )
+    annotates = {
+        f"day_{column}": fx_conversion_cases.get(column) if path is None else F(path)
+        for column, path in (*MONTH_SUM_COLUMNS.items(), *MONTH_MEAN_COLUMNS.items())
+    }
+
+    aggregates = {}
+    for column in MONTH_SUM_COLUMNS:
+        aggregates[column] = Sum(f"day_{column}")
+    for column in MONTH_MEAN_COLUMNS:
+        not_zero = ~Q(**{f"day_{column}": 0})
+        aggregates[f"{column}_sum"] = Sum(f"day_{column}", filter=not_zero)
+        aggregates[f"{column}_count"] = Count(f"day_{column}", filter=not_zero)
+
+    rows = BetenlaceDailyReport.objects.using(using).filter(
+        *filters,
+    ).annotate(
+        **annotates,
+        month=TruncMonth("created_at"),
+        day_partner_link_accumulated_id=F("partnerlinkdailyreport__partner_link_accumulated_id"),
+        day_adviser_id=F("partnerlinkdailyreport__adviser_id"),
+        day_referred_by_id=F("partnerlinkdailyreport__referred_by_id"),
+    ).values(
+        "betenlace_cpa_id",
+        "month",
+        "day_partner_link_accumulated_id",
+        "day_adviser_id",
+        "day_referred_by_id",
+    ).annotate(
+        **aggregates,
+    ).order_by()
+
+    with transaction.atomic(using=using):
+        member_report_months = [
+            MemberReportMonth(
+                betenlace_cpa_id=row_i.get("betenlace_cpa_id"),
+                partner_link_accumulated_id=row_i.get("day_partner_link_accumulated_id"),
+                adviser_id=row_i.get("day_adviser_id"),
+                referred_by_id=row_i.get("day_referred_by_id"),
+                created_at=row_i.get("month"),
+                **{
+                    column: row_i.get(column) or 0
+                    for column in aggregates
+                },
+            )
+            for row_i in rows
+        ]
+
+        # Same filters on rollup, both models have the link and date
+        MemberReportMonth.objects.using(using).filter(*filters).delete()
+        MemberReportMonth.objects.using(using).bulk_create(
+            objs=member_report_months,
+            batch_size=1000,
+        )
+
+    return len(member_report_months)
+
+
+def has_dirty_member_report_months(since_date, until_date, using=DB_USER_PARTNER):
+    """
+    True when some month between `since_date` and `until_date` has daily
+    reports changed that are not yet on `MemberReportMonth`, on that case
+    the range must be read from daily reports
+    """
+    from api_partner.models import MemberReportMonthDirty
+
+    since_month, until_month = month_range(since_date=since_date, until_date=until_date)
+    return MemberReportMonthDirty.objects.using(using).filter(
+        created_at__gte=since_month,
+        created_at__lte=until_month,
+    ).exists()
+
+
+def refresh_dirty_member_report_months(batch_size=1000, using=DB_USER_PARTNER):
+    """
+    Recalculate the rows of `MemberReportMonth` of links and months marked
+    on `MemberReportMonthDirty` by the triggers of daily reports, oldest
+    months first and by batches of `batch_size` links.
+
+    Marks are removed only if were not marked again while the batch was
+    refreshed (same `marked_at`), those are taken on next call.
+
+    Returns the count of rows of rollup created
+    """
+    from api_partner.models import MemberReportMonthDirty
+
+    months = MemberReportMonthDirty.objects.using(using).values_list(
+        "created_at",
+        flat=True,
+    ).distinct().order_by("created_at")
+
+    count = 0
+    for month_i in list(months):
+        dirty_rows = list(
+            MemberReportMonthDirty.objects.using(using).filter(
+                created_at=month_i,
+            ).values_list(
+                "pk",
+                "betenlace_cpa_id",
+                "marked_at",
+            ).order_by("betenlace_cpa_id"),
+        )
+        for start in range(0, len(dirty_rows), batch_size):
+            batch = dirty_rows[start:start + batch_size]
+            marks = Q()
+            for pk, _, marked_at in batch:
+                marks |= Q(pk=pk, marked_at=marked_at)
+
+            with transaction.atomic(using=using):
+                count += refresh_member_report_months(
+                    since_date=month_i,
+                    until_date=month_i,
+                    betenlace_cpa_ids=[betenlace_cpa_id for _, betenlace_cpa_id, _ in batch],
+                    using=using,
+                )
+                MemberReportMonthDirty.objects.using(using).filter(marks).delete()
+
+    return count
@@ -0,0 +1,92 @@
+from django.conf import settings
+from django.db import transaction
+
+_redirect_cache = None
+
+
+def get_redirect_cache():
+    """
+    Cache of redirect resolution, campaign title + prom_code to the data
+    of `Link` used by redirect views. Local tier on every process and
+    Redis as shared tier
+    """
+    from core.helpers import TwoTierCache
+
+    global _redirect_cache
+    if (_redirect_cache is None):
+        _redirect_cache = TwoTierCache(
+            namespace="redirect",
+            ttl_seconds=settings.REDIRECT_CACHE_SECONDS,
+            local_ttl_seconds=settings.REDIRECT_CACHE_LOCAL_SECONDS,
+            local_maxsize=settings.REDIRECT_CACHE_LOCAL_SIZE,
+        )
+    return _redirect_cache
+
+
+def get_redirect_target(
+    case,
+    campaign_title,
+    prom_code,
+    resolve,
+):
+    """
+    Get the redirect target of campaign title and prom_code from cache,
+    when is not cached is resolved with the callable `resolve` that
+    returns a tuple (link, campaign) like the redirect views, the not
+    found results are cached too.
+
+    Returns a dict with keys `link_id`, `url`, `currency_condition` and
+    `currency_fixed_income` or None if not found
+    """
+    def _resolve():
+        link, campaign = resolve()
+        if (link is None or campaign is None):
+            return None
+        return {
+            "link_id": link.pk,
+            "url": link.url,
+            "currency_condition": campaign.currency_condition,
+            "currency_fixed_income": campaign.currency_fixed_income,
+        }
+
+    return get_redirect_cache().get_or_set(
+        key=f"{case}:{campaign_title.lower()}:{prom_code.lower()}",
+        default=_resolve,
+    )
+
+
+def invalidate_redirect_cache(using=None, **kwargs):
+    """
+    Invalidate all cached redirects when the current transaction is
+    committed (immediately if there is no transaction), used as receiver
+    of signals of `Bookmaker`, `Campaign` and `Link` and after bulk
+    operations on them (signals are not sent on bulk operations)
+    """
+    transaction.on_commit(
+        func=get_redirect_cache().invalidate,
+        using=using,
+    )
+
+
+def connect_redirect_cache_signals():
+    from api_partner.models import (
+        Bookmaker,
+        Campaign,
+        Link,
+    )
+    from django.db.models.signals import (
+        post_delete,
+        post_save,
+    )
+
+    for sender in (Bookmaker, Campaign, Link):
+        post_save.connect(
+            receiver=invalidate_redirect_cache,
+            sender=sender,
+            dispatch_uid=f"redirect_cache_save_{sender.__name__}",
+        )
+        post_delete.connect(
+            receiver=invalidate_redirect_cache,
+            sender=sender,
+            dispatch_uid=f"redirect_cache_delete_{sender.__name__}",
+        )
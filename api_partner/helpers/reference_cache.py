@@ -0,0 +1,210 @@
+import copy
+import datetime
+
+from django.conf import settings
+from django.db import (
+    router,
+    transaction,
+)
+from django.utils import timezone
+
+_reference_cache = None
+
+
+def get_reference_cache():
+    """
+    Cache of single row reference tables (`FxPartner`,
+    `LevelPercentageBase`, `MinWithdrawalPartnerMoney`), local tier on
+    every process and Redis as shared tier. All entries belong to one
+    versioned namespace, any write on those tables bumps the version
+    """
+    from core.helpers import TwoTierCache
+
+    global _reference_cache
+    if (_reference_cache is None):
+        _reference_cache = TwoTierCache(
+            namespace="reference",
+            ttl_seconds=settings.REFERENCE_CACHE_SECONDS,
+            local_ttl_seconds=settings.REFERENCE_CACHE_LOCAL_SECONDS,
+            local_maxsize=settings.REFERENCE_CACHE_LOCAL_SIZE,
+        )
+    return _reference_cache
+
+
+def _to_cache(instance):
+    """
+    Values of concrete fields of instance by attname, JSON serializable
+    """
+    if (instance is None):
+        return None
+    values = {}
+    for field in instance._meta.concrete_fields:
+        value = getattr(instance, field.attname)
+        if (isinstance(value, (datetime.datetime, datetime.date))):
+            value = value.isoformat()
+        values[field.attname] = value
+    return values
+
+
+def _from_cache(model, using, values):
+    """
+    Instance of model from cached values, like loaded from DB so it can
+    be used on relations and saved
+    """
+    if (values is None):
+        return None
+    fields = [
+        field
+        for field in model._meta.concrete_fields
+        if field.attname in values
+    ]
+    return model.from_db(
+        db=using,
+        field_names=[field.attname for field in fields],
+        values=[
+            None if values.get(field.attname) is None
+            else field.to_python(copy.deepcopy(values.get(field.attname)))
+            for field in fields
+        ],
+    )
+
+
+def get_cached_reference(model, key, resolve, using=None):
+    """
+    Get the instance of model cached on key, when is not cached is
+    resolved with the callable `resolve` that receives the queryset of
+    model on DB and returns an instance or None (None is cached too)
+    """
+    using = using or router.db_for_read(model)
+    values = get_reference_cache().get_or_set(
+        key=f"{model._meta.label_lower}:{using}:{key}",
+        default=lambda: _to_cache(resolve(model.objects.using(using))),
+    )
+    return _from_cache(model=model, using=using, values=values)
+
+
+def fx_day_start(fx_date, days=0):
+    """
+    Start of the day `fx_date` (date or aware datetime, the day is taken
+    on its timezone) plus `days`, aware datetime. Dates are taken on
+    current timezone
+    """
+    if (isinstance(fx_date, datetime.datetime)):
+        day_start = fx_date.replace(minute=0, hour=0, second=0, microsecond=0)
+        if (days):
+            day_start = timezone.make_aware(
+                datetime.datetime.combine(day_start.date() + datetime.timedelta(days=days), datetime.time.min),
+                timezone=day_start.tzinfo,
+            )
+        return day_start
+    return timezone.make_aware(
+        datetime.datetime.combine(fx_date + datetime.timedelta(days=days), datetime.time.min),
+    )
+
+
+def get_fx_partner_on(fx_date, using=None):
+    """
+    Fx effective on the day `fx_date` (date or aware datetime, the day is
+    taken on its timezone), the first Fx created on the day or later, if
+    not exist the last Fx created before the day
+    """
+    from api_partner.models import FxPartner
+
+    fx_created_at = fx_day_start(fx_date)
+
+    def _resolve(queryset):
+        fx_partner = queryset.filter(created_at__gte=fx_created_at).order_by("created_at").first()
+        if (fx_partner is None):
+            fx_partner = queryset.filter(created_at__lte=fx_created_at).order_by("-created_at").first()
+        return fx_partner
+
+    return get_cached_reference(
+        model=FxPartner,
+        key=f"on:{fx_created_at.isoformat()}",
+        resolve=_resolve,
+        using=using,
+    )
+
+
+def get_latest_fx_partner(using=None):
+    """
+    Last Fx created
+    """
+    from api_partner.models import FxPartner
+
+    return get_cached_reference(
+        model=FxPartner,
+        key="latest",
+        resolve=lambda queryset: queryset.order_by("-created_at").first(),
+        using=using,
+    )
+
+
+def get_latest_level_percentage(using=None):
+    """
+    Last percentages by level of partner (`LevelPercentageBase`)
+    """
+    from api_admin.models import LevelPercentageBase
+
+    return get_cached_reference(
+        model=LevelPercentageBase,
+        key="latest",
+        resolve=lambda queryset: queryset.order_by("-created_at").first(),
+        using=using,
+    )
+
+
+def get_latest_min_withdrawal(using=None):
+    """
+    Last minimum of withdrawal by level of partner
+    """
+    from api_partner.models import MinWithdrawalPartnerMoney
+
+    return get_cached_reference(
+        model=MinWithdrawalPartnerMoney,
+        key="latest",
+        resolve=lambda queryset: queryset.order_by("-created_at").first(),
+        using=using,
+    )
+
+
+def invalidate_reference_cache(using=None, **kwargs):
+    """
+    Invalidate all cached reference data when the current transaction is
+    committed (immediately if there is no transaction), used as receiver
+    of signals of writes on reference tables
+    """
+    transaction.on_commit(
+        func=get_reference_cache().invalidate,
+        using=using,
+    )
+
+
+def connect_reference_cache_signals():
+    from api_partner.models import (
+        FxPartner,
+        MinWithdrawalPartnerMoney,
+    )
+    from django.apps import apps
+    from django.db.models.signals import (
+        post_delete,
+        post_save,
+    )
+
+    senders = [FxPartner, MinWithdrawalPartnerMoney]
+    # Percentages by level are written from admin app
+    if (apps.is_installed("api_admin")):
+        from api_admin.models import LevelPercentageBase
+        senders.append(LevelPercentageBase)
+
+    for sender in senders:
+        post_save.connect(
+            receiver=invalidate_reference_cache,
+            sender=sender,
+            dispatch_uid=f"reference_cache_save_{sender.__name__}",
+        )
+        post_delete.connect(
+            receiver=invalidate_reference_cache,
+            sender=sender,
+            dispatch_uid=f"reference_cache_delete_{sender.__name__}",
+        )
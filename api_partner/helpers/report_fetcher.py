@@ -0,0 +1,248 @@
+import codecs
+import random
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+# Status that are retried, the others are returned to caller
+RETRY_STATUS = (429, 500, 502, 503, 504)
+
+# Size in bytes of every read of a streamed body
+STREAM_CHUNK_BYTES = 64 * 1024
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_report_session():
+    """
+    Shared HTTP session for the bookmaker APIs, the connections are pooled
+    and reused between tasks of the same worker process
+    """
+    global _session
+    with _session_lock:
+        if (_session is None):
+            _session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=settings.REPORT_FETCH_MAX_WORKERS,
+                pool_maxsize=settings.REPORT_FETCH_MAX_WORKERS,
+            )
+            _session.mount("https://", adapter)
+            _session.mount("http://", adapter)
+    return _session
+
+
+def get_with_backoff(
+    url,
+    max_retries=None,
+    backoff_seconds=None,
+    **kwargs,
+):
+    """
+    Make a GET request with the shared session, connection errors and
+    responses with status of `RETRY_STATUS` are retried with exponential
+    backoff and jitter. On last attempt the response is returned or the
+    exception is raised. `max_retries` is the count of attempts, at least
+    1
+    """
+    if (max_retries is None):
+        max_retries = settings.REPORT_FETCH_MAX_RETRIES
+    if (max_retries < 1):
+        raise ValueError(f"max_retries must be at least 1, got {max_retries}")
+    if (backoff_seconds is None):
+        backoff_seconds = settings.REPORT_FETCH_BACKOFF_SECONDS
+    kwargs.setdefault("timeout", settings.REPORT_FETCH_TIMEOUT_SECONDS)
+
+    session = get_report_session()
+    for attempt in range(max_retries):
+        is_last_attempt = attempt == max_retries - 1
+        try:
+            response = session.get(url=url, **kwargs)
+        except requests.exceptions.RequestException:
+            if (is_last_attempt):
+                raise
+        else:
+            if (response.status_code not in RETRY_STATUS or is_last_attempt):
+                return response
+            # Body of retried response is discarded, with `stream=True` the
+            # connection is not returned to pool until is closed
+            response.close()
+
+        time.sleep(backoff_seconds * 2**attempt + random.uniform(0, backoff_seconds))
+
+
+class ReportFetchScheduler():
+    """
+    Run the fetches of reports on a thread pool, the wall time is the max
+    of latencies instead of the sum. Every fetch belongs to a group
+    (usually the bookmaker) with its own limit of concurrent requests for
+    not exceed the rate of its API.
+
+    Results are returned in same order of `add` calls as tuples of
+    (result, exception), only one of them is not None.
+    """
+
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers or settings.REPORT_FETCH_MAX_WORKERS
+        self.jobs = []
+        self.semaphores = {}
+
+    def add(
+        self,
+        fetch,
+        group=None,
+        max_concurrency=None,
+    ):
+        """
+        Add a callable without arguments that makes the request
+        """
+        if (group not in self.semaphores):
+            self.semaphores[group] = threading.BoundedSemaphore(
+                value=max_concurrency or self.max_workers,
+            )
+        self.jobs.append((fetch, self.semaphores[group]))
+
+    def _run_job(self, fetch, semaphore):
+        with semaphore:
+            try:
+                return fetch(), None
+            except Exception as e:
+                return None, e
+
+    def run(self):
+        if (not self.jobs):
+            return []
+
+        max_workers = min(self.max_workers, len(self.jobs))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(self._run_job, fetch, semaphore)
+                for fetch, semaphore in self.jobs
+            ]
+            return [future.result() for future in futures]
+
+
+class SpooledResponse():
+    """
+    Response with the body already downloaded to a temporary file on
+    disk, same interface of `requests.Response` used by `StreamedBody`.
+    The file is removed on `close`
+    """
+
+    def __init__(self, response):
+        self.status_code = response.status_code
+        self.url = response.url
+        self.headers = response.headers
+        self.encoding = response.encoding
+        self.file = tempfile.TemporaryFile()
+        try:
+            for chunk in response.iter_content(chunk_size=STREAM_CHUNK_BYTES):
+                self.file.write(chunk)
+        except Exception:
+            self.file.close()
+            raise
+        finally:
+            response.close()
+        self.file.seek(0)
+
+    def iter_content(self, chunk_size=STREAM_CHUNK_BYTES, decode_unicode=False):
+        decoder = None
+        if (decode_unicode):
+            decoder = codecs.getincrementaldecoder(self.encoding or "utf-8")(errors="replace")
+
+        while True:
+            chunk = self.file.read(chunk_size)
+            # Last call of decoder flushes the bytes of incomplete chars
+            data = chunk if decoder is None else decoder.decode(chunk, final=not chunk)
+            if (data):
+                yield data
+            if (not chunk):
+                return
+
+    def close(self):
+        self.file.close()
+
+
+class StreamedBody():
+    """
+    File-like object over the body of a response requested with
+    `stream=True`, the body is read in chunks on demand so the full text
+    is never materialized. All data before the first occurrence of
+    `marker` (preamble) is skipped, the preamble is kept on `preamble`
+    for logs.
+
+    If the marker is not found the whole body is on `preamble` and
+    `found` is False
+    """
+
+    def __init__(self, response, marker=None):
+        if (response.encoding is None):
+            response.encoding = "utf-8"
+        self.chunks = response.iter_content(
+            chunk_size=STREAM_CHUNK_BYTES,
+            decode_unicode=True,
+        )
+        self.buffer = ""
+        self.preamble = ""
+        self.found = True
+
+        if (marker is not None):
+            self._skip_preamble(marker=marker)
+
+    def _next_chunk(self):
+        return next(self.chunks, None)
+
+    def _skip_preamble(self, marker):
+        while True:
+            chunk = self._next_chunk()
+            if (chunk is None):
+                self.found = False
+                return
+
+            self.preamble += chunk
+            index = self.preamble.find(marker)
+            if (index != -1):
+                self.buffer = self.preamble[index:]
+                self.preamble = self.preamble[:index]
+                return
+
+    def read(self, size=-1):
+        while (size is None or size < 0 or len(self.buffer) < size):
+            chunk = self._next_chunk()
+            if (chunk is None):
+                break
+            self.buffer += chunk
+
+        if (size is None or size < 0):
+            data, self.buffer = self.buffer, ""
+        else:
+            data, self.buffer = self.buffer[:size], self.buffer[size:]
+        return data
+
+    def readline(self):
+        while ("\n" not in self.buffer):
+            chunk = self._next_chunk()
+            if (chunk is None):
+                break
+            self.buffer += chunk
+
+        index = self.buffer.find("\n")
+        if (index == -1):
+            data, self.buffer = self.buffer, ""
+        else:
+            data, self.buffer = self.buffer[:index + 1], self.buffer[index + 1:]
+        return data
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        line = self.readline()
+        if (not line):
+            raise StopIteration
+        return line
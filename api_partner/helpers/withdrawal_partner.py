@@ -0,0 +1,280 @@
+import numpy as np
+import pandas as pd
+from django.db.models import F
+
+# Fixed incomes of withdrawal and accum, on currency of campaign, the
+# transitories to USD and on currency local of partner
+WITHDRAWAL_FIXED_INCOME_FIELDS = (
+    "fixed_income_usd",
+
+    "fixed_income_eur",
+    "fixed_income_eur_usd",
+
+    "fixed_income_cop",
+    "fixed_income_cop_usd",
+
+    "fixed_income_mxn",
+    "fixed_income_mxn_usd",
+
+    "fixed_income_gbp",
+    "fixed_income_gbp_usd",
+
+    "fixed_income_pen",
+    "fixed_income_pen_usd",
+
+    "fixed_income_local",
+)
+
+# Fields of PartnerLinkDailyReport updated by withdrawal
+WITHDRAWAL_DAILY_FIELDS = (
+    "fixed_income",
+    "fixed_income_unitary",
+    "fixed_income_local",
+    "fixed_income_unitary_local",
+    "fx_book_local",
+    "fx_book_net_revenue_local",
+    "fx_percentage",
+    "percentage_cpa",
+    "fixed_income_adviser",
+    "fixed_income_adviser_local",
+    "net_revenue_adviser",
+    "net_revenue_adviser_local",
+    "fixed_income_referred",
+    "fixed_income_referred_local",
+    "net_revenue_referred",
+    "net_revenue_referred_local",
+)
+
+# Payments of adviser and referred, (prefix, fixed income percentage, net
+# revenue percentage)
+_WITHDRAWAL_SHARES = (
+    ("adviser", "fixed_income_adviser_percentage", "net_revenue_adviser_percentage"),
+    ("referred", "fixed_income_referred_percentage", "net_revenue_referred_percentage"),
+)
+
+
+def get_withdrawal_dailies_df(queryset):
+    """
+    DataFrame of values of `PartnerLinkDailyReport` of queryset with the
+    values of link accumulated, campaign and betenlace daily used by
+    withdrawal, one row per daily report
+    """
+    annotates = {
+        "partner_id": F("partner_link_accumulated__partner_id"),
+        "campaign_id": F("partner_link_accumulated__campaign_id"),
+        "currency_local": F("partner_link_accumulated__currency_local"),
+        "accum_percentage_cpa": F("partner_link_accumulated__percentage_cpa"),
+        "campaign_fixed_income_unitary": F("partner_link_accumulated__campaign__fixed_income_unitary"),
+        "currency_fixed_income": F("partner_link_accumulated__campaign__currency_fixed_income"),
+        "currency_condition": F("partner_link_accumulated__campaign__currency_condition"),
+        "betenlace_net_revenue": F("betenlace_daily_report__net_revenue"),
+    }
+    values = (
+        "id",
+        "cpa_count",
+        *(
+            key
+            for _, fixed_income_percentage_key, net_revenue_percentage_key in _WITHDRAWAL_SHARES
+            for key in (fixed_income_percentage_key, net_revenue_percentage_key)
+        ),
+        *(
+            key
+            for prefix, _, _ in _WITHDRAWAL_SHARES
+            for key in (
+                f"fixed_income_{prefix}",
+                f"fixed_income_{prefix}_local",
+                f"net_revenue_{prefix}",
+                f"net_revenue_{prefix}_local",
+            )
+        ),
+    )
+    rows = queryset.values(
+        *values,
+        **annotates,
+    ).order_by("id")
+    return pd.DataFrame.from_records(
+        data=rows.iterator(),
+        columns=(*values, *annotates),
+    )
+
+
+def _to_float(series):
+    return pd.to_numeric(series).to_numpy(dtype=np.float64)
+
+
+def _unitary(amount, count):
+    return np.divide(amount, count, out=np.zeros_like(amount), where=count != 0)
+
+
+def calc_withdrawal_dailies(df, fx_partner):
+    """
+    Calculate the fixed incomes, fx and payments of adviser and referred
+    of daily reports of DataFrame (see `get_withdrawal_dailies_df`) with
+    column operations, the fx are taken from `FxMatrix` of `fx_partner`.
+    Columns of `WITHDRAWAL_DAILY_FIELDS` are added to DataFrame, and
+    `fixed_income_usd_transitory` with the fixed income converted to USD
+    of campaigns with currency different to USD and to currency local.
+
+    Returns the array of bool of rows with undefined fx, those rows have
+    NaN on the converted values
+    """
+    from core.helpers import (
+        CurrencyAll,
+        CurrencyWithdrawalToUSD,
+        FxMatrix,
+    )
+
+    fx_matrix = FxMatrix.from_fx_partner(fx_partner)
+
+    cpa_count = _to_float(df.cpa_count)
+    percentage_cpa = _to_float(df.accum_percentage_cpa)
+    fixed_income = _to_float(df.campaign_fixed_income_unitary) * percentage_cpa * cpa_count
+
+    currencies_local = df.currency_local.to_numpy(dtype=object)
+    currencies_fixed_income = df.currency_fixed_income.to_numpy(dtype=object)
+    currencies_condition = df.currency_condition.to_numpy(dtype=object)
+
+    # Conversions are made with USD as transition currency, fx_percentage
+    # is applied on USD to currency local even for USD partners
+    fx_usd_local = fx_matrix.rates(
+        currency_from=CurrencyAll.USD,
+        currency_to=currencies_local,
+        with_percentage=True,
+        percentage_on_same_currency=True,
+    )
+    fx_fixed_income_usd = fx_matrix.rates(
+        currency_from=currencies_fixed_income,
+        currency_to=CurrencyAll.USD,
+    )
+    fx_condition_usd = fx_matrix.rates(
+        currency_from=currencies_condition,
+        currency_to=CurrencyAll.USD,
+    )
+
+    same_fixed_income = currencies_fixed_income == currencies_local
+    fx_book_local = np.where(same_fixed_income, 1, fx_fixed_income_usd * fx_usd_local)
+    fx_book_net_revenue_local = np.where(
+        currencies_condition == currencies_local,
+        1,
+        fx_condition_usd * fx_usd_local,
+    )
+
+    df["percentage_cpa"] = percentage_cpa
+    df["fx_percentage"] = fx_partner.fx_percentage
+    df["fixed_income"] = fixed_income
+    df["fixed_income_unitary"] = _unitary(amount=fixed_income, count=cpa_count)
+    df["fixed_income_local"] = fixed_income * fx_book_local
+    df["fixed_income_unitary_local"] = _unitary(amount=df.fixed_income_local.to_numpy(), count=cpa_count)
+    df["fx_book_local"] = fx_book_local
+    df["fx_book_net_revenue_local"] = fx_book_net_revenue_local
+    df["fixed_income_usd_transitory"] = np.where(
+        ~same_fixed_income & np.isin(currencies_fixed_income, CurrencyWithdrawalToUSD.values),
+        fixed_income * fx_fixed_income_usd,
+        0,
+    )
+
+    # Payments without percentage keep the current values
+    net_revenue = np.nan_to_num(_to_float(df.betenlace_net_revenue))
+    for prefix, fixed_income_percentage_key, net_revenue_percentage_key in _WITHDRAWAL_SHARES:
+        fixed_income_percentage = _to_float(df[fixed_income_percentage_key])
+        has_fixed_income = ~np.isnan(fixed_income_percentage)
+        fixed_income_share = np.where(
+            has_fixed_income,
+            fixed_income * fixed_income_percentage,
+            _to_float(df[f"fixed_income_{prefix}"]),
+        )
+        df[f"fixed_income_{prefix}"] = fixed_income_share
+        df[f"fixed_income_{prefix}_local"] = np.where(
+            has_fixed_income,
+            fixed_income_share * fx_book_local,
+            _to_float(df[f"fixed_income_{prefix}_local"]),
+        )
+
+        net_revenue_percentage = _to_float(df[net_revenue_percentage_key])
+        has_net_revenue = ~np.isnan(net_revenue_percentage)
+        net_revenue_share = np.where(
+            has_net_revenue,
+            net_revenue * net_revenue_percentage,
+            _to_float(df[f"net_revenue_{prefix}"]),
+        )
+        df[f"net_revenue_{prefix}"] = net_revenue_share
+        df[f"net_revenue_{prefix}_local"] = np.where(
+            has_net_revenue,
+            net_revenue_share * fx_book_net_revenue_local,
+            _to_float(df[f"net_revenue_{prefix}_local"]),
+        )
+
+    return np.isnan(fx_book_local) | np.isnan(fx_book_net_revenue_local)
+
+
+def sum_withdrawal_partners(df):
+    """
+    Totals by partner of daily reports calculated with
+    `calc_withdrawal_dailies`, DataFrame indexed by partner_id with
+    `cpa_count`, `currency_local` and the fields of
+    `WITHDRAWAL_FIXED_INCOME_FIELDS`
+    """
+    from core.helpers import (
+        CurrencyFixedIncome,
+        CurrencyWithdrawalToUSD,
+    )
+
+    grouped = df.groupby("partner_id", sort=False)
+    totals = pd.DataFrame(
+        {
+            "cpa_count": grouped.cpa_count.sum(),
+            # Must be same for all links of partner
+            "currency_local": grouped.currency_local.last(),
+            "fixed_income_local": grouped.fixed_income_local.sum(),
+        },
+    )
+
+    fixed_incomes = df.pivot_table(
+        index="partner_id",
+        columns="currency_fixed_income",
+        values="fixed_income",
+        aggfunc="sum",
+        fill_value=0,
+    ).reindex(
+        columns=CurrencyFixedIncome.values,
+        fill_value=0,
+    )
+    fixed_incomes.columns = [f"fixed_income_{currency.lower()}" for currency in fixed_incomes.columns]
+
+    fixed_incomes_usd = df.pivot_table(
+        index="partner_id",
+        columns="currency_fixed_income",
+        values="fixed_income_usd_transitory",
+        aggfunc="sum",
+        fill_value=0,
+    ).reindex(
+        columns=CurrencyWithdrawalToUSD.values,
+        fill_value=0,
+    )
+    fixed_incomes_usd.columns = [f"fixed_income_{currency.lower()}_usd" for currency in fixed_incomes_usd.columns]
+
+    totals = totals.join(fixed_incomes).join(fixed_incomes_usd)
+    return totals.reindex(
+        columns=(
+            "cpa_count",
+            "currency_local",
+            *WITHDRAWAL_FIXED_INCOME_FIELDS,
+        ),
+        fill_value=0,
+    )
+
+
+def withdrawal_daily_reports(df):
+    """
+    Instances of `PartnerLinkDailyReport` with the pk and the values of
+    `WITHDRAWAL_DAILY_FIELDS` of rows of DataFrame, for `bulk_update`.
+    NaN values are saved as null
+    """
+    from api_partner.models import PartnerLinkDailyReport
+
+    values = df.loc[:, ("id", *WITHDRAWAL_DAILY_FIELDS)].astype(object)
+    values = values.where(values.notna(), None)
+    return [
+        PartnerLinkDailyReport(**row_i)
+        for row_i in values.to_dict(orient="records")
+    ]
@@ -0,0 +1,77 @@
+# Generated by Django 3.2.12 on 2026-10-17 10:00
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_partner', '0015_acc_day_yajuego_rs'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MemberReportMonth',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('adviser_id', models.BigIntegerField(default=None, null=True)),
+                ('referred_by_id', models.BigIntegerField(default=None, null=True)),
+                ('deposit_usd', models.FloatField(default=0)),
+                ('deposit_partner_usd', models.FloatField(default=0)),
+                ('stake_usd', models.FloatField(default=0)),
+                ('net_revenue_usd', models.FloatField(default=0)),
+                ('revenue_share_usd', models.FloatField(default=0)),
+                ('fixed_income_usd', models.FloatField(default=0)),
+                ('cpa_count', models.IntegerField(default=0)),
+                ('click_count', models.IntegerField(default=0)),
+                ('registered_count', models.IntegerField(default=0)),
+                ('registered_count_partner', models.IntegerField(default=0)),
+                ('first_deposit_count', models.IntegerField(default=0)),
+                ('first_deposit_count_partner', models.IntegerField(default=0)),
+                ('wagering_count', models.IntegerField(default=0)),
+                ('wagering_count_partner', models.IntegerField(default=0)),
+                ('cpa_partner', models.IntegerField(default=0)),
+                ('fixed_income_local', models.FloatField(default=0)),
+                ('fixed_income_adviser_local', models.FloatField(default=0)),
+                ('net_revenue_adviser_local', models.FloatField(default=0)),
+                ('fixed_income_referred_local', models.FloatField(default=0)),
+                ('net_revenue_referred_local', models.FloatField(default=0)),
+                ('fixed_income_unitary_usd_sum', models.FloatField(default=0)),
+                ('fixed_income_unitary_usd_count', models.IntegerField(default=0)),
+                ('fixed_income_unitary_local_sum', models.FloatField(default=0)),
+                ('fixed_income_unitary_local_count', models.IntegerField(default=0)),
+                ('percentage_cpa_sum', models.FloatField(default=0)),
+                ('percentage_cpa_count', models.IntegerField(default=0)),
+                ('tracker_sum', models.FloatField(default=0)),
+                ('tracker_count', models.IntegerField(default=0)),
+                ('tracker_deposit_sum', models.FloatField(default=0)),
+                ('tracker_deposit_count', models.IntegerField(default=0)),
+                ('tracker_registered_count_sum', models.FloatField(default=0)),
+                ('tracker_registered_count_count', models.IntegerField(default=0)),
+                ('tracker_first_deposit_count_sum', models.FloatField(default=0)),
+                ('tracker_first_deposit_count_count', models.IntegerField(default=0)),
+                ('tracker_wagering_count_sum', models.FloatField(default=0)),
+                ('tracker_wagering_count_count', models.IntegerField(default=0)),
+                ('fixed_income_adviser_percentage_sum', models.FloatField(default=0)),
+                ('fixed_income_adviser_percentage_count', models.IntegerField(default=0)),
+                ('net_revenue_adviser_percentage_sum', models.FloatField(default=0)),
+                ('net_revenue_adviser_percentage_count', models.IntegerField(default=0)),
+                ('fixed_income_referred_percentage_sum', models.FloatField(default=0)),
+                ('fixed_income_referred_percentage_count', models.IntegerField(default=0)),
+                ('net_revenue_referred_percentage_sum', models.FloatField(default=0)),
+                ('net_revenue_referred_percentage_count', models.IntegerField(default=0)),
+                ('created_at', models.DateField()),
+                ('betenlace_cpa', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='member_report_month_to_betenlace_cpa', to='api_partner.betenlacecpa')),
+                ('partner_link_accumulated', models.ForeignKey(default=None, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='member_report_month_to_partner_link_accumulated', to='api_partner.partnerlinkaccumulated')),
+            ],
+            options={
+                'verbose_name': 'Member report month',
+                'verbose_name_plural': 'Member report months',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='memberreportmonth',
+            index=models.Index(fields=['created_at', 'betenlace_cpa'], name='memberreportmonth_date_idx'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 3.2.12 on 2026-10-17 12:00
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_partner', '0016_memberreportmonth'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WithdrawalPartnerRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('billed_to_at', models.DateField(unique=True)),
+                ('status', models.SmallIntegerField(default=0)),
+                ('last_partner_id', models.BigIntegerField(default=None, null=True)),
+                ('partners_count', models.IntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('finished_at', models.DateTimeField(default=None, null=True)),
+                ('fx_partner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='withdrawal_partner_run_to_fx_partner', to='api_partner.fxpartner')),
+                ('min_withdrawal', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='withdrawal_partner_run_to_min_withdrawal', to='api_partner.minwithdrawalpartnermoney')),
+                ('own_company', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='withdrawal_partner_run_to_own_company', to='api_partner.owncompany')),
+            ],
+            options={
+                'verbose_name': 'Withdrawal partner run',
+                'verbose_name_plural': 'Withdrawal partner runs',
+            },
+        ),
+    ]
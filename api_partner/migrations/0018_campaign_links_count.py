@@ -0,0 +1,58 @@
+# Generated by Django 3.2.12 on 2026-10-17 14:00
+
+from django.db import migrations, models
+
+
+def fill_links_counters(apps, schema_editor):
+    Campaign = apps.get_model("api_partner", "Campaign")
+    Link = apps.get_model("api_partner", "Link")
+    db_alias = schema_editor.connection.alias
+
+    counts = Link.objects.using(db_alias).exclude(
+        status=3,
+    ).values("campaign_id").annotate(
+        total=models.Count("id"),
+        assigned=models.Count("id", filter=models.Q(status=2)),
+    ).order_by()
+
+    campaigns = []
+    for row_i in counts:
+        campaigns.append(
+            Campaign(
+                pk=row_i.get("campaign_id"),
+                links_count=row_i.get("total"),
+                links_assigned_count=row_i.get("assigned"),
+            )
+        )
+    Campaign.objects.using(db_alias).bulk_update(
+        objs=campaigns,
+        fields=(
+            "links_count",
+            "links_assigned_count",
+        ),
+        batch_size=999,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_partner', '0017_withdrawalpartnerrun'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='campaign',
+            name='links_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='campaign',
+            name='links_assigned_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(
+            code=fill_links_counters,
+            reverse_code=migrations.RunPython.noop,
+        ),
+    ]
@@ -0,0 +1,107 @@
+# Generated by Django 3.2.12 on 2026-10-17 16:00
+
+from django.db import migrations, models
+
+# Triggers by statement with transition tables, a bulk operation makes a
+# single insert of its links and months on the table of dirty months
+MARK_DIRTY_SQL = """
+CREATE FUNCTION api_partner_mark_month_dirty_betenlace() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO api_partner_memberreportmonthdirty (betenlace_cpa_id, created_at, marked_at)
+    SELECT DISTINCT changed_rows.betenlace_cpa_id, date_trunc('month', changed_rows.created_at)::date, clock_timestamp()
+    FROM changed_rows
+    ON CONFLICT (created_at, betenlace_cpa_id) DO UPDATE SET marked_at = EXCLUDED.marked_at;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE FUNCTION api_partner_mark_month_dirty_partner() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO api_partner_memberreportmonthdirty (betenlace_cpa_id, created_at, marked_at)
+    SELECT DISTINCT betenlace_daily.betenlace_cpa_id, date_trunc('month', betenlace_daily.created_at)::date, clock_timestamp()
+    FROM changed_rows
+    INNER JOIN api_partner_betenlacedailyreport AS betenlace_daily
+        ON betenlace_daily.id = changed_rows.betenlace_daily_report_id
+    ON CONFLICT (created_at, betenlace_cpa_id) DO UPDATE SET marked_at = EXCLUDED.marked_at;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER betenlacedailyreport_month_dirty_insert
+    AFTER INSERT ON api_partner_betenlacedailyreport
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION api_partner_mark_month_dirty_betenlace();
+CREATE TRIGGER betenlacedailyreport_month_dirty_update
+    AFTER UPDATE ON api_partner_betenlacedailyreport
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION api_partner_mark_month_dirty_betenlace();
+CREATE TRIGGER betenlacedailyreport_month_dirty_delete
+    AFTER DELETE ON api_partner_betenlacedailyreport
+    REFERENCING OLD TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION api_partner_mark_month_dirty_betenlace();
+
+CREATE TRIGGER partnerlinkdailyreport_month_dirty_insert
+    AFTER INSERT ON api_partner_partnerlinkdailyreport
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION api_partner_mark_month_dirty_partner();
+CREATE TRIGGER partnerlinkdailyreport_month_dirty_update
+    AFTER UPDATE ON api_partner_partnerlinkdailyreport
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION api_partner_mark_month_dirty_partner();
+CREATE TRIGGER partnerlinkdailyreport_month_dirty_delete
+    AFTER DELETE ON api_partner_partnerlinkdailyreport
+    REFERENCING OLD TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION api_partner_mark_month_dirty_partner();
+"""
+
+UNMARK_DIRTY_SQL = """
+DROP TRIGGER IF EXISTS partnerlinkdailyreport_month_dirty_delete ON api_partner_partnerlinkdailyreport;
+DROP TRIGGER IF EXISTS partnerlinkdailyreport_month_dirty_update ON api_partner_partnerlinkdailyreport;
+DROP TRIGGER IF EXISTS partnerlinkdailyreport_month_dirty_insert ON api_partner_partnerlinkdailyreport;
+DROP TRIGGER IF EXISTS betenlacedailyreport_month_dirty_delete ON api_partner_betenlacedailyreport;
+DROP TRIGGER IF EXISTS betenlacedailyreport_month_dirty_update ON api_partner_betenlacedailyreport;
+DROP TRIGGER IF EXISTS betenlacedailyreport_month_dirty_insert ON api_partner_betenlacedailyreport;
+DROP FUNCTION IF EXISTS api_partner_mark_month_dirty_partner();
+DROP FUNCTION IF EXISTS api_partner_mark_month_dirty_betenlace();
+"""
+
+# Rollup was created empty, all months with daily reports are built by
+# the periodic refresh
+BACKFILL_DIRTY_SQL = """
+INSERT INTO api_partner_memberreportmonthdirty (betenlace_cpa_id, created_at, marked_at)
+SELECT DISTINCT betenlace_cpa_id, date_trunc('month', created_at)::date, clock_timestamp()
+FROM api_partner_betenlacedailyreport
+ON CONFLICT (created_at, betenlace_cpa_id) DO NOTHING;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_partner', '0018_campaign_links_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MemberReportMonthDirty',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('betenlace_cpa_id', models.BigIntegerField()),
+                ('created_at', models.DateField()),
+                ('marked_at', models.DateTimeField()),
+            ],
+            options={
+                'verbose_name': 'Member report month dirty',
+                'verbose_name_plural': 'Member report months dirty',
+                'unique_together': {('created_at', 'betenlace_cpa_id')},
+            },
+        ),
+        migrations.RunSQL(
+            sql=MARK_DIRTY_SQL,
+            reverse_sql=UNMARK_DIRTY_SQL,
+        ),
+        migrations.RunSQL(
+            sql=BACKFILL_DIRTY_SQL,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
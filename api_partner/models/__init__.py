@@ -34,6 +34,7 @@ from .payment_management import (
     OwnCompany,
     WithdrawalPartnerMoney,
     WithdrawalPartnerMoneyAccum,
+    WithdrawalPartnerRun,
 )
 from .question_management import (
     PartnerFeedback,
@@ -51,6 +52,8 @@ from .reports_management import (
     HistoricalCampaign,
     HistoricalPartnerLinkAccum,
     Link,
+    MemberReportMonth,
+    MemberReportMonthDirty,
     PartnerLinkAccumulated,
     PartnerLinkDailyReport,
 )
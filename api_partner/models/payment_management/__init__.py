@@ -4,3 +4,4 @@ from .min_withdrawal_partner_money import MinWithdrawalPartnerMoney
 from .own_company import OwnCompany
 from .withdrawal_partner_money import WithdrawalPartnerMoney
 from .withdrawal_partner_money_accum import WithdrawalPartnerMoneyAccum
+from .withdrawal_partner_run import WithdrawalPartnerRun
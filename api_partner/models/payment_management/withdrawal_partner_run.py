@@ -0,0 +1,46 @@
+from django.db import models
+
+
+class WithdrawalPartnerRun(models.Model):
+    """
+    Checkpoint of `withdrawal_partner` task for a billed month. Partners
+    are billed on ascending id by batches, every batch is saved on its own
+    transaction with `last_partner_id`, so a failed run continues after
+    the last billed partner with the same fx, company and min withdrawal
+    """
+    billed_to_at = models.DateField(unique=True)
+
+    class Status(models.IntegerChoices):
+        RUNNING = 0
+        SUCCESS = 1
+
+    status = models.SmallIntegerField(default=Status.RUNNING)
+    last_partner_id = models.BigIntegerField(null=True, default=None)
+    partners_count = models.IntegerField(default=0)
+
+    fx_partner = models.ForeignKey(
+        to="api_partner.FxPartner",
+        on_delete=models.CASCADE,
+        related_name="withdrawal_partner_run_to_fx_partner",
+    )
+    own_company = models.ForeignKey(
+        to="api_partner.OwnCompany",
+        on_delete=models.CASCADE,
+        related_name="withdrawal_partner_run_to_own_company",
+    )
+    min_withdrawal = models.ForeignKey(
+        to="api_partner.MinWithdrawalPartnerMoney",
+        on_delete=models.CASCADE,
+        related_name="withdrawal_partner_run_to_min_withdrawal",
+    )
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, default=None)
+
+    class Meta:
+        verbose_name = "Withdrawal partner run"
+        verbose_name_plural = "Withdrawal partner runs"
+
+    def __str__(self):
+        return f"Billed to {self.billed_to_at} - status {self.status} - last partner {self.last_partner_id}"
@@ -8,5 +8,7 @@ from .click_tracking import ClickTracking
 from .historical_campaign import HistoricalCampaign
 from .historical_partner_link_accumulated import HistoricalPartnerLinkAccum
 from .link import Link
+from .member_report_month import MemberReportMonth
+from .member_report_month_dirty import MemberReportMonthDirty
 from .partner_link_accumulated import PartnerLinkAccumulated
 from .partner_link_daily_report import PartnerLinkDailyReport
@@ -67,6 +67,11 @@ class Campaign(models.Model):
 
     has_links = models.BooleanField(default=False)
 
+    # Counters of links not unavailable and assigned, maintained on status
+    # transitions of links and reconciled periodically
+    links_count = models.IntegerField(default=0)
+    links_assigned_count = models.IntegerField(default=0)
+
     api_key = models.CharField(max_length=128, null=True, default=None, unique=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
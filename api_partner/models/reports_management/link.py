@@ -26,5 +26,14 @@ class Link(models.Model):
         verbose_name_plural = "Links"
         unique_together = ("campaign", "prom_code")
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Persisted campaign and status, used by counters of links of
+        # campaign on status transitions (without it on deferred status)
+        if ("status" in instance.__dict__ and "campaign_id" in instance.__dict__):
+            instance._counter_state = (instance.campaign_id, instance.status)
+        return instance
+
     def __str__(self):
         return f"{self.prom_code} - {self.campaign.title}"
@@ -0,0 +1,99 @@
+from django.db import models
+
+
+class MemberReportMonth(models.Model):
+    """
+    Rollup of `BetenlaceDailyReport` with its `PartnerLinkDailyReport` by
+    month, link, partner, adviser and referred. Amounts of bookmaker are
+    converted to USD with the fx of every day. Maintained by ingestion
+    with `refresh_member_report_months`, used by grouped member reports
+    for ranges of complete months.
+
+    Columns averaged on member report have the sum and the count of non
+    zero values (`<column>_sum`, `<column>_count`) so the average of any
+    group of rows is sum(`_sum`) / sum(`_count`)
+    """
+    betenlace_cpa = models.ForeignKey(
+        to="api_partner.BetenlaceCPA",
+        on_delete=models.CASCADE,
+        related_name="member_report_month_to_betenlace_cpa",
+    )
+    partner_link_accumulated = models.ForeignKey(
+        to="api_partner.PartnerLinkAccumulated",
+        on_delete=models.SET_NULL,
+        null=True,
+        default=None,
+        related_name="member_report_month_to_partner_link_accumulated",
+    )
+    adviser_id = models.BigIntegerField(
+        null=True,
+        default=None,
+    )
+    referred_by_id = models.BigIntegerField(
+        null=True,
+        default=None,
+    )
+
+    deposit_usd = models.FloatField(default=0)
+    deposit_partner_usd = models.FloatField(default=0)
+    stake_usd = models.FloatField(default=0)
+    net_revenue_usd = models.FloatField(default=0)
+    revenue_share_usd = models.FloatField(default=0)
+    fixed_income_usd = models.FloatField(default=0)
+    cpa_count = models.IntegerField(default=0)
+    click_count = models.IntegerField(default=0)
+    registered_count = models.IntegerField(default=0)
+    registered_count_partner = models.IntegerField(default=0)
+    first_deposit_count = models.IntegerField(default=0)
+    first_deposit_count_partner = models.IntegerField(default=0)
+    wagering_count = models.IntegerField(default=0)
+    wagering_count_partner = models.IntegerField(default=0)
+    cpa_partner = models.IntegerField(default=0)
+    fixed_income_local = models.FloatField(default=0)
+    fixed_income_adviser_local = models.FloatField(default=0)
+    net_revenue_adviser_local = models.FloatField(default=0)
+    fixed_income_referred_local = models.FloatField(default=0)
+    net_revenue_referred_local = models.FloatField(default=0)
+
+    fixed_income_unitary_usd_sum = models.FloatField(default=0)
+    fixed_income_unitary_usd_count = models.IntegerField(default=0)
+    fixed_income_unitary_local_sum = models.FloatField(default=0)
+    fixed_income_unitary_local_count = models.IntegerField(default=0)
+    percentage_cpa_sum = models.FloatField(default=0)
+    percentage_cpa_count = models.IntegerField(default=0)
+    tracker_sum = models.FloatField(default=0)
+    tracker_count = models.IntegerField(default=0)
+    tracker_deposit_sum = models.FloatField(default=0)
+    tracker_deposit_count = models.IntegerField(default=0)
+    tracker_registered_count_sum = models.FloatField(default=0)
+    tracker_registered_count_count = models.IntegerField(default=0)
+    tracker_first_deposit_count_sum = models.FloatField(default=0)
+    tracker_first_deposit_count_count = models.IntegerField(default=0)
+    tracker_wagering_count_sum = models.FloatField(default=0)
+    tracker_wagering_count_count = models.IntegerField(default=0)
+    fixed_income_adviser_percentage_sum = models.FloatField(default=0)
+    fixed_income_adviser_percentage_count = models.IntegerField(default=0)
+    net_revenue_adviser_percentage_sum = models.FloatField(default=0)
+    net_revenue_adviser_percentage_count = models.IntegerField(default=0)
+    fixed_income_referred_percentage_sum = models.FloatField(default=0)
+    fixed_income_referred_percentage_count = models.IntegerField(default=0)
+    net_revenue_referred_percentage_sum = models.FloatField(default=0)
+    net_revenue_referred_percentage_count = models.IntegerField(default=0)
+
+    created_at = models.DateField()
+    """
+    First day of month
+    """
+
+    class Meta:
+        verbose_name = "Member report month"
+        verbose_name_plural = "Member report months"
+        indexes = (
+            models.Index(
+                fields=("created_at", "betenlace_cpa"),
+                name="memberreportmonth_date_idx",
+            ),
+        )
+
+    def __str__(self):
+        return f"Member report month {self.betenlace_cpa_id} {self.created_at}"
@@ -0,0 +1,34 @@
+from django.db import models
+
+
+class MemberReportMonthDirty(models.Model):
+    """
+    Link and month of `MemberReportMonth` that must be recalculated,
+    written by triggers of DB on every insert, update or delete of
+    `BetenlaceDailyReport` and `PartnerLinkDailyReport` (bulk operations
+    and raw SQL included). Rows are removed by
+    `refresh_dirty_member_report_months` when the rollup is rebuilt.
+
+    While a month of range has dirty links the member report is read from
+    daily reports
+    """
+    betenlace_cpa_id = models.BigIntegerField()
+
+    created_at = models.DateField()
+    """
+    First day of month
+    """
+
+    marked_at = models.DateTimeField()
+    """
+    Time of last mark, a mark made while the month is refreshed keeps the
+    row
+    """
+
+    class Meta:
+        verbose_name = "Member report month dirty"
+        verbose_name_plural = "Member report months dirty"
+        unique_together = ("created_at", "betenlace_cpa_id")
+
+    def __str__(self):
+        return f"Member report month dirty {self.betenlace_cpa_id} {self.created_at}"
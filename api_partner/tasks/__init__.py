@@ -8,6 +8,7 @@ from .account_strendus import account_strendus
 from .account_yajuego import account_yajuego
 from .calculate_clicks import calculate_clicks
 from .click_count import click_count
+from .flush_clicks import flush_clicks
 from .fx_base import fx_base
 from .member_888sport import member_888sport
 from .member_betano import member_betano
@@ -19,9 +20,12 @@ from .member_campeonbet import member_campeonbet
 from .member_galera_bet import member_galera_bet
 from .member_ganabet import member_ganabet
 from .member_pixbet import member_pixbet
+from .member_reports import member_reports
 from .member_rivalo import member_rivalo
 from .member_sportaza import member_sportaza
 from .member_strendus import member_strendus
 from .member_william_hill import member_william_hill
 from .member_yajuego import member_yajuego
+from .reconcile_link_counters import reconcile_link_counters
+from .refresh_member_report_months import refresh_member_report_months
 from .withdrawal_partner import withdrawal_partner
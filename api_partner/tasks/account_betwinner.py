@@ -10,6 +10,7 @@ import pytz
 import requests
 from api_partner.helpers import (
     DB_USER_PARTNER,
+    MemberReportIndex,
     PartnerAccumStatusCHO,
 )
 from api_partner.models import (
@@ -397,6 +398,12 @@ def account_betwinner(campaign_title):
     filters = [Q(link__in=links.values_list("pk", flat=True)), Q(punter_id__in=df.punter_id.unique())]
     account_reports = AccountReport.objects.filter(*filters)
 
+    # Hash index of links and account reports for lookups by row
+    member_report_index = MemberReportIndex(
+        links=links,
+        account_reports=account_reports,
+    )
+
     # Acumulators bulk create and update
     account_reports_update = []
     account_reports_create = []
@@ -438,7 +445,7 @@ def account_betwinner(campaign_title):
             list_logs.append(error_msg)
             return
 
-        link = next(filter(lambda link: link.prom_code == row[keys.get("prom_code")], links), None)
+        link = member_report_index.get_link(prom_code=row[keys.get("prom_code")])
 
         if not link:
             warning_msg = (
@@ -482,12 +489,9 @@ def account_betwinner(campaign_title):
             first_deposit_at = None
 
         # Get current entry of account report based on link and punter_id
-        account_report = next(
-            filter(
-                lambda account_report: account_report.link_id == link.pk and
-                account_report.punter_id == row[keys.get("punter_id")], account_reports
-            ),
-            None
+        account_report = member_report_index.get_account_report(
+            link_id=link.pk,
+            punter_id=row[keys.get("punter_id")],
         )
 
         # Get current partner that have the current link
@@ -1,30 +1,32 @@
 import math
-import random
 import sys
-import time
 import traceback
+from functools import partial
 from io import StringIO
 
 import numpy as np
 import pandas as pd
 import pytz
-import requests
 from api_partner.helpers import (
     DB_USER_PARTNER,
+    AccountReportBulkLoader,
+    MemberReportIndex,
     PartnerAccumStatusCHO,
+    ReportFetchScheduler,
+    get_fx_partner_on,
+    get_with_backoff,
 )
 from api_partner.models import (
-    AccountReport,
     BetenlaceCPA,
     BetenlaceDailyReport,
     Campaign,
-    FxPartner,
     Link,
     PartnerLinkAccumulated,
     PartnerLinkDailyReport,
 )
 from betenlace.celery import app
 from celery.utils.log import get_task_logger
+from core.helpers import FxMatrix
 from core.tasks import chat_logger as chat_logger_task
 from dateutil.relativedelta import relativedelta
 from django.conf import settings
@@ -108,7 +110,6 @@ def account_member_betfair(
             "msg_url": settings.CHAT_WEBHOOK_CELERY,
         },
     )
-    max_retries = 5
 
     # Get id of Campaign Title
     filters = [Q(campaign_title__iexact=campaign_title)]
@@ -196,7 +197,7 @@ def account_member_betfair(
     }
 
     # Punters by activity
-    url = (
+    url_act = (
         "https://betfair.dataexport.netrefer.com/v2/export/reports/affiliate/XML_CustomerReporting_InclSubAff?"
         f"authorization={api_key}&playerID=all&username=all&websiteID=all&productID=all&brandID=all&"
         "customersource=all&customerTypeID=all&rewardplanID=all&countryID=all&FilterBySignUpDate=0&"
@@ -205,30 +206,43 @@ def account_member_betfair(
         f"FilterByActivityDateFrom={yesterday_str}&FilterByActivityDateTo={yesterday_str}"
     )
 
-    try:
-        for i in range(max_retries):
-            response_obj = requests.get(url)
-            if (response_obj.status_code == 200):
-                break
-            else:
-                error_msg = (
-                    f"Response for Punters by activity reach status {response_obj.status_code}, retrying..."
-                )
-                error_msg = f"*LEVEL:* `ERROR` \n*message:* `{error_msg}`\n\n"
-                logger_task.error(error_msg)
-                chat_logger_task.apply_async(
-                    kwargs={
-                        "msg": error_msg,
-                        "msg_url": settings.CHAT_WEBHOOK_CELERY,
-                    },
-                )
-                time.sleep(random.randint(1, 3))
-    except:
-        exc_type, exc_value, exc_traceback = sys.exc_info()
+    # Member report (Daily report) first day - CPA only
+    url_cpa = (
+        "https://betfair.dataexport.netrefer.com/v2/export/reports/affiliate/XML_MS_DailyFigures_InclSubAff?"
+        f"authorization={api_key}&yearmonthdayfrom={date_cpa_str}&yearmonthdayto={date_cpa_str}"
+        "&productID=all&PublishPointID=all"
+    )
+
+    # Member report (Daily report) CURRENT day
+    url_daily = (
+        "https://betfair.dataexport.netrefer.com/v2/export/reports/affiliate/XML_MS_DailyFigures_InclSubAff?"
+        f"authorization={api_key}&yearmonthdayfrom={yesterday_str}&yearmonthdayto={yesterday_str}"
+        "&productID=all&PublishPointID=all"
+    )
+
+    # Download the reports concurrently, the wall time is the max of
+    # latencies, connection errors and status 429/5xx are retried with
+    # exponential backoff
+    report_fetch_scheduler = ReportFetchScheduler()
+    for url in (url_act, url_cpa, url_daily):
+        report_fetch_scheduler.add(
+            fetch=partial(get_with_backoff, url=url),
+            group="betfair",
+            max_concurrency=3,
+        )
+    (
+        (response_act, exception_act),
+        (response_cpa, exception_cpa),
+        (response_daily, exception_daily),
+    ) = report_fetch_scheduler.run()
+
+    url = url_act
+    response_obj = response_act
+    if (exception_act is not None):
         e = traceback.format_exception(
-            etype=exc_type,
-            value=exc_value,
-            tb=exc_traceback,
+            etype=type(exception_act),
+            value=exception_act,
+            tb=exception_act.__traceback__,
         )
         error_msg = (
             "Something is wrong at get data from API for punters actvity filter, check if current "
@@ -343,36 +357,18 @@ def account_member_betfair(
             },
         )
 
-    # Member report (Daily report) first day - CPA only
-    url = (
-        "https://betfair.dataexport.netrefer.com/v2/export/reports/affiliate/XML_MS_DailyFigures_InclSubAff?"
-        f"authorization={api_key}&yearmonthdayfrom={date_cpa_str}&yearmonthdayto={date_cpa_str}"
-        "&productID=all&PublishPointID=all"
-    )
-
-    try:
-        for i in range(max_retries):
-            response_obj = requests.get(url)
-            if (response_obj.status_code == 200):
-                break
-            else:
-                logger_task.error(
-                    f"Response for Daily report CPA only reach status {response_obj.status_code}, retrying..."
-                )
-                time.sleep(random.randint(1, 3))
-    except:
-        exc_type, exc_value, exc_traceback = sys.exc_info()
+    url = url_cpa
+    response_obj = response_cpa
+    if (exception_cpa is not None):
         e = traceback.format_exception(
-            etype=exc_type,
-            value=exc_value,
-            tb=exc_traceback,
+            etype=type(exception_cpa),
+            value=exception_cpa,
+            tb=exception_cpa.__traceback__,
         )
         error_msg = (
             "Something is wrong at get data from API for Daily report CPA only, check the Authorization KEY "
             "and whitelist on server API .\n"
             f"url: {url}\n"
-            f"Response text:\n{response_obj.text}\n"
-            f"Response statis:\n{response_obj.status_code}\n\n"
             f"if problem persist check traceback:\n\n{''.join(e)}"
         )
         error_msg = f"*LEVEL:* `ERROR` \n*message:* `{error_msg}`\n\n"
@@ -493,43 +489,18 @@ def account_member_betfair(
     else:
         df_cpa = pd.DataFrame()
 
-    # Member report (Daily report) CURRENT day
-    url = (
-        "https://betfair.dataexport.netrefer.com/v2/export/reports/affiliate/XML_MS_DailyFigures_InclSubAff?"
-        f"authorization={api_key}&yearmonthdayfrom={yesterday_str}&yearmonthdayto={yesterday_str}"
-        "&productID=all&PublishPointID=all"
-    )
-
-    try:
-        for i in range(max_retries):
-            response_obj = requests.get(url)
-            if (response_obj.status_code == 200):
-                break
-            else:
-                error_msg = (
-                    f"Response for Punters by activity reach status {response_obj.status_code}, retrying..."
-                )
-                logger_task.error(error_msg)
-                chat_logger_task.apply_async(
-                    kwargs={
-                        "msg": error_msg,
-                        "msg_url": settings.CHAT_WEBHOOK_CELERY,
-                    },
-                )
-                time.sleep(random.randint(1, 3))
-    except:
-        exc_type, exc_value, exc_traceback = sys.exc_info()
+    url = url_daily
+    response_obj = response_daily
+    if (exception_daily is not None):
         e = traceback.format_exception(
-            etype=exc_type,
-            value=exc_value,
-            tb=exc_traceback,
+            etype=type(exception_daily),
+            value=exception_daily,
+            tb=exception_daily.__traceback__,
         )
         error_msg = (
             "Something is wrong at get data from API for Signup Date, check the Authorization KEY "
             "and whitelist on server API .\n"
             f"url: {url}\n"
-            f"Response text:\n{response_obj.text}\n"
-            f"Response statis:\n{response_obj.status_code}\n\n"
             f"if problem persist check traceback:\n\n{''.join(e)}"
         )
         logger_task.error(error_msg)
@@ -707,23 +678,10 @@ def account_member_betfair(
     )
     valid_prom_codes = links.values_list("prom_code", flat=True)
 
-    # Get data for Account report
-    # Get account reports from previous links and punter_id, QUERY
-    if (not df_act.empty):
-        punters_id = df_act.punter_id.unique()
-    else:
-        punters_id = []
-    filters = (
-        Q(link__in=links.values_list("pk", flat=True)),
-        Q(punter_id__in=punters_id),
-        Q(link__campaign__pk=campaign.pk),
+    # Hash index of links for lookups by row
+    member_report_index = MemberReportIndex(
+        links=links,
     )
-    account_reports = AccountReport.objects.filter(*filters)
-
-    # Dictionary with current applied sum of cpa's by prom_code
-    cpa_by_prom_code_iter = {}
-    deposit_by_prom_code_sum = {}
-    stake_by_prom_code_sum = {}
 
     # Remove data that now have a valid prom_code for campaign
     if (not df_act.empty):
@@ -743,56 +701,46 @@ def account_member_betfair(
             inplace=True,
         )
 
-    for prom_code_i in valid_prom_codes:
-        cpa_by_prom_code_iter[prom_code_i] = []
-        deposit_by_prom_code_sum[prom_code_i] = 0
-        stake_by_prom_code_sum[prom_code_i] = 0
-
-    # Acumulators bulk create and update
-    account_reports_update = []
-    account_reports_create = []
-
-    # Set keys by index based on colum names of Dataframe
-    keys = {key: index for index, key in enumerate(df_act.columns.values)}
+    # Sum of deposit and stake of punters by prom_code for member report
+    if (not df_act.empty):
+        deposit_by_prom_code_sum = df_act.groupby(by="prom_code").deposit.sum().to_dict()
+        stake_by_prom_code_sum = df_act.groupby(by="prom_code").stake.sum().to_dict()
+    else:
+        deposit_by_prom_code_sum = {}
+        stake_by_prom_code_sum = {}
 
     list_logs = []
-    # Account Report Case
-    for row in zip(*df_act.to_dict('list').values()):
-        """
-        punter_id
-        prom_code
-        registered_at
-        deposit
-        stake
-        net_revenue
-        cpa_at
-        """
-        deposit_by_prom_code_sum[row[keys.get("prom_code")]] += row[keys.get("deposit")]
-        stake_by_prom_code_sum[row[keys.get("prom_code")]] += row[keys.get("stake")]
-
-        if (not update_account):
-            # Force loop when account will not updated
-            continue
-
-        link = next(filter(lambda link: link.prom_code == row[keys.get("prom_code")], links), None)
-
-        if link is None:
-            warning_msg = (
-                f"Link with prom_code \"{row[keys.get('prom_code')]}\" and campaign \"{campaign_title}\" not "
-                "found on database at Account report Case"
-            )
-            warning_msg = f"*LEVEL:* `WARNING` \n*message:* `{warning_msg}`\n\n"
-            logger_task.warning(warning_msg)
-            list_logs.append(warning_msg)
-            continue
+    # Account Report Case, punters with the values of day, the accumulated
+    # values are calculated on DB by the loader
+    if (update_account and not df_act.empty):
+        # Partner of link, punters of inactive links are not assigned to
+        # partner
+        partner_link_accumulated_ids = {}
+        for prom_code, link in member_report_index.links.items():
+            partner_link_accumulated = link.partner_link_accumulated
+            if partner_link_accumulated:
+                # Validate if link has relationship with partner and if has verify if status is equal to status campaign
+                if partner_link_accumulated.status == PartnerAccumStatusCHO.BY_CAMPAIGN:
+                    # Validate if campaign status is equal to INACTIVE and last inactive at is great tha
+                    if(campaign.status == Campaign.Status.INACTIVE) and (yesterday.date() >= campaign.last_inactive_at.date()):
+                        msg = f"link with prom_code {partner_link_accumulated.prom_code} has status campaign inactive"
+                        msg = f"*LEVEL:* `WARNING` \n*message:* `{msg}`\n\n"
+                        logger_task.warning(msg)
+                        list_logs.append(msg)
+                        partner_link_accumulated = None
+                elif (partner_link_accumulated.status == PartnerAccumStatusCHO.INACTIVE):
+                    msg = f"link with prom_code {partner_link_accumulated.prom_code} has custom status inactive"
+                    msg = f"*LEVEL:* `WARNING` \n*message:* `{msg}`\n\n"
+                    logger_task.warning(msg)
+                    list_logs.append(msg)
+                    partner_link_accumulated = None
+            partner_link_accumulated_ids[prom_code] = getattr(partner_link_accumulated, "pk", None)
 
         # Check registration_date null
-        if (not pd.isna(row[keys.get("registered_at")])):
-            registered_at = row[keys.get("registered_at")].date()
-        else:
+        for prom_code in df_act.loc[df_act.registered_at.isna(), "prom_code"].unique():
             warning_msg = (
                 f"registered_at is null on campaign title \"{campaign_title}\" with prom_code "
-                f"\"{row[keys.get('prom_code')]}\""
+                f"\"{prom_code}\""
             )
             warning_msg = f"*LEVEL:* `WARNING` \n*message:* `{warning_msg}`\n\n"
             logger_task.warning(warning_msg)
@@ -802,82 +750,25 @@ def account_member_betfair(
                     "msg_url": settings.CHAT_WEBHOOK_CELERY,
                 },
             )
-            registered_at = None
-
-        # Flag for account/punter have cpa of requests month
-        cpa_account_current_month = 0
-
-        if (not pd.isna(row[keys.get("cpa_at")])):
-            if (
-                row[keys.get("cpa_at")].year == yesterday.date().year and
-                row[keys.get("cpa_at")].month == yesterday.date().month
-            ):
-                # Case current Year, month
-                cpa_at = yesterday.date()
-                cpa_account_current_month = 1
-            else:
-                cpa_at = row[keys.get("cpa_at")].date()
-        else:
-            cpa_at = None
 
-        # Get current entry of account report based on link and punter_id
-        account_report = next(
-            filter(
-                lambda account_report: account_report.link_id == link.pk and
-                account_report.punter_id == row[keys.get("punter_id")], account_reports
-            ),
-            None
+        # Flag for account/punter have cpa of requests month, the cpa_at of
+        # those is the day loaded
+        cpa_account_current_month = (
+            (df_act.cpa_at.dt.year == yesterday.date().year) &
+            (df_act.cpa_at.dt.month == yesterday.date().month)
         )
+        df_act.loc[cpa_account_current_month, "cpa_at"] = pd.Timestamp(yesterday.date())
 
-        # Get current partner that have the current link
-        partner_link_accumulated = link.partner_link_accumulated
-        if partner_link_accumulated:
-            # Validate if link has relationship with partner and if has verify if status is equal to status campaign
-            if partner_link_accumulated.status == PartnerAccumStatusCHO.BY_CAMPAIGN:
-                # Validate if campaign status is equal to INACTIVE and last inactive at is great tha
-                if(campaign.status == Campaign.Status.INACTIVE) and (yesterday.date() >= campaign.last_inactive_at.date()):
-                    msg = f"link with prom_code {partner_link_accumulated.prom_code} has status campaign inactive"
-                    msg = f"*LEVEL:* `WARNING` \n*message:* `{msg}`\n\n"
-                    logger_task.warning(msg)
-                    list_logs.append(msg)
-                    partner_link_accumulated = None
-            elif (partner_link_accumulated.status == PartnerAccumStatusCHO.INACTIVE):
-                msg = f"link with prom_code {partner_link_accumulated.prom_code} has custom status inactive"
-                msg = f"*LEVEL:* `WARNING` \n*message:* `{msg}`\n\n"
-                logger_task.warning(msg)
-                list_logs.append(msg)
-                partner_link_accumulated = None
-
-        if account_report:
-            # Case and exist entry
-            account_report_update = _account_report_update(
-                keys=keys,
-                row=row,
-                account_report=account_report,
-                partner_link_accumulated=partner_link_accumulated,
-                cpa_by_prom_code_iter=cpa_by_prom_code_iter,
-                campaign=campaign,
-                cpa_at=cpa_at,
-                revenue_share_percentage=revenue_share_percentage,
-                cpa_account_current_month=cpa_account_current_month,
-            )
-            account_reports_update.append(account_report_update)
-        else:
-            # Case new entry
-            account_report_new = _account_report_create(
-                row=row,
-                keys=keys,
-                link=link,
-                registered_at=registered_at,
-                partner_link_accumulated=partner_link_accumulated,
-                created_at=yesterday,
-                cpa_by_prom_code_iter=cpa_by_prom_code_iter,
-                campaign=campaign,
-                cpa_at=cpa_at,
-                revenue_share_percentage=revenue_share_percentage,
-                cpa_account_current_month=cpa_account_current_month,
-            )
-            account_reports_create.append(account_report_new)
+        df_act["link_id"] = df_act.prom_code.map(
+            {
+                prom_code: link.pk
+                for prom_code, link in member_report_index.links.items()
+            },
+        )
+        df_act["partner_link_accumulated_id"] = df_act.prom_code.map(partner_link_accumulated_ids)
+        df_act["revenue_share"] = df_act.net_revenue * revenue_share_percentage
+        df_act["cpa_betenlace"] = cpa_account_current_month.astype(int)
+        df_act["first_deposit_at"] = None
 
     # Get data for Member report
     betenlacecpas = links.values_list("betenlacecpa", flat=True)
@@ -893,18 +784,13 @@ def account_member_betfair(
     )
     partner_link_dailies_reports = PartnerLinkDailyReport.objects.filter(*filters)
 
-    # Get the last Fx value
-    filters = (
-        Q(created_at__gte=yesterday),
+    member_report_index.index_daily_reports(
+        betenlace_daily_reports=betenlace_daily_reports,
+        partner_link_dailies_reports=partner_link_dailies_reports,
     )
-    fx_partner = FxPartner.objects.filter(*filters).order_by("created_at").first()
 
-    if(fx_partner is None):
-        # Get just next from supplied date
-        filters = (
-            Q(created_at__lte=yesterday),
-        )
-        fx_partner = FxPartner.objects.filter(*filters).order_by("-created_at").first()
+    # Get the Fx of day, the first created on the day or later else the last before
+    fx_partner = get_fx_partner_on(fx_date=yesterday)
 
     # If still none prevent execution
     if(fx_partner is None):
@@ -965,616 +851,590 @@ def account_member_betfair(
     for row in zip(*df_cpa.to_dict("list").values()):
         cpa_daily[row[keys.get("prom_code")]] = row[keys.get("cpa_count")]
 
-    # Acumulators bulk create and update
-    member_reports_betenlace_month_update = []
-    member_reports_daily_betenlace_update = []
-    member_reports_daily_betenlace_create = []
-
-    member_reports_partner_month_update = []
-    member_reports_daily_partner_update = []
-    member_reports_daily_partner_create = []
-
-    # Set keys by index based on colum names of Dataframe
-    keys = {key: index for index, key in enumerate(df_daily.columns.values)}
-
-    # Member report Case
-    for row in zip(*df_daily.to_dict('list').values()):
-        """
-        "prom_code"
-        "deposit"
-        "stake"
-        "net_revenue"
-        "registered_count"
-        "cpa_count"
-        """
-        # Get link according to prom_code of current loop
-        link = next(filter(lambda link: link.prom_code == row[keys.get("prom_code")], links), None)
-        if not link:
-            warning_msg = (
-                f"Link with prom_code \"{row[keys.get('prom_code')]}\" and campaign \"{campaign_title}\" "
-                "not found on database at Member report Case"
-            )
-            warning_msg = f"*LEVEL:* `WARNING` \n*message:* `{warning_msg}`\n\n"
-            logger_task.warning(warning_msg)
-            chat_logger_task.apply_async(
-                kwargs={
-                    "msg": warning_msg,
-                    "msg_url": settings.CHAT_WEBHOOK_CELERY,
-                },
-            )
-            continue
+    # Stage punters on DB, the punters with cpa of month on report are
+    # counted as cpa of the link on this day
+    account_report_loader = AccountReportBulkLoader(
+        currency_condition=campaign.currency_condition,
+        currency_fixed_income=campaign.currency_fixed_income,
+        created_at=yesterday.date(),
+        fixed_income_unitary=campaign.fixed_income_unitary,
+    )
+    try:
+        # Without update of account nothing is staged
+        account_report_loader.stage(df=df_act if update_account else df_act.head(0))
+        new_cpas = account_report_loader.get_new_cpas()
+
+        # Acumulators bulk create and update
+        member_reports_betenlace_month_update = []
+        member_reports_daily_betenlace_update = []
+        member_reports_daily_betenlace_create = []
+
+        member_reports_partner_month_update = []
+        member_reports_daily_partner_update = []
+        member_reports_daily_partner_create = []
+
+        # Set keys by index based on colum names of Dataframe
+        keys = {key: index for index, key in enumerate(df_daily.columns.values)}
+
+        # Member report Case
+        for row in zip(*df_daily.to_dict('list').values()):
+            """
+            "prom_code"
+            "deposit"
+            "stake"
+            "net_revenue"
+            "registered_count"
+            "cpa_count"
+            """
+            # Get link according to prom_code of current loop
+            link = member_report_index.get_link(prom_code=row[keys.get("prom_code")])
+            if not link:
+                warning_msg = (
+                    f"Link with prom_code \"{row[keys.get('prom_code')]}\" and campaign \"{campaign_title}\" "
+                    "not found on database at Member report Case"
+                )
+                warning_msg = f"*LEVEL:* `WARNING` \n*message:* `{warning_msg}`\n\n"
+                logger_task.warning(warning_msg)
+                chat_logger_task.apply_async(
+                    kwargs={
+                        "msg": warning_msg,
+                        "msg_url": settings.CHAT_WEBHOOK_CELERY,
+                    },
+                )
+                continue
 
-        try:
-            # Get current entry of member report based on link (prom_code)
-            betenlace_cpa = link.betenlacecpa
-        except link._meta.model.betenlacecpa.RelatedObjectDoesNotExist:
-            msg_error = (
-                f"Betenlace CPA entry not found for link with prom_code \"{row[keys.get('prom_code')]}\""
-            )
-            msg_error = f"*LEVEL:* `ERROR` \n*message:* `{msg_error}`\n\n"
-            logger_task.error(msg_error)
-            list_logs.append(msg_error)
-            continue
-
-        # Get data from member from accumulated cpa at month
-        cpa_count = cpa_daily.pop(row[keys.get("prom_code")], 0)
-
-        # Get data for member from punters
-        deposit = deposit_by_prom_code_sum.get(row[keys.get("prom_code")])
-        stake = stake_by_prom_code_sum.get(row[keys.get("prom_code")])
-
-        # Betenlace Month
-        betenlace_cpa = _betenlace_month_update(
-            keys=keys,
-            row=row,
-            betenlace_cpa=betenlace_cpa,
-            deposit=deposit,
-            stake=stake,
-            cpa_count=cpa_count,
-            campaign=campaign,
-            revenue_share_percentage=revenue_share_percentage,
-        )
-        member_reports_betenlace_month_update.append(betenlace_cpa)
-
-        # Betenlace Daily
-        betenlace_daily = next(
-            filter(
-                lambda betenlace_daily: (
-                    betenlace_daily.betenlace_cpa_id == betenlace_cpa.pk and
-                    betenlace_daily.created_at == yesterday.date()
-                ), betenlace_daily_reports
-            ), None
-        )
-
-        if(betenlace_daily):
-            betenlace_daily = _betenlace_daily_update(
+            try:
+                # Get current entry of member report based on link (prom_code)
+                betenlace_cpa = link.betenlacecpa
+            except link._meta.model.betenlacecpa.RelatedObjectDoesNotExist:
+                msg_error = (
+                    f"Betenlace CPA entry not found for link with prom_code \"{row[keys.get('prom_code')]}\""
+                )
+                msg_error = f"*LEVEL:* `ERROR` \n*message:* `{msg_error}`\n\n"
+                logger_task.error(msg_error)
+                list_logs.append(msg_error)
+                continue
+
+            # Get data from member from accumulated cpa at month
+            cpa_count = cpa_daily.pop(row[keys.get("prom_code")], 0)
+
+            # Get data for member from punters
+            deposit = deposit_by_prom_code_sum.get(row[keys.get("prom_code")], 0)
+            stake = stake_by_prom_code_sum.get(row[keys.get("prom_code")], 0)
+
+            # Betenlace Month
+            betenlace_cpa = _betenlace_month_update(
                 keys=keys,
                 row=row,
-                betenlace_daily=betenlace_daily,
+                betenlace_cpa=betenlace_cpa,
                 deposit=deposit,
                 stake=stake,
                 cpa_count=cpa_count,
                 campaign=campaign,
-                fx_partner=fx_partner,
                 revenue_share_percentage=revenue_share_percentage,
             )
-            member_reports_daily_betenlace_update.append(betenlace_daily)
-        else:
-            betenlace_daily = _betenlace_daily_create(
-                from_date=yesterday.date(),
-                keys=keys,
-                row=row,
-                betenlace_cpa=betenlace_cpa,
-                deposit=deposit,
-                stake=stake,
-                cpa_count=cpa_count if update_cpa else 0,
-                campaign=campaign,
-                fx_partner=fx_partner,
-                revenue_share_percentage=revenue_share_percentage,
+            member_reports_betenlace_month_update.append(betenlace_cpa)
+
+            # Betenlace Daily
+            betenlace_daily = member_report_index.get_betenlace_daily(
+                betenlace_cpa_id=betenlace_cpa.pk,
+                created_at=yesterday.date(),
             )
-            member_reports_daily_betenlace_create.append(betenlace_daily)
 
-        # Partner Month
-        partner_link_accumulated = link.partner_link_accumulated
+            if(betenlace_daily):
+                betenlace_daily = _betenlace_daily_update(
+                    keys=keys,
+                    row=row,
+                    betenlace_daily=betenlace_daily,
+                    deposit=deposit,
+                    stake=stake,
+                    cpa_count=cpa_count,
+                    campaign=campaign,
+                    fx_partner=fx_partner,
+                    revenue_share_percentage=revenue_share_percentage,
+                )
+                member_reports_daily_betenlace_update.append(betenlace_daily)
+            else:
+                betenlace_daily = _betenlace_daily_create(
+                    from_date=yesterday.date(),
+                    keys=keys,
+                    row=row,
+                    betenlace_cpa=betenlace_cpa,
+                    deposit=deposit,
+                    stake=stake,
+                    cpa_count=cpa_count if update_cpa else 0,
+                    campaign=campaign,
+                    fx_partner=fx_partner,
+                    revenue_share_percentage=revenue_share_percentage,
+                )
+                member_reports_daily_betenlace_create.append(betenlace_daily)
+
+            # Partner Month
+            partner_link_accumulated = link.partner_link_accumulated
 
-        # When partner have not assigned the link must be continue to next loop
-        if(partner_link_accumulated is None):
-            continue
+            # When partner have not assigned the link must be continue to next loop
+            if(partner_link_accumulated is None):
+                continue
 
-        # Validate if link has relationship with partner and if has verify if status is equal to status campaign
-        if partner_link_accumulated.status == PartnerAccumStatusCHO.BY_CAMPAIGN:
-            # Validate if campaign status is equal to INACTIVE and last inactive at is great tha
-            if(campaign.status == Campaign.Status.INACTIVE) and (yesterday.date() >= campaign.last_inactive_at.date()):
-                msg = f"link with prom_code {partner_link_accumulated.prom_code} has status campaign inactive"
+            # Validate if link has relationship with partner and if has verify if status is equal to status campaign
+            if partner_link_accumulated.status == PartnerAccumStatusCHO.BY_CAMPAIGN:
+                # Validate if campaign status is equal to INACTIVE and last inactive at is great tha
+                if(campaign.status == Campaign.Status.INACTIVE) and (yesterday.date() >= campaign.last_inactive_at.date()):
+                    msg = f"link with prom_code {partner_link_accumulated.prom_code} has status campaign inactive"
+                    msg = f"*LEVEL:* `WARNING` \n*message:* `{msg}`\n\n"
+                    logger_task.warning(msg)
+                    list_logs.append(msg)
+                    continue
+            elif (partner_link_accumulated.status == PartnerAccumStatusCHO.INACTIVE):
+                msg = f"link with prom_code {partner_link_accumulated.prom_code} has custom status inactive"
                 msg = f"*LEVEL:* `WARNING` \n*message:* `{msg}`\n\n"
                 logger_task.warning(msg)
                 list_logs.append(msg)
                 continue
-        elif (partner_link_accumulated.status == PartnerAccumStatusCHO.INACTIVE):
-            msg = f"link with prom_code {partner_link_accumulated.prom_code} has custom status inactive"
-            msg = f"*LEVEL:* `WARNING` \n*message:* `{msg}`\n\n"
-            logger_task.warning(msg)
-            list_logs.append(msg)
-            continue
-
-        # Tracker
-        if(cpa_count > settings.MIN_CPA_TRACKER_DAY):
-            cpa_count_partner = math.floor(cpa_count*partner_link_accumulated.tracker)
-        else:
-            cpa_count_partner = cpa_count
-
-        # verify if cpa_count had a change from tracker calculation
-        if (update_account and cpa_count > cpa_count_partner):
-            # Reduce -1 additional for enum behavior
-            diff_count = (cpa_count - cpa_count_partner) - 1
-
-            for enum, account_instance_i in enumerate(
-                    reversed(cpa_by_prom_code_iter.get(row[keys.get("prom_code")]))):
-                # Remove cpa partner
-                account_instance_i.cpa_partner = 0
-                if (enum >= diff_count):
-                    break
-
-        tracked_data = _get_tracker_values(
-            keys=keys,
-            row=row,
-            deposit=deposit,
-            partner_link_accumulated=partner_link_accumulated,
-        )
-
-        # Fx Currency Fixed income
-        partner_currency_str = partner_link_accumulated.currency_local.lower()
-        fx_fixed_income_partner = _calc_fx(
-            fx_partner=fx_partner,
-            fx_partner_percentage=fx_partner_percentage,
-            currency_from_str=currency_fixed_income_str,
-            partner_currency_str=partner_currency_str,
-        )
-
-        fixed_income_partner_unitary = campaign.fixed_income_unitary * partner_link_accumulated.percentage_cpa
-        fixed_income_partner = cpa_count_partner * fixed_income_partner_unitary
-        fixed_income_partner_unitary_local = (
-            campaign.fixed_income_unitary * partner_link_accumulated.percentage_cpa * fx_fixed_income_partner)
-        fixed_income_partner_local = cpa_count_partner * fixed_income_partner_unitary_local
-
-        # Fx Currency Condition
-        fx_condition_partner = _calc_fx(
-            fx_partner=fx_partner,
-            fx_partner_percentage=fx_partner_percentage,
-            currency_from_str=currency_condition_str,
-            partner_currency_str=partner_currency_str,
-        )
-
-        partner_link_accumulated = _partner_link_month_update(
-            partner_link_accumulated=partner_link_accumulated,
-            cpa_count=cpa_count_partner,
-            fixed_income_partner=fixed_income_partner,
-            fixed_income_partner_local=fixed_income_partner_local,
-        )
-        member_reports_partner_month_update.append(partner_link_accumulated)
-
-        # Partner Daily
-        partner_link_daily = next(
-            filter(
-                lambda partner_link_daily: partner_link_daily.betenlace_daily_report_id ==
-                betenlace_daily.id, partner_link_dailies_reports),
-            None)
-
-        if(partner_link_daily):
-            # Recalculate fixed_incomes for update
-            # fixed_income_partner_unitary = betenlace_daily.fixed_income_unitary * partner_link_daily.percentage_cpa
-            # fixed_income_partner = cpa_count_partner * fixed_income_partner_unitary
-            # fixed_income_partner_unitary_local = (
-            #     betenlace_daily.fixed_income_unitary * partner_link_daily.percentage_cpa * fx_book_partner)
-            # fixed_income_partner_local = cpa_count_partner * fixed_income_partner_unitary_local
-            partner_link_daily = _partner_link_daily_update(
-                cpa_count=cpa_count_partner,
-                tracked_data=tracked_data,
-                fx_fixed_income_partner=fx_fixed_income_partner,
-                fx_condition_partner=fx_condition_partner,
-                fx_partner_percentage=fx_partner_percentage,
-                fixed_income_partner_unitary=fixed_income_partner_unitary,
-                fixed_income_partner=fixed_income_partner,
-                fixed_income_partner_unitary_local=fixed_income_partner_unitary_local,
-                fixed_income_partner_local=fixed_income_partner_local,
-                partner_link_daily=partner_link_daily,
+
+            # Tracker
+            if(cpa_count > settings.MIN_CPA_TRACKER_DAY):
+                cpa_count_partner = math.floor(cpa_count*partner_link_accumulated.tracker)
+            else:
+                cpa_count_partner = cpa_count
+
+            # verify if cpa_count had a change from tracker calculation
+            if (update_account and cpa_count > cpa_count_partner):
+                # Remove cpa partner of last punters
+                new_cpas_link = new_cpas.get(link.pk, [])
+                account_report_loader.remove_cpa_partner(
+                    link_id=link.pk,
+                    punter_ids=new_cpas_link[max(len(new_cpas_link) - (cpa_count - cpa_count_partner), 0):],
+                )
+
+            tracked_data = _get_tracker_values(
+                keys=keys,
+                row=row,
+                deposit=deposit,
                 partner_link_accumulated=partner_link_accumulated,
-                partner=partner_link_accumulated.partner,
-                betenlace_daily=betenlace_daily,
             )
-            member_reports_daily_partner_update.append(partner_link_daily)
-        else:
-            partner_link_daily = _partner_link_daily_create(
-                from_date=yesterday,
-                campaign=campaign,
-                betenlace_daily=betenlace_daily,
-                partner_link_accumulated=partner_link_accumulated,
-                cpa_count=cpa_count_partner if update_cpa else 0,
-                tracked_data=tracked_data,
-                fx_fixed_income_partner=fx_fixed_income_partner,
-                fx_condition_partner=fx_condition_partner,
+
+            # Fx Currency Fixed income
+            partner_currency_str = partner_link_accumulated.currency_local.lower()
+            fx_fixed_income_partner = _calc_fx(
+                fx_partner=fx_partner,
                 fx_partner_percentage=fx_partner_percentage,
-                fixed_income_partner_unitary=fixed_income_partner_unitary,
-                fixed_income_partner=fixed_income_partner,
-                fixed_income_partner_unitary_local=fixed_income_partner_unitary_local,
-                fixed_income_partner_local=fixed_income_partner_local,
-                partner=partner_link_accumulated.partner,
+                currency_from_str=currency_fixed_income_str,
+                partner_currency_str=partner_currency_str,
             )
-            member_reports_daily_partner_create.append(partner_link_daily)
-
-    # Member report Case CPA only
-    for prom_code in cpa_daily.keys():
-        """
-        "prom_code"
-        "deposit"
-        "stake"
-        "net_revenue"
-        "registered_count"
-        "cpa_count"
-        """
-        # Get link according to prom_code of current loop
-        link = next(filter(lambda link: link.prom_code == prom_code, links), None)
-        if not link:
-            warning_msg = (
-                f"Link with prom_code \"{prom_code}\" and campaign \"{campaign_title}\" "
-                "not found on database at Member report Case"
+
+            fixed_income_partner_unitary = campaign.fixed_income_unitary * partner_link_accumulated.percentage_cpa
+            fixed_income_partner = cpa_count_partner * fixed_income_partner_unitary
+            fixed_income_partner_unitary_local = (
+                campaign.fixed_income_unitary * partner_link_accumulated.percentage_cpa * fx_fixed_income_partner)
+            fixed_income_partner_local = cpa_count_partner * fixed_income_partner_unitary_local
+
+            # Fx Currency Condition
+            fx_condition_partner = _calc_fx(
+                fx_partner=fx_partner,
+                fx_partner_percentage=fx_partner_percentage,
+                currency_from_str=currency_condition_str,
+                partner_currency_str=partner_currency_str,
             )
-            warning_msg = f"*LEVEL:* `WARNING` \n*message:* `{warning_msg}`\n\n"
-            logger_task.warning(warning_msg)
-            list_logs.append(warning_msg)
-            continue
 
-        try:
-            # Get current entry of member report based on link (prom_code)
-            betenlace_cpa = link.betenlacecpa
-        except link._meta.model.betenlacecpa.RelatedObjectDoesNotExist:
-            msg_error = (
-                f"Betenlace CPA entry not found for link with prom_code \"{row[keys.get('prom_code')]}\""
+            partner_link_accumulated = _partner_link_month_update(
+                partner_link_accumulated=partner_link_accumulated,
+                cpa_count=cpa_count_partner,
+                fixed_income_partner=fixed_income_partner,
+                fixed_income_partner_local=fixed_income_partner_local,
             )
-            msg_error = f"*LEVEL:* `ERROR` \n*message:* `{msg_error}`\n\n"
-            logger_task.error(msg_error)
-            list_logs.append(msg_error)
-            continue
-
-        # Get data from member from accumulated cpa at month
-        cpa_count = cpa_daily.get(prom_code, 0)
-
-        # Prevent data with only 0
-        if (cpa_count == 0):
-            continue
-
-        # Betenlace Month
-        betenlace_cpa = _betenlace_month_update_cpa(
-            betenlace_cpa=betenlace_cpa,
-            cpa_count=cpa_count,
-            campaign=campaign,
-        )
-        member_reports_betenlace_month_update.append(betenlace_cpa)
-
-        # Betenlace Daily
-        betenlace_daily = next(
-            filter(
-                lambda betenlace_daily: (
-                    betenlace_daily.betenlace_cpa_id == betenlace_cpa.pk and
-                    betenlace_daily.created_at == yesterday.date()
-                ), betenlace_daily_reports
-            ), None
-        )
-
-        if(betenlace_daily):
-            betenlace_daily = _betenlace_daily_update_cpa(
-                betenlace_daily=betenlace_daily,
+            member_reports_partner_month_update.append(partner_link_accumulated)
+
+            # Partner Daily
+            partner_link_daily = member_report_index.get_partner_link_daily(betenlace_daily_report_id=betenlace_daily.id)
+
+            if(partner_link_daily):
+                # Recalculate fixed_incomes for update
+                # fixed_income_partner_unitary = betenlace_daily.fixed_income_unitary * partner_link_daily.percentage_cpa
+                # fixed_income_partner = cpa_count_partner * fixed_income_partner_unitary
+                # fixed_income_partner_unitary_local = (
+                #     betenlace_daily.fixed_income_unitary * partner_link_daily.percentage_cpa * fx_book_partner)
+                # fixed_income_partner_local = cpa_count_partner * fixed_income_partner_unitary_local
+                partner_link_daily = _partner_link_daily_update(
+                    cpa_count=cpa_count_partner,
+                    tracked_data=tracked_data,
+                    fx_fixed_income_partner=fx_fixed_income_partner,
+                    fx_condition_partner=fx_condition_partner,
+                    fx_partner_percentage=fx_partner_percentage,
+                    fixed_income_partner_unitary=fixed_income_partner_unitary,
+                    fixed_income_partner=fixed_income_partner,
+                    fixed_income_partner_unitary_local=fixed_income_partner_unitary_local,
+                    fixed_income_partner_local=fixed_income_partner_local,
+                    partner_link_daily=partner_link_daily,
+                    partner_link_accumulated=partner_link_accumulated,
+                    partner=partner_link_accumulated.partner,
+                    betenlace_daily=betenlace_daily,
+                )
+                member_reports_daily_partner_update.append(partner_link_daily)
+            else:
+                partner_link_daily = _partner_link_daily_create(
+                    from_date=yesterday,
+                    campaign=campaign,
+                    betenlace_daily=betenlace_daily,
+                    partner_link_accumulated=partner_link_accumulated,
+                    cpa_count=cpa_count_partner if update_cpa else 0,
+                    tracked_data=tracked_data,
+                    fx_fixed_income_partner=fx_fixed_income_partner,
+                    fx_condition_partner=fx_condition_partner,
+                    fx_partner_percentage=fx_partner_percentage,
+                    fixed_income_partner_unitary=fixed_income_partner_unitary,
+                    fixed_income_partner=fixed_income_partner,
+                    fixed_income_partner_unitary_local=fixed_income_partner_unitary_local,
+                    fixed_income_partner_local=fixed_income_partner_local,
+                    partner=partner_link_accumulated.partner,
+                )
+                member_reports_daily_partner_create.append(partner_link_daily)
+
+        # Member report Case CPA only
+        for prom_code in cpa_daily.keys():
+            """
+            "prom_code"
+            "deposit"
+            "stake"
+            "net_revenue"
+            "registered_count"
+            "cpa_count"
+            """
+            # Get link according to prom_code of current loop
+            link = member_report_index.get_link(prom_code=prom_code)
+            if not link:
+                warning_msg = (
+                    f"Link with prom_code \"{prom_code}\" and campaign \"{campaign_title}\" "
+                    "not found on database at Member report Case"
+                )
+                warning_msg = f"*LEVEL:* `WARNING` \n*message:* `{warning_msg}`\n\n"
+                logger_task.warning(warning_msg)
+                list_logs.append(warning_msg)
+                continue
+
+            try:
+                # Get current entry of member report based on link (prom_code)
+                betenlace_cpa = link.betenlacecpa
+            except link._meta.model.betenlacecpa.RelatedObjectDoesNotExist:
+                msg_error = (
+                    f"Betenlace CPA entry not found for link with prom_code \"{row[keys.get('prom_code')]}\""
+                )
+                msg_error = f"*LEVEL:* `ERROR` \n*message:* `{msg_error}`\n\n"
+                logger_task.error(msg_error)
+                list_logs.append(msg_error)
+                continue
+
+            # Get data from member from accumulated cpa at month
+            cpa_count = cpa_daily.get(prom_code, 0)
+
+            # Prevent data with only 0
+            if (cpa_count == 0):
+                continue
+
+            # Betenlace Month
+            betenlace_cpa = _betenlace_month_update_cpa(
+                betenlace_cpa=betenlace_cpa,
                 cpa_count=cpa_count,
                 campaign=campaign,
-                fx_partner=fx_partner,
             )
-            member_reports_daily_betenlace_update.append(betenlace_daily)
-        else:
-            betenlace_daily = _betenlace_daily_create_cpa(
-                from_date=yesterday.date(),
-                betenlace_cpa=betenlace_cpa,
-                cpa_count=cpa_count if update_cpa else 0,
-                campaign=campaign,
-                fx_partner=fx_partner,
+            member_reports_betenlace_month_update.append(betenlace_cpa)
+
+            # Betenlace Daily
+            betenlace_daily = member_report_index.get_betenlace_daily(
+                betenlace_cpa_id=betenlace_cpa.pk,
+                created_at=yesterday.date(),
             )
-            member_reports_daily_betenlace_create.append(betenlace_daily)
 
-        # Partner Month
-        partner_link_accumulated = link.partner_link_accumulated
+            if(betenlace_daily):
+                betenlace_daily = _betenlace_daily_update_cpa(
+                    betenlace_daily=betenlace_daily,
+                    cpa_count=cpa_count,
+                    campaign=campaign,
+                    fx_partner=fx_partner,
+                )
+                member_reports_daily_betenlace_update.append(betenlace_daily)
+            else:
+                betenlace_daily = _betenlace_daily_create_cpa(
+                    from_date=yesterday.date(),
+                    betenlace_cpa=betenlace_cpa,
+                    cpa_count=cpa_count if update_cpa else 0,
+                    campaign=campaign,
+                    fx_partner=fx_partner,
+                )
+                member_reports_daily_betenlace_create.append(betenlace_daily)
+
+            # Partner Month
+            partner_link_accumulated = link.partner_link_accumulated
 
-        # When partner have not assigned the link must be continue to next loop
-        if(partner_link_accumulated is None):
-            continue
+            # When partner have not assigned the link must be continue to next loop
+            if(partner_link_accumulated is None):
+                continue
 
-        # Validate if link has relationship with partner and if has verify if status is equal to status campaign
-        if partner_link_accumulated.status == PartnerAccumStatusCHO.BY_CAMPAIGN:
-            # Validate if campaign status is equal to INACTIVE and last inactive at is great tha
-            if(campaign.status == Campaign.Status.INACTIVE) and (yesterday.date() >= campaign.last_inactive_at.date()):
-                msg = f"link with prom_code {partner_link_accumulated.prom_code} has status campaign inactive"
+            # Validate if link has relationship with partner and if has verify if status is equal to status campaign
+            if partner_link_accumulated.status == PartnerAccumStatusCHO.BY_CAMPAIGN:
+                # Validate if campaign status is equal to INACTIVE and last inactive at is great tha
+                if(campaign.status == Campaign.Status.INACTIVE) and (yesterday.date() >= campaign.last_inactive_at.date()):
+                    msg = f"link with prom_code {partner_link_accumulated.prom_code} has status campaign inactive"
+                    msg = f"*LEVEL:* `WARNING` \n*message:* `{msg}`\n\n"
+                    logger_task.warning(msg)
+                    list_logs.append(msg)
+                    continue
+            elif (partner_link_accumulated.status == PartnerAccumStatusCHO.INACTIVE):
+                msg = f"link with prom_code {partner_link_accumulated.prom_code} has custom status inactive"
                 msg = f"*LEVEL:* `WARNING` \n*message:* `{msg}`\n\n"
                 logger_task.warning(msg)
                 list_logs.append(msg)
                 continue
-        elif (partner_link_accumulated.status == PartnerAccumStatusCHO.INACTIVE):
-            msg = f"link with prom_code {partner_link_accumulated.prom_code} has custom status inactive"
-            msg = f"*LEVEL:* `WARNING` \n*message:* `{msg}`\n\n"
-            logger_task.warning(msg)
-            list_logs.append(msg)
-            continue
-
-        # Tracker
-        if(cpa_count > settings.MIN_CPA_TRACKER_DAY):
-            cpa_count_partner = math.floor(cpa_count*partner_link_accumulated.tracker)
-        else:
-            cpa_count_partner = cpa_count
-
-        # verify if cpa_count had a change from tracker calculation
-        if (update_account and cpa_count > cpa_count_partner):
-            # Reduce -1 additional for enum behavior
-            diff_count = (cpa_count - cpa_count_partner) - 1
-
-            for enum, account_instance_i in enumerate(
-                    reversed(cpa_by_prom_code_iter.get(row[keys.get("prom_code")]))):
-                # Remove cpa partner
-                account_instance_i.cpa_partner = 0
-                if (enum >= diff_count):
-                    break
-
-        # Fx Currency Fixed income
-        partner_currency_str = partner_link_accumulated.currency_local.lower()
-        fx_fixed_income_partner = _calc_fx(
-            fx_partner=fx_partner,
-            fx_partner_percentage=fx_partner_percentage,
-            currency_from_str=currency_fixed_income_str,
-            partner_currency_str=partner_currency_str,
-        )
-
-        fixed_income_partner_unitary = campaign.fixed_income_unitary * partner_link_accumulated.percentage_cpa
-        fixed_income_partner = cpa_count_partner * fixed_income_partner_unitary
-        fixed_income_partner_unitary_local = (
-            campaign.fixed_income_unitary * partner_link_accumulated.percentage_cpa * fx_fixed_income_partner)
-        fixed_income_partner_local = cpa_count_partner * fixed_income_partner_unitary_local
-
-        # Fx Currency Condition
-        fx_condition_partner = _calc_fx(
-            fx_partner=fx_partner,
-            fx_partner_percentage=fx_partner_percentage,
-            currency_from_str=currency_condition_str,
-            partner_currency_str=partner_currency_str,
-        )
-
-        partner_link_accumulated = _partner_link_month_update(
-            partner_link_accumulated=partner_link_accumulated,
-            cpa_count=cpa_count_partner,
-            fixed_income_partner=fixed_income_partner,
-            fixed_income_partner_local=fixed_income_partner_local,
-        )
-        member_reports_partner_month_update.append(partner_link_accumulated)
-
-        # Partner Daily
-        partner_link_daily = next(
-            filter(
-                lambda partner_link_daily: partner_link_daily.betenlace_daily_report_id ==
-                betenlace_daily.id, partner_link_dailies_reports),
-            None)
-
-        if(partner_link_daily):
-            # Recalculate fixed_incomes for update
-            # fixed_income_partner_unitary = betenlace_daily.fixed_income_unitary * partner_link_daily.percentage_cpa
-            # fixed_income_partner = cpa_count_partner * fixed_income_partner_unitary
-            # fixed_income_partner_unitary_local = (
-            #     betenlace_daily.fixed_income_unitary * partner_link_daily.percentage_cpa * fx_book_partner)
-            # fixed_income_partner_local = cpa_count_partner * fixed_income_partner_unitary_local
-            partner_link_daily = _partner_link_daily_update_cpa(
-                cpa_count=cpa_count_partner,
-                fx_fixed_income_partner=fx_fixed_income_partner,
-                fx_condition_partner=fx_condition_partner,
+
+            # Tracker
+            if(cpa_count > settings.MIN_CPA_TRACKER_DAY):
+                cpa_count_partner = math.floor(cpa_count*partner_link_accumulated.tracker)
+            else:
+                cpa_count_partner = cpa_count
+
+            # verify if cpa_count had a change from tracker calculation
+            if (update_account and cpa_count > cpa_count_partner):
+                # Remove cpa partner of last punters
+                new_cpas_link = new_cpas.get(link.pk, [])
+                account_report_loader.remove_cpa_partner(
+                    link_id=link.pk,
+                    punter_ids=new_cpas_link[max(len(new_cpas_link) - (cpa_count - cpa_count_partner), 0):],
+                )
+
+            # Fx Currency Fixed income
+            partner_currency_str = partner_link_accumulated.currency_local.lower()
+            fx_fixed_income_partner = _calc_fx(
+                fx_partner=fx_partner,
                 fx_partner_percentage=fx_partner_percentage,
-                fixed_income_partner_unitary=fixed_income_partner_unitary,
-                fixed_income_partner=fixed_income_partner,
-                fixed_income_partner_unitary_local=fixed_income_partner_unitary_local,
-                fixed_income_partner_local=fixed_income_partner_local,
-                partner_link_daily=partner_link_daily,
-                partner_link_accumulated=partner_link_accumulated,
-                partner=partner_link_accumulated.partner,
+                currency_from_str=currency_fixed_income_str,
+                partner_currency_str=partner_currency_str,
             )
-            member_reports_daily_partner_update.append(partner_link_daily)
-        else:
-            partner_link_daily = _partner_link_daily_create_cpa(
-                from_date=yesterday,
-                campaign=campaign,
-                betenlace_daily=betenlace_daily,
-                partner_link_accumulated=partner_link_accumulated,
-                cpa_count=cpa_count_partner if update_cpa else 0,
-                fx_fixed_income_partner=fx_fixed_income_partner,
-                fx_condition_partner=fx_condition_partner,
+
+            fixed_income_partner_unitary = campaign.fixed_income_unitary * partner_link_accumulated.percentage_cpa
+            fixed_income_partner = cpa_count_partner * fixed_income_partner_unitary
+            fixed_income_partner_unitary_local = (
+                campaign.fixed_income_unitary * partner_link_accumulated.percentage_cpa * fx_fixed_income_partner)
+            fixed_income_partner_local = cpa_count_partner * fixed_income_partner_unitary_local
+
+            # Fx Currency Condition
+            fx_condition_partner = _calc_fx(
+                fx_partner=fx_partner,
                 fx_partner_percentage=fx_partner_percentage,
-                fixed_income_partner_unitary=fixed_income_partner_unitary,
+                currency_from_str=currency_condition_str,
+                partner_currency_str=partner_currency_str,
+            )
+
+            partner_link_accumulated = _partner_link_month_update(
+                partner_link_accumulated=partner_link_accumulated,
+                cpa_count=cpa_count_partner,
                 fixed_income_partner=fixed_income_partner,
-                fixed_income_partner_unitary_local=fixed_income_partner_unitary_local,
                 fixed_income_partner_local=fixed_income_partner_local,
-                partner=partner_link_accumulated.partner,
             )
-            member_reports_daily_partner_create.append(partner_link_daily)
-
-    join_list = "".join(list_logs)
-    chat_logger_task.apply_async(
-        kwargs={
-            "msg": join_list,
-            "msg_url": settings.CHAT_WEBHOOK_CELERY,
-        },
-    )
-
-    with transaction.atomic(using=DB_USER_PARTNER):
-        if (update_account):
-            if(account_reports_create):
-                AccountReport.objects.bulk_create(
-                    objs=account_reports_create,
+            member_reports_partner_month_update.append(partner_link_accumulated)
+
+            # Partner Daily
+            partner_link_daily = member_report_index.get_partner_link_daily(betenlace_daily_report_id=betenlace_daily.id)
+
+            if(partner_link_daily):
+                # Recalculate fixed_incomes for update
+                # fixed_income_partner_unitary = betenlace_daily.fixed_income_unitary * partner_link_daily.percentage_cpa
+                # fixed_income_partner = cpa_count_partner * fixed_income_partner_unitary
+                # fixed_income_partner_unitary_local = (
+                #     betenlace_daily.fixed_income_unitary * partner_link_daily.percentage_cpa * fx_book_partner)
+                # fixed_income_partner_local = cpa_count_partner * fixed_income_partner_unitary_local
+                partner_link_daily = _partner_link_daily_update_cpa(
+                    cpa_count=cpa_count_partner,
+                    fx_fixed_income_partner=fx_fixed_income_partner,
+                    fx_condition_partner=fx_condition_partner,
+                    fx_partner_percentage=fx_partner_percentage,
+                    fixed_income_partner_unitary=fixed_income_partner_unitary,
+                    fixed_income_partner=fixed_income_partner,
+                    fixed_income_partner_unitary_local=fixed_income_partner_unitary_local,
+                    fixed_income_partner_local=fixed_income_partner_local,
+                    partner_link_daily=partner_link_daily,
+                    partner_link_accumulated=partner_link_accumulated,
+                    partner=partner_link_accumulated.partner,
                 )
-            if(account_reports_update):
-                AccountReport.objects.bulk_update(
-                    objs=account_reports_update,
-                    fields=(
-                        "deposit",
-                        "net_revenue",
-                        "stake",
-                        "fixed_income",
-                        "net_revenue",
-                        "revenue_share",
-                        "cpa_betenlace",
-                        "cpa_partner",
-                        "registered_at",
-                        "cpa_at",
-                    ),
+                member_reports_daily_partner_update.append(partner_link_daily)
+            else:
+                partner_link_daily = _partner_link_daily_create_cpa(
+                    from_date=yesterday,
+                    campaign=campaign,
+                    betenlace_daily=betenlace_daily,
+                    partner_link_accumulated=partner_link_accumulated,
+                    cpa_count=cpa_count_partner if update_cpa else 0,
+                    fx_fixed_income_partner=fx_fixed_income_partner,
+                    fx_condition_partner=fx_condition_partner,
+                    fx_partner_percentage=fx_partner_percentage,
+                    fixed_income_partner_unitary=fixed_income_partner_unitary,
+                    fixed_income_partner=fixed_income_partner,
+                    fixed_income_partner_unitary_local=fixed_income_partner_unitary_local,
+                    fixed_income_partner_local=fixed_income_partner_local,
+                    partner=partner_link_accumulated.partner,
                 )
-        if(member_reports_betenlace_month_update):
-            BetenlaceCPA.objects.bulk_update(
-                objs=member_reports_betenlace_month_update,
-                fields=(
-                    "deposit",
-                    "stake",
-                    "fixed_income",
-                    "net_revenue",
-                    "revenue_share",
-                    "registered_count",
-                    "cpa_count",
-                ),
-            )
+                member_reports_daily_partner_create.append(partner_link_daily)
+
+        join_list = "".join(list_logs)
+        chat_logger_task.apply_async(
+            kwargs={
+                "msg": join_list,
+                "msg_url": settings.CHAT_WEBHOOK_CELERY,
+            },
+        )
 
-        if(member_reports_daily_betenlace_update):
-            if (update_cpa):
-                BetenlaceDailyReport.objects.bulk_update(
-                    objs=member_reports_daily_betenlace_update,
+        with transaction.atomic(using=DB_USER_PARTNER):
+            if (update_account):
+                account_report_loader.load()
+            if(member_reports_betenlace_month_update):
+                BetenlaceCPA.objects.bulk_update(
+                    objs=member_reports_betenlace_month_update,
                     fields=(
                         "deposit",
                         "stake",
-                        "net_revenue",
-                        "revenue_share",
                         "fixed_income",
-                        "fixed_income_unitary",
-                        "fx_partner",
-                        "registered_count",
-                        "cpa_count",
-                        "first_deposit_count",
-                        # "wagering_count",
-                    ),
-                )
-            else:
-                BetenlaceDailyReport.objects.bulk_update(
-                    objs=member_reports_daily_betenlace_update,
-                    fields=(
-                        "deposit",
-                        "stake",
                         "net_revenue",
                         "revenue_share",
-                        # "fixed_income",
-                        # "fixed_income_unitary",
-                        "fx_partner",
                         "registered_count",
-                        # "cpa_count",
-                        "first_deposit_count",
-                        # "wagering_count",
-                    ),
-                )
-
-        if(member_reports_daily_betenlace_create):
-            BetenlaceDailyReport.objects.bulk_create(
-                objs=member_reports_daily_betenlace_create,
-            )
-
-        if(member_reports_partner_month_update):
-            if (update_cpa):
-                PartnerLinkAccumulated.objects.bulk_update(
-                    objs=member_reports_partner_month_update,
-                    fields=(
                         "cpa_count",
-                        "fixed_income",
-                        "fixed_income_local",
                     ),
                 )
 
-        if(member_reports_daily_partner_update):
-            if (update_cpa):
-                PartnerLinkDailyReport.objects.bulk_update(
-                    objs=member_reports_daily_partner_update,
-                    fields=(
-                        "fixed_income",
-                        "fixed_income_unitary",
-                        "fx_book_local",
-                        "fx_book_net_revenue_local",
-                        "fx_percentage",
-                        "fixed_income_local",
-                        "fixed_income_unitary_local",
-                        "cpa_count",
-                        "percentage_cpa",
-                        "tracker",
-                        "tracker_deposit",
-                        "tracker_registered_count",
-                        "tracker_first_deposit_count",
-                        # "tracker_wagering_count",
-                        "deposit",
-                        "registered_count",
-                        "first_deposit_count",
-                        # "wagering_count",
-                        "adviser_id",
-                        "fixed_income_adviser",
-                        "fixed_income_adviser_local",
-                        "net_revenue_adviser",
-                        "net_revenue_adviser_local",
-                        "fixed_income_adviser_percentage",
-                        "net_revenue_adviser_percentage",
-                        "referred_by",
-                        "fixed_income_referred",
-                        "fixed_income_referred_local",
-                        "net_revenue_referred",
-                        "net_revenue_referred_local",
-                        "fixed_income_referred_percentage",
-                        "net_revenue_referred_percentage",
-                    ),
-                )
-            else:
-                PartnerLinkDailyReport.objects.bulk_update(
-                    objs=member_reports_daily_partner_update,
-                    fields=(
-                        # "fixed_income",
-                        # "fixed_income_unitary",
-                        # "fx_book_local",
-                        "fx_book_net_revenue_local",
-                        "fx_percentage",
-                        # "fixed_income_local",
-                        # "fixed_income_unitary_local",
-                        # "cpa_count",
-                        # "percentage_cpa",
-                        # "tracker",
-                        "tracker_deposit",
-                        "tracker_registered_count",
-                        "tracker_first_deposit_count",
-                        # "tracker_wagering_count",
-                        "deposit",
-                        "registered_count",
-                        "first_deposit_count",
-                        # "wagering_count",
-                        "adviser_id",
-                        # "fixed_income_adviser",
-                        # "fixed_income_adviser_local",
-                        "net_revenue_adviser",
-                        "net_revenue_adviser_local",
-                        # "fixed_income_adviser_percentage",
-                        "net_revenue_adviser_percentage",
-                        "referred_by",
-                        # "fixed_income_referred",
-                        # "fixed_income_referred_local",
-                        "net_revenue_referred",
-                        "net_revenue_referred_local",
-                        # "fixed_income_referred_percentage",
-                        "net_revenue_referred_percentage",
-                    ),
+            if(member_reports_daily_betenlace_update):
+                if (update_cpa):
+                    BetenlaceDailyReport.objects.bulk_update(
+                        objs=member_reports_daily_betenlace_update,
+                        fields=(
+                            "deposit",
+                            "stake",
+                            "net_revenue",
+                            "revenue_share",
+                            "fixed_income",
+                            "fixed_income_unitary",
+                            "fx_partner",
+                            "registered_count",
+                            "cpa_count",
+                            "first_deposit_count",
+                            # "wagering_count",
+                        ),
+                    )
+                else:
+                    BetenlaceDailyReport.objects.bulk_update(
+                        objs=member_reports_daily_betenlace_update,
+                        fields=(
+                            "deposit",
+                            "stake",
+                            "net_revenue",
+                            "revenue_share",
+                            # "fixed_income",
+                            # "fixed_income_unitary",
+                            "fx_partner",
+                            "registered_count",
+                            # "cpa_count",
+                            "first_deposit_count",
+                            # "wagering_count",
+                        ),
+                    )
+
+            if(member_reports_daily_betenlace_create):
+                BetenlaceDailyReport.objects.bulk_create(
+                    objs=member_reports_daily_betenlace_create,
                 )
 
-        if(member_reports_daily_partner_create):
-            PartnerLinkDailyReport.objects.bulk_create(
-                objs=member_reports_daily_partner_create,
-            )
+            if(member_reports_partner_month_update):
+                if (update_cpa):
+                    PartnerLinkAccumulated.objects.bulk_update(
+                        objs=member_reports_partner_month_update,
+                        fields=(
+                            "cpa_count",
+                            "fixed_income",
+                            "fixed_income_local",
+                        ),
+                    )
+
+            if(member_reports_daily_partner_update):
+                if (update_cpa):
+                    PartnerLinkDailyReport.objects.bulk_update(
+                        objs=member_reports_daily_partner_update,
+                        fields=(
+                            "fixed_income",
+                            "fixed_income_unitary",
+                            "fx_book_local",
+                            "fx_book_net_revenue_local",
+                            "fx_percentage",
+                            "fixed_income_local",
+                            "fixed_income_unitary_local",
+                            "cpa_count",
+                            "percentage_cpa",
+                            "tracker",
+                            "tracker_deposit",
+                            "tracker_registered_count",
+                            "tracker_first_deposit_count",
+                            # "tracker_wagering_count",
+                            "deposit",
+                            "registered_count",
+                            "first_deposit_count",
+                            # "wagering_count",
+                            "adviser_id",
+                            "fixed_income_adviser",
+                            "fixed_income_adviser_local",
+                            "net_revenue_adviser",
+                            "net_revenue_adviser_local",
+                            "fixed_income_adviser_percentage",
+                            "net_revenue_adviser_percentage",
+                            "referred_by",
+                            "fixed_income_referred",
+                            "fixed_income_referred_local",
+                            "net_revenue_referred",
+                            "net_revenue_referred_local",
+                            "fixed_income_referred_percentage",
+                            "net_revenue_referred_percentage",
+                        ),
+                    )
+                else:
+                    PartnerLinkDailyReport.objects.bulk_update(
+                        objs=member_reports_daily_partner_update,
+                        fields=(
+                            # "fixed_income",
+                            # "fixed_income_unitary",
+                            # "fx_book_local",
+                            "fx_book_net_revenue_local",
+                            "fx_percentage",
+                            # "fixed_income_local",
+                            # "fixed_income_unitary_local",
+                            # "cpa_count",
+                            # "percentage_cpa",
+                            # "tracker",
+                            "tracker_deposit",
+                            "tracker_registered_count",
+                            "tracker_first_deposit_count",
+                            # "tracker_wagering_count",
+                            "deposit",
+                            "registered_count",
+                            "first_deposit_count",
+                            # "wagering_count",
+                            "adviser_id",
+                            # "fixed_income_adviser",
+                            # "fixed_income_adviser_local",
+                            "net_revenue_adviser",
+                            "net_revenue_adviser_local",
+                            # "fixed_income_adviser_percentage",
+                            "net_revenue_adviser_percentage",
+                            "referred_by",
+                            # "fixed_income_referred",
+                            # "fixed_income_referred_local",
+                            "net_revenue_referred",
+                            "net_revenue_referred_local",
+                            # "fixed_income_referred_percentage",
+                            "net_revenue_referred_percentage",
+                        ),
+                    )
+
+            if(member_reports_daily_partner_create):
+                PartnerLinkDailyReport.objects.bulk_create(
+                    objs=member_reports_daily_partner_create,
+                )
+    finally:
+        account_report_loader.close()
 
     if (df_daily.empty):
         msg = f"Member for Campaign {campaign_title} No Records/No data"
@@ -1621,96 +1481,6 @@ def account_member_betfair(
     return
 
 
-def _account_report_update(
-    keys,
-    row,
-    account_report,
-    partner_link_accumulated,
-    cpa_by_prom_code_iter,
-    campaign,
-    cpa_at,
-    revenue_share_percentage,
-    cpa_account_current_month,
-):
-    account_report.deposit += row[keys.get("deposit")]
-    account_report.stake += row[keys.get("stake")]
-
-    account_report.net_revenue += row[keys.get("net_revenue")]
-    account_report.revenue_share += revenue_share_percentage * row[keys.get("net_revenue")]
-
-    if (cpa_at is not None):
-        if (account_report.cpa_at is None):
-            # Update cpa date only if this is not none
-            account_report.cpa_at = cpa_at
-        elif (cpa_at.month != account_report.cpa_at.month and cpa_at.year != account_report.cpa_at.year):
-            logger_task.warning(
-                f"Punter pk {account_report.pk} have incoming cpa_at \"{account_report.cpat_ap}\" on "
-                "different month, is forced to update"
-            )
-            account_report.cpa_at = cpa_at
-    else:
-        if (account_report.cpa_at is not None):
-            # Prevent multi count at same punter, but alert
-            logger_task.warning(
-                f"punter_pk=\"{account_report.pk}\" for campaign_title=\"{campaign.campaign_title}\" "
-                f"has cpa_at {account_report.cpa_at} and now coming None"
-            )
-        else:
-            account_report.cpa_at = None
-
-    if (not account_report.cpa_partner):
-        account_report.partner_link_accumulated = partner_link_accumulated
-
-    if account_report.cpa_betenlace != 1:
-        account_report.cpa_betenlace = cpa_account_current_month
-        if (cpa_account_current_month):
-            account_report.fixed_income = campaign.fixed_income_unitary
-            if (partner_link_accumulated is not None):
-                account_report.cpa_partner = 1
-                # Append only punters that are not already counted
-                cpa_by_prom_code_iter[row[keys.get("prom_code")]].append(account_report)
-
-        account_report.partner_link_accumulated = partner_link_accumulated
-
-    return account_report
-
-
-def _account_report_create(
-    row,
-    keys,
-    link,
-    registered_at,
-    partner_link_accumulated,
-    created_at,
-    cpa_by_prom_code_iter,
-    campaign,
-    cpa_at,
-    revenue_share_percentage,
-    cpa_account_current_month,
-):
-    account_report = AccountReport(
-        partner_link_accumulated=partner_link_accumulated,
-        punter_id=row[keys.get("punter_id")],
-        deposit=row[keys.get("deposit")],
-        stake=row[keys.get("stake")],
-        fixed_income=campaign.fixed_income_unitary * cpa_account_current_month,
-        net_revenue=row[keys.get("net_revenue")],
-        revenue_share=row[keys.get("net_revenue")]*revenue_share_percentage,
-        currency_condition=campaign.currency_condition,
-        currency_fixed_income=campaign.currency_fixed_income,
-        cpa_betenlace=cpa_account_current_month,
-        link=link,
-        registered_at=registered_at,
-        cpa_at=cpa_at,
-        created_at=created_at,
-    )
-
-    if (cpa_account_current_month):
-        cpa_by_prom_code_iter[row[keys.get("prom_code")]].append(account_report)
-
-    return account_report
-
-
 def _partner_link_daily_create_cpa(
     from_date,
     campaign,
@@ -1940,8 +1710,10 @@ def _calc_fx(
 ):
     if(currency_from_str != partner_currency_str):
         try:
-            fx_book_partner = eval(
-                f"fx_partner.fx_{currency_from_str}_{partner_currency_str}") * fx_partner_percentage
+            fx_book_partner = FxMatrix.from_fx_partner(fx_partner).rate(
+                currency_from=currency_from_str,
+                currency_to=partner_currency_str,
+            ) * fx_partner_percentage
         except:
             logger_task.error(
                 f"Fx conversion from {currency_from_str} to {partner_currency_str} undefined on DB")
@@ -9,14 +9,15 @@ import pytz
 import requests
 from api_partner.helpers import (
     DB_USER_PARTNER,
+    AccountReportBulkLoader,
+    MemberReportIndex,
     PartnerAccumStatusCHO,
+    get_fx_partner_on,
 )
 from api_partner.models import (
-    AccountReport,
     BetenlaceCPA,
     BetenlaceDailyReport,
     Campaign,
-    FxPartner,
     FxPartnerPercentage,
     Link,
     PartnerLinkAccumulated,
@@ -24,7 +25,10 @@ from api_partner.models import (
 )
 from betenlace.celery import app
 from celery.utils.log import get_task_logger
-from core.helpers import CurrencyAll
+from core.helpers import (
+    CurrencyAll,
+    FxMatrix,
+)
 from core.tasks import chat_logger as chat_logger_task
 from django.conf import settings
 from django.db import transaction
@@ -34,11 +38,7 @@ from django.db.models import (
 )
 from django.db.models.functions import Concat
 from django.utils import timezone
-from django.utils.timezone import (
-    datetime,
-    make_aware,
-    timedelta,
-)
+from django.utils.timezone import timedelta
 
 logger_task = get_task_logger(__name__)
 
@@ -457,99 +457,55 @@ def account_member_rushbet(campaign_title):
         "betenlacecpa",
     )
 
-    links_pk = links.values_list("pk", flat=True)
-
-    # Get account reports from previous links and punter_id, QUERY
-    filters = (
-        Q(link__in=links_pk),
-        Q(punter_id__in=df_account.punter_id.unique()),
+    # Hash index of links for lookups by row
+    member_report_index = MemberReportIndex(
+        links=links,
     )
-    account_reports = AccountReport.objects.filter(*filters)
 
     currency_condition = campaign.currency_condition
     currency_condition_str = currency_condition.lower()
     currency_fixed_income = campaign.currency_fixed_income
     currency_fixed_income_str = currency_fixed_income.lower()
 
-    # Acumulators bulk create and update
-    account_reports_update = []
-    account_reports_create = []
-
-    # Set keys by index based on colum names of Dataframe
-    keys = {key: index for index, key in enumerate(df_account.columns.values)}
-
-    # Dictionary with current applied sum of cpa's by prom_code
-    cpa_by_prom_code_iter = {}
-    for prom_code in prom_codes:
-        cpa_by_prom_code_iter[prom_code] = []
-
     list_logs = []
-    for row in zip(*df_account.to_dict('list').values()):
-        """
-        'row_id': 0,
-        'prom_code': 2,
-        'punter_id': 3,
-        'revenue_share': 4,
-        'registered_at': 5,
-        'first_deposit_at': 6,
-        """
-        link = next(filter(lambda link: link.prom_code == row[keys.get("prom_code")], links), None)
-
-        if not link:
-            warning_msg = (
-                f"Link with prom_code={row[keys.get('prom_code')]} and campaign={campaign_title} "
-                "not found on database"
-            )
-            warning_msg = f"*LEVEL:* `WARNING` \n*message:* `{warning_msg}`\n\n"
-            logger_task.warning(warning_msg)
-            list_logs.append(warning_msg)
-            continue
-
-        # Get current entry of account report based on link and punter_id
-        account_report = next(
-            filter(
-                lambda account_report: account_report.link_id == link.pk and
-                account_report.punter_id == row[keys.get("punter_id")], account_reports
-            ),
-            None
-        )
-
-        # Get current partner that have the current link
-        partner_link_accumulated = link.partner_link_accumulated
 
-        if account_report:
-            # Temp use to_date
-            # Case and exist entry
-            account_report_update = _account_report_update(
-                keys=keys,
-                row=row,
-                from_date=yesterday,
-                partner_link_accumulated=partner_link_accumulated,
-                account_report=account_report,
-                cpa_by_prom_code_iter=cpa_by_prom_code_iter,
-                revenue_share_percentage=revenue_share_percentage,
-                cpa_condition_from_revenue_share=cpa_condition_from_revenue_share,
-                fixed_income_campaign=fixed_income_unitary_campaign,
-            )
-            account_reports_update.append(account_report_update)
-        else:
-            # Temp use to_date
-            # Case new entry
-            account_report_new = _account_report_create(
-                row=row,
-                keys=keys,
-                link=link,
-                currency_condition=currency_condition,
-                currency_fixed_income=currency_fixed_income,
-                partner_link_accumulated=partner_link_accumulated,
-                from_date=yesterday,
-                cpa_by_prom_code_iter=cpa_by_prom_code_iter,
-                revenue_share_percentage=revenue_share_percentage,
-                cpa_condition_from_revenue_share=cpa_condition_from_revenue_share,
-                fixed_income_campaign=fixed_income_unitary_campaign,
-            )
+    # Punters of account report with the values of day, the accumulated
+    # values are calculated on DB by the loader
+    df_account["link_id"] = df_account.prom_code.map(
+        {
+            prom_code: link.pk
+            for prom_code, link in member_report_index.links.items()
+        },
+    )
+    for prom_code in df_account.loc[df_account.link_id.isna(), "prom_code"].unique():
+        warning_msg = (
+            f"Link with prom_code={prom_code} and campaign={campaign_title} "
+            "not found on database"
+        )
+        warning_msg = f"*LEVEL:* `WARNING` \n*message:* `{warning_msg}`\n\n"
+        logger_task.warning(warning_msg)
+        list_logs.append(warning_msg)
+    df_account.dropna(subset=["link_id"], inplace=True)
 
-            account_reports_create.append(account_report_new)
+    df_account["partner_link_accumulated_id"] = df_account.prom_code.map(
+        {
+            prom_code: link.partner_link_accumulated_id
+            for prom_code, link in member_report_index.links.items()
+        },
+    )
+    df_account["deposit"] = 0
+    df_account["stake"] = 0
+    df_account["net_revenue"] = df_account.revenue_share / revenue_share_percentage
+    # Only positive value for accelerate cpa trigger 0 for negative case
+    df_account["revenue_share"] = df_account.revenue_share.abs()
+    df_account["cpa_betenlace"] = 0
+    df_account["cpa_at"] = None
+    df_account["registered_at"] = pd.to_datetime(
+        df_account.registered_at,
+        format="%m/%d/%Y",
+        errors="coerce",
+    )
+    df_account["first_deposit_at"] = None
 
     # Continue for Member report
 
@@ -566,21 +522,15 @@ def account_member_rushbet(campaign_title):
     filters = (
         Q(betenlace_daily_report__in=betenlace_daily_reports),
     )
-    partner_link_dailies_reports = PartnerLinkDailyReport.objects.filter()
+    partner_link_dailies_reports = PartnerLinkDailyReport.objects.filter(*filters)
 
-    # Get the last Fx value
-    fx_created_at = yesterday.replace(minute=0, hour=0, second=0, microsecond=0)
-    filters = (
-        Q(created_at__gte=fx_created_at),
+    member_report_index.index_daily_reports(
+        betenlace_daily_reports=betenlace_daily_reports,
+        partner_link_dailies_reports=partner_link_dailies_reports,
     )
-    fx_partner = FxPartner.objects.filter(*filters).order_by("created_at").first()
 
-    if(fx_partner is None):
-        # Get just next from supplied date
-        filters = (
-            Q(created_at__lte=fx_created_at),
-        )
-        fx_partner = FxPartner.objects.filter(*filters).order_by("-created_at").first()
+    # Get the Fx of day, the first created on the day or later else the last before
+    fx_partner = get_fx_partner_on(fx_date=yesterday)
 
     # If still none prevent execution
     if(fx_partner is None):
@@ -620,339 +570,324 @@ def account_member_rushbet(campaign_title):
     else:
         fx_partner_percentage = fx_partner_percentage.percentage_fx
 
-    # Acumulators bulk create and update
-    member_reports_betenlace_month_update = []
-    member_reports_daily_betenlace_update = []
-    member_reports_daily_betenlace_create = []
-
-    member_reports_partner_month_update = []
-    member_reports_daily_partner_update = []
-    member_reports_daily_partner_create = []
-
-    # Set keys by index based on colum names of Dataframe
-    keys = {key: index for index, key in enumerate(df_member.columns.values)}
-
-    list_logs = []
-    for row in zip(*df_member.to_dict('list').values()):
-        # Get link according to prom_code of current loop
-        link = next(filter(lambda link: link.prom_code == row[keys.get("prom_code")], links), None)
-        if not link:
-            warning_msg = (
-                f"Link with prom_code={row[keys.get('prom_code')]} and campaign={campaign_title} "
-                "not found on database"
-            )
-            warning_msg = f"*LEVEL:* `WARNING` \n*message:* `{warning_msg}`\n\n"
-            logger_task.warning(warning_msg)
-            list_logs.append(warning_msg)
-            continue
+    # Stage punters on DB, the punters that reach the cpa condition on this
+    # day are counted as cpa of the link
+    account_report_loader = AccountReportBulkLoader(
+        currency_condition=currency_condition,
+        currency_fixed_income=currency_fixed_income,
+        created_at=yesterday.date(),
+        # Rushbet pay only Revenue share
+        fixed_income_unitary=0,
+        cpa_revenue_share=cpa_condition_from_revenue_share,
+    )
+    try:
+        account_report_loader.stage(df=df_account)
+        new_cpas = account_report_loader.get_new_cpas()
+
+        # Acumulators bulk create and update
+        member_reports_betenlace_month_update = []
+        member_reports_daily_betenlace_update = []
+        member_reports_daily_betenlace_create = []
+
+        member_reports_partner_month_update = []
+        member_reports_daily_partner_update = []
+        member_reports_daily_partner_create = []
+
+        # Set keys by index based on colum names of Dataframe
+        keys = {key: index for index, key in enumerate(df_member.columns.values)}
+
+        for row in zip(*df_member.to_dict('list').values()):
+            # Get link according to prom_code of current loop
+            link = member_report_index.get_link(prom_code=row[keys.get("prom_code")])
+            if not link:
+                warning_msg = (
+                    f"Link with prom_code={row[keys.get('prom_code')]} and campaign={campaign_title} "
+                    "not found on database"
+                )
+                warning_msg = f"*LEVEL:* `WARNING` \n*message:* `{warning_msg}`\n\n"
+                logger_task.warning(warning_msg)
+                list_logs.append(warning_msg)
+                continue
 
-        try:
-            # Get current entry of member report based on link (prom_code)
-            betenlace_cpa = link.betenlacecpa
-        except link._meta.model.betenlacecpa.RelatedObjectDoesNotExist:
-            msg_error = (
-                f"Betenlace CPA entry not found for link with prom_code={row[keys.get('prom_code')]}"
-            )
-            msg_error = f"*LEVEL:* `ERROR` \n*message:* `{msg_error}`\n\n"
-            logger_task.error(msg_error)
-            list_logs.append(msg_error)
-            continue
-
-        # Generate data from account report by prom_code
-        cpa_count = len(cpa_by_prom_code_iter.get(row[keys.get("prom_code")]))
-
-        # Betenlace Month
-        betenlace_cpa = _betenlace_month_update(
-            keys=keys,
-            row=row,
-            betenlace_cpa=betenlace_cpa,
-            cpa_count=cpa_count,
-            fixed_income_campaign=fixed_income_unitary_campaign,
-            revenue_share_percentage=revenue_share_percentage,
-        )
-        member_reports_betenlace_month_update.append(betenlace_cpa)
-
-        # Betenlace Daily
-        betenlace_daily = next(
-            filter(
-                lambda betenlace_daily: (
-                    betenlace_daily.betenlace_cpa_id == betenlace_cpa.pk and
-                    betenlace_daily.created_at == yesterday.date()
-                ),
-                betenlace_daily_reports,
-            ),
-            None,
-        )
+            try:
+                # Get current entry of member report based on link (prom_code)
+                betenlace_cpa = link.betenlacecpa
+            except link._meta.model.betenlacecpa.RelatedObjectDoesNotExist:
+                msg_error = (
+                    f"Betenlace CPA entry not found for link with prom_code={row[keys.get('prom_code')]}"
+                )
+                msg_error = f"*LEVEL:* `ERROR` \n*message:* `{msg_error}`\n\n"
+                logger_task.error(msg_error)
+                list_logs.append(msg_error)
+                continue
 
-        cpa_count = len(cpa_by_prom_code_iter.get(row[keys.get("prom_code")]))
+            # Generate data from account report by prom_code
+            cpa_count = len(new_cpas.get(link.pk, ()))
 
-        if(betenlace_daily):
-            betenlace_daily = _betenlace_daily_update(
-                keys=keys,
-                row=row,
-                betenlace_daily=betenlace_daily,
-                fixed_income_campaign=fixed_income_unitary_campaign,
-                cpa_count=cpa_count,
-                revenue_share_percentage=revenue_share_percentage,
-                fx_partner=fx_partner,
-            )
-            member_reports_daily_betenlace_update.append(betenlace_daily)
-        else:
-            # keys, row, betenlace_daily, fixed_income_campaign, cpa_count, revenue_share_percentage
-            betenlace_daily = _betenlace_daily_create(
+            # Betenlace Month
+            betenlace_cpa = _betenlace_month_update(
                 keys=keys,
                 row=row,
                 betenlace_cpa=betenlace_cpa,
-                from_date=yesterday.date(),
-                fixed_income_campaign=fixed_income_unitary_campaign,
                 cpa_count=cpa_count,
+                fixed_income_campaign=fixed_income_unitary_campaign,
                 revenue_share_percentage=revenue_share_percentage,
-                currency_condition=currency_condition,
-                currency_fixed_income=currency_fixed_income,
-                fx_partner=fx_partner,
             )
-            member_reports_daily_betenlace_create.append(betenlace_daily)
+            member_reports_betenlace_month_update.append(betenlace_cpa)
 
-        # Get current partner that have the current link
-        partner_link_accumulated = link.partner_link_accumulated
+            # Betenlace Daily
+            betenlace_daily = member_report_index.get_betenlace_daily(
+                betenlace_cpa_id=betenlace_cpa.pk,
+                created_at=yesterday.date(),
+            )
 
-        # When partner have not assigned the link must be continue to next loop
-        if(partner_link_accumulated is None):
-            continue
+            cpa_count = len(new_cpas.get(link.pk, ()))
+
+            if(betenlace_daily):
+                betenlace_daily = _betenlace_daily_update(
+                    keys=keys,
+                    row=row,
+                    betenlace_daily=betenlace_daily,
+                    fixed_income_campaign=fixed_income_unitary_campaign,
+                    cpa_count=cpa_count,
+                    revenue_share_percentage=revenue_share_percentage,
+                    fx_partner=fx_partner,
+                )
+                member_reports_daily_betenlace_update.append(betenlace_daily)
+            else:
+                # keys, row, betenlace_daily, fixed_income_campaign, cpa_count, revenue_share_percentage
+                betenlace_daily = _betenlace_daily_create(
+                    keys=keys,
+                    row=row,
+                    betenlace_cpa=betenlace_cpa,
+                    from_date=yesterday.date(),
+                    fixed_income_campaign=fixed_income_unitary_campaign,
+                    cpa_count=cpa_count,
+                    revenue_share_percentage=revenue_share_percentage,
+                    currency_condition=currency_condition,
+                    currency_fixed_income=currency_fixed_income,
+                    fx_partner=fx_partner,
+                )
+                member_reports_daily_betenlace_create.append(betenlace_daily)
+
+            # Get current partner that have the current link
+            partner_link_accumulated = link.partner_link_accumulated
+
+            # When partner have not assigned the link must be continue to next loop
+            if(partner_link_accumulated is None):
+                continue
 
-        # Validate if link has relationship with partner and if has verify if status is equal to status campaign
-        if partner_link_accumulated.status == PartnerAccumStatusCHO.BY_CAMPAIGN:
-            # Validate if campaign status is equal to INACTIVE and last inactive at is great tha
-            if (campaign.status == Campaign.Status.INACTIVE and yesterday.date() >= campaign.last_inactive_at.date()):
-                msg = f"link with prom_code {partner_link_accumulated.prom_code} has status campaign inactive"
+            # Validate if link has relationship with partner and if has verify if status is equal to status campaign
+            if partner_link_accumulated.status == PartnerAccumStatusCHO.BY_CAMPAIGN:
+                # Validate if campaign status is equal to INACTIVE and last inactive at is great tha
+                if (campaign.status == Campaign.Status.INACTIVE and yesterday.date() >= campaign.last_inactive_at.date()):
+                    msg = f"link with prom_code {partner_link_accumulated.prom_code} has status campaign inactive"
+                    msg = f"*LEVEL:* `WARNING` \n*message:* `{msg}`\n\n"
+                    logger_task.warning(msg)
+                    list_logs.append(msg)
+                    continue
+            elif (partner_link_accumulated.status == PartnerAccumStatusCHO.INACTIVE):
+                msg = f"link with prom_code {partner_link_accumulated.prom_code} has custom status inactive"
                 msg = f"*LEVEL:* `WARNING` \n*message:* `{msg}`\n\n"
                 logger_task.warning(msg)
                 list_logs.append(msg)
                 continue
-        elif (partner_link_accumulated.status == PartnerAccumStatusCHO.INACTIVE):
-            msg = f"link with prom_code {partner_link_accumulated.prom_code} has custom status inactive"
-            msg = f"*LEVEL:* `WARNING` \n*message:* `{msg}`\n\n"
-            logger_task.warning(msg)
-            list_logs.append(msg)
-            continue
-
-        # Tracker
-        if(cpa_count > settings.MIN_CPA_TRACKER_DAY):
-            cpa_count_new = math.floor(cpa_count*partner_link_accumulated.tracker)
-        else:
-            cpa_count_new = cpa_count
-
-        # verify if cpa_count had a change from tracker calculation
-        if (cpa_count > cpa_count_new):
-            # Reduce -1 additional for enum behavior
-            diff_count = (cpa_count - cpa_count_new) - 1
-
-            for enum, account_instance_i in enumerate(reversed(cpa_by_prom_code_iter.get(row[keys.get("prom_code")]))):
-                # Remove cpa partner
-                account_instance_i.cpa_partner = 0
-                if (enum >= diff_count):
-                    break
-
-        tracked_data = _get_tracker_values(
-            keys=keys,
-            row=row,
-            partner_link_accumulated=partner_link_accumulated,
-        )
 
-        # Fx Currency Fixed income
-        partner_currency_str = partner_link_accumulated.currency_local.lower()
-        fx_fixed_income_partner = _calc_fx(
-            fx_partner=fx_partner,
-            fx_partner_percentage=fx_partner_percentage,
-            currency_from_str=currency_fixed_income_str,
-            partner_currency_str=partner_currency_str,
-        )
-
-        fixed_income_partner_unitary = fixed_income_unitary_campaign * partner_link_accumulated.percentage_cpa
-        fixed_income_partner = cpa_count_new * fixed_income_partner_unitary
-        fixed_income_partner_unitary_local = (
-            fixed_income_unitary_campaign *
-            partner_link_accumulated.percentage_cpa *
-            fx_fixed_income_partner
-        )
-        fixed_income_partner_local = cpa_count_new * fixed_income_partner_unitary_local
-
-        # Fx Currency Condition
-        fx_condition_partner = _calc_fx(
-            fx_partner=fx_partner,
-            fx_partner_percentage=fx_partner_percentage,
-            currency_from_str=currency_condition_str,
-            partner_currency_str=partner_currency_str,
-        )
-
-        # Update month
-        partner_link_accumulated = _partner_link_month_update(
-            partner_link_accumulated=partner_link_accumulated,
-            cpa_count=cpa_count_new,
-            fixed_income_partner=fixed_income_partner,
-            fixed_income_partner_local=fixed_income_partner_local,
-        )
-        member_reports_partner_month_update.append(partner_link_accumulated)
-
-        # Partner Daily
-        partner_link_daily = next(
-            filter(
-                lambda partner_link_daily: partner_link_daily.betenlace_daily_report_id == betenlace_daily.id,
-                partner_link_dailies_reports,
-            ),
-            None)
-
-        if(partner_link_daily):
-            partner_link_daily = _partner_link_daily_update(
-                cpa_count=cpa_count_new,
-                tracked_data=tracked_data,
-                fx_fixed_income_partner=fx_fixed_income_partner,
-                fx_condition_partner=fx_condition_partner,
-                fx_partner_percentage=fx_partner_percentage,
-                fixed_income_partner_unitary=fixed_income_partner_unitary,
-                fixed_income_partner=fixed_income_partner,
-                fixed_income_partner_unitary_local=fixed_income_partner_unitary_local,
-                fixed_income_partner_local=fixed_income_partner_local,
-                partner_link_daily=partner_link_daily,
-                partner_link_accumulated=partner_link_accumulated,
-                partner=partner_link_accumulated.partner,
-                betenlace_daily=betenlace_daily,
-            )
-            member_reports_daily_partner_update.append(partner_link_daily)
-        else:
-            partner_link_daily = _partner_link_daily_create(
-                from_date=yesterday,
-                campaign=campaign,
-                betenlace_daily=betenlace_daily,
+            # Tracker
+            if(cpa_count > settings.MIN_CPA_TRACKER_DAY):
+                cpa_count_new = math.floor(cpa_count*partner_link_accumulated.tracker)
+            else:
+                cpa_count_new = cpa_count
+
+            # verify if cpa_count had a change from tracker calculation
+            if (cpa_count > cpa_count_new):
+                # Remove cpa partner of last punters
+                account_report_loader.remove_cpa_partner(
+                    link_id=link.pk,
+                    punter_ids=new_cpas.get(link.pk)[cpa_count_new:],
+                )
+
+            tracked_data = _get_tracker_values(
+                keys=keys,
+                row=row,
                 partner_link_accumulated=partner_link_accumulated,
-                cpa_count=cpa_count_new,
-                tracked_data=tracked_data,
-                fx_fixed_income_partner=fx_fixed_income_partner,
-                fx_condition_partner=fx_condition_partner,
-                fx_partner_percentage=fx_partner_percentage,
-                fixed_income_partner_unitary=fixed_income_partner_unitary,
-                fixed_income_partner=fixed_income_partner,
-                fixed_income_partner_unitary_local=fixed_income_partner_unitary_local,
-                fixed_income_partner_local=fixed_income_partner_local,
-                partner=partner_link_accumulated.partner,
-            )
-            member_reports_daily_partner_create.append(partner_link_daily)
-
-    join_list = "".join(list_logs)
-    chat_logger_task.apply_async(
-        kwargs={
-            "msg": join_list,
-            "msg_url": settings.CHAT_WEBHOOK_CELERY,
-        },
-    )
-
-    with transaction.atomic(using=DB_USER_PARTNER):
-        # Account case
-        if(account_reports_create):
-            AccountReport.objects.bulk_create(
-                objs=account_reports_create,
-            )
-        if(account_reports_update):
-            AccountReport.objects.bulk_update(
-                objs=account_reports_update,
-                fields=(
-                    "net_revenue",
-                    "fixed_income",
-                    "net_revenue",
-                    "revenue_share",
-                    "cpa_betenlace",
-                    "cpa_partner",
-                    "cpa_at",
-                ),
             )
 
-        # Member case
-        if(member_reports_betenlace_month_update):
-            BetenlaceCPA.objects.bulk_update(
-                objs=member_reports_betenlace_month_update,
-                fields=(
-                    "deposit",
-                    "fixed_income",
-                    "net_revenue",
-                    "revenue_share",
-                    "registered_count",
-                    "cpa_count",
-                    "wagering_count",
-                ),
-            )
-
-        if(member_reports_daily_betenlace_update):
-            BetenlaceDailyReport.objects.bulk_update(
-                objs=member_reports_daily_betenlace_update,
-                fields=(
-                    "deposit",
-                    "net_revenue",
-                    "revenue_share",
-                    "fixed_income",
-                    "fixed_income_unitary",
-                    "fx_partner",
-                    "cpa_count",
-                    "registered_count",
-                    "wagering_count",
-                ),
+            # Fx Currency Fixed income
+            partner_currency_str = partner_link_accumulated.currency_local.lower()
+            fx_fixed_income_partner = _calc_fx(
+                fx_partner=fx_partner,
+                fx_partner_percentage=fx_partner_percentage,
+                currency_from_str=currency_fixed_income_str,
+                partner_currency_str=partner_currency_str,
             )
 
-        if(member_reports_daily_betenlace_create):
-            BetenlaceDailyReport.objects.bulk_create(
-                objs=member_reports_daily_betenlace_create,
+            fixed_income_partner_unitary = fixed_income_unitary_campaign * partner_link_accumulated.percentage_cpa
+            fixed_income_partner = cpa_count_new * fixed_income_partner_unitary
+            fixed_income_partner_unitary_local = (
+                fixed_income_unitary_campaign *
+                partner_link_accumulated.percentage_cpa *
+                fx_fixed_income_partner
             )
+            fixed_income_partner_local = cpa_count_new * fixed_income_partner_unitary_local
 
-        if(member_reports_partner_month_update):
-            PartnerLinkAccumulated.objects.bulk_update(
-                objs=member_reports_partner_month_update,
-                fields=(
-                    "cpa_count",
-                    "fixed_income",
-                    "fixed_income_local",
-                ),
+            # Fx Currency Condition
+            fx_condition_partner = _calc_fx(
+                fx_partner=fx_partner,
+                fx_partner_percentage=fx_partner_percentage,
+                currency_from_str=currency_condition_str,
+                partner_currency_str=partner_currency_str,
             )
 
-        if(member_reports_daily_partner_update):
-            PartnerLinkDailyReport.objects.bulk_update(
-                objs=member_reports_daily_partner_update,
-                fields=(
-                    "fixed_income",
-                    "fixed_income_unitary",
-                    "fx_book_local",
-                    "fx_book_net_revenue_local",
-                    "fx_percentage",
-                    "fixed_income_local",
-                    "fixed_income_unitary_local",
-                    "cpa_count",
-                    "percentage_cpa",
-                    "deposit",
-                    "registered_count",
-                    "wagering_count",
-                    "tracker",
-                    "tracker_deposit",
-                    "tracker_registered_count",
-                    "tracker_wagering_count",
-                    "adviser_id",
-                    "fixed_income_adviser",
-                    "fixed_income_adviser_local",
-                    "net_revenue_adviser",
-                    "net_revenue_adviser_local",
-                    "fixed_income_adviser_percentage",
-                    "net_revenue_adviser_percentage",
-                    "referred_by",
-                    "fixed_income_referred",
-                    "fixed_income_referred_local",
-                    "net_revenue_referred",
-                    "net_revenue_referred_local",
-                    "fixed_income_referred_percentage",
-                    "net_revenue_referred_percentage",
-                ),
+            # Update month
+            partner_link_accumulated = _partner_link_month_update(
+                partner_link_accumulated=partner_link_accumulated,
+                cpa_count=cpa_count_new,
+                fixed_income_partner=fixed_income_partner,
+                fixed_income_partner_local=fixed_income_partner_local,
             )
+            member_reports_partner_month_update.append(partner_link_accumulated)
+
+            # Partner Daily
+            partner_link_daily = member_report_index.get_partner_link_daily(betenlace_daily_report_id=betenlace_daily.id)
+
+            if(partner_link_daily):
+                partner_link_daily = _partner_link_daily_update(
+                    cpa_count=cpa_count_new,
+                    tracked_data=tracked_data,
+                    fx_fixed_income_partner=fx_fixed_income_partner,
+                    fx_condition_partner=fx_condition_partner,
+                    fx_partner_percentage=fx_partner_percentage,
+                    fixed_income_partner_unitary=fixed_income_partner_unitary,
+                    fixed_income_partner=fixed_income_partner,
+                    fixed_income_partner_unitary_local=fixed_income_partner_unitary_local,
+                    fixed_income_partner_local=fixed_income_partner_local,
+                    partner_link_daily=partner_link_daily,
+                    partner_link_accumulated=partner_link_accumulated,
+                    partner=partner_link_accumulated.partner,
+                    betenlace_daily=betenlace_daily,
+                )
+                member_reports_daily_partner_update.append(partner_link_daily)
+            else:
+                partner_link_daily = _partner_link_daily_create(
+                    from_date=yesterday,
+                    campaign=campaign,
+                    betenlace_daily=betenlace_daily,
+                    partner_link_accumulated=partner_link_accumulated,
+                    cpa_count=cpa_count_new,
+                    tracked_data=tracked_data,
+                    fx_fixed_income_partner=fx_fixed_income_partner,
+                    fx_condition_partner=fx_condition_partner,
+                    fx_partner_percentage=fx_partner_percentage,
+                    fixed_income_partner_unitary=fixed_income_partner_unitary,
+                    fixed_income_partner=fixed_income_partner,
+                    fixed_income_partner_unitary_local=fixed_income_partner_unitary_local,
+                    fixed_income_partner_local=fixed_income_partner_local,
+                    partner=partner_link_accumulated.partner,
+                )
+                member_reports_daily_partner_create.append(partner_link_daily)
+
+        join_list = "".join(list_logs)
+        chat_logger_task.apply_async(
+            kwargs={
+                "msg": join_list,
+                "msg_url": settings.CHAT_WEBHOOK_CELERY,
+            },
+        )
 
-        if(member_reports_daily_partner_create):
-            PartnerLinkDailyReport.objects.bulk_create(
-                objs=member_reports_daily_partner_create,
-            )
+        with transaction.atomic(using=DB_USER_PARTNER):
+            # Account case
+            account_report_loader.load()
+
+            # Member case
+            if(member_reports_betenlace_month_update):
+                BetenlaceCPA.objects.bulk_update(
+                    objs=member_reports_betenlace_month_update,
+                    fields=(
+                        "deposit",
+                        "fixed_income",
+                        "net_revenue",
+                        "revenue_share",
+                        "registered_count",
+                        "cpa_count",
+                        "wagering_count",
+                    ),
+                )
+
+            if(member_reports_daily_betenlace_update):
+                BetenlaceDailyReport.objects.bulk_update(
+                    objs=member_reports_daily_betenlace_update,
+                    fields=(
+                        "deposit",
+                        "net_revenue",
+                        "revenue_share",
+                        "fixed_income",
+                        "fixed_income_unitary",
+                        "fx_partner",
+                        "cpa_count",
+                        "registered_count",
+                        "wagering_count",
+                    ),
+                )
+
+            if(member_reports_daily_betenlace_create):
+                BetenlaceDailyReport.objects.bulk_create(
+                    objs=member_reports_daily_betenlace_create,
+                )
+
+            if(member_reports_partner_month_update):
+                PartnerLinkAccumulated.objects.bulk_update(
+                    objs=member_reports_partner_month_update,
+                    fields=(
+                        "cpa_count",
+                        "fixed_income",
+                        "fixed_income_local",
+                    ),
+                )
+
+            if(member_reports_daily_partner_update):
+                PartnerLinkDailyReport.objects.bulk_update(
+                    objs=member_reports_daily_partner_update,
+                    fields=(
+                        "fixed_income",
+                        "fixed_income_unitary",
+                        "fx_book_local",
+                        "fx_book_net_revenue_local",
+                        "fx_percentage",
+                        "fixed_income_local",
+                        "fixed_income_unitary_local",
+                        "cpa_count",
+                        "percentage_cpa",
+                        "deposit",
+                        "registered_count",
+                        "wagering_count",
+                        "tracker",
+                        "tracker_deposit",
+                        "tracker_registered_count",
+                        "tracker_wagering_count",
+                        "adviser_id",
+                        "fixed_income_adviser",
+                        "fixed_income_adviser_local",
+                        "net_revenue_adviser",
+                        "net_revenue_adviser_local",
+                        "fixed_income_adviser_percentage",
+                        "net_revenue_adviser_percentage",
+                        "referred_by",
+                        "fixed_income_referred",
+                        "fixed_income_referred_local",
+                        "net_revenue_referred",
+                        "net_revenue_referred_local",
+                        "fixed_income_referred_percentage",
+                        "net_revenue_referred_percentage",
+                    ),
+                )
+
+            if(member_reports_daily_partner_create):
+                PartnerLinkDailyReport.objects.bulk_create(
+                    objs=member_reports_daily_partner_create,
+                )
+    finally:
+        account_report_loader.close()
 
     if (len(df_member.index) == 0):
         msg = f"Member for Campaign {campaign_title} No Records/No data"
@@ -978,110 +913,6 @@ def account_member_rushbet(campaign_title):
     return
 
 
-def _account_report_update(
-    keys,
-    row,
-    from_date,
-    partner_link_accumulated,
-    account_report,
-    cpa_by_prom_code_iter,
-    revenue_share_percentage,
-    cpa_condition_from_revenue_share,
-    fixed_income_campaign,
-):
-    """
-    Update account report data from row data like
-    - first_deposit_at
-    - revenue_share
-    - prom_code
-
-    prom_code is used to get the related link on database and sum iter
-    count for easy tracker management, with revenue_share are calculated
-    the net_revenue with `revenue_share_percentage` value, registered at
-    must be alredy defined at punter data creation.
-    """
-
-    # Only positive value for accelerate cpa trigger 0 for negative case
-    account_report.revenue_share += abs(row[keys.get("revenue_share")])
-    account_report.net_revenue += row[keys.get("revenue_share")] / revenue_share_percentage
-
-    if(not account_report.cpa_betenlace):
-        account_report.partner_link_accumulated = partner_link_accumulated
-
-    # condition from revenue share and not already cpa
-    if (account_report.revenue_share >= cpa_condition_from_revenue_share and not account_report.cpa_betenlace):
-        account_report.cpa_betenlace = 1
-        account_report.cpa_at = from_date
-        # Rushbet pay only Revenue share
-        account_report.fixed_income = 0
-
-        # Temp have value 1, later will removed
-        account_report.cpa_partner = 0 if partner_link_accumulated is None else 1
-
-        cpa_by_prom_code_iter[row[keys.get("prom_code")]].append(account_report)
-
-    return account_report
-
-
-def _account_report_create(
-    row,
-    keys,
-    link,
-    currency_condition,
-    currency_fixed_income,
-    partner_link_accumulated,
-    from_date,
-    cpa_by_prom_code_iter,
-    revenue_share_percentage,
-    cpa_condition_from_revenue_share,
-    fixed_income_campaign,
-):
-    """
-    Create account report data from row data like
-    - first_deposit_at
-    - revenue_share
-    - registered_at
-    - prom_code
-
-    prom_code is used to get the related link on database and sum iter
-    count for easy tracker management, with revenue_share are calculated
-    the net_revenue
-    """
-    # Check registrationdate null
-    if (not pd.isna(row[keys.get("registered_at")])):
-        registered_at = make_aware(datetime.strptime(row[keys.get("registered_at")], "%m/%d/%Y"))
-    else:
-        registered_at = None
-
-    cpa_count = 0
-    if (abs(row[keys.get("revenue_share")]) >= cpa_condition_from_revenue_share):
-        cpa_count = 1
-
-    account_report = AccountReport(
-        partner_link_accumulated=partner_link_accumulated,
-        punter_id=row[keys.get("punter_id")],
-        # Rushbet pay only Revenue share
-        fixed_income=0,
-        net_revenue=row[keys.get("revenue_share")] / revenue_share_percentage,
-        # Only positive value for accelerate cpa trigger 0 for negative case
-        revenue_share=abs(row[keys.get("revenue_share")]),
-        currency_condition=currency_condition,
-        currency_fixed_income=currency_fixed_income,
-        cpa_betenlace=cpa_count,
-        cpa_partner=(0 if partner_link_accumulated is None else cpa_count),
-        link=link,
-        registered_at=registered_at,
-        created_at=from_date,
-    )
-
-    if(cpa_count):
-        # Case when cpa is True or 1
-        account_report.cpa_at = from_date
-
-        cpa_by_prom_code_iter[row[keys.get("prom_code")]].append(account_report)
-    return account_report
-
-
 def _betenlace_daily_update(
     keys,
     row,
@@ -1261,8 +1092,10 @@ def _calc_fx(
     """
     if(currency_from_str != partner_currency_str):
         try:
-            fx_book_partner = eval(
-                f"fx_partner.fx_{currency_from_str}_{partner_currency_str}") * fx_partner_percentage
+            fx_book_partner = FxMatrix.from_fx_partner(fx_partner).rate(
+                currency_from=currency_from_str,
+                currency_to=partner_currency_str,
+            ) * fx_partner_percentage
         except:
             logger_task.error(
                 f"Fx conversion from {currency_from_str} to {partner_currency_str} undefined on DB")
@@ -2,7 +2,7 @@ import pytz
 from api_log.helpers import DB_HISTORY
 from api_log.models import ClickTracking
 from api_partner.helpers import (
-    get_client_ip,
+    get_click_sessions,
     make_iplist_call,
 )
 from api_partner.models import (
@@ -15,7 +15,10 @@ from betenlace.celery import app
 from celery.utils.log import get_task_logger
 from core.helpers import CurrencyPartner
 from django.conf import settings
-from django.db.models import Q
+from django.db.models import (
+    F,
+    Q,
+)
 from django.utils import timezone
 from urllib3.exceptions import ProtocolError
 
@@ -100,20 +103,28 @@ def click_count(
     logger_task.info("Ending cpa sum")
 
 
-def _create_clickreport(link_pk, partner_link_accumulated, ip):
-    ip_detail = make_iplist_call(ip)
+def _create_clickreport(link_pk, partner_link_accumulated, ip, today):
+    """
+    Create ClickTracking record of ip and start its session, returns False
+    when the detail of ip is not available (record is created with null
+    details)
+    """
+    click_tracking = ClickTracking(
+        partner_link_accumulated_id=partner_link_accumulated.pk if partner_link_accumulated else None,
+        link_id=link_pk,
+        ip=ip,
+        created_at=today,
+    )
+    state = False
+    ip_detail = make_iplist_call(ip) if ip else None
     if ip_detail and ip_detail.get("registry") != 'PRIVATE':
-        click_tracking = ClickTracking(
-            partner_link_accumulated_id=partner_link_accumulated.pk if partner_link_accumulated else None,
-            link_id=link_pk,
-            ip=ip_detail.get("ip", None),
-            registry=ip_detail.get("registry", None),
-            countrycode=ip_detail.get("countrycode", None),
-            countryname=ip_detail.get("countryname", None),
-            city=ip_detail.get("city", None),
-            spam=ip_detail.get("spam", None),
-            tor=ip_detail.get("tor", None)
-        )
+        click_tracking.ip = ip_detail.get("ip", ip)
+        click_tracking.registry = ip_detail.get("registry", None)
+        click_tracking.countrycode = ip_detail.get("countrycode", None)
+        click_tracking.countryname = ip_detail.get("countryname", None)
+        click_tracking.city = ip_detail.get("city", None)
+        click_tracking.spam = ip_detail.get("spam", None)
+        click_tracking.tor = ip_detail.get("tor", None)
         if asn := ip_detail.get("asn"):
             click_tracking.asn_code = asn.get("code", None)
             click_tracking.asn_name = asn.get("name")
@@ -121,28 +132,35 @@ def _create_clickreport(link_pk, partner_link_accumulated, ip):
             click_tracking.asn_start = asn.get("start")
             click_tracking.asn_end = asn.get("end")
             click_tracking.asn_count = asn.get("count")
-            click_tracking.save(using=DB_HISTORY)
-        return True
-    else:
-        # Click with Null details
-        ClickTracking.objects.using(DB_HISTORY).create(
-            partner_link_accumulated_id=partner_link_accumulated.pk if partner_link_accumulated else None,
-            link_id=link_pk,
-            ip=ip,
-            registry=None,
-            countrycode=None,
-            countryname=None,
-            city=None,
-            spam=None,
-            tor=None,
-            asn_code=None,
-            asn_name=None,
-            asn_route=None,
-            asn_start=None,
-            asn_end=None,
-            asn_count=None,
+        state = True
+
+    click_tracking.save(using=DB_HISTORY)
+    get_click_sessions().start_session(
+        link_id=link_pk,
+        ip=ip,
+        click_tracking_pk=click_tracking.pk,
+        created_at=today.timestamp(),
+    )
+    return state
+
+
+def _track_click(link_pk, partner_link_accumulated, today, ip):
+    """
+    Clicks of same ip and link inside the session window increment the
+    count of the session record without read it, otherwise a new record
+    is created
+    """
+    click_tracking_pk = get_click_sessions().get_session(link_id=link_pk, ip=ip)
+    if (click_tracking_pk is not None):
+        updated_count = ClickTracking.objects.using(DB_HISTORY).filter(
+            pk=click_tracking_pk,
+        ).update(
+            count=F("count") + 1,
         )
-    return False
+        if (updated_count):
+            return True
+
+    return _create_clickreport(link_pk, partner_link_accumulated, ip, today)
 
 
 def _ip_not_null_click_report(
@@ -164,26 +182,9 @@ def _ip_not_null_click_report(
                 ip_client=ip_i,
             )
         return
-    filters = (
-        Q(ip=ip_client),
-        Q(link_id=link_pk),
-    )
-    click_tracking = ClickTracking.objects.using(DB_HISTORY).filter(
-        *filters,
-    ).order_by("-created_at").first()
 
     # State for catch error and flush on log
-    state = None
-    if click_tracking:
-        less_time = today.timestamp() - click_tracking.created_at.timestamp()
-        if less_time < settings.CLICK_PERIOD_SECONDS:
-            click_tracking.count += 1
-            click_tracking.save()
-            state = True
-        else:
-            state = _create_clickreport(link_pk, partner_link_accumulated, ip_client)
-    else:
-        state = _create_clickreport(link_pk, partner_link_accumulated, ip_client)
+    state = _track_click(link_pk, partner_link_accumulated, today, ip_client)
 
     if not state:
         logger_task.error(f"Error with ip_client, failed to log with ipclient {ip_client} to link id: {link_pk}")
@@ -192,43 +193,8 @@ def _ip_not_null_click_report(
     betenlace_daily.click_count += 1
 
 
-def _create_clickreport_without(link_pk, partner_link_accumulated):
-    ClickTracking.objects.using(DB_HISTORY).create(
-        partner_link_accumulated_id=partner_link_accumulated.pk if partner_link_accumulated else None,
-        link_id=link_pk,
-        ip=None,
-        registry=None,
-        countrycode=None,
-        countryname=None,
-        city=None,
-        spam=None,
-        tor=None,
-        asn_code=None,
-        asn_name=None,
-        asn_route=None,
-        asn_start=None,
-        asn_end=None,
-        asn_count=None,
-    )
-
-
 def _ip_null_click_report(link_pk, partner_link_accumulated, today, betenlace_daily):
-    filters = (
-        Q(ip__isnull=True),
-        Q(link_id=link_pk),
-    )
-    click_tracking = ClickTracking.objects.using(DB_HISTORY).filter(
-        *filters,
-    ).order_by("-created_at").first()
-    if click_tracking:
-        less_time = today.timestamp() - click_tracking.created_at.timestamp()
-        if less_time < settings.CLICK_PERIOD_SECONDS:
-            click_tracking.count += 1
-            click_tracking.save()
-        else:
-            _create_clickreport_without(link_pk, partner_link_accumulated)
-    else:
-        _create_clickreport_without(link_pk, partner_link_accumulated)
+    _track_click(link_pk, partner_link_accumulated, today, None)
 
     betenlace_daily.click_count += 1
     logger_task.error(f"Error to fetch ip_client link id: {link_pk}")
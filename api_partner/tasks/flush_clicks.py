@@ -0,0 +1,324 @@
+import datetime
+import sys
+import traceback
+from collections import Counter
+
+import pytz
+from api_log.helpers import DB_HISTORY
+from api_log.models import ClickTracking
+from api_partner.helpers import (
+    DB_USER_PARTNER,
+    get_click_sessions,
+    make_iplist_call,
+    pop_clicks,
+    requeue_clicks,
+)
+from api_partner.models import (
+    BetenlaceDailyReport,
+    Campaign,
+    Link,
+    PartnerLinkDailyReport,
+)
+from betenlace.celery import app
+from celery.utils.log import get_task_logger
+from core.helpers import CurrencyPartner
+from django.conf import settings
+from django.db import transaction
+from django.db.models import (
+    Case,
+    F,
+    IntegerField,
+    Q,
+    Value,
+    When,
+)
+
+logger_task = get_task_logger(__name__)
+
+
+@app.task(
+    ignore_result=True,
+)
+def flush_clicks():
+    """
+    Count the clicks buffered on Redis by redirect views, the clicks are
+    taken in batches of `CLICK_BUFFER_BATCH_SIZE` and every batch makes
+    one bulk update of `click_count` on Betenlace daily reports and one
+    bulk create/update of ClickTracking instead of a task per click.
+
+    Must be scheduled periodically (django_celery_beat), the interval is
+    the max delay of click counts
+    """
+    logger_task.info("Starting flush of buffered clicks")
+    flushed_count = 0
+    while True:
+        clicks = pop_clicks(max_count=settings.CLICK_BUFFER_BATCH_SIZE)
+        if (not clicks):
+            break
+
+        _flush_batch(clicks=clicks)
+
+        flushed_count += len(clicks)
+        if (len(clicks) < settings.CLICK_BUFFER_BATCH_SIZE):
+            break
+
+    logger_task.info(f"Ending flush of buffered clicks, flushed {flushed_count} clicks")
+
+
+def _flush_batch(clicks):
+    tz = pytz.timezone(settings.TIME_ZONE)
+
+    # Special case for some vpns, ip with comma counts a click per ip
+    events = []
+    currencies = {}
+    for click_i in clicks:
+        link_id = click_i.get("link_id")
+        clicked_at = datetime.datetime.fromtimestamp(click_i.get("clicked_at"), tz=tz)
+        currencies[link_id] = (
+            click_i.get("currency_condition"),
+            click_i.get("currency_fixed_income"),
+        )
+        ip_client = click_i.get("ip")
+        ips = ip_client.split(",") if ip_client else (None,)
+        for ip_i in ips:
+            events.append((link_id, ip_i, clicked_at))
+
+    click_counts = Counter(
+        (link_id, clicked_at.date())
+        for link_id, _, clicked_at in events
+    )
+    try:
+        partner_links_accumulated = _update_click_counts(
+            click_counts=click_counts,
+            currencies=currencies,
+        )
+    except Exception:
+        # Counts are not committed, clicks are returned to buffer for next
+        # run
+        requeue_clicks(clicks=clicks)
+        raise
+
+    # Counts are already committed, a requeue would count the clicks
+    # twice, on error only the tracking of batch is lost
+    try:
+        _update_click_tracking(
+            events=events,
+            partner_links_accumulated=partner_links_accumulated,
+        )
+    except Exception:
+        exc_type, exc_value, exc_traceback = sys.exc_info()
+        e = traceback.format_exception(exc_type, exc_value, exc_traceback)
+        logger_task.error(f"Failed tracking of {len(events)} clicks, counts were saved\n{''.join(e)}")
+
+
+def _update_click_counts(click_counts, currencies):
+    """
+    Increment `click_count` of Betenlace daily reports, the missing
+    reports of the day are created with their Partner link daily report.
+
+    Returns dict of link pk to its partner link accumulated or None
+    """
+    links_pk = {link_id for link_id, _ in click_counts}
+    dates = {date for _, date in click_counts}
+
+    links = Link.objects.filter(
+        pk__in=links_pk,
+    ).select_related(
+        "campaign",
+        "partner_link_accumulated__partner",
+    )
+    partner_links_accumulated = {
+        link_i.pk: (
+            None
+            if link_i.campaign.status == Campaign.Status.INACTIVE
+            else link_i.partner_link_accumulated
+        )
+        for link_i in links
+    }
+
+    with transaction.atomic(using=DB_USER_PARTNER):
+        filters = (
+            Q(betenlace_cpa_id__in=links_pk),
+            Q(created_at__in=dates),
+        )
+        betenlace_dailies = {
+            (betenlace_daily_i.betenlace_cpa_id, betenlace_daily_i.created_at): betenlace_daily_i
+            for betenlace_daily_i in BetenlaceDailyReport.objects.select_for_update().filter(*filters)
+        }
+
+        # Case not found data, the reports are created and locked for
+        # avoid lost of counts with concurrent `click_count` tasks
+        keys_to_create = [
+            key
+            for key in click_counts
+            if key not in betenlace_dailies and key[0] in partner_links_accumulated
+        ]
+        if (keys_to_create):
+            BetenlaceDailyReport.objects.bulk_create(
+                objs=[
+                    BetenlaceDailyReport(
+                        betenlace_cpa_id=link_id,
+                        currency_condition=currencies.get(link_id)[0],
+                        currency_fixed_income=currencies.get(link_id)[1],
+                        created_at=date,
+                    )
+                    for link_id, date in keys_to_create
+                ],
+                ignore_conflicts=True,
+            )
+            filters = (
+                Q(betenlace_cpa_id__in={link_id for link_id, _ in keys_to_create}),
+                Q(created_at__in={date for _, date in keys_to_create}),
+            )
+            created_dailies = BetenlaceDailyReport.objects.select_for_update().filter(*filters)
+
+            partner_link_dailies_create = []
+            for betenlace_daily_i in created_dailies:
+                key = (betenlace_daily_i.betenlace_cpa_id, betenlace_daily_i.created_at)
+                betenlace_dailies.setdefault(key, betenlace_daily_i)
+                partner_link_accumulated = partner_links_accumulated.get(betenlace_daily_i.betenlace_cpa_id)
+                if (key not in keys_to_create or partner_link_accumulated is None):
+                    continue
+
+                # Create relation with partner link daily if this have
+                # current relation, when a concurrent `click_count` task
+                # created it first the conflict is ignored
+                partner_link_dailies_create.append(
+                    PartnerLinkDailyReport(
+                        partner_link_accumulated=partner_link_accumulated,
+                        betenlace_daily_report=betenlace_daily_i,
+                        adviser_id=partner_link_accumulated.partner.adviser_id,
+                        currency_fixed_income=betenlace_daily_i.currency_fixed_income,
+                        currency_local=CurrencyPartner.USD,
+                        created_at=betenlace_daily_i.created_at,
+                    )
+                )
+
+            if (partner_link_dailies_create):
+                PartnerLinkDailyReport.objects.bulk_create(
+                    objs=partner_link_dailies_create,
+                    ignore_conflicts=True,
+                )
+
+        betenlace_dailies_update = []
+        for key, count in click_counts.items():
+            betenlace_daily = betenlace_dailies.get(key)
+            if (betenlace_daily is None):
+                logger_task.error(f"Link with id {key[0]} not found, {count} clicks are discarded")
+                continue
+
+            betenlace_daily.click_count = (betenlace_daily.click_count or 0) + count
+            betenlace_dailies_update.append(betenlace_daily)
+
+        if (betenlace_dailies_update):
+            BetenlaceDailyReport.objects.bulk_update(
+                objs=betenlace_dailies_update,
+                fields=(
+                    "click_count",
+                ),
+            )
+
+    return partner_links_accumulated
+
+
+def _update_click_tracking(events, partner_links_accumulated):
+    """
+    Register the clicks on ClickTracking, a click of same ip and link
+    inside the window of a session (see `ClickSessionWindow`) increments
+    the count of the session record, otherwise a new record is created
+    with the detail of ip. No reads of history DB are made
+    """
+    click_sessions = get_click_sessions()
+    sessions = click_sessions.get_sessions(
+        keys={(link_id, ip) for link_id, ip, _ in events},
+    )
+
+    ip_details = {}
+    click_trackings_create = {}
+    click_counts_update = Counter()
+    for link_id, ip, clicked_at in sorted(events, key=lambda event: event[2]):
+        key = (link_id, ip)
+        click_tracking = click_trackings_create.get(key)
+        if (click_tracking is not None):
+            less_time = clicked_at.timestamp() - click_tracking.created_at.timestamp()
+            if (less_time < settings.CLICK_PERIOD_SECONDS):
+                click_tracking.count += 1
+                continue
+        elif (key in sessions):
+            click_counts_update[sessions.get(key)] += 1
+            continue
+
+        partner_link_accumulated = partner_links_accumulated.get(link_id)
+        click_tracking = ClickTracking(
+            partner_link_accumulated_id=partner_link_accumulated.pk if partner_link_accumulated else None,
+            link_id=link_id,
+            ip=ip,
+            created_at=clicked_at,
+        )
+        if (ip is None):
+            logger_task.error(f"Error to fetch ip_client link id: {link_id}")
+        else:
+            if (ip not in ip_details):
+                ip_details[ip] = make_iplist_call(ip)
+            _set_ip_detail(
+                click_tracking=click_tracking,
+                ip_detail=ip_details.get(ip),
+                link_id=link_id,
+            )
+
+        if (key in click_trackings_create):
+            # Window of previous record of batch is over, it is saved
+            # without start a session
+            click_trackings_create[(link_id, ip, clicked_at)] = click_trackings_create.pop(key)
+        click_trackings_create[key] = click_tracking
+
+    with transaction.atomic(using=DB_HISTORY):
+        if (click_trackings_create):
+            ClickTracking.objects.using(DB_HISTORY).bulk_create(
+                objs=click_trackings_create.values(),
+            )
+        if (click_counts_update):
+            ClickTracking.objects.using(DB_HISTORY).filter(
+                pk__in=click_counts_update.keys(),
+            ).update(
+                count=F("count") + Case(
+                    *(
+                        When(pk=pk, then=Value(count))
+                        for pk, count in click_counts_update.items()
+                    ),
+                    default=Value(0),
+                    output_field=IntegerField(),
+                ),
+            )
+
+    click_sessions.start_sessions(
+        sessions={
+            key: (click_tracking.pk, click_tracking.created_at.timestamp())
+            for key, click_tracking in click_trackings_create.items()
+            if len(key) == 2
+        },
+    )
+
+
+def _set_ip_detail(click_tracking, ip_detail, link_id):
+    if (not ip_detail or ip_detail.get("registry") == "PRIVATE"):
+        # Click with Null details
+        logger_task.error(
+            f"Error with ip_client, failed to log with ipclient {click_tracking.ip} to link id: {link_id}"
+        )
+        return
+
+    click_tracking.ip = ip_detail.get("ip", click_tracking.ip)
+    click_tracking.registry = ip_detail.get("registry", None)
+    click_tracking.countrycode = ip_detail.get("countrycode", None)
+    click_tracking.countryname = ip_detail.get("countryname", None)
+    click_tracking.city = ip_detail.get("city", None)
+    click_tracking.spam = ip_detail.get("spam", None)
+    click_tracking.tor = ip_detail.get("tor", None)
+    if asn := ip_detail.get("asn"):
+        click_tracking.asn_code = asn.get("code", None)
+        click_tracking.asn_name = asn.get("name")
+        click_tracking.asn_route = asn.get("route")
+        click_tracking.asn_start = asn.get("start")
+        click_tracking.asn_end = asn.get("end")
+        click_tracking.asn_count = asn.get("count")
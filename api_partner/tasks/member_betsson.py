@@ -1,5 +1,4 @@
 import json
-import math
 import re
 import sys
 import traceback
@@ -11,13 +10,15 @@ import pytz
 import requests
 from api_partner.helpers import (
     DB_USER_PARTNER,
+    MemberReportIndex,
     PartnerAccumStatusCHO,
+    get_fx_partner_on,
+    get_partner_values,
 )
 from api_partner.models import (
     BetenlaceCPA,
     BetenlaceDailyReport,
     Campaign,
-    FxPartner,
     Link,
     PartnerLinkAccumulated,
     PartnerLinkDailyReport,
@@ -527,18 +528,15 @@ def _member_report(
     )
     partner_link_dailies_reports = PartnerLinkDailyReport.objects.filter(*filters)
 
-    # Get the last Fx value
-    filters = (
-        Q(created_at__gte=yesterday),
+    # Hash index of links and daily reports for lookups by row
+    member_report_index = MemberReportIndex(
+        links=links,
+        betenlace_daily_reports=betenlace_daily_reports,
+        partner_link_dailies_reports=partner_link_dailies_reports,
     )
-    fx_partner = FxPartner.objects.filter(*filters).order_by("created_at").first()
 
-    if(fx_partner is None):
-        # Get just next from supplied date
-        filters = (
-            Q(created_at__lte=yesterday),
-        )
-        fx_partner = FxPartner.objects.filter(*filters).order_by("-created_at").first()
+    # Get the Fx of day, the first created on the day or later else the last before
+    fx_partner = get_fx_partner_on(fx_date=yesterday)
 
     # If still none prevent execution
     if(fx_partner is None):
@@ -555,9 +553,6 @@ def _member_report(
 
     fx_partner_percentage = fx_partner.fx_percentage
 
-    currency_condition_str = campaign.currency_condition.lower()
-    currency_fixed_income_str = campaign.currency_fixed_income.lower()
-
     # Acumulators bulk create and update
     member_reports_betenlace_month_update = []
     member_reports_daily_betenlace_update = []
@@ -572,11 +567,25 @@ def _member_report(
 
     df_member.loc[np.isnan(df_member.fixed_income.values), "fixed_income"] = 0
 
-    for row in zip(*df_member.to_dict('list').values()):
+    # Tracker and Fx of partners for all rows as column operations
+    tracked_keys = (
+        "deposit",
+        "registered_count",
+        "first_deposit_count",
+    )
+    partner_values = get_partner_values(
+        df=df_member,
+        member_report_index=member_report_index,
+        campaign=campaign,
+        fx_partner=fx_partner,
+        tracked_keys=tracked_keys,
+    )
+
+    for row, partner_row in zip(zip(*df_member.to_dict('list').values()), partner_values):
         """
         """
         # Get link according to prom_code of current loop
-        link = next(filter(lambda link: link.prom_code == row[keys.get("prom_code")], links), None)
+        link = member_report_index.get_link(prom_code=row[keys.get("prom_code")])
         if not link:
             logger_msg = (
                 f"Link with prom_code=\"{row[keys.get('prom_code')]}\" and campaign=\"{campaign_title}\" "
@@ -628,15 +637,9 @@ def _member_report(
         member_reports_betenlace_month_update.append(betenlace_cpa)
 
         # Betenlace Daily
-        betenlace_daily = next(
-            filter(
-                lambda betenlace_daily: (
-                    betenlace_daily.betenlace_cpa_id == betenlace_cpa.pk and
-                    betenlace_daily.created_at == yesterday.date()
-                ),
-                betenlace_daily_reports,
-            ),
-            None,
+        betenlace_daily = member_report_index.get_betenlace_daily(
+            betenlace_cpa_id=betenlace_cpa.pk,
+            created_at=yesterday.date(),
         )
 
         if(betenlace_daily):
@@ -692,42 +695,35 @@ def _member_report(
             )
             continue
 
-        # Tracker
-        if(data_i.get("cpa_count") > settings.MIN_CPA_TRACKER_DAY):
-            cpa_count = math.floor(data_i.get("cpa_count")*partner_link_accumulated.tracker)
-        else:
-            cpa_count = data_i.get("cpa_count")
-
-        tracked_data = _get_tracker_values(
-            data=data_i,
-            partner_link_accumulated=partner_link_accumulated,
-        )
-
-        # Fx Currency Fixed income
-        partner_currency_str = partner_link_accumulated.currency_local.lower()
-        fx_fixed_income_partner = _calc_fx(
-            fx_partner=fx_partner,
-            fx_partner_percentage=fx_partner_percentage,
-            currency_from_str=currency_fixed_income_str,
-            partner_currency_str=partner_currency_str,
-        )
+        fx_fixed_income_partner = partner_row.get("fx_fixed_income_partner")
+        fx_condition_partner = partner_row.get("fx_condition_partner")
+        if (fx_fixed_income_partner is None or fx_condition_partner is None):
+            logger_msg = (
+                f"Fx from currency \"{campaign.currency_fixed_income}\" or \"{campaign.currency_condition}\" "
+                f"to \"{partner_link_accumulated.currency_local}\" undefined for link with prom_code "
+                f"{partner_link_accumulated.prom_code}"
+            )
+            logger_task.error(logger_msg)
+            logger_msg = f"*LEVEL:* `ERROR` \n*message:* `{logger_msg}`\n\n"
+            chat_logger_task.apply_async(
+                kwargs={
+                    "msg": logger_msg,
+                    "msg_url": settings.CHAT_WEBHOOK_CELERY,
+                },
+            )
+            continue
 
-        fixed_income_partner_unitary = campaign.fixed_income_unitary * partner_link_accumulated.percentage_cpa
-        fixed_income_partner = cpa_count * fixed_income_partner_unitary
-        fixed_income_partner_unitary_local = (
-            campaign.fixed_income_unitary *
-            partner_link_accumulated.percentage_cpa *
-            fx_fixed_income_partner
-        )
-        fixed_income_partner_local = cpa_count * fixed_income_partner_unitary_local
-
-        # Fx Currency Condition
-        fx_condition_partner = _calc_fx(
-            fx_partner=fx_partner,
-            fx_partner_percentage=fx_partner_percentage,
-            currency_from_str=currency_condition_str,
-            partner_currency_str=partner_currency_str,
-        )
+        # Tracker and fixed income of partner
+        cpa_count = partner_row.get("cpa_count")
+        tracked_data = {
+            key: partner_row.get(f"tracked_{key}")
+            for key in tracked_keys
+            if keys.get(key) is not None
+        }
+        fixed_income_partner_unitary = partner_row.get("fixed_income_partner_unitary")
+        fixed_income_partner = partner_row.get("fixed_income_partner")
+        fixed_income_partner_unitary_local = partner_row.get("fixed_income_partner_unitary_local")
+        fixed_income_partner_local = partner_row.get("fixed_income_partner_local")
 
         partner_link_accumulated = _partner_link_month_update(
             partner_link_accumulated=partner_link_accumulated,
@@ -738,13 +734,7 @@ def _member_report(
         member_reports_partner_month_update.append(partner_link_accumulated)
 
         # Partner Daily
-        partner_link_daily = next(
-            filter(
-                lambda partner_link_daily: partner_link_daily.betenlace_daily_report_id == betenlace_daily.id,
-                partner_link_dailies_reports,
-            ),
-            None,
-        )
+        partner_link_daily = member_report_index.get_partner_link_daily(betenlace_daily_report_id=betenlace_daily.id)
 
         if(partner_link_daily):
             # Recalculate fixed_incomes for update
@@ -910,59 +900,6 @@ def _member_report(
         )
 
 
-def _get_tracker_values(
-    data,
-    partner_link_accumulated,
-):
-    tracked_data = {}
-    if (data.get("deposit") is not None):
-        tracked_data["deposit"] = data.get("deposit")*partner_link_accumulated.tracker_deposit
-
-    if (data.get("registered_count") is not None):
-        if(data.get("registered_count") > 1):
-            tracked_data["registered_count"] = math.floor(
-                data.get("registered_count")*partner_link_accumulated.tracker_registered_count
-            )
-        else:
-            tracked_data["registered_count"] = data.get("registered_count")
-
-    if (data.get("first_deposit_count") is not None):
-        if(data.get("first_deposit_count") > 1):
-            tracked_data["first_deposit_count"] = math.floor(
-                data.get("first_deposit_count")*partner_link_accumulated.tracker_first_deposit_count
-            )
-        else:
-            tracked_data["first_deposit_count"] = data.get("first_deposit_count")
-
-    return tracked_data
-
-
-def _calc_fx(
-    fx_partner,
-    fx_partner_percentage,
-    currency_from_str,
-    partner_currency_str,
-):
-    if(currency_from_str != partner_currency_str):
-        try:
-            fx_book_partner = eval(
-                f"fx_partner.fx_{currency_from_str}_{partner_currency_str}") * fx_partner_percentage
-        except:
-            logger_msg = (
-                f"Fx conversion from {currency_from_str} to {partner_currency_str} undefined on DB")
-            logger_task.info(logger_msg)
-            logger_msg = f"*LEVEL:* `INFO` \n*message:* `{logger_msg}`\n\n"
-            chat_logger_task.apply_async(
-                kwargs={
-                    "msg": logger_msg,
-                    "msg_url": settings.CHAT_WEBHOOK_CELERY,
-                },
-            )
-    else:
-        fx_book_partner = 1
-    return fx_book_partner
-
-
 def _partner_link_daily_create(
     from_date,
     campaign,
@@ -8,13 +8,15 @@ import pytz
 import requests
 from api_partner.helpers import (
     DB_USER_PARTNER,
+    MemberReportIndex,
     PartnerAccumStatusCHO,
+    get_fx_partner_on,
+    get_partner_values,
 )
 from api_partner.models import (
     BetenlaceCPA,
     BetenlaceDailyReport,
     Campaign,
-    FxPartner,
     Link,
     PartnerLinkAccumulated,
     PartnerLinkDailyReport,
@@ -357,19 +359,15 @@ def member_galera_bet(campaign_title, is_today=True):
     )
     partner_link_dailies_reports = PartnerLinkDailyReport.objects.filter(*filters)
 
-    # Get the Fx of previous day (today at 02:00 or today lte)
-    fx_created_at = update_datetime.replace(minute=0, hour=0, second=0, microsecond=0)
-    filters = (
-        Q(created_at__gte=fx_created_at),
+    # Hash index of links and daily reports for lookups by row
+    member_report_index = MemberReportIndex(
+        links=links,
+        betenlace_daily_reports=betenlace_daily_reports,
+        partner_link_dailies_reports=partner_link_dailies_reports,
     )
-    fx_partner = FxPartner.objects.filter(*filters).order_by("created_at").first()
 
-    if(fx_partner is None):
-        # Get just next from supplied date
-        filters = (
-            Q(created_at__lte=fx_created_at),
-        )
-        fx_partner = FxPartner.objects.filter(*filters).order_by("-created_at").first()
+    # Get the Fx of previous day (today at 02:00 or today lte)
+    fx_partner = get_fx_partner_on(fx_date=update_datetime)
 
     # If still none prevent execution
     if(fx_partner is None):
@@ -386,9 +384,6 @@ def member_galera_bet(campaign_title, is_today=True):
 
     fx_partner_percentage = fx_partner.fx_percentage
 
-    currency_condition_str = campaign.currency_condition.lower()
-    currency_fixed_income_str = campaign.currency_fixed_income.lower()
-
     # Acumulators bulk create and update
     # BetenlaceCPA
     member_reports_betenlace_month_update = []
@@ -405,7 +400,20 @@ def member_galera_bet(campaign_title, is_today=True):
     keys = {key: index for index, key in enumerate(df.columns.values)}
 
     list_logs = []
-    for row in zip(*df.to_dict('list').values()):
+    # Tracker and Fx of partners for all rows as column operations
+    tracked_keys = (
+        "deposit",
+    )
+    partner_values = get_partner_values(
+        # Galera bet not supply cpa, fixed income of partner is only for create
+        df=df.assign(cpa_count=0),
+        member_report_index=member_report_index,
+        campaign=campaign,
+        fx_partner=fx_partner,
+        tracked_keys=tracked_keys,
+    )
+
+    for row, partner_row in zip(zip(*df.to_dict('list').values()), partner_values):
         """
         - prom_code
         - registered_count
@@ -415,7 +423,7 @@ def member_galera_bet(campaign_title, is_today=True):
         - net_revenue
         """
         # Get link according to prom_code of current loop
-        link = next(filter(lambda link: link.prom_code == row[keys.get("prom_code")], links), None)
+        link = member_report_index.get_link(prom_code=row[keys.get("prom_code")])
 
         if not link:
             msg_warning = (
@@ -438,15 +446,9 @@ def member_galera_bet(campaign_title, is_today=True):
             continue
 
         # Betenlace Daily -  Betenlace Month
-        betenlace_daily = next(
-            filter(
-                lambda betenlace_daily: (
-                    betenlace_daily.betenlace_cpa_id == betenlace_cpa.pk and
-                    betenlace_daily.created_at == update_datetime.date()
-                ),
-                betenlace_daily_reports,
-            ),
-            None,
+        betenlace_daily = member_report_index.get_betenlace_daily(
+            betenlace_cpa_id=betenlace_cpa.pk,
+            created_at=update_datetime.date(),
         )
 
         if(betenlace_daily):
@@ -496,48 +498,32 @@ def member_galera_bet(campaign_title, is_today=True):
             list_logs.append(msg)
             continue
 
-        tracked_data = _get_tracker_values(
-            keys=keys,
-            row=row,
-            partner_link_accumulated=partner_link_accumulated,
-        )
-
-        # Get currency local from partner link accumulated
-        partner_currency_str = partner_link_accumulated.currency_local.lower()
-
-        # Fx Currency Fixed income
-        fx_fixed_income_partner = _calc_fx(
-            fx_partner=fx_partner,
-            fx_partner_percentage=fx_partner_percentage,
-            currency_from_str=currency_fixed_income_str,
-            partner_currency_str=partner_currency_str,
-        )
+        fx_fixed_income_partner = partner_row.get("fx_fixed_income_partner")
+        fx_condition_partner = partner_row.get("fx_condition_partner")
+        if (fx_fixed_income_partner is None or fx_condition_partner is None):
+            msg_error = (
+                f"Fx from currency \"{campaign.currency_fixed_income}\" or \"{campaign.currency_condition}\" "
+                f"to \"{partner_link_accumulated.currency_local}\" undefined for link with prom_code "
+                f"{partner_link_accumulated.prom_code}"
+            )
+            msg_error = f"*LEVEL:* `ERROR` \n*message:* `{msg_error}`\n\n"
+            logger_task.error(msg_error)
+            list_logs.append(msg_error)
+            continue
 
-        # Calculate fixed income for partner, on this case only for create
-        fixed_income_partner_unitary = campaign.fixed_income_unitary * partner_link_accumulated.percentage_cpa
-        fixed_income_partner = 0
-        fixed_income_partner_unitary_local = (
-            fixed_income_partner_unitary *
-            fx_fixed_income_partner
-        )
-        fixed_income_partner_local = 0
-
-        # Fx Currency Condition
-        fx_condition_partner = _calc_fx(
-            fx_partner=fx_partner,
-            fx_partner_percentage=fx_partner_percentage,
-            currency_from_str=currency_condition_str,
-            partner_currency_str=partner_currency_str,
-        )
+        # Tracker and fixed income of partner, on this case only for create
+        tracked_data = {
+            key: partner_row.get(f"tracked_{key}")
+            for key in tracked_keys
+            if keys.get(key) is not None
+        }
+        fixed_income_partner_unitary = partner_row.get("fixed_income_partner_unitary")
+        fixed_income_partner = partner_row.get("fixed_income_partner")
+        fixed_income_partner_unitary_local = partner_row.get("fixed_income_partner_unitary_local")
+        fixed_income_partner_local = partner_row.get("fixed_income_partner_local")
 
         # Partner Daily
-        partner_link_daily = next(
-            filter(
-                lambda partner_link_daily: partner_link_daily.betenlace_daily_report_id == betenlace_daily.id,
-                partner_link_dailies_reports,
-            ),
-            None,
-        )
+        partner_link_daily = member_report_index.get_partner_link_daily(betenlace_daily_report_id=betenlace_daily.id)
 
         if(partner_link_daily):
             # Recalculate fixed_incomes for update
@@ -693,60 +679,6 @@ def member_galera_bet(campaign_title, is_today=True):
     return
 
 
-def _get_tracker_values(
-    keys,
-    row,
-    partner_link_accumulated,
-):
-    tracked_data = {}
-    if (keys.get("deposit") is not None):
-        tracked_data["deposit"] = row[keys.get("deposit")]*partner_link_accumulated.tracker_deposit
-
-    # if (keys.get("registered_count") is not None):
-    #     if(row[keys.get("registered_count")] > 1):
-    #         tracked_data["registered_count"] = math.floor(
-    #             row[keys.get("registered_count")]*partner_link_accumulated.tracker_registered_count
-    #         )
-    #     else:
-    #         tracked_data["registered_count"] = row[keys.get("registered_count")]
-
-    # if (keys.get("first_deposit_count") is not None):
-    #     if(row[keys.get("first_deposit_count")] > 1):
-    #         tracked_data["first_deposit_count"] = math.floor(
-    #             row[keys.get("first_deposit_count")]*partner_link_accumulated.tracker_first_deposit_count
-    #         )
-    #     else:
-    #         tracked_data["first_deposit_count"] = row[keys.get("first_deposit_count")]
-
-    # if (keys.get("wagering_count") is not None):
-    #     if(row[keys.get("wagering_count")] > 1):
-    #         tracked_data["wagering_count"] = math.floor(
-    #             row[keys.get("wagering_count")]*partner_link_accumulated.tracker_wagering_count
-    #         )
-    #     else:
-    #         tracked_data["wagering_count"] = row[keys.get("wagering_count")]
-
-    return tracked_data
-
-
-def _calc_fx(
-    fx_partner,
-    fx_partner_percentage,
-    currency_from_str,
-    partner_currency_str,
-):
-    if(currency_from_str != partner_currency_str):
-        try:
-            fx_book_partner = eval(
-                f"fx_partner.fx_{currency_from_str}_{partner_currency_str}") * fx_partner_percentage
-        except:
-            logger_task.error(
-                f"Fx conversion from {currency_from_str} to {partner_currency_str} undefined on DB")
-    else:
-        fx_book_partner = 1
-    return fx_book_partner
-
-
 def _betenlace_daily_update(
     keys,
     row,
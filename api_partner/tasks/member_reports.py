@@ -0,0 +1,57 @@
+import pytz
+from api_partner.helpers import (
+    get_member_report_adapter,
+    run_member_reports,
+)
+from betenlace.celery import app
+from celery.utils.log import get_task_logger
+from core.tasks import chat_logger as chat_logger_task
+from django.conf import settings
+from django.utils import timezone
+from django.utils.timezone import timedelta
+
+logger_task = get_task_logger(__name__)
+
+
+@app.task(
+    ignore_result=True,
+)
+def member_reports(campaign_titles):
+    """
+    Get the member reports of many campaigns of yesterday on a single
+    task, the reports of all campaigns are downloaded concurrently with a
+    limit of requests by bookmaker and then are processed one by one.
+
+    The nightly ingestion window is the max of latencies of bookmaker APIs
+    instead of the sum when the campaigns are scheduled on this task
+    instead of a task by campaign
+
+    ### Args
+    - campaign_titles : `list`
+        Titles of campaigns like "betano pe", "yajuego 80". Titles
+        without adapter are ignored with error log
+    """
+    today = timezone.now().astimezone(pytz.timezone(settings.TIME_ZONE))
+    yesterday = today - timedelta(days=1)
+
+    adapters = []
+    for campaign_title in campaign_titles:
+        adapter = get_member_report_adapter(campaign_title=campaign_title)
+        if (adapter is None):
+            error_msg = f"Campaign with title \"{campaign_title}\" has not defined member report adapter"
+            error_msg = f"*LEVEL:* `ERROR` \n*message:* `{error_msg}`\n\n"
+            logger_task.error(error_msg)
+            chat_logger_task.apply_async(
+                kwargs={
+                    "msg": error_msg,
+                    "msg_url": settings.CHAT_WEBHOOK_CELERY,
+                },
+            )
+            continue
+        adapters.append(adapter)
+
+    run_member_reports(
+        adapters=adapters,
+        report_date=yesterday,
+    )
+    return
@@ -0,0 +1,45 @@
+from api_partner.helpers import (
+    DB_USER_PARTNER,
+    recount_link_counters,
+)
+from api_partner.models import Campaign
+from betenlace.celery import app
+from celery.utils.log import get_task_logger
+from core.tasks import chat_logger as chat_logger_task
+from django.conf import settings
+from django.db import transaction
+
+logger_task = get_task_logger(__name__)
+
+
+@app.task(
+    ignore_result=True,
+)
+def reconcile_link_counters():
+    """
+    Recount the counters of links of all campaigns and recalculate the
+    temperature of campaigns out of sync. Counters are maintained on
+    status transitions of links, this covers the writes out of models
+    (bulk operations, manual SQL).
+
+    Must be scheduled periodically (django_celery_beat)
+    """
+    from api_admin.helpers import recalculate_temperature
+
+    logger_task.info("Starting reconcile of counters of links of campaigns")
+    with transaction.atomic(using=DB_USER_PARTNER):
+        campaign_ids = recount_link_counters(using=DB_USER_PARTNER)
+        for campaign_i in Campaign.objects.using(DB_USER_PARTNER).filter(pk__in=campaign_ids):
+            recalculate_temperature(campaign_i)
+
+    if (campaign_ids):
+        msg = f"Counters of links out of sync on campaigns {campaign_ids}, were recalculated"
+        logger_task.warning(msg)
+        msg = f"*LEVEL:* `WARNING` \n*message:* `{msg}`\n\n"
+        chat_logger_task.apply_async(
+            kwargs={
+                "msg": msg,
+                "msg_url": settings.CHAT_WEBHOOK_CELERY,
+            },
+        )
+    logger_task.info(f"Ending reconcile of counters of links, {len(campaign_ids)} campaigns fixed")
@@ -0,0 +1,22 @@
+from api_partner.helpers import refresh_dirty_member_report_months
+from betenlace.celery import app
+from celery.utils.log import get_task_logger
+
+logger_task = get_task_logger(__name__)
+
+
+@app.task(
+    ignore_result=True,
+)
+def refresh_member_report_months():
+    """
+    Recalculate the month rollup of member report for the links and
+    months marked as dirty by the triggers of daily reports, covers all
+    writers of daily reports (member report engine, tasks by campaign,
+    click flush, manual edits of admins) on any month.
+
+    Must be scheduled periodically (django_celery_beat)
+    """
+    logger_task.info("Starting refresh of dirty member report months")
+    count = refresh_dirty_member_report_months()
+    logger_task.info(f"Ending refresh of member report months, created {count} rows")
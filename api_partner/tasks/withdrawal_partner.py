@@ -1,46 +1,67 @@
 import pytz
 from api_partner.helpers import (
     DB_USER_PARTNER,
+    WITHDRAWAL_DAILY_FIELDS,
+    WITHDRAWAL_FIXED_INCOME_FIELDS,
     PartnerStatusCHO,
+    calc_withdrawal_dailies,
+    get_latest_fx_partner,
+    get_withdrawal_dailies_df,
+    sum_withdrawal_partners,
+    withdrawal_daily_reports,
 )
 from api_partner.models import (
     AdditionalInfo,
-    Campaign,
-    FxPartner,
     MinWithdrawalPartnerMoney,
     OwnCompany,
-    Partner,
     PartnerBankAccount,
     PartnerLinkDailyReport,
     WithdrawalPartnerMoney,
     WithdrawalPartnerMoneyAccum,
+    WithdrawalPartnerRun,
 )
 from betenlace.celery import app
 from celery.utils.log import get_task_logger
-from core.helpers import (
-    CurrencyAll,
-    CurrencyCondition,
-    CurrencyFixedIncome,
-    CurrencyWithdrawalToUSD,
-)
+from core.helpers import CurrencyFixedIncome
 from core.models import User
 from dateutil.relativedelta import relativedelta
 from django.conf import settings
 from django.db import transaction
-from django.db.models import Q
+from django.db.models import (
+    Q,
+    Sum,
+)
 from django.utils import timezone
 
 logger_task = get_task_logger(__name__)
 
 
+class _BillingError(Exception):
+    """
+    Error that stops the billing, the billed batches are kept and the
+    next run continues after the last billed partner
+    """
+
+    def __init__(self, msg, critical=False):
+        self.critical = critical
+        super().__init__(msg)
+
+
 @app.task
-def withdrawal_partner():
+def withdrawal_partner(batch_size=None):
     """
     The Fx rate will be recalculated at the end of the month for the month
     being billed.
     The CPA payment percentage will be recalculated at the end of the month,
     so only on the next billing day will you be able to change the CPA
     percentage.
+
+    Partners are billed on batches of `batch_size` (default
+    `WITHDRAWAL_PARTNER_BATCH_SIZE`) each one on its own transaction with
+    the checkpoint on `WithdrawalPartnerRun`. When the previous run of the
+    billed month was not finished the billing continues after its last
+    partner with the same fx, company and min withdrawal, a finished month
+    is billed again from start.
     """
     # Alerts count
     critical_count = 0
@@ -54,422 +75,269 @@ def withdrawal_partner():
         f"Today -> {today}"
     )
 
+    batch_size = batch_size or settings.WITHDRAWAL_PARTNER_BATCH_SIZE
+
     prev_month_date = today + relativedelta(months=-1) + relativedelta(day=1)
     prev_month_date_last_day = prev_month_date + relativedelta(day=31)
 
     prev_year = prev_month_date.year
     prev_month = prev_month_date.month
 
-    filters = [
-        Q(created_at__month=prev_month),
-        Q(created_at__year=prev_year),
-        Q(cpa_count__isnull=False),
-    ]
-    partner_link_dailies = PartnerLinkDailyReport.objects.filter(
+    filters = (
+        Q(billed_to_at=prev_month_date_last_day.date()),
+    )
+    run = WithdrawalPartnerRun.objects.filter(
         *filters,
     ).select_related(
-        "partner_link_accumulated",
-        # "partner_link_accumulated__partner",
-        "betenlace_daily_report",
-    )
+        "fx_partner",
+        "own_company",
+        "min_withdrawal",
+    ).first()
+
+    if (run is None or run.status == WithdrawalPartnerRun.Status.SUCCESS):
+        filters = (
+            Q(created_at__lte=today),
+        )
+        own_company = OwnCompany.objects.filter(*filters).order_by("-created_at").first()
 
-    partners_id = set(partner_link_dailies.values_list("partner_link_accumulated__partner_id", flat=True))
-    campaigns_id = set(partner_link_dailies.values_list("partner_link_accumulated__campaign_id", flat=True))
+        if(own_company is None):
+            error_count += 1
+            error_msg = "Undefined own_company on DB"
+            logger_task.error(error_msg)
+            return f"crit:{critical_count} error:{error_count} warn:{warning_count} today:{today.date()} - {error_msg}"
 
-    filters = (
-        Q(id__in=partners_id),
-    )
-    users = User.objects.db_manager(DB_USER_PARTNER).filter(*filters).select_related("partner")
+        # Get the last Fx value
+        fx_partner = get_latest_fx_partner()
 
-    filters = (
-        Q(partner_id__in=partners_id),
-    )
-    additional_infos = AdditionalInfo.objects.db_manager(DB_USER_PARTNER).filter(*filters)
-
-    query = Q(is_primary=True) & Q(partner_id__in=partners_id)
-    bank_accounts = PartnerBankAccount.objects.filter(query)
+        if(fx_partner is None):
+            error_count += 1
+            error_msg = "Undefined fx_partner on DB"
+            logger_task.error(error_msg)
+            return f"crit:{critical_count} error:{error_count} warn:{warning_count} today:{today.date()} - {error_msg}"
 
-    filters = (
-        Q(id__in=campaigns_id),
-    )
-    campaigns = Campaign.objects.filter(*filters)
+        filters = (
+            Q(created_at__lte=today),
+        )
+        min_withdrawal = MinWithdrawalPartnerMoney.objects.filter(*filters).order_by("-created_at").first()
 
-    filters = (
-        Q(created_at__lte=today),
-    )
-    own_company = OwnCompany.objects.filter(*filters).order_by("-created_at").first()
+        if(min_withdrawal is None):
+            error_count += 1
+            error_msg = "Undefined min_withdrawal on DB"
+            logger_task.error(error_msg)
+            return f"crit:{critical_count} error:{error_count} warn:{warning_count} today:{today.date()} - {error_msg}"
 
-    if(own_company is None):
-        error_count += 1
-        error_msg = "Undefined own_company on DB"
-        logger_task.error(error_msg)
-        return f"crit:{critical_count} error:{error_count} warn:{warning_count} today:{today.date()} - {error_msg}"
+        if (run is None):
+            run = WithdrawalPartnerRun(billed_to_at=prev_month_date_last_day.date())
+        run.status = WithdrawalPartnerRun.Status.RUNNING
+        run.last_partner_id = None
+        run.partners_count = 0
+        run.finished_at = None
+        run.fx_partner = fx_partner
+        run.own_company = own_company
+        run.min_withdrawal = min_withdrawal
+        run.save()
+    else:
+        logger_task.info(
+            f"Continue billing of {run.billed_to_at} after partner id {run.last_partner_id}"
+        )
 
-    filters = (
-        Q(partner_id__in=partners_id),
-        ~Q(status=WithdrawalPartnerMoney.Status.PAYED),
+    dailies_filters = (
+        Q(created_at__month=prev_month),
+        Q(created_at__year=prev_year),
+        Q(cpa_count__isnull=False),
     )
-    withdrawals = WithdrawalPartnerMoney.objects.filter(
-        *filters,
-    ).prefetch_related("withdrawal_partner_money_accum_set")
 
-    # Get the last Fx value
-    filters = (
-        Q(created_at__lte=today),
+    filters = dailies_filters
+    if (run.last_partner_id is not None):
+        filters += (Q(partner_link_accumulated__partner_id__gt=run.last_partner_id),)
+    partners_id = list(
+        PartnerLinkDailyReport.objects.filter(
+            *filters,
+        ).values_list(
+            "partner_link_accumulated__partner_id",
+            flat=True,
+        ).order_by(
+            "partner_link_accumulated__partner_id",
+        ).distinct(),
     )
-    fx_partner = FxPartner.objects.filter(*filters).order_by("-created_at").first()
-
-    if(fx_partner is None):
-        error_count += 1
-        error_msg = "Undefined fx_partner on DB"
-        logger_task.error(error_msg)
-        return f"crit:{critical_count} error:{error_count} warn:{warning_count} today:{today.date()} - {error_msg}"
-
-    fx_partner_percentage = fx_partner.fx_percentage
 
-    filters = (
-        Q(created_at__lte=today),
-    )
-    min_withdrawal = MinWithdrawalPartnerMoney.objects.filter(*filters).order_by("-created_at").first()
-
-    if(min_withdrawal is None):
-        error_count += 1
-        error_msg = "Undefined min_withdrawal on DB"
-        logger_task.error(error_msg)
-        return f"crit:{critical_count} error:{error_count} warn:{warning_count} today:{today.date()} - {error_msg}"
-
-    withdrawal_partner_create = []
-    withdrawal_partner_update = []
-    withdrawal_partner_accum_create = []
-    withdrawal_partner_accum_update = []
-    partner_link_daily_report_update = []
-    for partner_id_i in partners_id:
-        # daily report of certain Partner
-        partner_dailies_iter = list(
-            filter(
-                lambda partner_link_daily: partner_link_daily.partner_link_accumulated.partner_id == partner_id_i,
-                partner_link_dailies,
-            )
+    for index in range(0, len(partners_id), batch_size):
+        batch_partners_id = partners_id[index:index + batch_size]
+        filters = dailies_filters + (
+            Q(partner_link_accumulated__partner_id__in=batch_partners_id),
         )
-
-        # Add normal currencies
-        fixed_incomes = {
-            f"fixed_income_{currency_i.lower()}": 0 for currency_i in CurrencyFixedIncome.labels
-        }
-
-        # Add transitories currencies to usd
-        fixed_incomes = fixed_incomes | {
-            f"fixed_income_{currency_i.lower()}_usd": 0 for currency_i in CurrencyWithdrawalToUSD.labels
-        }
-
-        # Add currencie local
-        fixed_incomes["fixed_income_local"] = 0
-
-        cpa_count_partner = 0
-
-        for campaign_id_i in campaigns_id:
-            # daily reports of certain campaign and previous Partner
-            partner_dailies_campaign_iter = list(
-                filter(
-                    lambda partner_daily_iter: (
-                        partner_daily_iter.partner_link_accumulated.campaign_id == campaign_id_i
-                    ),
-                    partner_dailies_iter,
-                )
+        try:
+            bills = _bill_partners(
+                partner_link_dailies_df=get_withdrawal_dailies_df(
+                    queryset=PartnerLinkDailyReport.objects.filter(*filters),
+                ),
+                partners_id=batch_partners_id,
+                run=run,
+                prev_month_date=prev_month_date,
+                prev_month_date_last_day=prev_month_date_last_day,
+            )
+        except _BillingError as e:
+            if (e.critical):
+                critical_count += 1
+                logger_task.critical(str(e))
+            else:
+                error_count += 1
+                logger_task.error(str(e))
+            return (
+                f"crit:{critical_count} error:{error_count} warn:{warning_count} today:{today.date()} - {e}"
             )
 
-            if (not partner_dailies_campaign_iter):
-                logger_task.warning(
-                    f"Partner id {partner_id_i}, do not have data on daily report of campaign id {campaign_id_i}"
-                )
-                continue
+        with transaction.atomic(using=DB_USER_PARTNER):
+            _save_bills(bills=bills)
 
-            campaign = next(
-                filter(
-                    lambda campaign: campaign.id == campaign_id_i,
-                    campaigns,
-                ),
-                None,
-            )
+            # Checkpoint of billed partners
+            run.last_partner_id = batch_partners_id[-1]
+            run.partners_count += len(batch_partners_id)
+            run.save(update_fields=("last_partner_id", "partners_count", "updated_at"))
 
-            campaign_currency_fixed_income = campaign.currency_fixed_income
+        logger_task.info(f"Billed {run.partners_count} partners, last partner id {run.last_partner_id}")
 
-            # Temporary currency condition is same to all incoming data
-            # This is used in case payment is not reflected on data and
-            # assume different to data
-            campaign_currency_condition = campaign.currency_condition
+    with transaction.atomic(using=DB_USER_PARTNER):
+        run.status = WithdrawalPartnerRun.Status.SUCCESS
+        run.finished_at = timezone.now()
+        run.save(update_fields=("status", "finished_at", "updated_at"))
 
-            # Must be same and only one per campaign and partner
-            partner_link_accumulated = partner_dailies_campaign_iter[0].partner_link_accumulated
+        # Update Fx percentage
+        fx_partner = run.fx_partner
+        fx_partner.save()
+        # For accummulated months must be run another command
+    return f"crit:{critical_count} error:{error_count} warn:{warning_count} today:{today.date()}"
 
-            currency_local = partner_link_accumulated.currency_local
+# Define local functions
 
-            campaign_currency_fixed_income_str = campaign_currency_fixed_income.lower()
-            campaign_currency_condition_str = campaign_currency_condition.lower()
-            partner_currency_str = currency_local.lower()
 
-            for partner_daily_i in partner_dailies_campaign_iter:
-                # Accumulate cpa
-                cpa_count_partner += partner_daily_i.cpa_count
+def _bill_partners(
+    partner_link_dailies_df,
+    partners_id,
+    run,
+    prev_month_date,
+    prev_month_date_last_day,
+):
+    """
+    Calculate the withdrawals, accums of billed month and daily reports of
+    partners of `partners_id` from its daily reports. Returns dict with
+    the instances to create and update, raises `_BillingError` when the
+    billing can not be calculated
+    """
+    own_company = run.own_company
+    fx_partner = run.fx_partner
+    fx_partner_percentage = fx_partner.fx_percentage
+    min_withdrawal = run.min_withdrawal
 
-                # Fixed income on Currency of Bookmaker, update daily of days of withdrawal
-                partner_daily_i.fixed_income = (
-                    campaign.fixed_income_unitary *
-                    partner_link_accumulated.percentage_cpa *
-                    partner_daily_i.cpa_count
-                )
-                partner_daily_i.percentage_cpa = partner_link_accumulated.percentage_cpa
-                partner_daily_i.fx_percentage = fx_partner_percentage
-                partner_daily_i.fixed_income_unitary = (
-                    partner_daily_i.fixed_income / partner_daily_i.cpa_count
-                    if partner_daily_i.cpa_count != 0
-                    else
-                    0
-                )
+    prev_year = prev_month_date.year
+    prev_month = prev_month_date.month
 
-                if (not campaign_currency_fixed_income in CurrencyFixedIncome):
-                    logger_task.critical(
-                        f"Currency {campaign_currency_fixed_income} fixed income not configured on enumerator MUST CHECK"
-                    )
-                    return
-
-                # Local conversions, Verifying if Local currency are same to
-                # payment for fixed income conversions
-                if (
-                    any(
-                        campaign_currency_fixed_income == currency_i and
-                        currency_local == currency_i
-                        for currency_i in CurrencyFixedIncome
-                    )
-                ):
-                    partner_daily_i.fixed_income_local = partner_daily_i.fixed_income
-                    partner_daily_i.fixed_income_unitary_local = (
-                        partner_daily_i.fixed_income_local / partner_daily_i.cpa_count
-                        if partner_daily_i.cpa_count != 0
-                        else
-                        0
-                    )
-
-                    partner_daily_i.fx_book_local = 1
-                    partner_daily_i.fx_percentage = fx_partner_percentage
-                else:
-                    # USDs conversions
-                    fx_book_usd = _calc_fx_no_percentage(
-                        fx_partner=fx_partner,
-                        currency_from=campaign_currency_fixed_income,
-                        currency_to=CurrencyAll.USD,
-                        currency_from_str=campaign_currency_fixed_income_str,
-                        currency_to_str=CurrencyAll.USD.lower(),
-                    )
-
-                    iter_usd = fx_book_usd * partner_daily_i.fixed_income
-
-                    # Add sum to transitory conversion, (all except same
-                    # currency usd)
-                    if (campaign_currency_fixed_income in CurrencyWithdrawalToUSD):
-                        fixed_incomes[f"fixed_income_{campaign_currency_fixed_income_str}_usd"] += iter_usd
-
-                    fx_usd_partner = _calc_fx(
-                        fx_partner=fx_partner,
-                        fx_partner_percentage=fx_partner_percentage,
-                        campaign_currency=CurrencyAll.USD,
-                        currency_local=currency_local,
-                        campaign_currency_fixed_income_str=CurrencyAll.USD.lower(),
-                        partner_currency_str=partner_currency_str,
-                    )
-                    # Fixed income on Currency of Partner
-                    partner_daily_i.fixed_income_local = iter_usd * fx_usd_partner
-                    partner_daily_i.fixed_income_unitary_local = (
-                        partner_daily_i.fixed_income_local / partner_daily_i.cpa_count
-                        if partner_daily_i.cpa_count != 0
-                        else
-                        0
-                    )
-
-                    partner_daily_i.fx_book_local = fx_book_usd * fx_usd_partner
-                    partner_daily_i.fx_percentage = fx_partner_percentage
-
-                # Calculate Fx book for adviser and Revenue share partner
-                # payment
-                if (
-                    any(
-                        campaign_currency_condition == currency_i and
-                        currency_local == currency_i
-                        for currency_i in CurrencyCondition
-                    )
-                ):
-                    # Here calculation of USDs for payment for RS and
-                    # netrevenue case
-                    partner_daily_i.fx_book_net_revenue_local = 1
-                else:
-                    # USDs conversions
-                    fx_book_usd = _calc_fx_no_percentage(
-                        fx_partner=fx_partner,
-                        currency_from=campaign_currency_condition,
-                        currency_to=CurrencyAll.USD,
-                        currency_from_str=campaign_currency_condition_str,
-                        currency_to_str=CurrencyAll.USD.lower(),
-                    )
-
-                    # Here must be calculate USD transition to currency
-                    # local for RS and net revenue payment
-                    fx_usd_local_net_revenue = _calc_fx(
-                        fx_partner=fx_partner,
-                        fx_partner_percentage=fx_partner_percentage,
-                        from_currency=CurrencyAll.USD,
-                        to_currency=currency_local,
-                        from_currency_str=CurrencyAll.USD.lower(),
-                        to_currency_str=partner_currency_str,
-                    )
-
-                    partner_daily_i.fx_book_net_revenue_local = fx_book_usd * fx_usd_local_net_revenue
-
-                # Calculate Adviser payment
-
-                # Update adviser
-                # partner = partner_daily_i.partner_link_accumulated.partner
-                # partner_daily_i.adviser_id = partner.adviser_id
-                # partner_daily_i.fixed_income_adviser_percentage = partner.fixed_income_adviser_percentage
-                # partner_daily_i.net_revenue_adviser_percentage = partner.net_revenue_adviser_percentage
-
-                if (partner_daily_i.fixed_income_adviser_percentage is not None):
-                    partner_daily_i.fixed_income_adviser = (
-                        partner_daily_i.fixed_income *
-                        partner_daily_i.fixed_income_adviser_percentage
-                    )
-                    partner_daily_i.fixed_income_adviser_local = (
-                        partner_daily_i.fixed_income_adviser *
-                        partner_daily_i.fx_book_local
-                    )
-
-                if (partner_daily_i.net_revenue_adviser_percentage is not None):
-                    partner_daily_i.net_revenue_adviser = (
-                        partner_daily_i.betenlace_daily_report.net_revenue *
-                        partner_daily_i.net_revenue_adviser_percentage
-                        if partner_daily_i.betenlace_daily_report.net_revenue is not None
-                        else
-                        0
-                    )
-                    partner_daily_i.net_revenue_adviser_local = (
-                        partner_daily_i.net_revenue_adviser *
-                        partner_daily_i.fx_book_net_revenue_local
-                    )
-
-                ####
-                if (partner_daily_i.fixed_income_referred_percentage is not None):
-                    partner_daily_i.fixed_income_referred = (
-                        partner_daily_i.fixed_income *
-                        partner_daily_i.fixed_income_referred_percentage
-                    )
-                    partner_daily_i.fixed_income_referred_local = (
-                        partner_daily_i.fixed_income_referred *
-                        partner_daily_i.fx_book_local
-                    )
-
-                if (partner_daily_i.net_revenue_referred_percentage is not None):
-                    partner_daily_i.net_revenue_referred = (
-                        partner_daily_i.betenlace_daily_report.net_revenue *
-                        partner_daily_i.net_revenue_referred_percentage
-                        if partner_daily_i.betenlace_daily_report.net_revenue is not None
-                        else
-                        0
-                    )
-                    partner_daily_i.net_revenue_referred_local = (
-                        partner_daily_i.net_revenue_referred *
-                        partner_daily_i.fx_book_net_revenue_local
-                    )
-
-                partner_link_daily_report_update.append(partner_daily_i)
-
-                # Sum accum
-                fixed_incomes[f"fixed_income_{campaign_currency_fixed_income_str}"] += partner_daily_i.fixed_income
-                fixed_incomes[f"fixed_income_local"] += partner_daily_i.fixed_income_local
-
-        # Sum all
-        current_fixed_income_usd_total = fixed_incomes.get("fixed_income_usd")
-
-        current_fixed_income_eur_total = fixed_incomes.get("fixed_income_eur")
-        current_fixed_income_eur_usd_total = fixed_incomes.get("fixed_income_eur_usd")
-
-        current_fixed_income_cop_total = fixed_incomes.get("fixed_income_cop")
-        current_fixed_income_cop_usd_total = fixed_incomes.get("fixed_income_cop_usd")
-
-        current_fixed_income_mxn_total = fixed_incomes.get("fixed_income_mxn")
-        current_fixed_income_mxn_usd_total = fixed_incomes.get("fixed_income_mxn_usd")
-
-        current_fixed_income_gbp_total = fixed_incomes.get("fixed_income_gbp")
-        current_fixed_income_gbp_usd_total = fixed_incomes.get("fixed_income_gbp_usd")
-
-        current_fixed_income_pen_total = fixed_incomes.get("fixed_income_pen")
-        current_fixed_income_pen_usd_total = fixed_incomes.get("fixed_income_pen_usd")
-
-        current_fixed_income_local_total = fixed_incomes.get("fixed_income_local")
-
-        cpa_count_accum = 0
-
-        # Get accumulations
-        withdrawal = next(filter(lambda withdrawal: withdrawal.partner_id == partner_id_i, withdrawals), None)
-        user = next(filter(lambda user: user.id == partner_id_i, users), None)
-        additional_info = next(
-            filter(
-                lambda additional_info: additional_info.pk == partner_id_i,
-                additional_infos,
-            ),
-            None,
+    currencies_not_configured = set(
+        partner_link_dailies_df.currency_fixed_income.unique(),
+    ) - set(CurrencyFixedIncome.values)
+    if (currencies_not_configured):
+        raise _BillingError(
+            f"Currencies {currencies_not_configured} fixed income not configured on enumerator MUST CHECK",
+            critical=True,
         )
-        bank_account = next(
-            (bank for bank in bank_accounts if bank.partner_id == partner_id_i),
-            None,
-        )
-        accum_id = None
 
-        if(withdrawal):
-            withdrawals_accum = withdrawal.withdrawal_partner_money_accum_set.values(
-                "fixed_income_usd",
-                "fixed_income_eur",
-                "fixed_income_eur_usd",
-                "fixed_income_cop",
-                "fixed_income_cop_usd",
-                "fixed_income_mxn",
-                "fixed_income_mxn_usd",
-                "fixed_income_gbp",
-                "fixed_income_gbp_usd",
-                "fixed_income_pen",
-                "fixed_income_pen_usd",
-                "fixed_income_local",
-                "cpa_count",
-                "accum_at",
-                "id",
-            )
-            for withdrawal_accum_i in withdrawals_accum:
-                # Ignore the accum of same current date
-                if(
-                    withdrawal_accum_i.get("accum_at").month == prev_month and
-                    withdrawal_accum_i.get("accum_at").year == prev_year
-                ):
-                    accum_id = withdrawal_accum_i.get("id")
-                    continue
-                current_fixed_income_usd_total += withdrawal_accum_i.get("fixed_income_usd")
+    bills = {
+        "withdrawal_create": [],
+        "withdrawal_update": [],
+        "withdrawal_accum_create": [],
+        "withdrawal_accum_update": [],
+        "partner_link_daily_report_update": [],
+    }
+    if (partner_link_dailies_df.empty):
+        return bills
+
+    undefined_fx = calc_withdrawal_dailies(
+        df=partner_link_dailies_df,
+        fx_partner=fx_partner,
+    )
+    if (undefined_fx.any()):
+        undefined_pairs = partner_link_dailies_df.loc[
+            undefined_fx,
+            ["currency_fixed_income", "currency_condition", "currency_local"],
+        ].drop_duplicates().to_numpy().tolist()
+        raise _BillingError(
+            "Fx conversion undefined on DB for (currency fixed income, currency condition, "
+            f"currency local) {undefined_pairs}",
+            critical=True,
+        )
 
-                current_fixed_income_eur_total += withdrawal_accum_i.get("fixed_income_eur")
-                current_fixed_income_eur_usd_total += withdrawal_accum_i.get("fixed_income_eur_usd")
+    bills["partner_link_daily_report_update"] = withdrawal_daily_reports(df=partner_link_dailies_df)
+    partner_totals = sum_withdrawal_partners(df=partner_link_dailies_df).to_dict(orient="index")
 
-                current_fixed_income_cop_total += withdrawal_accum_i.get("fixed_income_cop")
-                current_fixed_income_cop_usd_total += withdrawal_accum_i.get("fixed_income_cop_usd")
+    filters = (
+        Q(id__in=partners_id),
+    )
+    users = User.objects.db_manager(DB_USER_PARTNER).filter(*filters).select_related("partner").in_bulk()
 
-                current_fixed_income_mxn_total += withdrawal_accum_i.get("fixed_income_mxn")
-                current_fixed_income_mxn_usd_total += withdrawal_accum_i.get("fixed_income_mxn_usd")
+    filters = (
+        Q(partner_id__in=partners_id),
+    )
+    additional_infos = AdditionalInfo.objects.db_manager(DB_USER_PARTNER).filter(*filters).in_bulk()
 
-                current_fixed_income_gbp_total += withdrawal_accum_i.get("fixed_income_gbp")
-                current_fixed_income_gbp_usd_total += withdrawal_accum_i.get("fixed_income_gbp_usd")
+    query = Q(is_primary=True) & Q(partner_id__in=partners_id)
+    bank_accounts = {}
+    for bank_account_i in PartnerBankAccount.objects.filter(query):
+        bank_accounts.setdefault(bank_account_i.partner_id, bank_account_i)
 
-                current_fixed_income_pen_total += withdrawal_accum_i.get("fixed_income_pen")
-                current_fixed_income_pen_usd_total += withdrawal_accum_i.get("fixed_income_pen_usd")
+    filters = (
+        Q(partner_id__in=partners_id),
+        ~Q(status=WithdrawalPartnerMoney.Status.PAYED),
+    )
+    withdrawals = {}
+    for withdrawal_i in WithdrawalPartnerMoney.objects.filter(*filters):
+        withdrawals.setdefault(withdrawal_i.partner_id, withdrawal_i)
 
-                current_fixed_income_local_total += withdrawal_accum_i.get("fixed_income_local")
-                cpa_count_accum += withdrawal_accum_i.get("cpa_count")
+    # Accumulated of previous months not payed and the accum of billed
+    # month, this is recalculated
+    filters = (
+        Q(withdrawal_partner_money_id__in=[withdrawal_i.pk for withdrawal_i in withdrawals.values()]),
+    )
+    accums = WithdrawalPartnerMoneyAccum.objects.filter(*filters)
+    billed_month_filters = (
+        Q(accum_at__month=prev_month),
+        Q(accum_at__year=prev_year),
+    )
+    accums_prev = {
+        accum_i.pop("withdrawal_partner_money__partner_id"): accum_i
+        for accum_i in accums.exclude(
+            *billed_month_filters,
+        ).values(
+            "withdrawal_partner_money__partner_id",
+        ).annotate(
+            **{
+                f"prev_{key}": Sum(key)
+                for key in (*WITHDRAWAL_FIXED_INCOME_FIELDS, "cpa_count")
+            },
+        ).order_by()
+    }
+    accums_billed_month = {
+        accum_i.withdrawal_partner_money.partner_id: accum_i
+        for accum_i in accums.filter(*billed_month_filters).select_related("withdrawal_partner_money")
+    }
+
+    for partner_id_i, totals_i in partner_totals.items():
+        currency_local = totals_i.pop("currency_local")
+        cpa_count_partner = totals_i.pop("cpa_count")
+        fixed_incomes = totals_i
+
+        withdrawal = withdrawals.get(partner_id_i)
+        user = users.get(partner_id_i)
+        additional_info = additional_infos.get(partner_id_i)
+        bank_account = bank_accounts.get(partner_id_i)
+
+        accum_prev = accums_prev.get(partner_id_i, {})
+        cpa_count_accum = accum_prev.get("prev_cpa_count") or 0
+        current_fixed_incomes = {
+            key: fixed_incomes.get(key) + (accum_prev.get(f"prev_{key}") or 0)
+            for key in WITHDRAWAL_FIXED_INCOME_FIELDS
+        }
 
-            withdrawal.partner_id = partner_id_i
+        if(withdrawal):
             withdrawal.own_company = own_company
             withdrawal.bank_account = bank_account
             withdrawal.first_name = user.first_name
@@ -483,26 +351,10 @@ def withdrawal_partner():
             withdrawal.currency_local = currency_local
             withdrawal.cpa_count = cpa_count_accum + cpa_count_partner
             withdrawal.billed_to_at = prev_month_date_last_day
-            withdrawal.fixed_income_usd = current_fixed_income_usd_total
-
-            withdrawal.fixed_income_eur = current_fixed_income_eur_total
-            withdrawal.fixed_income_eur_usd = current_fixed_income_eur_usd_total
-
-            withdrawal.fixed_income_cop = current_fixed_income_cop_total
-            withdrawal.fixed_income_cop_usd = current_fixed_income_cop_usd_total
-
-            withdrawal.fixed_income_mxn = current_fixed_income_mxn_total
-            withdrawal.fixed_income_mxn_usd = current_fixed_income_mxn_usd_total
-
-            withdrawal.fixed_income_gbp = current_fixed_income_gbp_total
-            withdrawal.fixed_income_gbp_usd = current_fixed_income_gbp_usd_total
+            for key, value in current_fixed_incomes.items():
+                setattr(withdrawal, key, value)
 
-            withdrawal.fixed_income_pen = current_fixed_income_pen_total
-            withdrawal.fixed_income_pen_usd = current_fixed_income_pen_usd_total
-
-            withdrawal.fixed_income_local = current_fixed_income_local_total
-
-            withdrawal_partner_update.append(withdrawal)
+            bills["withdrawal_update"].append(withdrawal)
         else:
             # Discard case for none cpas
             if(cpa_count_partner == 0):
@@ -528,277 +380,115 @@ def withdrawal_partner():
                 billed_to_at=prev_month_date_last_day,
                 currency_local=currency_local,
                 cpa_count=cpa_count_accum + cpa_count_partner,
-
-                fixed_income_usd=current_fixed_income_usd_total,
-
-                fixed_income_eur=current_fixed_income_eur_total,
-                fixed_income_eur_usd=current_fixed_income_eur_usd_total,
-
-                fixed_income_cop=current_fixed_income_cop_total,
-                fixed_income_cop_usd=current_fixed_income_cop_usd_total,
-
-                fixed_income_mxn=current_fixed_income_mxn_total,
-                fixed_income_mxn_usd=current_fixed_income_mxn_usd_total,
-
-                fixed_income_gbp=current_fixed_income_gbp_total,
-                fixed_income_gbp_usd=current_fixed_income_gbp_usd_total,
-
-                fixed_income_pen=current_fixed_income_pen_total,
-                fixed_income_pen_usd=current_fixed_income_pen_usd_total,
-
-                fixed_income_local=current_fixed_income_local_total,
+                **current_fixed_incomes,
             )
-            withdrawal_partner_create.append(withdrawal)
+            bills["withdrawal_create"].append(withdrawal)
 
-        if(accum_id):
+        withdrawal_accum = accums_billed_month.get(partner_id_i)
+        if(withdrawal_accum):
             # Update accum at for same month
-            filters = (
-                Q(id=accum_id),
-            )
-            withdrawal_accum = WithdrawalPartnerMoneyAccum.objects.filter(*filters).first()
             withdrawal_accum.withdrawal_partner_money = withdrawal
             withdrawal_accum.cpa_count = cpa_count_partner
-
-            withdrawal_accum.fixed_income_usd = fixed_incomes.get("fixed_income_usd")
-
-            withdrawal_accum.fixed_income_eur = fixed_incomes.get("fixed_income_eur")
-            withdrawal_accum.fixed_income_eur_usd = fixed_incomes.get("fixed_income_eur_usd")
-
-            withdrawal_accum.fixed_income_cop = fixed_incomes.get("fixed_income_cop")
-            withdrawal_accum.fixed_income_cop_usd = fixed_incomes.get("fixed_income_cop_usd")
-
-            withdrawal_accum.fixed_income_mxn = fixed_incomes.get("fixed_income_mxn")
-            withdrawal_accum.fixed_income_mxn_usd = fixed_incomes.get("fixed_income_mxn_usd")
-
-            withdrawal_accum.fixed_income_gbp = fixed_incomes.get("fixed_income_gbp")
-            withdrawal_accum.fixed_income_gbp_usd = fixed_incomes.get("fixed_income_gbp_usd")
-
-            withdrawal_accum.fixed_income_pen = fixed_incomes.get("fixed_income_pen")
-            withdrawal_accum.fixed_income_pen_usd = fixed_incomes.get("fixed_income_pen_usd")
-
+            for key, value in fixed_incomes.items():
+                setattr(withdrawal_accum, key, value)
             withdrawal_accum.fx_partner = fx_partner
             withdrawal_accum.fx_percentage = fx_partner_percentage
-
-            withdrawal_accum.fixed_income_local = fixed_incomes.get("fixed_income_local")
             withdrawal_accum.currency_local = currency_local
             withdrawal_accum.partner_level = user.partner.level
 
-            withdrawal_partner_accum_update.append(withdrawal_accum)
+            bills["withdrawal_accum_update"].append(withdrawal_accum)
         else:
             # Create accum
             withdrawal_accum = WithdrawalPartnerMoneyAccum(
                 withdrawal_partner_money=withdrawal,
                 cpa_count=cpa_count_partner,
-
-                fixed_income_usd=fixed_incomes.get("fixed_income_usd"),
-
-                fixed_income_eur=fixed_incomes.get("fixed_income_eur"),
-                fixed_income_eur_usd=fixed_incomes.get("fixed_income_eur_usd"),
-
-                fixed_income_cop=fixed_incomes.get("fixed_income_cop"),
-                fixed_income_cop_usd=fixed_incomes.get("fixed_income_cop_usd"),
-
-                fixed_income_mxn=fixed_incomes.get("fixed_income_mxn"),
-                fixed_income_mxn_usd=fixed_incomes.get("fixed_income_mxn_usd"),
-
-                fixed_income_gbp=fixed_incomes.get("fixed_income_gbp"),
-                fixed_income_gbp_usd=fixed_incomes.get("fixed_income_gbp_usd"),
-
-                fixed_income_pen=fixed_incomes.get("fixed_income_pen"),
-                fixed_income_pen_usd=fixed_incomes.get("fixed_income_pen_usd"),
-
-                fixed_income_local=fixed_incomes.get("fixed_income_local"),
-
+                **fixed_incomes,
                 fx_partner=fx_partner,
                 fx_percentage=fx_partner_percentage,
-
                 currency_local=currency_local,
                 accum_at=prev_month_date_last_day,
                 partner_level=user.partner.level,
             )
-            withdrawal_partner_accum_create.append(withdrawal_accum)
-
-        try:
-            min_local = eval(f"min_withdrawal.min_{partner_currency_str}")
-        except:
-            error_count += 1
-            error_msg = f"Error at get withdrawal min for partner_id {partner_id_i}"
-            logger_task.error(error_msg)
-            return f"crit:{critical_count} error:{error_count} warn:{warning_count} today:{today.date()} - {error_msg}"
+            bills["withdrawal_accum_create"].append(withdrawal_accum)
 
         partner = user.partner
+        # Min of withdrawal is defined by level of partner
+        min_local = min_withdrawal.min_usd_by_level.get(str(partner.level or "0"))
+        if (min_local is None):
+            raise _BillingError(f"Error at get withdrawal min for partner_id {partner_id_i}")
+
         if partner.bank_status == PartnerStatusCHO.ACCEPTED:
-            if current_fixed_income_local_total >= min_local:
+            if current_fixed_incomes.get("fixed_income_local") >= min_local:
                 withdrawal.status = WithdrawalPartnerMoney.Status.TO_PAY
             else:
                 withdrawal.status = WithdrawalPartnerMoney.Status.NOT_READY
         else:
             withdrawal.status = WithdrawalPartnerMoney.Status.NO_INFO
 
-    with transaction.atomic(using=DB_USER_PARTNER):
-        if(withdrawal_partner_create):
-            WithdrawalPartnerMoney.objects.bulk_create(objs=withdrawal_partner_create)
-
-        if(withdrawal_partner_update):
-            WithdrawalPartnerMoney.objects.bulk_update(
-                objs=withdrawal_partner_update,
-                fields=(
-                    "own_company",
-                    "bank_account",
-                    "first_name",
-                    "second_name",
-                    "last_name",
-                    "second_last_name",
-                    "email",
-                    "phone",
-                    "country",
-                    "city",
-                    "address",
-                    "identification",
-                    "identification_type",
-                    "currency_local",
-                    "status",
-                    "cpa_count",
-                    "billed_to_at",
-
-                    "fixed_income_usd",
-
-                    "fixed_income_eur",
-                    "fixed_income_eur_usd",
-
-                    "fixed_income_cop",
-                    "fixed_income_cop_usd",
-
-                    "fixed_income_mxn",
-                    "fixed_income_mxn_usd",
-
-                    "fixed_income_gbp",
-                    "fixed_income_gbp_usd",
-
-                    "fixed_income_pen",
-                    "fixed_income_pen_usd",
-
-                    "fixed_income_local",
-                ),
-            )
-        if(withdrawal_partner_accum_create):
-            WithdrawalPartnerMoneyAccum.objects.bulk_create(objs=withdrawal_partner_accum_create)
-
-        if(withdrawal_partner_accum_update):
-            WithdrawalPartnerMoneyAccum.objects.bulk_update(
-                objs=withdrawal_partner_accum_update,
-                fields=(
-                    "withdrawal_partner_money",
-                    "cpa_count",
-
-                    "fixed_income_usd",
-
-                    "fixed_income_eur",
-                    "fixed_income_eur_usd",
-
-                    "fixed_income_cop",
-                    "fixed_income_cop_usd",
-
-                    "fixed_income_mxn",
-                    "fixed_income_mxn_usd",
+    return bills
 
-                    "fixed_income_gbp",
-                    "fixed_income_gbp_usd",
 
-                    "fixed_income_pen",
-                    "fixed_income_pen_usd",
-
-                    "fx_partner",
-                    "fx_percentage",
-
-                    "fixed_income_local",
-                    "currency_local",
-                    "partner_level",
-                ),
-            )
-
-        if(partner_link_daily_report_update):
-            PartnerLinkDailyReport.objects.bulk_update(
-                objs=partner_link_daily_report_update,
-                fields=(
-                    "fixed_income",
-                    "fixed_income_unitary",
-                    "fixed_income_local",
-                    "fixed_income_unitary_local",
-                    "fx_book_local",
-                    "fx_book_net_revenue_local",
-                    "fx_percentage",
-                    "percentage_cpa",
-                    "fixed_income_adviser",
-                    "fixed_income_adviser_local",
-                    "net_revenue_adviser",
-                    "net_revenue_adviser_local",
-                    "fixed_income_referred",
-                    "fixed_income_referred_local",
-                    "net_revenue_referred",
-                    "net_revenue_referred_local",
-
-                )
-            )
-        # Update Fx percentage
-        fx_partner.fx_percentage = fx_partner_percentage
-        fx_partner.save()
-        # For accummulated months must be run another command
-    return f"crit:{critical_count} error:{error_count} warn:{warning_count} today:{today.date()}"
-
-# Define local functions
+def _save_bills(bills):
+    """
+    Save instances calculated by `_bill_partners`, must be called inside
+    a transaction
+    """
+    if(bills.get("withdrawal_create")):
+        WithdrawalPartnerMoney.objects.bulk_create(
+            objs=bills.get("withdrawal_create"),
+            batch_size=999,
+        )
 
+    if(bills.get("withdrawal_update")):
+        WithdrawalPartnerMoney.objects.bulk_update(
+            objs=bills.get("withdrawal_update"),
+            fields=(
+                "own_company",
+                "bank_account",
+                "first_name",
+                "second_name",
+                "last_name",
+                "second_last_name",
+                "email",
+                "phone",
+                "country",
+                "city",
+                "address",
+                "identification",
+                "identification_type",
+                "currency_local",
+                "status",
+                "cpa_count",
+                "billed_to_at",
+                *WITHDRAWAL_FIXED_INCOME_FIELDS,
+            ),
+            batch_size=999,
+        )
 
-def _calc_fx(
-    fx_partner,
-    fx_partner_percentage,
-    campaign_currency,
-    currency_local,
-    campaign_currency_fixed_income_str,
-    partner_currency_str,
-):
-    if(campaign_currency == currency_local):
-        # Special Case for usd at conversion for "local" payment includes fx_percentage
-        fx_book_partner = 1 * fx_partner_percentage
-    else:
-        if(campaign_currency in CurrencyFixedIncome.values):
-            fx_book_partner = None
-            try:
-                fx_book_partner = eval(
-                    f"fx_partner.fx_{campaign_currency_fixed_income_str}_{partner_currency_str}"
-                ) * fx_partner_percentage
-            except:
-                logger_task.critical(
-                    f"Fx conversion from {campaign_currency_fixed_income_str} to {partner_currency_str} undefined on DB"
-                )
-        else:
-            logger_task.critical("Currency not defined on field of Model Withdrawal")
-    return fx_book_partner
+    if(bills.get("withdrawal_accum_create")):
+        WithdrawalPartnerMoneyAccum.objects.bulk_create(
+            objs=bills.get("withdrawal_accum_create"),
+            batch_size=999,
+        )
 
+    if(bills.get("withdrawal_accum_update")):
+        WithdrawalPartnerMoneyAccum.objects.bulk_update(
+            objs=bills.get("withdrawal_accum_update"),
+            fields=(
+                "withdrawal_partner_money",
+                "cpa_count",
+                *WITHDRAWAL_FIXED_INCOME_FIELDS,
+                "fx_partner",
+                "fx_percentage",
+                "currency_local",
+                "partner_level",
+            ),
+            batch_size=999,
+        )
 
-def _calc_fx_no_percentage(
-    fx_partner,
-    currency_from,
-    currency_to,
-    currency_from_str,
-    currency_to_str,
-):
-    if(currency_from == currency_to):
-        fx_book_partner = 1
-    else:
-        if(currency_from in CurrencyWithdrawalToUSD.values):
-            fx_book_partner = None
-            try:
-                fx_book_partner = eval(
-                    f"fx_partner.fx_{currency_from_str}_{currency_to_str}"
-                )
-            except:
-                logger_task.critical(
-                    f"Fx conversion from {currency_from_str} to {currency_to_str} undefined on DB"
-                )
-        else:
-            logger_task.critical(
-                f"Currency {currency_from} not defined on field of Model Withdrawal for to USD columns"
-            )
-    return fx_book_partner
-    # For accumulated months must be run another command
+    if(bills.get("partner_link_daily_report_update")):
+        PartnerLinkDailyReport.objects.bulk_update(
+            objs=bills.get("partner_link_daily_report_update"),
+            fields=WITHDRAWAL_DAILY_FIELDS,
+            batch_size=999,
+        )
@@ -1,6 +1,11 @@
 import logging
+from functools import partial
 
-from api_partner.helpers import get_client_ip
+from api_partner.helpers import (
+    get_client_ip,
+    get_redirect_target,
+    push_click,
+)
 from api_partner.models import (
     Campaign,
     Link,
@@ -157,60 +162,56 @@ class ClickReportTwoParamsAPI(APIView):
         #  Check if campaign param is some betfair col campaign
         if (validator.document.get("campaign") == "betfair col"):
             filters.append(Q(campaign_title__istartswith=validator.document.get("campaign")))
-            link, campaign = self._multiple_case(filters, validator,)
+            case = "multiple"
+            resolve = partial(self._multiple_case, filters, validator,)
         else:
             filters.append(Q(campaign_title__iexact=validator.document.get("campaign")))
-            link, campaign = self._normal_case(filters, validator,)
+            case = "normal"
+            resolve = partial(self._normal_case, filters, validator,)
+
+        # Resolution from cache, DB is only used when is not cached
+        redirect_target = get_redirect_target(
+            case=case,
+            campaign_title=validator.document.get("campaign"),
+            prom_code=validator.document.get("prom_code"),
+            resolve=resolve,
+        )
 
-        if not link or not campaign:
+        if not redirect_target:
             return HttpResponseRedirect(redirect_to=settings.URL_REDIRECT_CAMPAIGN_ERROR + request.path)
 
         ip_client = get_client_ip(request)
-        click_count_task.apply_async(
-            (
-                link.pk,
-                campaign.currency_condition,
-                campaign.currency_fixed_income,
-                ip_client
-            ),
-            ignore_result=True
+        # Clicks are counted in bulk by task flush_clicks, without Redis
+        # every click is counted by its own task
+        is_buffered = push_click(
+            link_id=redirect_target.get("link_id"),
+            currency_condition=redirect_target.get("currency_condition"),
+            currency_fixed_income=redirect_target.get("currency_fixed_income"),
+            ip_client=ip_client,
         )
-        return HttpResponseRedirect(redirect_to=link.url)
+        if (not is_buffered):
+            click_count_task.apply_async(
+                (
+                    redirect_target.get("link_id"),
+                    redirect_target.get("currency_condition"),
+                    redirect_target.get("currency_fixed_income"),
+                    ip_client
+                ),
+                ignore_result=True
+            )
+        return HttpResponseRedirect(redirect_to=redirect_target.get("url"))
 
 
 class ClickReportThreeParamsAPI(APIView):
     """ Resource to add click """
 
-    def get(self, request, **url_kwargs):
-        validator = Validator(
-            schema={
-                "langague": {
-                    "required": True,
-                    "type": "string",
-                    "coerce": to_lower,
-                    "regex": "(?i)(es)",
-                },
-                "campaign": {
-                    "required": True,
-                    "type": "string",
-                    "coerce": to_campaign_redirect,
-                },
-                "prom_code": {
-                    "required": True,
-                    "type": "string",
-                    "coerce": to_campaign_redirect,
-                },
-            },
-        )
-
-        if not validator.validate(url_kwargs):
-            return HttpResponseRedirect(
-                redirect_to=(
-                    settings.URL_REDIRECT_CAMPAIGN_ERROR +
-                    request.path
-                )
-            )
+    def _get_link(self, validator):
+        '''
+            Function that get the campaign that contains the campaign param and the link of
+            this campaign with validator.prom_code
 
+            return link and campaign object
+        '''
         campaign = Campaign.objects.annotate(
             campaign_title=Concat(
                 "bookmaker__name",
@@ -226,12 +227,7 @@ class ClickReportThreeParamsAPI(APIView):
                 f"not found campaign with campaign \"{validator.document.get('campaign')}\" and prom_code "
                 f"\"{validator.document.get('prom_code')}\""
             )
-            return HttpResponseRedirect(
-                redirect_to=(
-                    settings.URL_REDIRECT_CAMPAIGN_ERROR +
-                    request.path
-                )
-            )
+            return None, None
 
         link = Link.objects.filter(
             Q(
@@ -247,6 +243,48 @@ class ClickReportThreeParamsAPI(APIView):
                 f"not found link with campaign {validator.document.get('campaign')} and prom_code "
                 f"\"{validator.document.get('prom_code')}"
             )
+            return None, None
+        return link, campaign
+
+    def get(self, request, **url_kwargs):
+        validator = Validator(
+            schema={
+                "langague": {
+                    "required": True,
+                    "type": "string",
+                    "coerce": to_lower,
+                    "regex": "(?i)(es)",
+                },
+                "campaign": {
+                    "required": True,
+                    "type": "string",
+                    "coerce": to_campaign_redirect,
+                },
+                "prom_code": {
+                    "required": True,
+                    "type": "string",
+                    "coerce": to_campaign_redirect,
+                },
+            },
+        )
+
+        if not validator.validate(url_kwargs):
+            return HttpResponseRedirect(
+                redirect_to=(
+                    settings.URL_REDIRECT_CAMPAIGN_ERROR +
+                    request.path
+                )
+            )
+
+        # Resolution from cache, DB is only used when is not cached
+        redirect_target = get_redirect_target(
+            case="contains",
+            campaign_title=validator.document.get("campaign"),
+            prom_code=validator.document.get("prom_code"),
+            resolve=partial(self._get_link, validator),
+        )
+
+        if not redirect_target:
             return HttpResponseRedirect(
                 redirect_to=(
                     settings.URL_REDIRECT_CAMPAIGN_ERROR +
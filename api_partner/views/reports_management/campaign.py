@@ -1,6 +1,5 @@
 import logging
 
-from api_admin.models import LevelPercentageBase
 from api_partner.helpers import (
     DB_USER_PARTNER,
     HasLevel,
@@ -9,11 +8,12 @@ from api_partner.helpers import (
     IsTerms,
     PartnerAccumStatusCHO,
     fx_conversion_campaign_fixed_income_cases,
+    get_latest_fx_partner,
+    get_latest_level_percentage,
 )
 from api_partner.models import (
     AdditionalInfo,
     Campaign,
-    FxPartner,
     Link,
     Partner,
     PartnerLinkAccumulated,
@@ -34,7 +34,6 @@ from django.db.models import (
     Value,
 )
 from django.db.models.functions import Concat
-from django.utils import timezone
 from django.utils.translation import gettext as _
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
@@ -95,7 +94,7 @@ class CampaignPartnerAPI(APIView):
         user = request.user
         partner = request.user.partner
 
-        level = LevelPercentageBase.objects.order_by("-created_at").first()
+        level = get_latest_level_percentage()
         partner = Partner.objects.filter(user_id=request.user.id).first()
         query = Q(cpa_count__gt=0, partner_link_accumulated__partner_id=request.user.id)
         partner_daily = PartnerLinkDailyReport.objects.filter(query)
@@ -213,18 +212,7 @@ class CampaignPartnerAPI(APIView):
             ),
         ).order_by("-temperature")
 
-        filters = (
-            Q(created_at__gte=timezone.now()),
-        )
-
-        fx_partner = FxPartner.objects.using(DB_USER_PARTNER).filter(*filters).order_by("created_at").first()
-
-        if(fx_partner is None):
-            # Get just next from supplied date
-            filters = (
-                Q(created_at__lte=timezone.now()),
-            )
-            fx_partner = FxPartner.objects.filter(*filters).order_by("-created_at").first()
+        fx_partner = get_latest_fx_partner(using=DB_USER_PARTNER)
 
         fx_partner_percentage = fx_partner.fx_percentage
 
@@ -334,20 +322,9 @@ class CampaignAssignedAPI(APIView):
             ),
         ).order_by("-temperature").distinct()
 
-        filters = (
-            Q(created_at__gte=timezone.now()),
-        )
-
-        fx_partner = FxPartner.objects.using(DB_USER_PARTNER).filter(*filters).order_by("created_at").first()
-
-        if(fx_partner is None):
-            # Get just next from supplied date
-            filters = (
-                Q(created_at__lte=timezone.now()),
-            )
-            fx_partner = FxPartner.objects.filter(*filters).order_by("-created_at").first()
+        fx_partner = get_latest_fx_partner(using=DB_USER_PARTNER)
 
-        level = LevelPercentageBase.objects.order_by("-created_at").first()
+        level = get_latest_level_percentage()
         partner = Partner.objects.filter(user_id=request.user.id).first()
 
         fx_partner_percentage = fx_partner.fx_percentage
@@ -4,13 +4,13 @@ from api_partner.helpers.choices.partner_link_accum_status import PartnerAccumUp
 
 import pytz
 from api_admin.helpers import recalculate_temperature
-from api_admin.models import LevelPercentageBase
 from api_partner.helpers import (
     DB_USER_PARTNER,
     IsActive,
     IsNotBanned,
     IsTerms,
     PartnerLevelCHO,
+    get_latest_level_percentage,
 )
 from api_partner.models import (
     BetenlaceDailyReport,
@@ -166,7 +166,7 @@ class LinkPartnerAPI(APIView):
         campaign = link.campaign
 
         partner = Partner.objects.filter(user_id=request.user.id).first()
-        level_percentages = LevelPercentageBase.objects.all().order_by("-created_at").first()
+        level_percentages = get_latest_level_percentage()
 
         # Update case
         if partner_accumulated is not None and not partner_accumulated.is_assigned:
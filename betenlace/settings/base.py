@@ -340,6 +340,14 @@ CELERY_TASK_SERIALIZER = 'json'
 # Withdrawals
 WITHDRAWAL_AMOUNT = os.getenv('WITHDRAWAL_AMOUNT')
 
+# Cache - Redis shared between processes, when is not defined only the
+# local cache of every process is used
+REDIS_CACHE_URL = os.getenv("REDIS_CACHE_URL")
+REDIS_CACHE_TIMEOUT_SECONDS = float(os.getenv("REDIS_CACHE_TIMEOUT_SECONDS", "0.2"))
+# Seconds between logs of hits and misses of every cache by process, 0
+# disables the logs
+CACHE_STATS_LOG_SECONDS = int(os.getenv("CACHE_STATS_LOG_SECONDS", "600"))
+
 # Custom vars - account report
 MIN_CPA_TRACKER_DAY = int(os.getenv("MIN_CPA_TRACKER_DAY", "5"))
 
@@ -351,6 +359,68 @@ FIRST_ADMIN_CODE = os.getenv("FIRST_ADMIN_CODE")
 
 # Custom vars - click period seconds
 CLICK_PERIOD_SECONDS = int(os.getenv("CLICK_PERIOD_SECONDS", "600"))
+# Max sessions of clicks on memory of every process, used without Redis
+CLICK_SESSION_LOCAL_SIZE = int(os.getenv("CLICK_SESSION_LOCAL_SIZE", "100000"))
+
+# Custom vars - Buffer of clicks, max clicks counted by every bulk update
+CLICK_BUFFER_BATCH_SIZE = int(os.getenv("CLICK_BUFFER_BATCH_SIZE", "5000"))
+
+# Custom vars - Load of punters of account reports, rows copied to DB by
+# every chunk
+ACCOUNT_LOADER_CHUNK_SIZE = int(os.getenv("ACCOUNT_LOADER_CHUNK_SIZE", "50000"))
+
+# Custom vars - Billing of partners, partners billed by every transaction
+WITHDRAWAL_PARTNER_BATCH_SIZE = int(os.getenv("WITHDRAWAL_PARTNER_BATCH_SIZE", "500"))
+
+# Custom vars - Exports of reports, rows read by query of server side
+# cursor and dir of temporary files of XLSX (default dir of system)
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", "2000"))
+EXPORT_TMP_DIR = os.getenv("EXPORT_TMP_DIR") or None
+
+# Custom vars - Background export jobs, jobs without progress after
+# EXPORT_JOB_TIMEOUT_SECONDS are failed (running) or requeued (pending),
+# files of finished jobs are removed after EXPORT_JOB_RETENTION_DAYS
+EXPORT_JOB_TIMEOUT_SECONDS = int(os.getenv("EXPORT_JOB_TIMEOUT_SECONDS", "3600"))
+EXPORT_JOB_RETENTION_DAYS = int(os.getenv("EXPORT_JOB_RETENTION_DAYS", "7"))
+
+# Custom vars - Buffer of chat logger, messages of a webhook are sent
+# together after CHAT_BUFFER_FLUSH_SECONDS or when CHAT_BUFFER_MAX_MESSAGES
+# are buffered, with at most CHAT_RATE_PER_MINUTE requests by webhook
+CHAT_BUFFER_FLUSH_SECONDS = int(os.getenv("CHAT_BUFFER_FLUSH_SECONDS", "10"))
+CHAT_BUFFER_MAX_MESSAGES = int(os.getenv("CHAT_BUFFER_MAX_MESSAGES", "50"))
+CHAT_RATE_PER_MINUTE = int(os.getenv("CHAT_RATE_PER_MINUTE", "50"))
+CHAT_RATE_BURST = int(os.getenv("CHAT_RATE_BURST", "10"))
+CHAT_HTTP_POOL_SIZE = int(os.getenv("CHAT_HTTP_POOL_SIZE", "4"))
+
+# Custom vars - Fetch of bookmaker reports
+REPORT_FETCH_MAX_WORKERS = int(os.getenv("REPORT_FETCH_MAX_WORKERS", "8"))
+REPORT_FETCH_MAX_RETRIES = int(os.getenv("REPORT_FETCH_MAX_RETRIES", "5"))
+REPORT_FETCH_BACKOFF_SECONDS = float(os.getenv("REPORT_FETCH_BACKOFF_SECONDS", "1"))
+REPORT_FETCH_TIMEOUT_SECONDS = int(os.getenv("REPORT_FETCH_TIMEOUT_SECONDS", "300"))
+REPORT_CSV_CHUNKSIZE = int(os.getenv("REPORT_CSV_CHUNKSIZE", "50000"))
+
+# Custom vars - Cache of redirect resolution
+REDIRECT_CACHE_SECONDS = int(os.getenv("REDIRECT_CACHE_SECONDS", "3600"))
+REDIRECT_CACHE_LOCAL_SECONDS = int(os.getenv("REDIRECT_CACHE_LOCAL_SECONDS", "30"))
+REDIRECT_CACHE_LOCAL_SIZE = int(os.getenv("REDIRECT_CACHE_LOCAL_SIZE", "10000"))
+
+# Custom vars - Cache of authentication tokens, a change of user or token
+# is applied on all processes after TOKEN_CACHE_LOCAL_SECONDS at most
+TOKEN_CACHE_SECONDS = int(os.getenv("TOKEN_CACHE_SECONDS", "3600"))
+TOKEN_CACHE_LOCAL_SECONDS = int(os.getenv("TOKEN_CACHE_LOCAL_SECONDS", "10"))
+TOKEN_CACHE_LOCAL_SIZE = int(os.getenv("TOKEN_CACHE_LOCAL_SIZE", "10000"))
+
+# Custom vars - Cache of permissions by rol and user
+PERMISSION_CACHE_SECONDS = int(os.getenv("PERMISSION_CACHE_SECONDS", "86400"))
+PERMISSION_CACHE_LOCAL_SECONDS = int(os.getenv("PERMISSION_CACHE_LOCAL_SECONDS", "10"))
+PERMISSION_CACHE_LOCAL_SIZE = int(os.getenv("PERMISSION_CACHE_LOCAL_SIZE", "1000"))
+
+# Custom vars - Cache of reference data (Fx, percentages by level, min
+# withdrawal), a write on them is applied on all processes after
+# REFERENCE_CACHE_LOCAL_SECONDS at most
+REFERENCE_CACHE_SECONDS = int(os.getenv("REFERENCE_CACHE_SECONDS", "86400"))
+REFERENCE_CACHE_LOCAL_SECONDS = int(os.getenv("REFERENCE_CACHE_LOCAL_SECONDS", "10"))
+REFERENCE_CACHE_LOCAL_SIZE = int(os.getenv("REFERENCE_CACHE_LOCAL_SIZE", "1000"))
 
 # Custom vars - Yajuego API logging data
 API_ACCOUNT_REPORT_YAJUEGO50_KEY = os.getenv("API_ACCOUNT_REPORT_YAJUEGO50_KEY")
@@ -646,6 +716,13 @@ MAX_CAMPAIGN_PARTNER = 3
 
 # Custom vars - IP LIST
 IP_LIST_CALL = os.getenv("IP_LIST_CALL")
+IPLIST_TIMEOUT_SECONDS = float(os.getenv("IPLIST_TIMEOUT_SECONDS", "3"))
+IPLIST_CACHE_SECONDS = int(os.getenv("IPLIST_CACHE_SECONDS", "86400"))
+IPLIST_CACHE_LOCAL_SECONDS = int(os.getenv("IPLIST_CACHE_LOCAL_SECONDS", "300"))
+IPLIST_CACHE_LOCAL_SIZE = int(os.getenv("IPLIST_CACHE_LOCAL_SIZE", "50000"))
+# CSV of ip ranges with registry, country and ASN, when is defined is used
+# before the ip list API
+IP_RANGE_DB_PATH = os.getenv("IP_RANGE_DB_PATH")
 
 # Custom vars - Templates
 
@@ -4,3 +4,11 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        from core.helpers import (
+            connect_permission_cache_signals,
+            connect_token_cache_signals,
+        )
+        connect_permission_cache_signals()
+        connect_token_cache_signals()
@@ -1,3 +1,9 @@
+from .cache import (
+    CACHE_MISS,
+    LocalLRUCache,
+    TwoTierCache,
+    get_redis_cache,
+)
 from .calc_fx import calc_fx
 from .cerberus_custom_errors_validator import (
     AdminFilenameErrorHandler,
@@ -46,11 +52,26 @@ from .email_thread import (
     send_email,
     send_validation_response_email,
 )
+from .export import (
+    ExportColumn,
+    ExportFormat,
+    export_response,
+    iter_export_rows,
+    to_export_date,
+    to_export_list,
+    write_export_file,
+)
+from .fx_matrix import FxMatrix
 from .get_client_ip import get_client_ip
 from .identification_type import IdentificationType
 from .languages import LanguagesCHO
 from .manage_locale import ManageLocaleMiddleware
 from .path_route_db import request_cfg
+from .permission_cache import (
+    connect_permission_cache_signals,
+    get_rol_permissions,
+    invalidate_permission_cache,
+)
 from .responses import (
     bad_request_response,
     obj_not_found_response,
@@ -64,6 +85,11 @@ from .s3_config import (
 )
 from .sendgrid import send_phone_message
 from .timezone import timezone_customer
+from .token_cache import (
+    connect_token_cache_signals,
+    invalidate_token_cache,
+    invalidate_user_token_cache,
+)
 from .validation import (
     ValidatorFile,
     create_validator,
@@ -11,6 +11,9 @@ from django.conf import settings
 from rest_framework import exceptions
 from rest_framework.authentication import TokenAuthentication
 
+from .permission_cache import get_cached_permissions
+from .token_cache import get_cached_token
+
 UserModel = get_user_model()
 
 
@@ -120,16 +123,24 @@ class AuthBackend(BaseBackend):
 
         perm_cache_name = '_%s_perm_cache' % from_name
         if not hasattr(user_obj, perm_cache_name):
+            def _resolve():
+                if user_obj.is_superuser:
+                    perms = Permission.objects.all()
+                else:
+                    perms = getattr(self, '_get_%s_permissions' %
+                                    from_name)(user_obj)
+                perms = perms.values_list(
+                    'content_type__app_label', 'codename').order_by()
+                return {"%s.%s" % (ct, name) for ct, name in perms}
+
+            # Cached between requests, superusers share the same set
             if user_obj.is_superuser:
-                perms = Permission.objects.all()
+                key = f"all:{user_obj._state.db}"
             else:
-                perms = getattr(self, '_get_%s_permissions' %
-                                from_name)(user_obj)
-            perms = perms.values_list(
-                'content_type__app_label', 'codename').order_by()
+                key = f"user:{user_obj._state.db}:{user_obj.pk}:{from_name}"
             setattr(
                 user_obj, perm_cache_name,
-                {"%s.%s" % (ct, name) for ct, name in perms})
+                get_cached_permissions(key=key, resolve=_resolve))
         return getattr(user_obj, perm_cache_name)
 
     def get_user_permissions(self, user_obj, obj=None):
@@ -204,9 +215,14 @@ class AuthBackend(BaseBackend):
 class BackTokenAuthentication(TokenAuthentication):
     def authenticate_credentials(self, key):
         model = self.get_model()
-        try:
-            token = model.objects.select_related('user').get(key=key)
-        except model.DoesNotExist:
+
+        def _resolve():
+            return model.objects.select_related('user').filter(key=key).first()
+
+        # Token and user are cached, cache is invalidated on logout,
+        # rotation of token and changes of user
+        token = get_cached_token(model=model, key=key, resolve=_resolve)
+        if token is None:
             raise exceptions.AuthenticationFailed(
                 detail={
                     "error": settings.INVALID_TOKEN,
@@ -0,0 +1,270 @@
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+import redis
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Returned by caches when the key is not cached, None is a valid cached
+# value
+CACHE_MISS = object()
+
+_redis_client = None
+_redis_lock = threading.Lock()
+
+
+def get_redis_cache():
+    """
+    Client of Redis used as cache shared between processes, None when the
+    var `REDIS_CACHE_URL` is not defined. The client keeps its own pool
+    of connections and is safe to use between threads
+    """
+    global _redis_client
+    if (not settings.REDIS_CACHE_URL):
+        return None
+
+    with _redis_lock:
+        if (_redis_client is None):
+            _redis_client = redis.Redis.from_url(
+                url=settings.REDIS_CACHE_URL,
+                socket_timeout=settings.REDIS_CACHE_TIMEOUT_SECONDS,
+                socket_connect_timeout=settings.REDIS_CACHE_TIMEOUT_SECONDS,
+            )
+    return _redis_client
+
+
+class LocalLRUCache():
+    """
+    Cache on memory of the process with limit of size (least recently
+    used are removed first) and time to live by entry, safe to use between
+    threads
+    """
+
+    def __init__(self, maxsize, ttl_seconds):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if (entry is None or entry[1] < time.monotonic()):
+                if (entry is not None):
+                    del self.entries[key]
+                self.misses += 1
+                return CACHE_MISS
+
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key, value, ttl_seconds=None):
+        expire_at = time.monotonic() + (ttl_seconds or self.ttl_seconds)
+        with self.lock:
+            self.entries[key] = (value, expire_at)
+            self.entries.move_to_end(key)
+            while (len(self.entries) > self.maxsize):
+                self.entries.popitem(last=False)
+
+    def delete(self, key):
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+class TwoTierCache():
+    """
+    Cache with a local LRU tier on every process and Redis as shared tier,
+    values are serialized with JSON.
+
+    All keys belong to a versioned namespace, `invalidate` increments the
+    version on Redis so all keys of previous version are ignored by all
+    processes. The local tier verifies the version each
+    `local_ttl_seconds` at most, that is the max time that a process can
+    answer with invalidated data.
+
+    When Redis is not defined or fails, the cache works only with the
+    local tier and the errors are logged.
+
+    Hits and misses of every tier are logged each
+    `CACHE_STATS_LOG_SECONDS` by process (see `stats`)
+    """
+
+    def __init__(
+        self,
+        namespace,
+        ttl_seconds,
+        local_ttl_seconds,
+        local_maxsize,
+    ):
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds
+        self.local = LocalLRUCache(
+            maxsize=local_maxsize,
+            ttl_seconds=local_ttl_seconds,
+        )
+        self.version = None
+        self.version_checked_at = 0
+        self.shared_hits = 0
+        self.shared_misses = 0
+        self.stats_logged_at = time.monotonic()
+
+    @property
+    def version_key(self):
+        return f"{self.namespace}:version"
+
+    def _key(self, key, version):
+        return f"{self.namespace}:{version}:{key}"
+
+    def _get_version(self):
+        """
+        Current version of namespace, is verified against Redis each
+        `local_ttl_seconds`. When the version changes the local tier is
+        cleared
+        """
+        now = time.monotonic()
+        if (self.version is not None and now - self.version_checked_at < self.local.ttl_seconds):
+            return self.version
+
+        redis_cache = get_redis_cache()
+        version = self.version or 0
+        if (redis_cache is not None):
+            try:
+                version = int(redis_cache.get(self.version_key) or 0)
+            except redis.exceptions.RedisError:
+                logger.warning(f"Redis not available for get version of cache \"{self.namespace}\"")
+
+        if (version != self.version):
+            self.local.clear()
+        self.version = version
+        self.version_checked_at = now
+        return version
+
+    def get(self, key):
+        """
+        Get the cached value of key, returns `CACHE_MISS` if is not cached
+        """
+        version = self._get_version()
+        self._log_stats()
+        value = self.local.get(key)
+        if (value is not CACHE_MISS):
+            return value
+
+        redis_cache = get_redis_cache()
+        if (redis_cache is None):
+            return CACHE_MISS
+
+        try:
+            raw_value = redis_cache.get(self._key(key=key, version=version))
+        except redis.exceptions.RedisError:
+            logger.warning(f"Redis not available for get key of cache \"{self.namespace}\"")
+            return CACHE_MISS
+
+        if (raw_value is None):
+            self.shared_misses += 1
+            return CACHE_MISS
+
+        self.shared_hits += 1
+        value = json.loads(raw_value)
+        self.local.set(key, value)
+        return value
+
+    def set(self, key, value):
+        version = self._get_version()
+        self.local.set(key, value)
+
+        redis_cache = get_redis_cache()
+        if (redis_cache is None):
+            return
+
+        try:
+            redis_cache.set(
+                self._key(key=key, version=version),
+                json.dumps(value),
+                ex=self.ttl_seconds,
+            )
+        except redis.exceptions.RedisError:
+            logger.warning(f"Redis not available for set key of cache \"{self.namespace}\"")
+
+    def get_or_set(self, key, default):
+        """
+        Get the cached value of key, if is not cached the value is
+        calculated with the callable `default` and cached
+        """
+        value = self.get(key)
+        if (value is CACHE_MISS):
+            value = default()
+            self.set(key, value)
+        return value
+
+    def delete(self, key):
+        version = self._get_version()
+        self.local.delete(key)
+
+        redis_cache = get_redis_cache()
+        if (redis_cache is None):
+            return
+
+        try:
+            redis_cache.delete(self._key(key=key, version=version))
+        except redis.exceptions.RedisError:
+            logger.warning(f"Redis not available for delete key of cache \"{self.namespace}\"")
+
+    def invalidate(self):
+        """
+        Invalidate all keys of namespace on all processes
+        """
+        self.local.clear()
+        self.version_checked_at = 0
+
+        redis_cache = get_redis_cache()
+        if (redis_cache is None):
+            return
+
+        try:
+            redis_cache.incr(self.version_key)
+        except redis.exceptions.RedisError:
+            logger.error(f"Redis not available for invalidate cache \"{self.namespace}\"")
+
+    def stats(self):
+        """
+        Counters of hits and misses of this process by tier since last log
+        of stats, a miss of local tier is looked up on Redis
+        """
+        return {
+            "namespace": self.namespace,
+            "version": self.version,
+            "local_size": len(self.local.entries),
+            "local_hits": self.local.hits,
+            "local_misses": self.local.misses,
+            "shared_hits": self.shared_hits,
+            "shared_misses": self.shared_misses,
+        }
+
+    def _log_stats(self):
+        """
+        Log the counters of `stats` each `CACHE_STATS_LOG_SECONDS`, the
+        counters are restarted after every log
+        """
+        if (not settings.CACHE_STATS_LOG_SECONDS):
+            return
+        now = time.monotonic()
+        if (now - self.stats_logged_at < settings.CACHE_STATS_LOG_SECONDS):
+            return
+
+        self.stats_logged_at = now
+        logger.info(f"Stats of cache \"{self.namespace}\": {self.stats()}")
+        self.local.hits = 0
+        self.local.misses = 0
+        self.shared_hits = 0
+        self.shared_misses = 0
@@ -1,5 +1,6 @@
 import logging
 
+from .fx_matrix import FxMatrix
 
 logger = logging.getLogger(__name__)
 
@@ -9,13 +10,16 @@ def calc_fx(
     currency_from_str,
     partner_currency_str,
 ):
-    if(currency_from_str != partner_currency_str):
-        try:
-            fx_book_partner = eval(
-                f"fx_partner.fx_{currency_from_str}_{partner_currency_str}") * fx_partner.fx_percentage
-        except:
-            logger.error(
-                f"Fx conversion from {currency_from_str} to {partner_currency_str} undefined on DB")
-    else:
-        fx_book_partner = 1
+    """
+    Fx with fx_percentage from currency to currency of partner, 1 on same
+    currency and None when the conversion is undefined on DB
+    """
+    fx_book_partner = FxMatrix.from_fx_partner(fx_partner).rate(
+        currency_from=currency_from_str,
+        currency_to=partner_currency_str,
+        with_percentage=True,
+    )
+    if(fx_book_partner is None):
+        logger.error(
+            f"Fx conversion from {currency_from_str} to {partner_currency_str} undefined on DB")
     return fx_book_partner
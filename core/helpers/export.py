@@ -0,0 +1,209 @@
+import csv
+import datetime
+import io
+import tempfile
+from collections import namedtuple
+
+import xlsxwriter
+from django.conf import settings
+from django.http import (
+    FileResponse,
+    StreamingHttpResponse,
+)
+from django.utils import timezone
+
+ExportColumn = namedtuple(
+    typename="ExportColumn",
+    field_names=(
+        "field",
+        "header",
+        "format",
+    ),
+    defaults=(None,),
+)
+"""
+Column of export, `field` is the name used on `values_list` of queryset,
+`header` the title of column on file and `format` an optional callable
+applied to every value
+"""
+
+
+class ExportFormat():
+    CSV = "csv"
+    XLSX = "xlsx"
+
+    values = (
+        CSV,
+        XLSX,
+    )
+
+
+def to_export_date(value):
+    """
+    Date of datetime on UTC (as DB returns it), same date of old exports
+    with pandas `.dt.date`. None and dates are returned without changes
+    """
+    if (isinstance(value, datetime.datetime)):
+        if (timezone.is_aware(value)):
+            value = value.astimezone(datetime.timezone.utc)
+        return value.date()
+    return value
+
+
+def to_export_list(value):
+    """
+    Values of an array (like `ArrayAgg`) separated by comma, xlsx and csv
+    cells not support lists. None is returned without changes
+    """
+    if (value is None):
+        return value
+    return ", ".join(str(value_i) for value_i in value)
+
+
+def iter_export_rows(queryset, columns, chunk_size=None):
+    """
+    Rows of queryset as lists of values of columns, the queryset is read
+    with a server side cursor by chunks so the memory used not depends of
+    count of rows
+    """
+    formats = [column.format for column in columns]
+    rows = queryset.values_list(
+        *(column.field for column in columns),
+    ).iterator(
+        chunk_size=chunk_size or settings.EXPORT_CHUNK_SIZE,
+    )
+    for row in rows:
+        yield [
+            value if format_ is None else format_(value)
+            for value, format_ in zip(row, formats)
+        ]
+
+
+class _EchoBuffer():
+    """
+    File like object that returns the written value instead of keep it,
+    used with `csv.writer` for generate the lines of CSV one by one
+    """
+
+    def write(self, value):
+        return value
+
+
+def csv_export_response(queryset, columns, filename, chunk_size=None):
+    """
+    CSV file streamed while the queryset is read, the response starts
+    before the last row is read
+    """
+    writer = csv.writer(_EchoBuffer())
+
+    def _lines():
+        # BOM for correct encoding on Excel
+        yield "\ufeff"
+        yield writer.writerow([column.header for column in columns])
+        for row in iter_export_rows(queryset=queryset, columns=columns, chunk_size=chunk_size):
+            yield writer.writerow(row)
+
+    response = StreamingHttpResponse(
+        streaming_content=_lines(),
+        content_type="text/csv; charset=utf-8",
+    )
+    response["Content-Disposition"] = f"attachment; filename={filename}.csv"
+    return response
+
+
+def write_xlsx_file(file, queryset, columns, chunk_size=None, sheet_name="Sheet1"):
+    """
+    Write the XLSX of queryset on binary file with XlsxWriter on
+    `constant_memory` mode, every row is flushed to disk when the next row
+    is written so only one row is on memory. Returns the count of rows
+    """
+    rows_count = 0
+    workbook = xlsxwriter.Workbook(
+        file,
+        {
+            "constant_memory": True,
+            "tmpdir": settings.EXPORT_TMP_DIR,
+            "default_date_format": "yyyy-mm-dd",
+            "remove_timezone": True,
+        },
+    )
+    worksheet = workbook.add_worksheet(sheet_name)
+    worksheet.write_row(0, 0, [column.header for column in columns])
+    for row_index, row in enumerate(
+        iter_export_rows(queryset=queryset, columns=columns, chunk_size=chunk_size),
+        start=1,
+    ):
+        worksheet.write_row(row_index, 0, row)
+        rows_count = row_index
+    workbook.close()
+    return rows_count
+
+
+def write_csv_file(file, queryset, columns, chunk_size=None):
+    """
+    Write the CSV of queryset on binary file, encoded with UTF-8 with BOM
+    for correct encoding on Excel. Returns the count of rows
+    """
+    rows_count = 0
+    text_file = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    writer = csv.writer(text_file)
+    writer.writerow([column.header for column in columns])
+    for row in iter_export_rows(queryset=queryset, columns=columns, chunk_size=chunk_size):
+        writer.writerow(row)
+        rows_count += 1
+    text_file.flush()
+    # Binary file is kept open for the caller
+    text_file.detach()
+    return rows_count
+
+
+def write_export_file(file, queryset, columns, file_format=ExportFormat.XLSX, chunk_size=None):
+    """
+    Write the queryset on binary file on CSV or XLSX, returns the count
+    of rows
+    """
+    if (file_format == ExportFormat.CSV):
+        return write_csv_file(file=file, queryset=queryset, columns=columns, chunk_size=chunk_size)
+    return write_xlsx_file(file=file, queryset=queryset, columns=columns, chunk_size=chunk_size)
+
+
+def xlsx_export_response(queryset, columns, filename, chunk_size=None):
+    """
+    XLSX file built on a temporary file (see `write_xlsx_file`) that is
+    streamed by chunks on response and removed when is closed
+    """
+    excel_file = tempfile.TemporaryFile()
+    write_xlsx_file(
+        file=excel_file,
+        queryset=queryset,
+        columns=columns,
+        chunk_size=chunk_size,
+    )
+
+    excel_file.seek(0)
+    return FileResponse(
+        excel_file,
+        as_attachment=True,
+        filename=f"{filename}.xlsx",
+        content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    )
+
+
+def export_response(queryset, columns, filename, file_format=ExportFormat.XLSX, chunk_size=None):
+    """
+    Streaming response of queryset on CSV or XLSX, `filename` is without
+    extension
+    """
+    if (file_format == ExportFormat.CSV):
+        return csv_export_response(
+            queryset=queryset,
+            columns=columns,
+            filename=filename,
+            chunk_size=chunk_size,
+        )
+    return xlsx_export_response(
+        queryset=queryset,
+        columns=columns,
+        filename=filename,
+        chunk_size=chunk_size,
+    )
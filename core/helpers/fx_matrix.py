@@ -0,0 +1,141 @@
+import numpy as np
+
+from .currencies import (
+    CurrencyCondition,
+    CurrencyFixedIncome,
+    CurrencyPartner,
+)
+
+
+class FxMatrix():
+    """
+    Conversion matrix of a `FxPartner` row, `matrix[from, to]` is the fx
+    from currency `from` to currency `to` indexed by position of currency
+    on `CURRENCIES`. Same currency is 1 and conversions undefined on
+    `FxPartner` are NaN. The extra last row and column are for unknown
+    currencies (NaN) so lookups of arrays with unknown or null currencies
+    not fail.
+
+    Use `from_fx_partner` for reuse the matrix built on the same instance
+    of `FxPartner`
+    """
+
+    CURRENCIES = tuple(
+        sorted(
+            {
+                *CurrencyCondition.values,
+                *CurrencyFixedIncome.values,
+                *CurrencyPartner.values,
+            },
+        ),
+    )
+    INDEXES = {
+        currency.lower(): index
+        for index, currency in enumerate(CURRENCIES)
+    }
+    UNKNOWN_INDEX = len(CURRENCIES)
+
+    def __init__(self, fx_partner):
+        self.fx_percentage = fx_partner.fx_percentage
+        self.matrix = np.full(
+            shape=(len(self.CURRENCIES) + 1, len(self.CURRENCIES) + 1),
+            fill_value=np.nan,
+        )
+        for currency_from, index_from in self.INDEXES.items():
+            for currency_to, index_to in self.INDEXES.items():
+                if (index_from == index_to):
+                    self.matrix[index_from, index_to] = 1
+                    continue
+
+                fx = getattr(fx_partner, f"fx_{currency_from}_{currency_to}", None)
+                if (fx is not None):
+                    self.matrix[index_from, index_to] = fx
+
+    @classmethod
+    def from_fx_partner(cls, fx_partner):
+        fx_matrix = getattr(fx_partner, "_fx_matrix", None)
+        if (fx_matrix is None):
+            fx_matrix = cls(fx_partner=fx_partner)
+            fx_partner._fx_matrix = fx_matrix
+        return fx_matrix
+
+    def indexes(self, currencies):
+        """
+        Position of currency or array of positions for iterable of
+        currencies, case insensitive
+        """
+        if (isinstance(currencies, str)):
+            return self.INDEXES.get(currencies.lower(), self.UNKNOWN_INDEX)
+
+        return np.fromiter(
+            (
+                self.INDEXES.get(currency.lower(), self.UNKNOWN_INDEX)
+                if isinstance(currency, str)
+                else self.UNKNOWN_INDEX
+                for currency in currencies
+            ),
+            dtype=np.intp,
+        )
+
+    def rates(
+        self,
+        currency_from,
+        currency_to,
+        with_percentage=False,
+        percentage_on_same_currency=False,
+    ):
+        """
+        Fx between currencies, `currency_from` and `currency_to` can be a
+        currency or arrays of same length. With `with_percentage` the
+        fx_percentage is applied to conversions between different
+        currencies, also to same currency with
+        `percentage_on_same_currency` (payments of withdrawals)
+        """
+        index_from = self.indexes(currency_from)
+        index_to = self.indexes(currency_to)
+        rates = self.matrix[index_from, index_to]
+        if (with_percentage):
+            rates = rates * np.where(
+                index_from == index_to,
+                self.fx_percentage if percentage_on_same_currency else 1,
+                self.fx_percentage,
+            )
+        return rates
+
+    def rate(
+        self,
+        currency_from,
+        currency_to,
+        with_percentage=False,
+        percentage_on_same_currency=False,
+    ):
+        """
+        Fx between two currencies, None if it is undefined on `FxPartner`
+        """
+        rate = float(
+            self.rates(
+                currency_from=currency_from,
+                currency_to=currency_to,
+                with_percentage=with_percentage,
+                percentage_on_same_currency=percentage_on_same_currency,
+            ),
+        )
+        return None if np.isnan(rate) else rate
+
+    def convert(
+        self,
+        amounts,
+        currency_from,
+        currency_to,
+        with_percentage=False,
+        percentage_on_same_currency=False,
+    ):
+        """
+        Convert array of amounts, returns NaN for the undefined conversions
+        """
+        return np.asarray(amounts, dtype=np.float64) * self.rates(
+            currency_from=currency_from,
+            currency_to=currency_to,
+            with_percentage=with_percentage,
+            percentage_on_same_currency=percentage_on_same_currency,
+        )
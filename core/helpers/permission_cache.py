@@ -0,0 +1,102 @@
+from django.conf import settings
+from django.db import transaction
+
+_permission_cache = None
+
+
+def get_permission_cache():
+    """
+    Cache of sets of permissions by rol and by user, local tier on every
+    process and Redis as shared tier. All entries belong to one versioned
+    namespace, any write of roles or permissions bumps the version
+    """
+    from .cache import TwoTierCache
+
+    global _permission_cache
+    if (_permission_cache is None):
+        _permission_cache = TwoTierCache(
+            namespace="permission",
+            ttl_seconds=settings.PERMISSION_CACHE_SECONDS,
+            local_ttl_seconds=settings.PERMISSION_CACHE_LOCAL_SECONDS,
+            local_maxsize=settings.PERMISSION_CACHE_LOCAL_SIZE,
+        )
+    return _permission_cache
+
+
+def get_cached_permissions(key, resolve):
+    """
+    Get set of permissions of key from cache, when is not cached is
+    resolved with the callable `resolve` that returns an iterable of
+    permission names
+    """
+    return set(
+        get_permission_cache().get_or_set(
+            key=key,
+            default=lambda: sorted(resolve()),
+        ),
+    )
+
+
+def get_rol_permissions(rol_id, using):
+    """
+    Codenames of `core.Permission` of rol
+    """
+    from core.models import Permission
+
+    return get_cached_permissions(
+        key=f"rol:{using}:{rol_id}",
+        resolve=lambda: Permission.objects.using(using).filter(
+            permissions_to_rol__pk=rol_id,
+        ).values_list("codename", flat=True),
+    )
+
+
+def invalidate_permission_cache(using=None, **kwargs):
+    """
+    Invalidate all cached permissions when the current transaction is
+    committed (immediately if there is no transaction), used as receiver
+    of signals of writes on roles and permissions
+    """
+    transaction.on_commit(
+        func=get_permission_cache().invalidate,
+        using=using,
+    )
+
+
+def connect_permission_cache_signals():
+    from core.models import (
+        Permission,
+        Rol,
+        User,
+    )
+    from django.contrib.auth.models import Group
+    from django.contrib.auth.models import Permission as AuthPermission
+    from django.db.models.signals import (
+        m2m_changed,
+        post_delete,
+        post_save,
+    )
+
+    for sender in (Permission, Rol, AuthPermission, Group):
+        post_save.connect(
+            receiver=invalidate_permission_cache,
+            sender=sender,
+            dispatch_uid=f"permission_cache_save_{sender._meta.label}",
+        )
+        post_delete.connect(
+            receiver=invalidate_permission_cache,
+            sender=sender,
+            dispatch_uid=f"permission_cache_delete_{sender._meta.label}",
+        )
+
+    for sender in (
+        Rol.permissions.through,
+        User.user_permissions.through,
+        User.groups.through,
+        Group.permissions.through,
+    ):
+        m2m_changed.connect(
+            receiver=invalidate_permission_cache,
+            sender=sender,
+            dispatch_uid=f"permission_cache_m2m_{sender._meta.label}",
+        )
@@ -0,0 +1,208 @@
+import datetime
+import decimal
+import hashlib
+import uuid
+
+from django.conf import settings
+from django.db import (
+    router,
+    transaction,
+)
+
+from .cache import (
+    CACHE_MISS,
+    TwoTierCache,
+)
+
+# Fields cached by model, used by authentication and permissions. Other
+# fields (password included) are deferred and loaded from DB on access
+TOKEN_CACHE_FIELDS = (
+    "user_id",
+    "created",
+)
+USER_CACHE_FIELDS = (
+    "id",
+    "email",
+    "is_active",
+    "is_staff",
+    "is_superuser",
+    "is_banned",
+    "user_type",
+    "rol_id",
+    "language",
+)
+
+_token_cache = None
+
+
+def get_token_cache():
+    """
+    Cache of authentication tokens, hash of key of token (and DB) to the
+    fields of token and its user of `TOKEN_CACHE_FIELDS` and
+    `USER_CACHE_FIELDS`. Local tier on every process and Redis as shared
+    tier
+    """
+    global _token_cache
+    if (_token_cache is None):
+        _token_cache = TwoTierCache(
+            namespace="token",
+            ttl_seconds=settings.TOKEN_CACHE_SECONDS,
+            local_ttl_seconds=settings.TOKEN_CACHE_LOCAL_SECONDS,
+            local_maxsize=settings.TOKEN_CACHE_LOCAL_SIZE,
+        )
+    return _token_cache
+
+
+def _cache_key(db, key):
+    """
+    Key of token on cache, the raw key of token is never stored
+    """
+    return f"{db}:{hashlib.sha256(key.encode()).hexdigest()}"
+
+
+def _dump_instance(instance, attnames):
+    """
+    Values of fields of `attnames` of instance that can be serialized with
+    JSON
+    """
+    values = {}
+    for field in instance._meta.concrete_fields:
+        if (field.attname not in attnames):
+            continue
+        value = getattr(instance, field.attname)
+        if (isinstance(value, (datetime.date, datetime.time, decimal.Decimal, uuid.UUID))):
+            value = field.value_to_string(instance)
+        values[field.attname] = value
+    return values
+
+
+def _load_instance(model, db, values):
+    """
+    Build an instance of model from values of `_dump_instance`, the
+    fields not on values are deferred
+    """
+    fields = [
+        field
+        for field in model._meta.concrete_fields
+        if field.attname in values
+    ]
+    return model.from_db(
+        db=db,
+        field_names=[field.attname for field in fields],
+        values=[
+            None if values.get(field.attname) is None else field.to_python(values.get(field.attname))
+            for field in fields
+        ],
+    )
+
+
+def get_cached_token(model, key, resolve):
+    """
+    Get token of key and its user from cache, when is not cached is
+    resolved with the callable `resolve` that returns the token with its
+    user or None. Not found tokens are not cached.
+
+    Returns a new instance of token with user on every call, so the
+    instances are never shared between requests
+    """
+    from django.contrib.auth import get_user_model
+
+    user_model = get_user_model()
+    db = router.db_for_read(model)
+    token_cache = get_token_cache()
+    cache_key = _cache_key(db=db, key=key)
+
+    data = token_cache.get(cache_key)
+    if (data is CACHE_MISS):
+        token = resolve()
+        if (token is None):
+            return None
+
+        data = {
+            "token": _dump_instance(instance=token, attnames=TOKEN_CACHE_FIELDS),
+            "user": _dump_instance(instance=token.user, attnames=USER_CACHE_FIELDS),
+        }
+        token_cache.set(cache_key, data)
+
+    # Key is the primary key of token, taken from request
+    token = _load_instance(
+        model=model,
+        db=db,
+        values={
+            model._meta.pk.attname: key,
+            **data.get("token"),
+        },
+    )
+    token.user = _load_instance(model=user_model, db=db, values=data.get("user"))
+    return token
+
+
+def invalidate_token_cache(keys, using=None):
+    """
+    Remove tokens of keys from cache when the current transaction is
+    committed (immediately if there is no transaction)
+    """
+    keys = list(keys)
+    if (not keys):
+        return
+
+    def _delete():
+        token_cache = get_token_cache()
+        for key in keys:
+            token_cache.delete(_cache_key(db=using, key=key))
+
+    transaction.on_commit(func=_delete, using=using)
+
+
+def _invalidate_token(instance, using=None, **kwargs):
+    invalidate_token_cache(keys=(instance.key,), using=using)
+
+
+def invalidate_user_token_cache(user_id, using=None):
+    """
+    Remove all tokens of user from cache, must be called on writes of
+    users that not send signals (`QuerySet.update`)
+    """
+    from rest_framework.authtoken.models import Token
+
+    keys = Token.objects.using(using).filter(
+        user_id=user_id,
+    ).values_list("key", flat=True)
+    invalidate_token_cache(keys=keys, using=using)
+
+
+def _invalidate_user_tokens(instance, using=None, **kwargs):
+    """
+    Changes of user (is_active, password, etc) invalidate all their
+    tokens
+    """
+    invalidate_user_token_cache(user_id=instance.pk, using=using)
+
+
+def connect_token_cache_signals():
+    """
+    Invalidate cached tokens on logout and rotation (delete or save of
+    token) and on changes of user
+    """
+    from django.contrib.auth import get_user_model
+    from django.db.models.signals import (
+        post_delete,
+        post_save,
+    )
+    from rest_framework.authtoken.models import Token
+
+    post_save.connect(
+        receiver=_invalidate_token,
+        sender=Token,
+        dispatch_uid="token_cache_save_token",
+    )
+    post_delete.connect(
+        receiver=_invalidate_token,
+        sender=Token,
+        dispatch_uid="token_cache_delete_token",
+    )
+    post_save.connect(
+        receiver=_invalidate_user_tokens,
+        sender=get_user_model(),
+        dispatch_uid="token_cache_save_user",
+    )
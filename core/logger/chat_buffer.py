@@ -0,0 +1,219 @@
+import hashlib
+import logging
+import threading
+import time
+import uuid
+
+import redis
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+# Keys on Redis by webhook, the url is hashed for not expose it on keys
+CHAT_BUFFER_KEY = "chat:buffer:{url_hash}"
+CHAT_LOCK_KEY = "chat:lock:{url_hash}"
+CHAT_BUCKET_KEY = "chat:bucket:{url_hash}"
+CHAT_PENDING_KEY = "chat:pending:{url_hash}"
+
+# Max length of text of a message on webhook
+CHAT_MESSAGE_LENGTH = 4096
+
+_chat_session = None
+_chat_session_lock = threading.Lock()
+
+
+def _url_hash(msg_url):
+    return hashlib.sha1(msg_url.encode()).hexdigest()
+
+
+def _get_redis():
+    from core.helpers.cache import get_redis_cache
+
+    return get_redis_cache()
+
+
+def get_chat_session():
+    """
+    Session of requests shared by the process, the connections to webhooks
+    are reused between messages
+    """
+    global _chat_session
+    with _chat_session_lock:
+        if (_chat_session is None):
+            _chat_session = requests.Session()
+            _chat_session.headers.update(
+                {
+                    "Content-Type": "application/json; charset=UTF-8",
+                },
+            )
+            adapter = HTTPAdapter(
+                pool_connections=settings.CHAT_HTTP_POOL_SIZE,
+                pool_maxsize=settings.CHAT_HTTP_POOL_SIZE,
+            )
+            _chat_session.mount("https://", adapter)
+            _chat_session.mount("http://", adapter)
+    return _chat_session
+
+
+def push_chat_log(msg, msg_url):
+    """
+    Add a message to the buffer of webhook on Redis, the messages are
+    sent together by task `flush_chat_logs`.
+
+    Returns the count of messages on buffer, None when Redis is not
+    defined or fails, in that case the caller must send the message
+    """
+    redis_cache = _get_redis()
+    if (redis_cache is None or not msg_url):
+        return None
+
+    try:
+        return redis_cache.rpush(CHAT_BUFFER_KEY.format(url_hash=_url_hash(msg_url)), msg)
+    except redis.exceptions.RedisError:
+        logger.warning("Redis not available for buffer chat log, fallback to chat_logger task")
+        return None
+
+
+def pop_chat_logs(msg_url, max_count):
+    """
+    Take at most `max_count` messages from the buffer of webhook, the read
+    and removal are made on the same transaction
+    """
+    redis_cache = _get_redis()
+    if (redis_cache is None):
+        return []
+
+    key = CHAT_BUFFER_KEY.format(url_hash=_url_hash(msg_url))
+    with redis_cache.pipeline(transaction=True) as pipe:
+        pipe.lrange(key, 0, max_count - 1)
+        pipe.ltrim(key, max_count, -1)
+        raw_msgs, _ = pipe.execute()
+    return [raw_msg.decode() for raw_msg in raw_msgs]
+
+
+def requeue_chat_logs(msg_url, msgs):
+    """
+    Return messages to the head of buffer of webhook, used when the send
+    fails or is limited so the messages are not lost
+    """
+    redis_cache = _get_redis()
+    if (redis_cache is None or not msgs):
+        return
+
+    redis_cache.lpush(
+        CHAT_BUFFER_KEY.format(url_hash=_url_hash(msg_url)),
+        *reversed(msgs),
+    )
+
+
+def acquire_flush_lock(msg_url, timeout_seconds):
+    """
+    Lock of flush of webhook, only one worker sends the messages of a
+    webhook at a time. Returns the token of lock or None if is taken
+    """
+    redis_cache = _get_redis()
+    token = uuid.uuid4().hex
+    acquired = redis_cache.set(
+        CHAT_LOCK_KEY.format(url_hash=_url_hash(msg_url)),
+        token,
+        nx=True,
+        ex=timeout_seconds,
+    )
+    return token if acquired else None
+
+
+def release_flush_lock(msg_url, token):
+    redis_cache = _get_redis()
+    key = CHAT_LOCK_KEY.format(url_hash=_url_hash(msg_url))
+    with redis_cache.pipeline(transaction=True) as pipe:
+        try:
+            pipe.watch(key)
+            if (pipe.get(key) == token.encode()):
+                pipe.multi()
+                pipe.delete(key)
+                pipe.execute()
+        except redis.exceptions.WatchError:
+            pass
+
+
+def mark_flush_pending(msg_url, timeout_seconds, force=False):
+    """
+    Mark that a flush of webhook is scheduled, the mark expires after
+    `timeout_seconds` so a lost task not stops the flushes. Returns True
+    when the mark was made (and the caller must schedule the flush), False
+    if other flush is already pending. With `force` the mark is always made
+    """
+    redis_cache = _get_redis()
+    marked = redis_cache.set(
+        CHAT_PENDING_KEY.format(url_hash=_url_hash(msg_url)),
+        1,
+        nx=not force,
+        ex=timeout_seconds,
+    )
+    return bool(marked)
+
+
+def clear_flush_pending(msg_url):
+    """
+    Remove the mark of pending flush when the flush starts, the messages
+    pushed after that schedule a new flush
+    """
+    redis_cache = _get_redis()
+    redis_cache.delete(CHAT_PENDING_KEY.format(url_hash=_url_hash(msg_url)))
+
+
+def take_chat_token(msg_url):
+    """
+    Token bucket of webhook, `CHAT_RATE_PER_MINUTE` messages by minute
+    with bursts of `CHAT_RATE_BURST`. Must be called with the flush lock
+    of webhook, the state is shared on Redis between workers.
+
+    Returns 0 when the message can be sent, otherwise the seconds to wait
+    for the next token
+    """
+    redis_cache = _get_redis()
+    key = CHAT_BUCKET_KEY.format(url_hash=_url_hash(msg_url))
+    rate = settings.CHAT_RATE_PER_MINUTE / 60
+    capacity = settings.CHAT_RATE_BURST
+
+    now = time.time()
+    tokens, updated_at = redis_cache.hmget(key, "tokens", "updated_at")
+    if (tokens is None or updated_at is None):
+        tokens = capacity
+    else:
+        tokens = min(capacity, float(tokens) + (now - float(updated_at)) * rate)
+
+    if (tokens < 1):
+        wait_seconds = (1 - tokens) / rate
+        return wait_seconds
+
+    redis_cache.hset(
+        key,
+        mapping={
+            "tokens": tokens - 1,
+            "updated_at": now,
+        },
+    )
+    redis_cache.expire(key, int(capacity / rate) + 60)
+    return 0
+
+
+def coalesce_chat_logs(msgs, length=CHAT_MESSAGE_LENGTH):
+    """
+    Join messages on texts of at most `length` characters, messages longer
+    than `length` are split
+    """
+    texts = []
+    current = ""
+    for msg in msgs:
+        for index in range(0, max(len(msg), 1), length):
+            chunk = msg[index:index + length]
+            if (current and len(current) + len(chunk) + 1 > length):
+                texts.append(current)
+                current = ""
+            current = f"{current}\n{chunk}" if current else chunk
+    if (current):
+        texts.append(current)
+    return texts
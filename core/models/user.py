@@ -280,10 +280,18 @@ class User(AbstractUser):
             return True
 
         # Without rol have no permissions
-        if (self.rol is None):
+        if (self.rol_id is None):
             return False
 
-        return bool(self.rol.permissions.filter(Q(codename=codename)).first())
+        # Permissions of rol are cached between requests, memoized on
+        # instance for the current request
+        if (not hasattr(self, "_rol_perm_cache")):
+            from core.helpers import get_rol_permissions
+            self._rol_perm_cache = get_rol_permissions(
+                rol_id=self.rol_id,
+                using=self._state.db,
+            )
+        return codename in self._rol_perm_cache
     # Fields that will not be used into current system
     username = None
 
@@ -1,4 +1,7 @@
-from .chat_logger import chat_logger
+from .chat_logger import (
+    chat_logger,
+    flush_chat_logs,
+)
 from .delete_old_clocked import delete_old_clocked
 from .error_log import celery_task_failure_email
 from .notion_ips_logger import notion_ips_logger
@@ -1,11 +1,61 @@
 import requests
 from betenlace.celery import app
+from celery import Task
 from celery.utils.log import get_task_logger
+from core.logger.chat_buffer import (
+    acquire_flush_lock,
+    clear_flush_pending,
+    coalesce_chat_logs,
+    get_chat_session,
+    mark_flush_pending,
+    pop_chat_logs,
+    push_chat_log,
+    release_flush_lock,
+    requeue_chat_logs,
+    take_chat_token,
+)
+from django.conf import settings
 
 logger_task = get_task_logger(__name__)
 
+# Seconds of lock of flush of a webhook, released before by the task
+CHAT_FLUSH_LOCK_SECONDS = 120
+# Seconds of wait after a failed send
+CHAT_FLUSH_RETRY_SECONDS = 30
+
+
+class ChatLoggerTask(Task):
+    """
+    Task of chat logger with buffer, calls of `apply_async` with only
+    `kwargs` (msg and msg_url) are added to the buffer of webhook on Redis
+    instead of send a task by message, the buffer is sent by
+    `flush_chat_logs` after `CHAT_BUFFER_FLUSH_SECONDS` or when has
+    `CHAT_BUFFER_MAX_MESSAGES` messages.
+
+    Without Redis or with other options (retries, countdown, etc) the task
+    is sent as usual
+    """
+
+    def apply_async(self, args=None, kwargs=None, **options):
+        if (args or options or not kwargs or set(kwargs) != {"msg", "msg_url"}):
+            return super().apply_async(args=args, kwargs=kwargs, **options)
+
+        msg_url = kwargs.get("msg_url")
+        buffer_length = push_chat_log(msg=kwargs.get("msg"), msg_url=msg_url)
+        if (buffer_length is None):
+            return super().apply_async(args=args, kwargs=kwargs, **options)
+
+        if (buffer_length % settings.CHAT_BUFFER_MAX_MESSAGES == 0):
+            # Full buffer, sent without wait
+            _schedule_flush(msg_url=msg_url, countdown=0, force=True)
+        else:
+            # Without pending flush, wait for coalesce the next messages
+            _schedule_flush(msg_url=msg_url, countdown=settings.CHAT_BUFFER_FLUSH_SECONDS)
+        return None
+
 
 @app.task(
+    base=ChatLoggerTask,
     ignore_result=True,
     autoretry_for=(
         ConnectionError,
@@ -21,14 +71,9 @@ def chat_logger(msg, msg_url):
         string=msg,
     )
     for msg_i in msg_chunked:
-        response = requests.post(
-            url=msg_url,
-            headers={
-                "Content-Type": "application/json; charset=UTF-8",
-            },
-            json={
-                "text": msg_i,
-            },
+        response = _post_chat_message(
+            msg=msg_i,
+            msg_url=msg_url,
         )
 
         if(response.status_code == 400):
@@ -62,6 +107,102 @@ def chat_logger(msg, msg_url):
             raise ConnectionError(f"Chat logger Unspected request status code {response.status_code}")
 
 
+@app.task(
+    ignore_result=True,
+)
+def flush_chat_logs(msg_url):
+    """
+    Send the buffered messages of webhook, the messages are joined on
+    texts of max length of webhook and sent with the rate limit of
+    webhook. When the rate is exceeded or the send fails (unexpected
+    errors included) the pending messages are returned to buffer and the
+    flush is scheduled again, so messages are not lost and the webhook is
+    not flooded with retries
+    """
+    # Messages pushed from now schedule a new flush
+    clear_flush_pending(msg_url=msg_url)
+
+    token = acquire_flush_lock(msg_url=msg_url, timeout_seconds=CHAT_FLUSH_LOCK_SECONDS)
+    if (token is None):
+        # Other worker is sending the messages of this webhook, checked
+        # again later for the messages pushed after its last pop
+        _schedule_flush(msg_url=msg_url, countdown=settings.CHAT_BUFFER_FLUSH_SECONDS)
+        return
+
+    countdown = None
+    # Popped texts not sent yet, returned to buffer on any exit
+    pending_texts = []
+    try:
+        while countdown is None:
+            msgs = pop_chat_logs(msg_url=msg_url, max_count=settings.CHAT_BUFFER_MAX_MESSAGES)
+            if (not msgs):
+                break
+
+            pending_texts = coalesce_chat_logs(msgs=msgs)
+            while pending_texts:
+                wait_seconds = take_chat_token(msg_url=msg_url)
+                if (wait_seconds):
+                    countdown = wait_seconds
+                    break
+
+                try:
+                    response = _post_chat_message(msg=pending_texts[0], msg_url=msg_url)
+                except requests.exceptions.RequestException as e:
+                    logger_task.error(f"Chat logger failed to connect with webhook, messages are kept on buffer\n{e}")
+                    countdown = CHAT_FLUSH_RETRY_SECONDS
+                    break
+
+                if (response.status_code == 400):
+                    logger_task.error(f"Badrequest with webhook, response data\n{response.text}")
+                elif (response.status_code != 200):
+                    logger_task.error(
+                        f"Chat logger Unspected request status code {response.status_code}, messages "
+                        f"are kept on buffer, response data\n{response.text}"
+                    )
+                    countdown = CHAT_FLUSH_RETRY_SECONDS
+                    break
+                pending_texts = pending_texts[1:]
+    except Exception:
+        countdown = CHAT_FLUSH_RETRY_SECONDS
+        raise
+    finally:
+        requeue_chat_logs(msg_url=msg_url, msgs=pending_texts)
+        release_flush_lock(msg_url=msg_url, token=token)
+        if (countdown is not None):
+            _schedule_flush(msg_url=msg_url, countdown=countdown, force=True)
+
+
+def _schedule_flush(msg_url, countdown, force=False):
+    """
+    Schedule a flush of webhook when there is not other pending, with
+    `force` is always scheduled
+    """
+    marked = mark_flush_pending(
+        msg_url=msg_url,
+        timeout_seconds=int(countdown) + CHAT_FLUSH_LOCK_SECONDS,
+        force=force,
+    )
+    if (not marked):
+        return
+
+    flush_chat_logs.apply_async(
+        kwargs={
+            "msg_url": msg_url,
+        },
+        countdown=countdown or None,
+    )
+
+
+def _post_chat_message(msg, msg_url):
+    return get_chat_session().post(
+        url=msg_url,
+        json={
+            "text": msg,
+        },
+        timeout=30,
+    )
+
+
 def _chunk_string(
     string,
     length=4096,
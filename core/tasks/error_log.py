@@ -30,7 +30,12 @@ def celery_task_failure_email(**kwargs):
     msg = subject+"\n\n"+content
 
     if not settings.DEBUG:
-        if (kwargs.get("sender").name == "core.tasks.chat_logger.chat_logger"):
+        if (
+            kwargs.get("sender").name in (
+                "core.tasks.chat_logger.chat_logger",
+                "core.tasks.chat_logger.flush_chat_logs",
+            )
+        ):
             logger_task.critical(msg)
             mail_admins(subject, content)
         else: